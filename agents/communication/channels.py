@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass
 from enum import Enum
 
+from src.services.rate_limiter import DistributedTokenBucket, rate_limit_backend
 from src.utils.logging import get_logger
 from src.utils.constants import SHARED_RETRY_POLICIES
 from .templates import RenderedMessage, NotificationChannel
@@ -58,7 +59,13 @@ class ChannelConfig:
 class NotificationChannelManager:
     """Manages notification channels with rate limiting and deduplication"""
     
-    def __init__(self):
+    def __init__(self, rate_limit_backend=rate_limit_backend):
+        """
+        Args:
+            rate_limit_backend: Shared token bucket state so channel limits hold
+                across workers; defaults to the backend from RATE_LIMIT_BACKEND,
+                per-process limits if None
+        """
         self.channel_configs = self._initialize_channel_configs()
         self.rate_limiters = {}
         self.delivery_history = []
@@ -69,7 +76,9 @@ class NotificationChannelManager:
         for channel in NotificationChannel:
             self.rate_limiters[channel] = RateLimiter(
                 self.channel_configs[channel].rate_limit_per_second,
-                self.channel_configs[channel].rate_limit_per_minute
+                self.channel_configs[channel].rate_limit_per_minute,
+                backend=rate_limit_backend,
+                name=f"notifications:{channel.value}"
             )
     
     def _initialize_channel_configs(self) -> Dict[NotificationChannel, ChannelConfig]:
@@ -534,13 +543,26 @@ class NotificationChannelManager:
 
 
 class RateLimiter:
-    """Rate limiter for notification channels"""
+    """
+    Rate limiter for notification channels
     
-    def __init__(self, per_second_limit: float, per_minute_limit: float):
+    With a backend, the limits are token buckets shared by every worker and
+    the windows only report this worker's usage.
+    """
+    
+    def __init__(self, per_second_limit: float, per_minute_limit: float,
+                 backend=None, name: Optional[str] = None):
         self.per_second_limit = per_second_limit
         self.per_minute_limit = per_minute_limit
         self.second_window = []
         self.minute_window = []
+        self.shared_buckets = None
+        if backend is not None:
+            # Capacity of at least one token, or a limit below 1/s could never admit a send
+            self.shared_buckets = (
+                DistributedTokenBucket(f"{name}:second", max(1, per_second_limit), per_second_limit, backend),
+                DistributedTokenBucket(f"{name}:minute", max(1, per_minute_limit), per_minute_limit / 60, backend)
+            )
     
     async def can_send(self, priority_bypass: bool = False) -> bool:
         """Check if we can send a message without exceeding rate limits"""
@@ -550,6 +572,9 @@ class RateLimiter:
             # Clean up old entries
             self._cleanup_windows(current_time)
             
+            if self.shared_buckets is not None:
+                return await self._take_shared_tokens(current_time, priority_bypass)
+            
             # Check per-second limit
             if len(self.second_window) >= self.per_second_limit and not priority_bypass:
                 return False
@@ -568,6 +593,27 @@ class RateLimiter:
             logger.error(f"Error checking rate limit: {e}")
             return False
     
+    async def _take_shared_tokens(self, current_time: datetime, priority_bypass: bool) -> bool:
+        """Take a token from the shared per-minute, then per-second bucket"""
+        second_bucket, minute_bucket = self.shared_buckets
+        
+        if priority_bypass:
+            # Bypassing sends still count against the limits other workers see
+            await minute_bucket.charge()
+            await second_bucket.charge()
+        else:
+            if not await minute_bucket.consume():
+                return False
+            if not await second_bucket.consume():
+                minute_bucket.release()
+                return False
+        
+        # Record this send
+        self.second_window.append(current_time)
+        self.minute_window.append(current_time)
+        
+        return True
+    
     def _cleanup_windows(self, current_time: datetime):
         """Remove old entries from rate limiting windows"""
         try:
@@ -8,7 +8,6 @@ import psutil
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass
 
 from src.interfaces.agent import DetectionAgent
 from src.models.incident import Incident, IncidentSeverity, ServiceTier, BusinessImpact, IncidentMetadata
@@ -17,33 +16,12 @@ from src.utils.constants import RESOURCE_LIMITS, PERFORMANCE_TARGETS, AGENT_CONF
 from src.utils.logging import get_logger
 from src.utils.exceptions import MemoryPressureError, AgentTimeoutError, ResourceLimitError
 from src.services.shared_memory_monitor import get_shared_memory_monitor
+from agents.detection.correlation import AlertCorrelationEngine, AlertSample, CorrelationGroup
 
 
 logger = get_logger("detection_agent")
 
 
-@dataclass
-class AlertSample:
-    """Represents a sampled alert."""
-    alert_id: str
-    timestamp: datetime
-    severity: str
-    source: str
-    message: str
-    metadata: Dict[str, Any]
-    priority_score: float = 0.0
-
-
-@dataclass
-class CorrelationGroup:
-    """Group of correlated alerts."""
-    group_id: str
-    alerts: List[AlertSample]
-    correlation_score: float
-    created_at: datetime
-    last_updated: datetime
-
-
 class AlertSampler:
     """Handles alert sampling during high-volume scenarios."""
     
@@ -212,13 +190,25 @@ class RobustDetectionAgent(DetectionAgent, MemoryBoundedDetectionAgent):
         MemoryBoundedDetectionAgent.__init__(self)
         
         self.alert_sampler = AlertSampler()  # Uses config default
-        self.correlation_groups: Dict[str, CorrelationGroup] = {}
+        self.correlation_engine = AlertCorrelationEngine()  # Uses config defaults
         self.processing_timeout = PERFORMANCE_TARGETS["detection"]["max"]
         
         # Defensive programming state
+        self.correlation_chunk_size = 1000
         self.max_correlation_depth = RESOURCE_LIMITS["correlation_depth"]
         self.processed_alert_ids: Set[str] = set()
-        self.circular_reference_detector: Set[str] = set()
+    
+    def emergency_cleanup(self) -> None:
+        """Also evict idle correlation groups when memory pressure is high."""
+        super().emergency_cleanup()
+        evicted = self.correlation_engine.expire()
+        if evicted:
+            logger.info(f"Evicted {evicted} idle correlation groups during emergency cleanup")
+    
+    @property
+    def correlation_groups(self) -> Dict[str, CorrelationGroup]:
+        """Active correlation groups tracked by the streaming engine."""
+        return self.correlation_engine.groups
     
     async def process_incident(self, incident: Incident) -> List[AgentRecommendation]:
         """
@@ -414,11 +404,20 @@ class RobustDetectionAgent(DetectionAgent, MemoryBoundedDetectionAgent):
             return None
     
     async def _correlate_alerts_with_timeout(self, alerts: List[AlertSample]) -> List[CorrelationGroup]:
-        """Correlate alerts with timeout protection."""
-        return await asyncio.wait_for(
-            self.correlate_events([alert.__dict__ for alert in alerts]),
-            timeout=30  # 30 second timeout for correlation
-        )
+        """
+        Correlate alerts incrementally into the streaming engine.
+        
+        Returns:
+            Correlation groups touched by this batch of alerts
+        """
+        groups = []
+        for start in range(0, len(alerts), self.correlation_chunk_size):
+            groups.extend(self.correlation_engine.add_alerts(alerts[start:start + self.correlation_chunk_size]))
+            # Yield between chunks so an alert storm cannot starve the event loop
+            await asyncio.sleep(0)
+        
+        # A group touched by several chunks is reported once
+        return list({group.group_id: group for group in groups}.values())
     
     def _simple_alert_grouping(self, alerts: List[AlertSample]) -> List[CorrelationGroup]:
         """Simple alert grouping fallback when correlation fails."""
@@ -503,7 +502,7 @@ class RobustDetectionAgent(DetectionAgent, MemoryBoundedDetectionAgent):
     
     async def correlate_events(self, events: List[Dict[str, Any]]) -> List[CorrelationGroup]:
         """
-        Correlate related events and alerts with circular reference detection.
+        Correlate a standalone batch of events without touching streaming state.
         
         Args:
             events: List of events to correlate
@@ -512,63 +511,29 @@ class RobustDetectionAgent(DetectionAgent, MemoryBoundedDetectionAgent):
             List of correlated event groups
         """
         try:
-            # Clear circular reference detector for new correlation
-            self.circular_reference_detector.clear()
-            
-            groups = []
-            processed_events = set()
+            engine = AlertCorrelationEngine(
+                window_seconds=self.correlation_engine.window.total_seconds(),
+                retention_seconds=self.correlation_engine.retention.total_seconds(),
+                # Depth limit bounds the number of groups a batch can create
+                max_active_groups=self.max_correlation_depth
+            )
             
+            samples = []
             for event in events:
-                event_id = event.get('alert_id', str(hash(str(event))))
-                
-                # Skip if already processed
-                if event_id in processed_events:
-                    continue
-                
-                # Detect circular references
-                if event_id in self.circular_reference_detector:
-                    logger.warning(f"Circular reference detected for event {event_id}")
-                    continue
-                
-                self.circular_reference_detector.add(event_id)
-                
-                # Find related events (simplified correlation logic)
-                related_events = [event]
-                source = event.get('source', '')
-                
-                for other_event in events:
-                    other_id = other_event.get('alert_id', str(hash(str(other_event))))
-                    
-                    if (other_id != event_id and 
-                        other_id not in processed_events and
-                        other_event.get('source', '') == source):
-                        related_events.append(other_event)
-                        processed_events.add(other_id)
-                
-                # Create correlation group
-                if related_events:
-                    group = CorrelationGroup(
-                        group_id=f"corr_{event_id}_{int(time.time())}",
-                        alerts=[AlertSample(
-                            alert_id=e.get('alert_id', str(hash(str(e)))),
-                            timestamp=datetime.utcnow(),
-                            severity=e.get('severity', 'medium'),
-                            source=e.get('source', 'unknown'),
-                            message=e.get('message', ''),
-                            metadata=e.get('metadata', {})
-                        ) for e in related_events],
-                        correlation_score=min(1.0, len(related_events) / 5.0),  # Higher score for more events
-                        created_at=datetime.utcnow(),
-                        last_updated=datetime.utcnow()
-                    )
-                    groups.append(group)
-                
-                processed_events.add(event_id)
-                
-                # Prevent infinite loops with depth limit
-                if len(groups) >= self.max_correlation_depth:
-                    logger.warning(f"Reached maximum correlation depth: {self.max_correlation_depth}")
-                    break
+                timestamp = event.get('timestamp')
+                samples.append(AlertSample(
+                    alert_id=event.get('alert_id') or '',
+                    timestamp=timestamp if isinstance(timestamp, datetime) else datetime.utcnow(),
+                    severity=event.get('severity', 'medium'),
+                    source=event.get('source', 'unknown'),
+                    message=event.get('message', ''),
+                    metadata=event.get('metadata') or {},
+                    priority_score=event.get('priority_score', 0.0)
+                ))
+            
+            groups = engine.add_alerts(samples)
+            if engine.rejected_count:
+                logger.warning(f"Reached maximum correlation depth: {self.max_correlation_depth}")
             
             return groups
             
@@ -0,0 +1,287 @@
+"""
+Streaming alert correlation engine.
+
+Alerts are correlated as they arrive instead of re-correlating whole batches.
+Hash indexes on source, service and fingerprint make every lookup O(1), and
+groups are bucketed by time window so expiry only touches stale buckets.
+"""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.utils.constants import AGENT_CONFIG
+from src.utils.logging import get_logger
+
+
+logger = get_logger("detection_correlation")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class AlertSample:
+    """Represents a sampled alert."""
+    alert_id: str
+    timestamp: datetime
+    severity: str
+    source: str
+    message: str
+    metadata: Dict[str, Any]
+    priority_score: float = 0.0
+
+
+@dataclass
+class CorrelationGroup:
+    """Group of correlated alerts."""
+    group_id: str
+    alerts: List[AlertSample]
+    correlation_score: float
+    created_at: datetime
+    last_updated: datetime
+
+
+def _as_naive_utc(timestamp: datetime) -> datetime:
+    """Normalize aware timestamps to naive UTC so they compare with utcnow()."""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def alert_fingerprint(alert: AlertSample) -> str:
+    """Stable identity for deduplicating an alert."""
+    if alert.alert_id:
+        return alert.alert_id
+    return f"{alert.source}|{alert.severity}|{alert.message}"
+
+
+class AlertCorrelationEngine:
+    """
+    Incremental alert correlator.
+
+    An alert joins the open group for its source when that group saw an alert
+    within ``window_seconds``; otherwise it opens a new group. Groups that have
+    been idle for ``retention_seconds`` are evicted.
+    """
+
+    def __init__(self, window_seconds: float = None, retention_seconds: float = None,
+                 max_active_groups: int = None):
+        """
+        Initialize correlation engine.
+
+        Args:
+            window_seconds: Maximum gap between alerts of one group
+            retention_seconds: Idle time after which a group is evicted
+            max_active_groups: Upper bound on tracked groups
+        """
+        config = AGENT_CONFIG["detection"]
+        self.window = timedelta(seconds=window_seconds or config["correlation_window_seconds"])
+        self.retention = timedelta(
+            seconds=retention_seconds or config["correlation_retention_seconds"]
+        )
+        self.max_active_groups = max_active_groups or config["max_active_correlation_groups"]
+        self._bucket_seconds = self.window.total_seconds()
+
+        self.groups: Dict[str, CorrelationGroup] = {}
+
+        # Secondary indexes
+        self._open_group_by_source: Dict[str, str] = {}
+        self._groups_by_service: Dict[str, Set[str]] = defaultdict(set)
+        self._group_by_fingerprint: Dict[str, str] = {}
+        self._fingerprints_by_group: Dict[str, List[str]] = defaultdict(list)
+        self._services_by_group: Dict[str, Set[str]] = defaultdict(set)
+
+        # Time-window buckets of group ids keyed by their last update
+        self._buckets: Dict[int, Set[str]] = defaultdict(set)
+        self._group_bucket: Dict[str, int] = {}
+
+        self._sequence = 0
+        self.duplicate_count = 0
+        self.rejected_count = 0
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def add_alert(self, alert: AlertSample) -> Optional[CorrelationGroup]:
+        """
+        Correlate a single alert.
+
+        Returns:
+            The group the alert joined, or None if it was a duplicate or
+            no group could be opened.
+        """
+        fingerprint = alert_fingerprint(alert)
+        if fingerprint in self._group_by_fingerprint:
+            self.duplicate_count += 1
+            return None
+
+        group = self._open_group_for(alert)
+        if group is None:
+            self.rejected_count += 1
+            return None
+
+        group.alerts.append(alert)
+        group.correlation_score = min(1.0, len(group.alerts) / 5.0)  # Higher score for more events
+        group.last_updated = max(group.last_updated, _as_naive_utc(alert.timestamp))
+
+        self._group_by_fingerprint[fingerprint] = group.group_id
+        self._fingerprints_by_group[group.group_id].append(fingerprint)
+        service = self._service_of(alert)
+        if service not in self._services_by_group[group.group_id]:
+            self._services_by_group[group.group_id].add(service)
+            self._groups_by_service[service].add(group.group_id)
+        self._touch_bucket(group)
+
+        return group
+
+    def add_alerts(self, alerts: Iterable[AlertSample]) -> List[CorrelationGroup]:
+        """
+        Correlate a batch of alerts.
+
+        Returns:
+            Groups touched by the batch, in order of first touch.
+        """
+        touched: Dict[str, CorrelationGroup] = {}
+        latest: Optional[datetime] = None
+
+        for alert in alerts:
+            group = self.add_alert(alert)
+            if group is not None and group.group_id not in touched:
+                touched[group.group_id] = group
+            timestamp = _as_naive_utc(alert.timestamp)
+            if latest is None or timestamp > latest:
+                latest = timestamp
+
+        if latest is not None:
+            self.expire(latest)
+
+        return list(touched.values())
+
+    def expire(self, now: datetime = None) -> int:
+        """
+        Evict groups idle for longer than the retention window.
+
+        Returns:
+            Number of evicted groups.
+        """
+        now = _as_naive_utc(now) if now else datetime.utcnow()
+        cutoff_bucket = self._bucket_of(now - self.retention)
+
+        stale_buckets = [bucket for bucket in self._buckets if bucket < cutoff_bucket]
+        evicted = 0
+        for bucket in stale_buckets:
+            for group_id in self._buckets.pop(bucket):
+                self._remove_group(group_id)
+                evicted += 1
+
+        if evicted:
+            logger.debug(f"Evicted {evicted} idle correlation groups")
+        return evicted
+
+    def get_group(self, group_id: str) -> Optional[CorrelationGroup]:
+        """Get a group by id."""
+        return self.groups.get(group_id)
+
+    def get_group_for_fingerprint(self, fingerprint: str) -> Optional[CorrelationGroup]:
+        """Get the group that absorbed an alert fingerprint."""
+        group_id = self._group_by_fingerprint.get(fingerprint)
+        return self.groups.get(group_id) if group_id else None
+
+    def get_open_group_for_source(self, source: str) -> Optional[CorrelationGroup]:
+        """Get the currently open group for a source."""
+        group_id = self._open_group_by_source.get(source)
+        return self.groups.get(group_id) if group_id else None
+
+    def get_groups_for_service(self, service: str) -> List[CorrelationGroup]:
+        """Get all tracked groups containing alerts for a service."""
+        return [self.groups[group_id] for group_id in self._groups_by_service.get(service, ())]
+
+    def clear(self) -> None:
+        """Drop all correlation state."""
+        self.groups.clear()
+        self._open_group_by_source.clear()
+        self._groups_by_service.clear()
+        self._group_by_fingerprint.clear()
+        self._fingerprints_by_group.clear()
+        self._services_by_group.clear()
+        self._buckets.clear()
+        self._group_bucket.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get correlation engine statistics."""
+        return {
+            "active_groups": len(self.groups),
+            "indexed_alerts": len(self._group_by_fingerprint),
+            "indexed_services": len(self._groups_by_service),
+            "time_buckets": len(self._buckets),
+            "duplicate_alerts": self.duplicate_count,
+            "rejected_alerts": self.rejected_count
+        }
+
+    def _open_group_for(self, alert: AlertSample) -> Optional[CorrelationGroup]:
+        """Find the open group for the alert's source or start a new one."""
+        timestamp = _as_naive_utc(alert.timestamp)
+        group_id = self._open_group_by_source.get(alert.source)
+        group = self.groups.get(group_id) if group_id else None
+
+        if group is not None and abs(timestamp - group.last_updated) <= self.window:
+            return group
+
+        if len(self.groups) >= self.max_active_groups:
+            return None
+
+        self._sequence += 1
+        group = CorrelationGroup(
+            group_id=f"corr_{alert_fingerprint(alert)}_{int(time.time())}_{self._sequence}",
+            alerts=[],
+            correlation_score=0.0,
+            created_at=timestamp,
+            last_updated=timestamp
+        )
+        self.groups[group.group_id] = group
+        self._open_group_by_source[alert.source] = group.group_id
+        return group
+
+    def _touch_bucket(self, group: CorrelationGroup) -> None:
+        """Move a group into the bucket for its latest update."""
+        bucket = self._bucket_of(group.last_updated)
+        previous = self._group_bucket.get(group.group_id)
+        if previous == bucket:
+            return
+        if previous is not None:
+            members = self._buckets.get(previous)
+            if members is not None:
+                members.discard(group.group_id)
+                if not members:
+                    del self._buckets[previous]
+        self._buckets[bucket].add(group.group_id)
+        self._group_bucket[group.group_id] = bucket
+
+    def _remove_group(self, group_id: str) -> None:
+        """Remove a group and all of its index entries."""
+        group = self.groups.pop(group_id, None)
+        if group is None:
+            return
+
+        for fingerprint in self._fingerprints_by_group.pop(group_id, ()):
+            self._group_by_fingerprint.pop(fingerprint, None)
+        for service in self._services_by_group.pop(group_id, ()):
+            members = self._groups_by_service.get(service)
+            if members is not None:
+                members.discard(group_id)
+                if not members:
+                    del self._groups_by_service[service]
+
+        self._group_bucket.pop(group_id, None)
+        # Groups are per source, so one index entry can point at this group
+        if group.alerts and self._open_group_by_source.get(group.alerts[0].source) == group_id:
+            del self._open_group_by_source[group.alerts[0].source]
+
+    def _bucket_of(self, timestamp: datetime) -> int:
+        return int((timestamp - _EPOCH).total_seconds() // self._bucket_seconds)
+
+    @staticmethod
+    def _service_of(alert: AlertSample) -> str:
+        return alert.metadata.get("service") or alert.source
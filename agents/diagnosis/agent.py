@@ -3,18 +3,19 @@ Hardened Diagnosis Agent with bounds checking and defensive programming.
 """
 
 import asyncio
-import json
-import re
+import os
 import time
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
 
+from agents.diagnosis.log_scanner import LogPatternMatcher, LogScanSummary, StratifiedLineSampler
+from agents.diagnosis.log_sources import LogSource, TextLogSource, open_log_source
 from src.interfaces.agent import DiagnosisAgent
 from src.models.incident import Incident
 from src.models.agent import AgentRecommendation, ActionType, RiskLevel, Evidence, AgentMessage
-from src.utils.constants import RESOURCE_LIMITS, PERFORMANCE_TARGETS
+from src.utils.constants import AGENT_CONFIG, RESOURCE_LIMITS, PERFORMANCE_TARGETS
 from src.utils.logging import get_logger
 from src.utils.exceptions import ResourceLimitError, AgentTimeoutError
 
@@ -57,6 +58,13 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
         self.max_log_size = RESOURCE_LIMITS["log_analysis_limit"]  # 100MB
         self.max_correlation_depth = RESOURCE_LIMITS["correlation_depth"]  # 5 levels
         self.processing_timeout = PERFORMANCE_TARGETS["diagnosis"]["max"]  # 180s
+        self.log_chunk_bytes = AGENT_CONFIG["diagnosis"]["log_chunk_bytes"]
+        self.log_sample_lines = AGENT_CONFIG["diagnosis"]["log_sample_lines"]
+        self.log_sample_strata = AGENT_CONFIG["diagnosis"]["log_sample_strata"]
+        self.log_root = AGENT_CONFIG["diagnosis"]["log_root"]
+        
+        # Named log sources streamed in chunks (files, gzip, object stores)
+        self.log_sources: Dict[str, LogSource] = {}
         
         # Circular reference detection
         self.analysis_stack: Set[str] = set()
@@ -75,6 +83,7 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
             "rate_limit": r"rate.*limit|too many requests|throttled",
             "service_unavailable": r"service.*unavailable|503|502|504"
         }
+        self._pattern_matcher: Optional[LogPatternMatcher] = None
         
         # Anomaly detection thresholds
         self.anomaly_thresholds = {
@@ -145,38 +154,32 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
         analysis_results = {}
         
         try:
-            for source in log_sources[:10]:  # Limit to 10 sources max
+            sources = log_sources[:10]  # Limit to 10 sources max
+            pending = {}
+            for source in sources:
                 # Check cache first
                 cache_key = f"{source}_{time_range[0]}_{time_range[1]}"
                 cached_result = self._get_cached_analysis(cache_key)
                 if cached_result:
                     analysis_results[source] = cached_result
-                    continue
-                
-                # Analyze log source with bounds checking
-                try:
-                    result = await self._analyze_single_log_source(source, time_range)
-                    analysis_results[source] = result
-                    
-                    # Cache result
-                    self._cache_analysis(cache_key, result)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to analyze log source {source}: {e}")
-                    analysis_results[source] = LogAnalysisResult(
-                        source=source,
-                        patterns_found=[],
-                        error_count=0,
-                        warning_count=0,
-                        anomalies=[],
-                        confidence=0.0,
-                        analysis_duration_ms=0
+                elif source not in pending:
+                    pending[source] = asyncio.create_task(
+                        self._analyze_and_cache_log_source(source, time_range, cache_key)
                     )
-                
-                # Check timeout
-                if time.time() - start_time > self.processing_timeout:
+            
+            # Analyze uncached sources concurrently, keeping whatever finishes in time
+            if pending:
+                done, not_done = await asyncio.wait(pending.values(), timeout=self.processing_timeout)
+                for task in not_done:
+                    task.cancel()
+                if not_done:
                     logger.warning("Log analysis timeout, returning partial results")
-                    break
+                for source, task in pending.items():
+                    if task in done:
+                        analysis_results[source] = task.result()
+            
+            # Preserve the order sources were requested in
+            analysis_results = {source: analysis_results[source] for source in sources if source in analysis_results}
             
             return {
                 "analysis_results": analysis_results,
@@ -188,42 +191,62 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
             logger.error(f"Log analysis failed: {e}")
             raise
     
+    async def _analyze_and_cache_log_source(self, source: str, time_range: tuple,
+                                            cache_key: str) -> LogAnalysisResult:
+        """Analyze one log source, caching the result and degrading to an empty result on failure."""
+        try:
+            result = await self._analyze_single_log_source(source, time_range)
+            self._cache_analysis(cache_key, result)
+            return result
+        except Exception as e:
+            logger.warning(f"Failed to analyze log source {source}: {e}")
+            return LogAnalysisResult(
+                source=source,
+                patterns_found=[],
+                error_count=0,
+                warning_count=0,
+                anomalies=[],
+                confidence=0.0,
+                analysis_duration_ms=0
+            )
+    
     async def _analyze_single_log_source(self, source: str, 
                                        time_range: tuple) -> LogAnalysisResult:
         """Analyze a single log source with defensive programming."""
         analysis_start = time.time()
         
         try:
-            # Simulate log retrieval with size checking
-            log_data = await self._retrieve_log_data(source, time_range)
-            
-            if len(log_data) > self.max_log_size:
-                logger.warning(f"Log source {source} exceeds size limit, sampling")
-                log_data = self._sample_log_data(log_data)
-            
-            # Parse logs defensively
-            parsed_logs = self._parse_logs_safely(log_data)
-            
-            # Pattern matching
-            patterns_found = []
-            error_count = 0
-            warning_count = 0
-            
-            for log_entry in parsed_logs:
-                # Count errors and warnings
-                if log_entry.get("level", "").lower() in ["error", "err"]:
-                    error_count += 1
-                elif log_entry.get("level", "").lower() in ["warning", "warn"]:
-                    warning_count += 1
-                
-                # Pattern matching
-                message = log_entry.get("message", "").lower()
-                for pattern_name, pattern in self.error_patterns.items():
-                    if re.search(pattern, message, re.IGNORECASE):
-                        patterns_found.append(pattern_name)
+            # Stream the source, scanning chunks until the budget is spent
+            # and sampling the remainder, so memory stays flat for any log size
+            matcher = self._get_pattern_matcher()
+            summary = LogScanSummary()
+            sampler = StratifiedLineSampler(self.log_sample_lines, self.log_sample_strata)
+            scan_entries = max(0, matcher.max_entries - self.log_sample_lines)
+            
+            async for chunk in self._open_log_source(source, time_range).chunks():
+                consumed = 0
+                if summary.entries < scan_entries and summary.bytes_scanned < self.max_log_size:
+                    scanned_before = summary.bytes_scanned
+                    matcher.scan(chunk, summary, max_entries=scan_entries)
+                    consumed = summary.bytes_scanned - scanned_before
+                if consumed < len(chunk):
+                    sampler.offer_chunk(chunk[consumed:])
+            
+            sampled_lines = sampler.lines()
+            if sampled_lines:
+                logger.warning(
+                    f"Log source {source} exceeds scan budget, sampled "
+                    f"{len(sampled_lines)} of {sampler.lines_offered} remaining lines"
+                )
+                newline = "\n" if isinstance(sampled_lines[0], str) else b"\n"
+                matcher.scan(newline.join(sampled_lines), summary)
+            
+            patterns_found = sorted(summary.patterns_found)
+            error_count = summary.error_count
+            warning_count = summary.warning_count
             
             # Anomaly detection
-            anomalies = self._detect_anomalies(parsed_logs)
+            anomalies = self._detect_anomalies_from_counts(summary.hourly_totals, summary.hourly_errors)
             
             # Calculate confidence based on findings
             confidence = self._calculate_analysis_confidence(
@@ -234,7 +257,7 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
             
             return LogAnalysisResult(
                 source=source,
-                patterns_found=list(set(patterns_found)),  # Remove duplicates
+                patterns_found=patterns_found,
                 error_count=error_count,
                 warning_count=warning_count,
                 anomalies=anomalies,
@@ -268,107 +291,59 @@ class HardenedDiagnosisAgent(DiagnosisAgent):
 2024-01-01T12:03:00Z INFO Cache miss, fetching from database
 """
     
-    def _sample_log_data(self, log_data: str) -> str:
-        """Sample log data when it exceeds size limits."""
-        lines = log_data.split('\n')
-        
-        if len(lines) <= 1000:
-            return log_data
-        
-        # Take first 300, middle 400, and last 300 lines
-        sampled_lines = (
-            lines[:300] + 
-            lines[len(lines)//2 - 200:len(lines)//2 + 200] + 
-            lines[-300:]
-        )
-        
-        return '\n'.join(sampled_lines)
+    def register_log_source(self, name: str, source: LogSource) -> None:
+        """Register a streamed log source to be analyzed under name."""
+        self.log_sources[name] = source
     
-    def _parse_logs_safely(self, log_data: str) -> List[Dict[str, Any]]:
-        """Parse logs with defensive error handling."""
-        parsed_logs = []
+    def _open_log_source(self, source: str, time_range: tuple) -> LogSource:
+        """
+        Registered source, file under the log root, or text from the log retrieval service.
         
-        for line_num, line in enumerate(log_data.split('\n')):
-            if not line.strip():
-                continue
-            
-            try:
-                # Try to parse as JSON first
-                if line.strip().startswith('{'):
-                    log_entry = json.loads(line)
-                else:
-                    # Parse structured log format
-                    log_entry = self._parse_structured_log_line(line)
-                
-                # Validate parsed entry
-                if isinstance(log_entry, dict):
-                    parsed_logs.append(log_entry)
-                
-            except Exception as e:
-                # Create basic entry for unparseable lines
-                parsed_logs.append({
-                    "line_number": line_num,
-                    "raw_message": line[:500],  # Limit length
-                    "level": "unknown",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "parse_error": str(e)[:100]
-                })
-            
-            # Limit total parsed logs
-            if len(parsed_logs) >= 10000:
-                logger.warning("Reached maximum parsed log limit")
-                break
+        Source names come from incident metadata, so a file is only opened
+        when its real path lies under log_root; file:// sources anywhere else
+        are rejected.
+        """
+        registered = self.log_sources.get(source)
+        if registered is not None:
+            return registered
+        
+        path = self._log_file_path(source)
+        if path is not None:
+            return open_log_source(path, self.log_chunk_bytes)
+        if source.startswith("file://"):
+            raise ValueError(f"Log file outside the log root: {source}")
+        
+        return TextLogSource(
+            source, lambda: self._retrieve_log_data(source, time_range), self.log_chunk_bytes
+        )
+    
+    def _log_file_path(self, source: str) -> Optional[str]:
+        """Real path of an existing file the source names under log_root, else None."""
+        if not self.log_root:
+            return None
         
-        return parsed_logs
+        root = os.path.realpath(self.log_root)
+        name = source[len("file://"):] if source.startswith("file://") else source
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+            return None
+        return path
     
-    def _parse_structured_log_line(self, line: str) -> Dict[str, Any]:
-        """Parse structured log line (timestamp level message format)."""
-        # Simple regex for common log format
-        pattern = r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z?)\s+(\w+)\s+(.*)'
-        match = re.match(pattern, line)
-        
-        if match:
-            timestamp, level, message = match.groups()
-            return {
-                "timestamp": timestamp,
-                "level": level,
-                "message": message
-            }
-        else:
-            return {
-                "timestamp": datetime.utcnow().isoformat(),
-                "level": "unknown",
-                "message": line
-            }
+    def _get_pattern_matcher(self) -> LogPatternMatcher:
+        """Combined matcher for error_patterns, rebuilt if the patterns change."""
+        if self._pattern_matcher is None or self._pattern_matcher.patterns != self.error_patterns:
+            self._pattern_matcher = LogPatternMatcher(self.error_patterns)
+        return self._pattern_matcher
     
-    def _detect_anomalies(self, parsed_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Detect anomalies in parsed logs."""
+    def _detect_anomalies_from_counts(self, total_counts: Dict[str, int],
+                                      error_counts: Dict[str, int]) -> List[Dict[str, Any]]:
+        """Detect error rate spikes from per-hour entry and error counts."""
         anomalies = []
         
-        # Count errors by time window
-        error_counts = defaultdict(int)
-        total_counts = defaultdict(int)
-        
-        for log_entry in parsed_logs:
-            timestamp = log_entry.get("timestamp", "")
-            level = log_entry.get("level", "").lower()
-            
-            # Extract hour for windowing
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                hour_key = dt.strftime("%Y-%m-%d %H:00")
-                
-                total_counts[hour_key] += 1
-                if level in ["error", "err"]:
-                    error_counts[hour_key] += 1
-                    
-            except Exception:
-                continue
-        
         # Detect error rate spikes
         for hour_key in total_counts:
             if total_counts[hour_key] > 0:
-                error_rate = error_counts[hour_key] / total_counts[hour_key]
+                error_rate = error_counts.get(hour_key, 0) / total_counts[hour_key]
                 if error_rate > self.anomaly_thresholds["error_rate_spike"]:
                     anomalies.append({
                         "type": "error_rate_spike",
@@ -0,0 +1,302 @@
+"""
+Single-pass log scanning for diagnosis.
+
+All error patterns are compiled into one case-insensitive alternation with a
+named group per pattern, and log lines are split and parsed by one compiled
+regex walking the whole buffer (str, bytes, memoryview or mmap) instead of
+splitting it into a list first. Each line's message is searched once with
+the alternation of patterns not yet found; the alternation shrinks as
+patterns are found, so a source that has hit every pattern stops matching.
+Messages are lowercased before matching, as the per-line loop this replaces
+did, which lets all-lowercase patterns skip the slower IGNORECASE matching.
+
+Scans accumulate into a LogScanSummary, so a log streamed in chunks is
+counted incrementally; the part of a log beyond the scan budget is reduced
+to an hour-stratified reservoir sample by StratifiedLineSampler.
+"""
+
+import json
+import random
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Union
+
+
+LogBuffer = Union[str, bytes, bytearray, memoryview]
+
+# Structured "timestamp level message" lines, or any other line. Whitespace
+# classes exclude newlines so a match never spans lines.
+_LINE_PATTERN = (
+    r"^(?:(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z?)[^\S\n]+(\w+)[^\S\n]+([^\n]*)"
+    r"|([^\n]*))$"
+)
+_LINE_RE = re.compile(_LINE_PATTERN, re.MULTILINE)
+_LINE_RE_BYTES = re.compile(_LINE_PATTERN.encode(), re.MULTILINE)
+
+# Hour prefix of an ISO timestamp near the start of a line, used as a sampling stratum
+_STRATUM_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}")
+_STRATUM_RE_BYTES = re.compile(_STRATUM_RE.pattern.encode())
+
+# Combined alternations kept per matcher, least recently used evicted first
+_MAX_COMBINED_PATTERNS = 256
+
+_ERROR_LEVELS = frozenset({"error", "err"})
+_WARNING_LEVELS = frozenset({"warning", "warn"})
+
+
+@dataclass
+class LogScanSummary:
+    """Counters gathered from one or more scanned log buffers."""
+    patterns_found: Set[str] = field(default_factory=set)
+    entries: int = 0
+    error_count: int = 0
+    warning_count: int = 0
+    bytes_scanned: int = 0
+    hourly_totals: Dict[str, int] = field(default_factory=dict)
+    hourly_errors: Dict[str, int] = field(default_factory=dict)
+
+
+class LogPatternMatcher:
+    """
+    Error patterns compiled into combined matchers.
+
+    Combined alternations are cached per set of still-unmatched patterns, so
+    a scan recompiles nothing after the first few sources. The cache is an
+    LRU, as many patterns can be left unmatched in many different subsets.
+    """
+
+    def __init__(self, patterns: Dict[str, str], max_entries: int = 10000,
+                 max_combined: int = _MAX_COMBINED_PATTERNS):
+        """
+        Initialize matcher.
+
+        Args:
+            patterns: Pattern name to regex; names must be valid identifiers
+            max_entries: Log entries counted per scan before stopping
+            max_combined: Combined alternations kept compiled
+        """
+        self.patterns = dict(patterns)
+        self.max_entries = max_entries
+        self._single: Dict[bool, Dict[str, Pattern]] = {
+            binary: {
+                name: re.compile(pattern.encode() if binary else pattern, _flags(pattern))
+                for name, pattern in self.patterns.items()
+            }
+            for binary in (False, True)
+        }
+        self.max_combined = max(1, max_combined)
+        self._combined: "OrderedDict[tuple, Pattern]" = OrderedDict()
+
+    def combined(self, names: FrozenSet[str], binary: bool = False) -> Optional[Pattern]:
+        """One alternation with a named group per pattern in names."""
+        if not names:
+            return None
+        key = (names, binary)
+        compiled = self._combined.get(key)
+        if compiled is None:
+            source = "|".join(f"(?P<{name}>{self.patterns[name]})" for name in sorted(names))
+            flags = max(_flags(self.patterns[name]) for name in names)
+            compiled = re.compile(source.encode() if binary else source, flags)
+            self._combined[key] = compiled
+            if len(self._combined) > self.max_combined:
+                self._combined.popitem(last=False)
+        else:
+            self._combined.move_to_end(key)
+        return compiled
+
+    def match_message(self, message, remaining: FrozenSet[str], binary: bool = False) -> Set[str]:
+        """Names from remaining whose pattern matches anywhere in a lowercased message."""
+        combined = self.combined(remaining, binary)
+        if combined is None:
+            return set()
+        hit = combined.search(message)
+        if hit is None:
+            return set()
+
+        # The alternation reports the first pattern to match; others may too
+        found = {hit.lastgroup}
+        single = self._single[binary]
+        for name in remaining:
+            if name not in found and single[name].search(message):
+                found.add(name)
+        return found
+
+    def scan(self, data: LogBuffer, summary: Optional[LogScanSummary] = None,
+             max_entries: Optional[int] = None) -> LogScanSummary:
+        """
+        Parse and pattern-match a buffer of newline-separated log lines.
+
+        Lines are JSON objects, "timestamp level message" lines or free
+        text; blank lines are skipped. Passing a summary accumulates into it,
+        stopping once it holds max_entries entries (the matcher's limit by
+        default); bytes_scanned then tells how much of data was consumed.
+        """
+        summary = summary or LogScanSummary()
+        max_entries = self.max_entries if max_entries is None else max_entries
+        binary = not isinstance(data, str)
+        line_re = _LINE_RE_BYTES if binary else _LINE_RE
+        remaining = frozenset(self.patterns) - summary.patterns_found
+        now_hour = datetime.utcnow().strftime("%Y-%m-%d %H:00")
+        hour_cache: Dict[str, Optional[str]] = {}
+
+        totals = summary.hourly_totals
+        errors = summary.hourly_errors
+        entries = summary.entries
+        error_count = summary.error_count
+        warning_count = summary.warning_count
+        end = 0
+
+        for match in line_re.finditer(data):
+            if entries >= max_entries:
+                break
+            end = match.end()
+            timestamp, level, message, other = match.groups()
+
+            if timestamp is not None:
+                if binary:
+                    timestamp = timestamp.decode()
+                    level = level.decode()
+                hour_key = hour_cache.get(timestamp[:19])
+                if hour_key is None and timestamp[:19] not in hour_cache:
+                    hour_key = hour_cache[timestamp[:19]] = _hour_key(timestamp)
+            else:
+                if not other.strip():
+                    continue
+                if other.lstrip()[:1] in ("{", b"{"):
+                    entry = _parse_json(other)
+                    if entry is None:
+                        continue
+                    level = entry.get("level", "")
+                    message = entry.get("message", "")
+                    if binary and isinstance(message, str):
+                        message = message.encode()
+                    timestamp = entry.get("timestamp", "")
+                    hour_key = _hour_key(timestamp) if isinstance(timestamp, str) else None
+                else:
+                    level = "unknown"
+                    message = other
+                    hour_key = now_hour
+
+            entries += 1
+            level = level.lower() if isinstance(level, str) else ""
+            is_error = level in _ERROR_LEVELS
+            if is_error:
+                error_count += 1
+            elif level in _WARNING_LEVELS:
+                warning_count += 1
+
+            if hour_key is not None:
+                totals[hour_key] = totals.get(hour_key, 0) + 1
+                if is_error:
+                    errors[hour_key] = errors.get(hour_key, 0) + 1
+
+            if remaining and message and isinstance(message, (str, bytes)):
+                found = self.match_message(message.lower(), remaining, binary)
+                if found:
+                    summary.patterns_found |= found
+                    remaining = remaining - found
+
+        summary.entries = entries
+        summary.error_count = error_count
+        summary.warning_count = warning_count
+        summary.bytes_scanned += end if entries >= max_entries else len(data)
+        return summary
+
+
+class StratifiedLineSampler:
+    """
+    Fixed-size uniform sample of log lines, stratified by hour.
+
+    Each hour seen gets an equal share of the capacity and keeps a reservoir
+    (Algorithm R) of its lines, so a burst in one hour cannot crowd out the
+    others. Memory is bounded by capacity times max_line_bytes whatever the
+    number of lines offered.
+    """
+
+    def __init__(self, capacity: int, max_strata: int = 48, max_line_bytes: int = 4096,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize sampler.
+
+        Args:
+            capacity: Total lines kept across all strata
+            max_strata: Distinct hours tracked; later hours share one stratum
+            max_line_bytes: Sampled lines are truncated to this length
+            rng: Random source, for reproducible samples
+        """
+        self.capacity = capacity
+        self.max_strata = max(1, min(max_strata, capacity))
+        self.max_line_bytes = max_line_bytes
+        self.lines_offered = 0
+        self._rng = rng or random.Random()
+        self._per_stratum = capacity
+        # stratum -> [lines seen, sampled lines]
+        self._strata: Dict[object, list] = {}
+
+    def offer_chunk(self, chunk: LogBuffer) -> None:
+        """Offer every non-blank line of a line-aligned chunk."""
+        if isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        binary = not isinstance(chunk, str)
+        stratum_re = _STRATUM_RE_BYTES if binary else _STRATUM_RE
+        for line in chunk.split(b"\n" if binary else "\n"):
+            if line.strip():
+                found = stratum_re.search(line, 0, 64)
+                self.offer(line, found.group() if found else None)
+
+    def offer(self, line, stratum=None) -> None:
+        """Offer one line to the reservoir of its stratum."""
+        self.lines_offered += 1
+        entry = self._strata.get(stratum)
+        if entry is None:
+            if len(self._strata) >= self.max_strata:
+                stratum = "overflow"
+                entry = self._strata.get(stratum)
+            if entry is None:
+                entry = self._strata[stratum] = [0, []]
+                self._rebalance()
+
+        entry[0] += 1
+        line = line[:self.max_line_bytes]
+        sample = entry[1]
+        if len(sample) < self._per_stratum:
+            sample.append(line)
+        else:
+            slot = self._rng.randrange(entry[0])
+            if slot < self._per_stratum:
+                sample[slot] = line
+
+    def lines(self) -> List:
+        """Sampled lines, grouped by stratum in the order strata were first seen."""
+        return [line for _, sample in self._strata.values() for line in sample]
+
+    def _rebalance(self) -> None:
+        """Shrink every stratum to an equal share; a random subset of a uniform sample stays uniform."""
+        self._per_stratum = max(1, self.capacity // len(self._strata))
+        for entry in self._strata.values():
+            if len(entry[1]) > self._per_stratum:
+                entry[1] = self._rng.sample(entry[1], self._per_stratum)
+
+
+def _flags(pattern: str) -> int:
+    """IGNORECASE unless the pattern can only match lowercase text as written."""
+    return re.IGNORECASE if pattern != pattern.lower() or "\\" in pattern else 0
+
+
+def _parse_json(line) -> Optional[dict]:
+    """Parse a JSON log line; unparseable lines count as unknown-level entries."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return {"level": "unknown", "timestamp": datetime.utcnow().isoformat()}
+    return entry if isinstance(entry, dict) else None
+
+
+def _hour_key(timestamp: str) -> Optional[str]:
+    """Hourly anomaly window for an ISO timestamp, None when it does not parse."""
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%Y-%m-%d %H:00")
+    except ValueError:
+        return None
@@ -0,0 +1,209 @@
+"""
+Streaming log sources for diagnosis.
+
+Each source yields its log as chunks that end on a line boundary, so a
+consumer can scan chunk by chunk and never holds more than one chunk (plus
+at most one over-long line) of a source in memory. Local files are read
+through mmap, gzip files and S3-compatible objects are decompressed
+incrementally, and text fetched by other means is re-chunked.
+"""
+
+import asyncio
+import gzip
+import mmap
+import os
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Union
+
+from src.utils.constants import AGENT_CONFIG
+from src.utils.logging import get_logger
+
+
+logger = get_logger("diagnosis_log_sources")
+
+LogChunk = Union[str, bytes, memoryview]
+
+_DEFAULT_CHUNK_BYTES = AGENT_CONFIG["diagnosis"]["log_chunk_bytes"]
+
+# A line longer than this is emitted as it stands instead of buffering further
+_MAX_LINE_BYTES = 1024 * 1024
+
+
+class LogSource(ABC):
+    """A log that can be read as line-aligned chunks."""
+
+    def __init__(self, name: str, chunk_size: int = _DEFAULT_CHUNK_BYTES):
+        self.name = name
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def chunks(self) -> AsyncIterator[LogChunk]:
+        """Yield the log as chunks that each end on a line boundary."""
+
+
+class FileLogSource(LogSource):
+    """Uncompressed local file read through mmap; chunks are zero-copy views."""
+
+    def __init__(self, path: str, chunk_size: int = _DEFAULT_CHUNK_BYTES):
+        super().__init__(path, chunk_size)
+        self.path = path
+
+    async def chunks(self) -> AsyncIterator[LogChunk]:
+        with open(self.path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(mapped)
+            try:
+                start, size = 0, len(mapped)
+                while start < size:
+                    end = min(start + self.chunk_size, size)
+                    if end < size:
+                        newline = mapped.rfind(b"\n", start, end)
+                        if newline < 0:
+                            newline = mapped.find(b"\n", end)
+                        end = size if newline < 0 else newline + 1
+                    view = buffer[start:end]
+                    try:
+                        yield view
+                    finally:
+                        view.release()
+                    start = end
+                    await asyncio.sleep(0)
+            finally:
+                buffer.release()
+                mapped.close()
+
+
+class GzipLogSource(LogSource):
+    """Gzip-compressed local file, decompressed a chunk at a time off the event loop."""
+
+    def __init__(self, path: str, chunk_size: int = _DEFAULT_CHUNK_BYTES):
+        super().__init__(path, chunk_size)
+        self.path = path
+
+    async def chunks(self) -> AsyncIterator[LogChunk]:
+        handle = gzip.open(self.path, "rb")
+        try:
+            async for chunk in _align_lines(_read_blocks(handle, self.chunk_size)):
+                yield chunk
+        finally:
+            handle.close()
+
+
+class ObjectStoreLogSource(LogSource):
+    """
+    Object in an S3-compatible store, streamed from the response body.
+
+    Works with any async client exposing ``get_object(Bucket=..., Key=...)``
+    whose ``Body`` has an async ``read(n)``. Keys ending in ``.gz`` are
+    decompressed as they stream.
+    """
+
+    def __init__(self, client: Any, bucket: str, key: str, chunk_size: int = _DEFAULT_CHUNK_BYTES):
+        super().__init__(f"s3://{bucket}/{key}", chunk_size)
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+
+    async def chunks(self) -> AsyncIterator[LogChunk]:
+        response = await self.client.get_object(Bucket=self.bucket, Key=self.key)
+        body = response["Body"]
+        try:
+            blocks = _read_body(body, self.chunk_size)
+            if self.key.endswith(".gz"):
+                blocks = _gunzip(blocks, self.chunk_size)
+            async for chunk in _align_lines(blocks):
+                yield chunk
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+
+
+class TextLogSource(LogSource):
+    """
+    Log text produced by a fetch coroutine, re-chunked on line boundaries.
+
+    The event loop gets a turn between chunks, so scanning a large fetched
+    log cannot starve other tasks or the analysis timeout.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Union[str, bytes]]],
+                 chunk_size: int = _DEFAULT_CHUNK_BYTES):
+        super().__init__(name, chunk_size)
+        self.fetch = fetch
+
+    async def chunks(self) -> AsyncIterator[LogChunk]:
+        text = await self.fetch()
+        newline = "\n" if isinstance(text, str) else b"\n"
+        start, size = 0, len(text)
+        while start < size:
+            end = min(start + self.chunk_size, size)
+            if end < size:
+                cut = text.rfind(newline, start, end)
+                if cut < 0:
+                    cut = text.find(newline, end)
+                end = size if cut < 0 else cut + 1
+            yield text[start:end]
+            start = end
+            await asyncio.sleep(0)
+
+
+def open_log_source(location: str, chunk_size: int = _DEFAULT_CHUNK_BYTES) -> LogSource:
+    """Local file source for a path, choosing gzip by extension."""
+    path = location[len("file://"):] if location.startswith("file://") else location
+    if path.endswith(".gz"):
+        return GzipLogSource(path, chunk_size)
+    return FileLogSource(path, chunk_size)
+
+
+async def _read_blocks(handle, size: int) -> AsyncIterator[bytes]:
+    while True:
+        block = await asyncio.to_thread(handle.read, size)
+        if not block:
+            return
+        yield block
+
+
+async def _read_body(body, size: int) -> AsyncIterator[bytes]:
+    while True:
+        block = await body.read(size)
+        if not block:
+            return
+        yield block
+
+
+async def _gunzip(blocks: AsyncIterator[bytes], size: int) -> AsyncIterator[bytes]:
+    """Decompress a gzip stream, emitting at most size bytes per block."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for block in blocks:
+        data = block
+        while data:
+            output = decompressor.decompress(data, size)
+            if output:
+                yield output
+            data = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+async def _align_lines(blocks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Regroup arbitrary byte blocks into chunks ending on a newline."""
+    pending = b""
+    async for block in blocks:
+        data = pending + block if pending else block
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            if len(data) < _MAX_LINE_BYTES:
+                pending = data
+                continue
+            cut = len(data) - 1
+        yield data[:cut + 1]
+        pending = data[cut + 1:]
+    if pending:
+        yield pending
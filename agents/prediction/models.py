@@ -6,8 +6,10 @@ Time-series forecasting models for incident prediction.
 
 import asyncio
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -68,104 +70,160 @@ class TrendAnalyzer:
                 logger.warning(f"Insufficient data for trend analysis: {len(trend_data.values)} points")
                 return {"trend_score": 0.0, "anomaly_score": 0.0, "seasonal_score": 0.0}
             
-            values = np.array(trend_data.values)
-            
-            # Calculate trend score (rate of change)
-            trend_score = await self._calculate_trend_score(values)
-            
-            # Calculate anomaly score (deviation from normal)
-            anomaly_score = await self._calculate_anomaly_score(values)
-            
-            # Calculate seasonal score (pattern deviation)
-            seasonal_score = await self._calculate_seasonal_score(values)
-            
-            return {
-                "trend_score": trend_score,
-                "anomaly_score": anomaly_score,
-                "seasonal_score": seasonal_score,
-                "volatility": np.std(values),
-                "mean_value": np.mean(values)
-            }
+            # A single series is cheap enough to score inline
+            scores = _score_trends(
+                np.asarray(trend_data.values, dtype=float)[np.newaxis, :],
+                self.seasonal_window, self.trend_window
+            )
+            return _row_scores(scores, 0)
             
         except Exception as e:
             logger.error(f"Error analyzing trend for {trend_data.metric_name}: {e}")
             return {"trend_score": 0.0, "anomaly_score": 0.0, "seasonal_score": 0.0}
     
-    async def _calculate_trend_score(self, values: np.ndarray) -> float:
-        """Calculate trend score based on rate of change"""
-        try:
-            # Use linear regression to find trend
-            x = np.arange(len(values))
-            coeffs = np.polyfit(x, values, 1)
-            trend_slope = coeffs[0]
-            
-            # Normalize trend score to [0, 1]
-            mean_val = np.mean(values)
-            if mean_val > 0:
-                normalized_slope = abs(trend_slope) / mean_val
-                return min(normalized_slope, 1.0)
-            return 0.0
+    async def analyze_trends(self, trend_data: Dict[str, TrendData]) -> Dict[str, Dict[str, float]]:
+        """
+        Analyze many metrics at once
+        
+        Series of equal length are stacked into one matrix and scored in a
+        single vectorized pass on a worker thread.
+        
+        Args:
+            trend_data: Time-series data keyed by metric name
             
-        except Exception as e:
-            logger.error(f"Error calculating trend score: {e}")
-            return 0.0
+        Returns:
+            Trend analysis results keyed by metric name, as from analyze_trend
+        """
+        results: Dict[str, Dict[str, float]] = {}
+        for names, matrix in _stack_by_length(trend_data):
+            if matrix.shape[1] < 10:
+                for name in names:
+                    results[name] = {"trend_score": 0.0, "anomaly_score": 0.0, "seasonal_score": 0.0}
+                continue
+            scores = await self.analyze_matrix(matrix)
+            for row, name in enumerate(names):
+                results[name] = _row_scores(scores, row)
+        
+        # Preserve the caller's metric order
+        return {name: results[name] for name in trend_data}
     
-    async def _calculate_anomaly_score(self, values: np.ndarray) -> float:
-        """Calculate anomaly score based on statistical deviation"""
-        try:
-            if len(values) < 5:
-                return 0.0
-                
-            # Use z-score for anomaly detection
-            mean_val = np.mean(values)
-            std_val = np.std(values)
-            
-            if std_val == 0:
-                return 0.0
-            
-            # Check recent values for anomalies
-            recent_values = values[-5:]  # Last 5 data points
-            z_scores = np.abs((recent_values - mean_val) / std_val)
-            max_z_score = np.max(z_scores)
-            
-            # Normalize to [0, 1] (z-score > 3 is highly anomalous)
-            return min(max_z_score / 3.0, 1.0)
+    async def analyze_matrix(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score a (metrics x time points) matrix without blocking the event loop
+        
+        Args:
+            values: One metric per row, oldest point first
             
-        except Exception as e:
-            logger.error(f"Error calculating anomaly score: {e}")
-            return 0.0
+        Returns:
+            trend_score, anomaly_score, seasonal_score, volatility and
+            mean_value arrays with one entry per row
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(f"Expected a 2-D metrics x time matrix, got shape {values.shape}")
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, _score_trends, values, self.seasonal_window, self.trend_window
+        )
+
+
+@lru_cache(maxsize=32)
+def _centered_index(length: int) -> Tuple[np.ndarray, float]:
+    """Centered time index and its sum of squares for least-squares slopes"""
+    x = np.arange(length, dtype=float)
+    x -= x.mean()
+    x.flags.writeable = False
+    return x, float(x @ x)
+
+
+def _score_trends(values: np.ndarray, seasonal_window: int, recent_window: int) -> Dict[str, np.ndarray]:
+    """Trend, anomaly and seasonal scores for every row of a metrics x time matrix.
     
-    async def _calculate_seasonal_score(self, values: np.ndarray) -> float:
-        """Calculate seasonal pattern deviation score"""
-        try:
-            if len(values) < self.seasonal_window:
-                return 0.0
-            
-            # Simple seasonal analysis - compare current pattern to historical
-            current_pattern = values[-24:]  # Last 24 hours
-            if len(current_pattern) < 24:
-                return 0.0
-            
-            # Compare with historical patterns (simplified)
-            historical_mean = np.mean(values[:-24])
-            current_mean = np.mean(current_pattern)
-            
-            if historical_mean > 0:
-                deviation = abs(current_mean - historical_mean) / historical_mean
-                return min(deviation, 1.0)
-            
-            return 0.0
-            
-        except Exception as e:
-            logger.error(f"Error calculating seasonal score: {e}")
-            return 0.0
+    Module-level so it can run in an executor without touching analyzer state.
+    """
+    length = values.shape[1]
+    mean = values.mean(axis=1)
+    std = values.std(axis=1)
+    
+    # Trend score: least-squares slope relative to the mean
+    x, sxx = _centered_index(length)
+    slope = values @ x / sxx if sxx > 0 else np.zeros(len(values))
+    positive = mean > 0
+    trend_score = np.where(positive, np.minimum(np.abs(slope) / np.where(positive, mean, 1.0), 1.0), 0.0)
+    
+    # Anomaly score: largest z-score among the last 5 points (z > 3 is highly anomalous)
+    anomaly_score = np.zeros(len(values))
+    if length >= 5:
+        varying = std > 0
+        max_deviation = np.abs(values[:, -5:] - mean[:, np.newaxis]).max(axis=1)
+        anomaly_score = np.where(
+            varying, np.minimum(max_deviation / np.where(varying, std, 1.0) / 3.0, 1.0), 0.0
+        )
+    
+    # Seasonal score: recent window mean against the historical mean
+    seasonal_score = np.zeros(len(values))
+    if length >= seasonal_window and length > recent_window:
+        historical_mean = values[:, :-recent_window].mean(axis=1)
+        current_mean = values[:, -recent_window:].mean(axis=1)
+        positive = historical_mean > 0
+        deviation = np.abs(current_mean - historical_mean) / np.where(positive, historical_mean, 1.0)
+        seasonal_score = np.where(positive, np.minimum(deviation, 1.0), 0.0)
+    
+    return {
+        "trend_score": trend_score,
+        "anomaly_score": anomaly_score,
+        "seasonal_score": seasonal_score,
+        "volatility": std,
+        "mean_value": mean
+    }
+
+
+def _row_scores(scores: Dict[str, np.ndarray], row: int) -> Dict[str, float]:
+    return {key: float(column[row]) for key, column in scores.items()}
+
+
+def _stack_by_length(trend_data: Dict[str, TrendData]) -> List[Tuple[List[str], np.ndarray]]:
+    """Group series by length into preallocated float matrices"""
+    groups: Dict[int, List[str]] = {}
+    for name, data in trend_data.items():
+        groups.setdefault(len(data.values), []).append(name)
+    
+    stacked = []
+    for length, names in groups.items():
+        matrix = np.empty((len(names), length), dtype=float)
+        for row, name in enumerate(names):
+            matrix[row] = trend_data[name].values
+        stacked.append((names, matrix))
+    return stacked
 
 
 class MonteCarloSimulator:
     """Monte Carlo simulation for risk assessment"""
     
-    def __init__(self, num_simulations: int = 1000):
+    def __init__(
+        self,
+        num_simulations: int = 1000,
+        seed: Optional[Union[int, np.random.Generator]] = None,
+        future_steps: int = 6,
+        process_pool_threshold: int = 200_000,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            num_simulations: Number of simulated scenarios per assessment
+            seed: Seed or Generator for reproducible simulation streams
+            future_steps: Random-walk steps per scenario (5-minute intervals)
+            process_pool_threshold: Simulation count above which work is split
+                across a process pool
+            max_workers: Process pool size (defaults to CPU count)
+        """
         self.num_simulations = num_simulations
+        self.future_steps = future_steps
+        self.process_pool_threshold = process_pool_threshold
+        self.max_workers = max_workers
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self._executor: Optional[ProcessPoolExecutor] = None
     
     async def simulate_incident_risk(
         self, 
@@ -183,17 +241,13 @@ class MonteCarloSimulator:
             Risk assessment results
         """
         try:
-            simulations = []
-            
-            for _ in range(self.num_simulations):
-                # Simulate future metric values with noise
-                simulated_risk = await self._simulate_single_scenario(
-                    trend_data, historical_incidents
-                )
-                simulations.append(simulated_risk)
+            # Fit every metric once; all scenarios share the same trend and volatility
+            fit = self._fit_metrics(trend_data)
             
-            # Calculate statistics
-            simulations = np.array(simulations)
+            if self.num_simulations > self.process_pool_threshold:
+                simulations = await self._simulate_in_process_pool(fit)
+            else:
+                simulations = _simulate_risk_batch(fit, self.num_simulations, self.rng)
             
             return {
                 "mean_risk": float(np.mean(simulations)),
@@ -210,54 +264,98 @@ class MonteCarloSimulator:
                    "percentile_99": 0.0, "probability_high_risk": 0.0, 
                    "probability_critical_risk": 0.0}
     
-    async def _simulate_single_scenario(
-        self, 
-        trend_data: Dict[str, TrendData],
-        historical_incidents: List[Incident]
-    ) -> float:
-        """Simulate a single risk scenario"""
-        try:
-            total_risk = 0.0
-            
-            for metric_name, data in trend_data.items():
-                if len(data.values) < 5:
-                    continue
-                
-                # Calculate trend and volatility
-                values = np.array(data.values)
-                trend = np.polyfit(range(len(values)), values, 1)[0]
-                volatility = np.std(values)
-                current_value = values[-1]
-                
-                # Simulate future value with random walk
-                future_steps = 6  # 30 minutes in 5-minute intervals
-                simulated_value = current_value
-                
-                for _ in range(future_steps):
-                    noise = np.random.normal(0, volatility * 0.1)
-                    simulated_value += trend + noise
-                
-                # Calculate risk based on simulated value
-                if "cpu" in metric_name.lower():
-                    risk = min(simulated_value / 100.0, 1.0)  # CPU percentage
-                elif "memory" in metric_name.lower():
-                    risk = min(simulated_value / 100.0, 1.0)  # Memory percentage
-                elif "error" in metric_name.lower():
-                    risk = min(simulated_value * 10, 1.0)  # Error rate
-                else:
-                    risk = min(simulated_value / 1000.0, 1.0)  # Generic normalization
-                
-                total_risk += max(0, risk)
-            
-            # Normalize by number of metrics
-            if len(trend_data) > 0:
-                total_risk /= len(trend_data)
-            
-            return min(total_risk, 1.0)
-            
-        except Exception as e:
-            logger.error(f"Error simulating single scenario: {e}")
-            return 0.0
+    def _fit_metrics(self, trend_data: Dict[str, TrendData]) -> "_MetricFit":
+        """Fit trend, volatility and risk scale for each usable metric"""
+        trends, volatilities, current_values, scales = [], [], [], []
+        
+        for metric_name, data in trend_data.items():
+            if len(data.values) < 5:
+                continue
+            
+            values = np.asarray(data.values, dtype=float)
+            trends.append(np.polyfit(np.arange(len(values)), values, 1)[0])
+            volatilities.append(np.std(values))
+            current_values.append(values[-1])
+            scales.append(self._risk_scale(metric_name))
+        
+        return _MetricFit(
+            trend=np.array(trends, dtype=float),
+            volatility=np.array(volatilities, dtype=float),
+            current_value=np.array(current_values, dtype=float),
+            risk_scale=np.array(scales, dtype=float),
+            # Skipped metrics still count towards normalization
+            metric_count=len(trend_data),
+            future_steps=self.future_steps
+        )
+    
+    @staticmethod
+    def _risk_scale(metric_name: str) -> float:
+        """Factor mapping a simulated metric value onto [0, 1] risk"""
+        name = metric_name.lower()
+        if "cpu" in name or "memory" in name:
+            return 1 / 100.0  # Percentage metrics
+        if "error" in name:
+            return 10.0  # Error rate
+        return 1 / 1000.0  # Generic normalization
+    
+    async def _simulate_in_process_pool(self, fit: "_MetricFit") -> np.ndarray:
+        """Split a large simulation count across worker processes"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        
+        chunk_count = -(-self.num_simulations // self.process_pool_threshold)
+        chunk_sizes = [len(c) for c in np.array_split(np.arange(self.num_simulations), chunk_count)]
+        # Independent child streams keep results reproducible for a given seed
+        child_seeds = self.rng.integers(0, 2**63 - 1, size=chunk_count)
+        
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _simulate_risk_batch, fit, size, int(seed))
+            for size, seed in zip(chunk_sizes, child_seeds)
+        ])
+        return np.concatenate(chunks)
+    
+    def close(self) -> None:
+        """Shut down the simulation process pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+@dataclass
+class _MetricFit:
+    """Per-metric parameters shared by every simulated scenario"""
+    trend: np.ndarray
+    volatility: np.ndarray
+    current_value: np.ndarray
+    risk_scale: np.ndarray
+    metric_count: int
+    future_steps: int
+
+
+def _simulate_risk_batch(
+    fit: _MetricFit,
+    num_simulations: int,
+    rng: Union[int, np.random.Generator]
+) -> np.ndarray:
+    """Simulate ``num_simulations`` random-walk scenarios in one vectorized pass.
+    
+    Module-level so it can be pickled into a process pool worker.
+    """
+    if fit.metric_count == 0 or len(fit.trend) == 0:
+        return np.zeros(num_simulations)
+    
+    generator = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    
+    # (simulations x steps x metrics) noise tensor drawn in a single call
+    noise = generator.normal(
+        0.0, 1.0, size=(num_simulations, fit.future_steps, len(fit.trend))
+    ) * (fit.volatility * 0.1)
+    simulated_values = fit.current_value + fit.future_steps * fit.trend + noise.sum(axis=1)
+    
+    risk = np.clip(simulated_values * fit.risk_scale, 0.0, 1.0)
+    total_risk = risk.sum(axis=1) / fit.metric_count
+    return np.minimum(total_risk, 1.0)
 
 
 class SeasonalDecomposer:
@@ -277,106 +375,118 @@ class SeasonalDecomposer:
             Dictionary with trend, seasonal, and residual components
         """
         try:
-            if len(trend_data.values) < self.seasonal_period * 2:
-                # Not enough data for seasonal decomposition
-                return await self._simple_decomposition(trend_data)
-            
-            values = np.array(trend_data.values)
-            
-            # Calculate trend using moving average
-            trend = await self._calculate_trend_component(values)
-            
-            # Calculate seasonal component
-            seasonal = await self._calculate_seasonal_component(values, trend)
-            
-            # Calculate residual
-            residual = values - trend - seasonal
+            # A single series is cheap enough to decompose inline
+            components = _decompose_rows(
+                np.asarray(trend_data.values, dtype=float)[np.newaxis, :], self.seasonal_period
+            )
+            return _row_components(components, 0)
             
+        except Exception as e:
+            logger.error(f"Error in seasonal decomposition: {e}")
+            values = np.asarray(trend_data.values, dtype=float)
             return {
                 "original": values,
-                "trend": trend,
-                "seasonal": seasonal,
-                "residual": residual,
-                "seasonal_strength": float(np.std(seasonal) / np.std(values)) if np.std(values) > 0 else 0.0,
-                "trend_strength": float(np.std(trend) / np.std(values)) if np.std(values) > 0 else 0.0
+                "trend": np.zeros_like(values),
+                "seasonal": np.zeros_like(values),
+                "residual": values.copy(),
+                "seasonal_strength": 0.0,
+                "trend_strength": 0.0
             }
+    
+    async def decompose_trends(self, trend_data: Dict[str, TrendData]) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Decompose many metrics at once on a worker thread
+        
+        Args:
+            trend_data: Time-series data keyed by metric name
             
-        except Exception as e:
-            logger.error(f"Error in seasonal decomposition: {e}")
-            return await self._simple_decomposition(trend_data)
+        Returns:
+            Components keyed by metric name, as from decompose_trend
+        """
+        results: Dict[str, Dict[str, np.ndarray]] = {}
+        for names, matrix in _stack_by_length(trend_data):
+            components = await self.decompose_matrix(matrix)
+            for row, name in enumerate(names):
+                results[name] = _row_components(components, row)
+        
+        return {name: results[name] for name in trend_data}
     
-    async def _simple_decomposition(self, trend_data: TrendData) -> Dict[str, np.ndarray]:
-        """Simple decomposition for insufficient data"""
-        values = np.array(trend_data.values)
+    async def decompose_matrix(self, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Decompose every row of a (metrics x time points) matrix without blocking the event loop
         
-        # Simple linear trend
-        x = np.arange(len(values))
-        trend_coeff = np.polyfit(x, values, 1)
-        trend = np.polyval(trend_coeff, x)
+        Args:
+            values: One metric per row, oldest point first
+            
+        Returns:
+            original, trend, seasonal and residual matrices plus per-row
+            seasonal_strength and trend_strength arrays
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError(f"Expected a 2-D metrics x time matrix, got shape {values.shape}")
         
-        # No seasonal component
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _decompose_rows, values, self.seasonal_period)
+
+
+def _decompose_rows(values: np.ndarray, period: int) -> Dict[str, np.ndarray]:
+    """Trend, seasonal and residual components for every row of a metrics x time matrix.
+    
+    Series shorter than two periods get a linear trend and no seasonal
+    component. Module-level so it can run in an executor.
+    """
+    metrics, length = values.shape
+    if length == 0:
+        empty = np.zeros((metrics, 0))
+        return {"original": values, "trend": empty, "seasonal": empty, "residual": empty,
+                "seasonal_strength": np.zeros(metrics), "trend_strength": np.zeros(metrics)}
+    
+    if length < period * 2:
+        # Least-squares linear trend
+        x, sxx = _centered_index(length)
+        slope = values @ x / sxx if sxx > 0 else np.zeros(metrics)
+        trend = values.mean(axis=1)[:, np.newaxis] + slope[:, np.newaxis] * x
         seasonal = np.zeros_like(values)
+    else:
+        # Centered moving average from prefix sums, truncated at the edges
+        half_window = max(3, min(period, length // 4)) // 2
+        prefix = np.zeros((metrics, length + 1))
+        np.cumsum(values, axis=1, out=prefix[:, 1:])
+        positions = np.arange(length)
+        starts = np.maximum(positions - half_window, 0)
+        ends = np.minimum(positions + half_window + 1, length)
+        trend = (prefix[:, ends] - prefix[:, starts]) / (ends - starts)
         
-        # Residual
-        residual = values - trend
-        
-        return {
-            "original": values,
-            "trend": trend,
-            "seasonal": seasonal,
-            "residual": residual,
-            "seasonal_strength": 0.0,
-            "trend_strength": float(np.std(trend) / np.std(values)) if np.std(values) > 0 else 0.0
-        }
+        # Mean detrended value at each seasonal position, centered on zero
+        detrended = values - trend
+        cycles = -(-length // period)
+        padded = np.full((metrics, cycles * period), np.nan)
+        padded[:, :length] = detrended
+        profile = np.nanmean(padded.reshape(metrics, cycles, period), axis=1)
+        seasonal = np.tile(profile, cycles)[:, :length]
+        seasonal -= seasonal.mean(axis=1, keepdims=True)
     
-    async def _calculate_trend_component(self, values: np.ndarray) -> np.ndarray:
-        """Calculate trend component using moving average"""
-        try:
-            # Use centered moving average
-            window_size = min(self.seasonal_period, len(values) // 4)
-            if window_size < 3:
-                window_size = 3
-            
-            trend = np.zeros_like(values)
-            half_window = window_size // 2
-            
-            for i in range(len(values)):
-                start_idx = max(0, i - half_window)
-                end_idx = min(len(values), i + half_window + 1)
-                trend[i] = np.mean(values[start_idx:end_idx])
-            
-            return trend
-            
-        except Exception as e:
-            logger.error(f"Error calculating trend component: {e}")
-            return np.zeros_like(values)
+    residual = values - trend - seasonal
     
-    async def _calculate_seasonal_component(self, values: np.ndarray, trend: np.ndarray) -> np.ndarray:
-        """Calculate seasonal component"""
-        try:
-            detrended = values - trend
-            seasonal = np.zeros_like(values)
-            
-            # Calculate seasonal pattern
-            for i in range(self.seasonal_period):
-                # Get all values at this seasonal position
-                seasonal_indices = list(range(i, len(values), self.seasonal_period))
-                if seasonal_indices:
-                    seasonal_values = detrended[seasonal_indices]
-                    seasonal_mean = np.mean(seasonal_values)
-                    
-                    # Apply seasonal mean to all positions
-                    for idx in seasonal_indices:
-                        seasonal[idx] = seasonal_mean
-            
-            # Center seasonal component (mean should be 0)
-            seasonal -= np.mean(seasonal)
-            
-            return seasonal
-            
-        except Exception as e:
-            logger.error(f"Error calculating seasonal component: {e}")
-            return np.zeros_like(values)
+    std = values.std(axis=1)
+    varying = std > 0
+    safe_std = np.where(varying, std, 1.0)
+    return {
+        "original": values,
+        "trend": trend,
+        "seasonal": seasonal,
+        "residual": residual,
+        "seasonal_strength": np.where(varying, seasonal.std(axis=1) / safe_std, 0.0),
+        "trend_strength": np.where(varying, trend.std(axis=1) / safe_std, 0.0)
+    }
+
+
+def _row_components(components: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+    return {
+        key: float(value[row]) if value.ndim == 1 else value[row]
+        for key, value in components.items()
+    }
 
 
 class PredictionModel:
@@ -398,6 +508,7 @@ class PredictionModel:
         
         # Enhanced components
         self.monte_carlo = MonteCarloSimulator()
+        self.trend_analyzer = TrendAnalyzer()
         self.seasonal_decomposer = SeasonalDecomposer()
         
         # Forecasting parameters
@@ -421,20 +532,20 @@ class PredictionModel:
         """
         try:
             predictions = []
-            trend_analyzer = TrendAnalyzer()
             
             # Run Monte Carlo simulation for overall risk assessment
             monte_carlo_results = await self.monte_carlo.simulate_incident_risk(
                 metrics, historical_incidents
             )
             
+            # Trend analysis and seasonal decomposition for all metrics in one pass each
+            trend_analyses = await self.trend_analyzer.analyze_trends(metrics)
+            seasonal_decomps = await self.seasonal_decomposer.decompose_trends(metrics)
+            
             # Analyze each metric with enhanced forecasting
             for metric_name, trend_data in metrics.items():
-                # Basic trend analysis
-                trend_analysis = await trend_analyzer.analyze_trend(trend_data)
-                
-                # Seasonal decomposition
-                seasonal_decomp = await self.seasonal_decomposer.decompose_trend(trend_data)
+                trend_analysis = trend_analyses[metric_name]
+                seasonal_decomp = seasonal_decomps[metric_name]
                 
                 # Time-series forecasting
                 forecast_results = await self._forecast_metric_values(
@@ -21,6 +21,7 @@ async def list_incidents(
     severity: Optional[str] = Query(None, description="Filter by severity: critical, high, medium, low"),
     limit: int = Query(50, ge=1, le=200, description="Maximum number of incidents to return"),
     offset: int = Query(0, ge=0, description="Number of incidents to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     services: ServiceContainer = Depends(get_services)
 ):
     """List incidents with optional filtering and pagination."""
@@ -30,7 +31,18 @@ async def list_incidents(
     # Note: This assumes coordinator has a list_incidents method
     # If not available, we'll need to implement it
     try:
-        if hasattr(coordinator, 'list_incidents'):
+        next_cursor = None
+        if hasattr(coordinator, 'list_incidents_page'):
+            page = coordinator.list_incidents_page(
+                status=status,
+                severity=severity,
+                limit=limit,
+                offset=offset,
+                cursor=cursor
+            )
+            incidents = page["incidents"]
+            next_cursor = page["next_cursor"]
+        elif hasattr(coordinator, 'list_incidents'):
             incidents = coordinator.list_incidents(
                 status=status,
                 severity=severity,
@@ -56,6 +68,7 @@ async def list_incidents(
             "total": total_count,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
             "filters": {
                 "status": status,
                 "severity": severity
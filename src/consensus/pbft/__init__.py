@@ -6,12 +6,14 @@ from src.consensus.pbft.pbft_engine import (
     ConsensusResult,
     MessageType,
     PBFTConsensusEngine,
+    PBFTInstance,
     PBFTMessage,
     PBFTNode,
 )
 
 __all__ = [
     "PBFTConsensusEngine",
+    "PBFTInstance",
     "PBFTNode",
     "PBFTMessage",
     "ConsensusProposal",
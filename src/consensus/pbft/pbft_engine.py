@@ -12,6 +12,12 @@ PBFT Phases:
 4. REPLY: Execute operation after 2f+1 commits
 
 Fault Tolerance: Tolerates up to f = (n-1)/3 Byzantine failures
+
+Pipelining: with ``pipeline_window`` or ``max_batch_size`` above 1, several
+sequence numbers are in flight at once, queued proposals are batched into
+one PBFT instance, and
+instances still execute in sequence order. Every ``checkpoint_interval``
+executed sequences a checkpoint is taken and older logs are discarded.
 """
 
 from __future__ import annotations
@@ -22,7 +28,7 @@ import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from cryptography.hazmat.primitives import hashes, serialization
@@ -125,6 +131,17 @@ class ConsensusProposal:
         return hashlib.sha256(content.encode()).hexdigest()
 
 
+@dataclass
+class PBFTInstance:
+    """Protocol state for one sequence number, possibly carrying a batch of proposals."""
+
+    sequence_number: int
+    view: int
+    proposals: List[ConsensusProposal]
+    digest: str
+    phase: ConsensusPhase = ConsensusPhase.IDLE
+
+
 @dataclass
 class ConsensusResult:
     """Result of consensus protocol."""
@@ -156,6 +173,11 @@ class PBFTConsensusEngine:
         heartbeat_timeout: int = 30,
         prepare_timeout: int = 10,
         commit_timeout: int = 10,
+        pipeline_window: int = 1,
+        max_batch_size: int = 1,
+        batch_timeout: float = 0.0,
+        checkpoint_interval: int = 100,
+        network_delay: float = 0.01,
     ):
         """
         Initialize PBFT engine.
@@ -166,6 +188,11 @@ class PBFTConsensusEngine:
             heartbeat_timeout: Timeout for node heartbeats (seconds)
             prepare_timeout: Timeout for prepare phase (seconds)
             commit_timeout: Timeout for commit phase (seconds)
+            pipeline_window: Sequence numbers allowed in flight
+            max_batch_size: Proposals carried by one PBFT instance
+            batch_timeout: How long to wait for a batch to fill (seconds)
+            checkpoint_interval: Executed sequences between checkpoints
+            network_delay: Simulated message exchange delay per phase (seconds)
         """
         self.node_id = node_id
         self.total_nodes = total_nodes
@@ -176,12 +203,34 @@ class PBFTConsensusEngine:
         self.heartbeat_timeout = heartbeat_timeout
         self.prepare_timeout = prepare_timeout
         self.commit_timeout = commit_timeout
+        self.network_delay = network_delay
 
         # PBFT state
         self.view = 0
         self.sequence_number = 0
         self.phase = ConsensusPhase.IDLE
         self.current_proposal: Optional[ConsensusProposal] = None
+        self.instances: Dict[int, PBFTInstance] = {}
+
+        # Pipelining
+        self.pipeline_window = max(1, pipeline_window)
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_timeout = batch_timeout
+        self.pipelined = self.pipeline_window > 1 or self.max_batch_size > 1
+        self._window = asyncio.Semaphore(self.pipeline_window)
+        self._pending: List[Tuple[ConsensusProposal, asyncio.Future, float]] = []
+        self._pending_ready = asyncio.Event()
+        self._pipeline_task: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # In-order execution and checkpoints
+        self.last_executed = 0
+        self._finished: Set[int] = set()
+        self._execution_turn = asyncio.Condition()
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.low_watermark = 0
+        self.checkpoints: Dict[int, str] = {}
+        self._state_digest = ""
 
         # Node management
         self.nodes: Dict[str, PBFTNode] = {}
@@ -251,12 +300,18 @@ class PBFTConsensusEngine:
         """
         Execute the PBFT consensus protocol.
 
+        In pipelined mode the proposal is queued and may share a PBFT
+        instance with other proposals; otherwise it runs as its own instance.
+
         Args:
             proposal: The proposal to reach consensus on
 
         Returns:
             ConsensusResult with the consensus decision
         """
+        if self.pipelined:
+            return await self.submit(proposal)
+
         start_time = asyncio.get_event_loop().time()
 
         logger.info(
@@ -268,70 +323,155 @@ class PBFTConsensusEngine:
             },
         )
 
+        self.current_proposal = proposal
         try:
-            # Phase 1: PRE-PREPARE
-            self.current_proposal = proposal
-            self.sequence_number += 1
-            seq = self.sequence_number
+            result = (await self._run_instance([proposal]))[0]
+        except Exception as e:
+            logger.error(f"PBFT consensus failed: {e}", exc_info=True)
+            return self._fallback_result(proposal, start_time)
 
-            if self.is_primary():
-                await self._phase_pre_prepare(proposal, seq)
-            else:
-                await self._wait_for_pre_prepare(seq)
+        result.execution_time_ms = (asyncio.get_event_loop().time() - start_time) * 1000
 
-            # Phase 2: PREPARE
-            await self._phase_prepare(seq)
+        logger.info(
+            f"PBFT consensus reached",
+            extra={
+                "proposal_id": proposal.proposal_id,
+                "view": self.view,
+                "sequence": result.sequence_number,
+                "execution_time_ms": result.execution_time_ms,
+            },
+        )
 
-            # Phase 3: COMMIT
-            await self._phase_commit(seq)
+        return result
 
-            # Phase 4: EXECUTE
-            result = await self._phase_execute(proposal, seq)
+    async def reach_consensus_batch(
+        self, proposals: List[ConsensusProposal]
+    ) -> List[ConsensusResult]:
+        """
+        Reach consensus on several proposals, pipelining them when enabled.
 
-            execution_time = (asyncio.get_event_loop().time() - start_time) * 1000
+        Returns:
+            One ConsensusResult per proposal, in the order given
+        """
+        if self.pipelined:
+            return list(await asyncio.gather(*[self.submit(p) for p in proposals]))
+        return [await self.reach_consensus(proposal) for proposal in proposals]
+
+    async def submit(self, proposal: ConsensusProposal) -> ConsensusResult:
+        """Queue a proposal for the pipeline and wait for its decision."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((proposal, future, loop.time()))
+        self._pending_ready.set()
+
+        if self._pipeline_task is None or self._pipeline_task.done():
+            self._pipeline_task = asyncio.create_task(self._pipeline_loop())
+
+        return await future
+
+    async def stop(self) -> None:
+        """Stop the pipeline, failing over any proposals still queued."""
+        if self._pipeline_task:
+            self._pipeline_task.cancel()
+            await asyncio.gather(self._pipeline_task, return_exceptions=True)
+            self._pipeline_task = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        for proposal, future, submitted_at in self._pending:
+            if not future.done():
+                future.set_result(self._fallback_result(proposal, submitted_at))
+        self._pending.clear()
+        self._pending_ready.clear()
+
+    async def _pipeline_loop(self) -> None:
+        """Cut queued proposals into batches and start an instance per free window slot."""
+        while True:
+            await self._pending_ready.wait()
+
+            if self.batch_timeout > 0 and len(self._pending) < self.max_batch_size:
+                await asyncio.sleep(self.batch_timeout)
+
+            # Proposals keep queuing while the window is full, so batches
+            # grow under load instead of adding more sequence numbers
+            await self._window.acquire()
+
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            if not self._pending:
+                self._pending_ready.clear()
+
+            task = asyncio.create_task(self._run_pipelined_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_pipelined_batch(
+        self, batch: List[Tuple[ConsensusProposal, asyncio.Future, float]]
+    ) -> None:
+        """Run one pipelined instance and resolve each proposal's future."""
+        try:
+            results = await self._run_instance([proposal for proposal, _, _ in batch])
+        except Exception as e:
+            logger.error(f"PBFT consensus failed: {e}", exc_info=True)
+            results = [self._fallback_result(proposal, submitted_at) for proposal, _, submitted_at in batch]
+        finally:
+            self._window.release()
+
+        now = asyncio.get_event_loop().time()
+        for (_, future, submitted_at), result in zip(batch, results):
+            if not result.execution_time_ms:
+                result.execution_time_ms = (now - submitted_at) * 1000
+            if not future.done():
+                future.set_result(result)
+
+    async def _run_instance(self, proposals: List[ConsensusProposal]) -> List[ConsensusResult]:
+        """Take one sequence number through all PBFT phases and execute it in order."""
+        self.sequence_number += 1
+        seq = self.sequence_number
+
+        if len(proposals) == 1:
+            digest = proposals[0].digest()
+        else:
+            digest = hashlib.sha256("".join(p.digest() for p in proposals).encode()).hexdigest()
 
-            result.execution_time_ms = execution_time
+        instance = PBFTInstance(sequence_number=seq, view=self.view, proposals=proposals, digest=digest)
+        self.instances[seq] = instance
+        executed = False
 
-            logger.info(
-                f"PBFT consensus reached",
-                extra={
-                    "proposal_id": proposal.proposal_id,
-                    "view": self.view,
-                    "sequence": seq,
-                    "execution_time_ms": execution_time,
-                },
-            )
+        try:
+            # Phase 1: PRE-PREPARE
+            if self.is_primary():
+                await self._phase_pre_prepare(instance)
+            else:
+                await self._wait_for_pre_prepare(instance)
 
-            return result
+            # Phase 2: PREPARE
+            await self._phase_prepare(instance)
 
-        except Exception as e:
-            logger.error(f"PBFT consensus failed: {e}", exc_info=True)
-            # Return fallback result
-            execution_time = (asyncio.get_event_loop().time() - start_time) * 1000
-            return ConsensusResult(
-                proposal_id=proposal.proposal_id,
-                decision=proposal.data,
-                participating_nodes=[self.node_id],
-                view=self.view,
-                sequence_number=seq,
-                phase=ConsensusPhase.IDLE,
-                confidence=0.5,
-                execution_time_ms=execution_time,
-            )
+            # Phase 3: COMMIT
+            await self._phase_commit(instance)
 
-    async def _phase_pre_prepare(
-        self, proposal: ConsensusProposal, sequence: int
-    ) -> None:
+            # Phase 4: EXECUTE, strictly in sequence order
+            await self._wait_for_turn(seq)
+            results = await self._phase_execute(instance)
+            executed = True
+            return results
+        finally:
+            await self._mark_finished(instance, executed)
+
+    async def _phase_pre_prepare(self, instance: PBFTInstance) -> None:
         """PRE-PREPARE phase: Primary broadcasts proposal."""
+        sequence = instance.sequence_number
         message = PBFTMessage(
             message_type=MessageType.PRE_PREPARE,
-            view=self.view,
+            view=instance.view,
             sequence_number=sequence,
             node_id=self.node_id,
             payload={
-                "proposal_id": proposal.proposal_id,
-                "proposal_data": proposal.data,
-                "digest": proposal.digest(),
+                "proposal_ids": [p.proposal_id for p in instance.proposals],
+                "proposal_data": [p.data for p in instance.proposals],
+                "digest": instance.digest,
             },
         )
 
@@ -342,29 +482,30 @@ class PBFTConsensusEngine:
         self.pre_prepare_log[sequence] = message
 
         # Update phase
-        self.phase = ConsensusPhase.PRE_PREPARED
+        self._set_phase(instance, ConsensusPhase.PRE_PREPARED)
 
         logger.debug(
             f"PRE-PREPARE phase completed",
-            extra={"sequence": sequence, "view": self.view},
+            extra={"sequence": sequence, "view": instance.view, "batch_size": len(instance.proposals)},
         )
 
-    async def _wait_for_pre_prepare(self, sequence: int) -> None:
+    async def _wait_for_pre_prepare(self, instance: PBFTInstance) -> None:
         """Wait for PRE-PREPARE message from primary."""
         # In a real implementation, this would wait for network messages
         # For now, simulate receiving pre-prepare
-        await asyncio.sleep(0.01)
-        self.phase = ConsensusPhase.PRE_PREPARED
+        await asyncio.sleep(self.network_delay)
+        self._set_phase(instance, ConsensusPhase.PRE_PREPARED)
 
-    async def _phase_prepare(self, sequence: int) -> None:
+    async def _phase_prepare(self, instance: PBFTInstance) -> None:
         """PREPARE phase: Replicas exchange prepare messages."""
+        sequence = instance.sequence_number
         # Send PREPARE message to all replicas
         message = PBFTMessage(
             message_type=MessageType.PREPARE,
-            view=self.view,
+            view=instance.view,
             sequence_number=sequence,
             node_id=self.node_id,
-            payload={"digest": self.current_proposal.digest() if self.current_proposal else ""},
+            payload={"digest": instance.digest},
         )
 
         message.signature = self._sign_message(message)
@@ -376,12 +517,12 @@ class PBFTConsensusEngine:
 
         # Simulate receiving prepares from other nodes (2f+1 total)
         # In production, this would wait for actual network messages
-        await asyncio.sleep(0.01)
+        await asyncio.sleep(self.network_delay)
 
         # Check if we have quorum (2f + 1 prepare messages)
         prepare_count = len(self.prepare_log.get(sequence, set()))
         if prepare_count >= self.required_quorum:
-            self.phase = ConsensusPhase.PREPARED
+            self._set_phase(instance, ConsensusPhase.PREPARED)
             logger.debug(
                 f"PREPARE phase completed",
                 extra={"sequence": sequence, "prepare_count": prepare_count},
@@ -391,15 +532,16 @@ class PBFTConsensusEngine:
                 f"Insufficient prepares for sequence {sequence}: {prepare_count}/{self.required_quorum}"
             )
 
-    async def _phase_commit(self, sequence: int) -> None:
+    async def _phase_commit(self, instance: PBFTInstance) -> None:
         """COMMIT phase: Replicas exchange commit messages."""
+        sequence = instance.sequence_number
         # Send COMMIT message to all replicas
         message = PBFTMessage(
             message_type=MessageType.COMMIT,
-            view=self.view,
+            view=instance.view,
             sequence_number=sequence,
             node_id=self.node_id,
-            payload={"digest": self.current_proposal.digest() if self.current_proposal else ""},
+            payload={"digest": instance.digest},
         )
 
         message.signature = self._sign_message(message)
@@ -410,12 +552,12 @@ class PBFTConsensusEngine:
         self.commit_log[sequence].add(self.node_id)
 
         # Simulate receiving commits from other nodes
-        await asyncio.sleep(0.01)
+        await asyncio.sleep(self.network_delay)
 
         # Check if we have quorum (2f + 1 commit messages)
         commit_count = len(self.commit_log.get(sequence, set()))
         if commit_count >= self.required_quorum:
-            self.phase = ConsensusPhase.COMMITTED
+            self._set_phase(instance, ConsensusPhase.COMMITTED)
             logger.debug(
                 f"COMMIT phase completed",
                 extra={"sequence": sequence, "commit_count": commit_count},
@@ -425,11 +567,10 @@ class PBFTConsensusEngine:
                 f"Insufficient commits for sequence {sequence}: {commit_count}/{self.required_quorum}"
             )
 
-    async def _phase_execute(
-        self, proposal: ConsensusProposal, sequence: int
-    ) -> ConsensusResult:
-        """EXECUTE phase: Execute the operation and return result."""
-        self.phase = ConsensusPhase.EXECUTED
+    async def _phase_execute(self, instance: PBFTInstance) -> List[ConsensusResult]:
+        """EXECUTE phase: Execute the operation and return one result per proposal."""
+        sequence = instance.sequence_number
+        self._set_phase(instance, ConsensusPhase.EXECUTED)
 
         # Calculate confidence based on quorum strength
         prepare_count = len(self.prepare_log.get(sequence, set()))
@@ -442,15 +583,18 @@ class PBFTConsensusEngine:
 
         participating_nodes = list(self.commit_log.get(sequence, set()))
 
-        result = ConsensusResult(
-            proposal_id=proposal.proposal_id,
-            decision=proposal.data,
-            participating_nodes=participating_nodes,
-            view=self.view,
-            sequence_number=sequence,
-            phase=self.phase,
-            confidence=confidence,
-        )
+        results = [
+            ConsensusResult(
+                proposal_id=proposal.proposal_id,
+                decision=proposal.data,
+                participating_nodes=participating_nodes,
+                view=instance.view,
+                sequence_number=sequence,
+                phase=instance.phase,
+                confidence=confidence,
+            )
+            for proposal in instance.proposals
+        ]
 
         logger.info(
             f"Consensus executed",
@@ -458,10 +602,76 @@ class PBFTConsensusEngine:
                 "sequence": sequence,
                 "confidence": confidence,
                 "participants": len(participating_nodes),
+                "batch_size": len(results),
             },
         )
 
-        return result
+        return results
+
+    def _set_phase(self, instance: PBFTInstance, phase: ConsensusPhase) -> None:
+        """Advance an instance's phase; the engine phase tracks the latest transition."""
+        instance.phase = phase
+        self.phase = phase
+
+    async def _wait_for_turn(self, sequence: int) -> None:
+        """Block until every lower sequence number has executed or been abandoned."""
+        async with self._execution_turn:
+            await self._execution_turn.wait_for(lambda: self.last_executed >= sequence - 1)
+
+    async def _mark_finished(self, instance: PBFTInstance, executed: bool) -> None:
+        """
+        Record that a sequence number is done and advance the execution point.
+
+        An abandoned instance counts as a no-op so later sequence numbers are
+        not blocked behind it.
+        """
+        async with self._execution_turn:
+            self._finished.add(instance.sequence_number)
+            if not executed:
+                instance.digest = ""
+
+            while self.last_executed + 1 in self._finished:
+                self.last_executed += 1
+                self._finished.discard(self.last_executed)
+
+                finished = self.instances.get(self.last_executed)
+                step = finished.digest if finished else ""
+                self._state_digest = hashlib.sha256(
+                    f"{self._state_digest}:{step}".encode()
+                ).hexdigest()
+
+                if self.last_executed % self.checkpoint_interval == 0:
+                    self._take_checkpoint(self.last_executed)
+
+            self._execution_turn.notify_all()
+
+    def _take_checkpoint(self, sequence: int) -> None:
+        """Record a stable checkpoint and garbage-collect logs at or below it."""
+        self.checkpoints = {sequence: self._state_digest}
+        self.low_watermark = sequence
+
+        for log in (self.pre_prepare_log, self.prepare_log, self.commit_log, self.instances):
+            for seq in [s for s in log if s <= sequence]:
+                del log[seq]
+
+        logger.debug(
+            f"Checkpoint taken",
+            extra={"sequence": sequence, "state_digest": self._state_digest},
+        )
+
+    def _fallback_result(self, proposal: ConsensusProposal, start_time: float) -> ConsensusResult:
+        """Result returned when the protocol fails for a proposal."""
+        execution_time = (asyncio.get_event_loop().time() - start_time) * 1000
+        return ConsensusResult(
+            proposal_id=proposal.proposal_id,
+            decision=proposal.data,
+            participating_nodes=[self.node_id],
+            view=self.view,
+            sequence_number=self.sequence_number,
+            phase=ConsensusPhase.IDLE,
+            confidence=0.5,
+            execution_time_ms=execution_time,
+        )
 
     def _sign_message(self, message: PBFTMessage) -> str:
         """Sign a message with the node's private key."""
@@ -533,4 +743,9 @@ class PBFTConsensusEngine:
             "fault_tolerance": self.fault_tolerance,
             "required_quorum": self.required_quorum,
             "registered_nodes": len(self.nodes),
+            "pipeline_window": self.pipeline_window,
+            "in_flight": self.sequence_number - self.last_executed,
+            "queued_proposals": len(self._pending),
+            "last_executed": self.last_executed,
+            "low_watermark": self.low_watermark,
         }
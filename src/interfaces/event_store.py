@@ -88,6 +88,22 @@ class EventStore(ABC):
         """
         pass
     
+    async def append_events(self, incident_id: str, events: List[IncidentEvent]) -> int:
+        """
+        Append several events to the incident stream in order.
+        
+        Args:
+            incident_id: ID of the incident
+            events: Events to append
+            
+        Returns:
+            Version number after the last append
+        """
+        version = await self.get_current_version(incident_id)
+        for event in events:
+            version = await self.append_event(incident_id, event)
+        return version
+    
     @abstractmethod
     async def get_events(self, incident_id: str, 
                         from_version: int = 0) -> List[IncidentEvent]:
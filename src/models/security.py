@@ -35,6 +35,10 @@ class SecuritySeverity(str, Enum):
     CRITICAL = "critical"
 
 
+# Chain metadata the audit logger adds to details after an event is hashed
+AUDIT_CHAIN_FIELDS = frozenset({"chain_id", "chain_sequence", "chain_hash", "previous_hash"})
+
+
 class AuditEvent(BaseModel):
     """
     Tamper-proof audit event with cryptographic integrity verification.
@@ -69,7 +73,7 @@ class AuditEvent(BaseModel):
             "resource": self.resource,
             "action": self.action,
             "outcome": self.outcome,
-            "details": self.details
+            "details": {key: value for key, value in self.details.items() if key not in AUDIT_CHAIN_FIELDS}
         }
         
         # Sort keys for deterministic hashing
@@ -186,7 +190,7 @@ class PIIRedactionResult(BaseModel):
     """Result of PII redaction scanning."""
     original_text: str = Field(..., description="Original text before redaction")
     redacted_text: str = Field(..., description="Text after PII redaction")
-    redacted_items: List[Dict[str, str]] = Field(default_factory=list)
+    redacted_items: List[Dict[str, Any]] = Field(default_factory=list)
     confidence_score: float = Field(..., ge=0.0, le=1.0)
     
     @field_validator('redacted_items')
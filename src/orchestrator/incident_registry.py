@@ -0,0 +1,336 @@
+"""
+Indexed registry of incident processing states.
+
+Keeps secondary indexes by status, severity and phase plus a time-ordered
+index so dashboard listings and counts do not scan every incident ever
+processed. Finished incidents are evicted once they pass a retention window.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict, deque
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.utils.constants import RESOURCE_LIMITS
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from src.orchestrator.swarm_coordinator import IncidentProcessingState
+
+
+logger = get_logger("incident_registry")
+
+# Phase values that end processing, and the status each maps to
+_TERMINAL_STATUSES = {"completed": "resolved", "failed": "failed"}
+
+_IndexKey = Tuple[str, str, str]  # (status, severity, phase)
+_OrderKey = Tuple[datetime, str]  # (start_time, incident_id)
+
+
+def incident_status(state: "IncidentProcessingState") -> str:
+    """Dashboard status string for a processing state."""
+    phase = state.phase.value if state.phase else "unknown"
+    return _TERMINAL_STATUSES.get(phase, "active")
+
+
+def _severity_of(state: "IncidentProcessingState") -> str:
+    severity = getattr(state.incident, "severity", "medium")
+    return getattr(severity, "value", severity)
+
+
+def encode_cursor(key: _OrderKey) -> str:
+    """Opaque pagination cursor for a position in the time index."""
+    return f"{key[0].isoformat()}|{key[1]}"
+
+
+def decode_cursor(cursor: str) -> _OrderKey:
+    """Parse a cursor produced by encode_cursor."""
+    try:
+        timestamp, incident_id = cursor.split("|", 1)
+        return datetime.fromisoformat(timestamp), incident_id
+    except ValueError:
+        raise ValueError(f"Invalid incident cursor: {cursor!r}")
+
+
+class IncidentRegistry(MutableMapping):
+    """
+    Mapping of incident id to processing state with incremental indexes.
+
+    States call back into the registry when their phase, end time or incident
+    changes, so indexes stay current without rescans. Completed and failed
+    states are evicted after ``retention_seconds`` or once more than
+    ``max_completed`` are held, oldest first; ``on_evict`` can archive them.
+    """
+
+    def __init__(self, retention_seconds: Optional[float] = None, max_completed: Optional[int] = None,
+                 on_evict: Optional[Callable[["IncidentProcessingState"], Any]] = None):
+        """
+        Initialize incident registry.
+
+        Args:
+            retention_seconds: How long finished incidents are kept
+            max_completed: Maximum number of finished incidents kept
+            on_evict: Optional archive hook called with each evicted state
+        """
+        self.retention = timedelta(
+            seconds=retention_seconds or RESOURCE_LIMITS["completed_incident_retention_seconds"]
+        )
+        self.max_completed = max_completed or RESOURCE_LIMITS["max_completed_incidents"]
+        self.on_evict = on_evict
+
+        self._states: Dict[str, "IncidentProcessingState"] = {}
+        self._keys: Dict[str, _IndexKey] = {}
+        self._order_keys: Dict[str, _OrderKey] = {}
+
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_severity: Dict[str, Set[str]] = defaultdict(set)
+        self._by_phase: Dict[str, Set[str]] = defaultdict(set)
+        self._pair_counts: Counter = Counter()  # (status, severity) -> count
+
+        # Sorted by start time for cursor pagination
+        self._order: List[_OrderKey] = []
+
+        # Finished incidents in order of completion
+        self._completed: deque = deque()
+        self._completed_at: Dict[str, datetime] = {}
+
+        self.evicted_count = 0
+
+    # Mapping interface
+
+    def __getitem__(self, incident_id: str) -> "IncidentProcessingState":
+        return self._states[incident_id]
+
+    def __setitem__(self, incident_id: str, state: "IncidentProcessingState") -> None:
+        if incident_id in self._states:
+            self._remove(incident_id)
+        self._states[incident_id] = state
+        order_key = (state.start_time, incident_id)
+        self._order_keys[incident_id] = order_key
+        if not self._order or order_key >= self._order[-1]:
+            self._order.append(order_key)
+        else:
+            insort(self._order, order_key)
+        state.attach_listener(self.reindex)
+        self.reindex(state)
+        self.evict_expired()
+
+    def __delitem__(self, incident_id: str) -> None:
+        if incident_id not in self._states:
+            raise KeyError(incident_id)
+        self._remove(incident_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._states)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def clear(self) -> None:
+        """Remove every state and index entry."""
+        for state in self._states.values():
+            state.attach_listener(None)
+        self._states.clear()
+        self._keys.clear()
+        self._order_keys.clear()
+        self._by_status.clear()
+        self._by_severity.clear()
+        self._by_phase.clear()
+        self._pair_counts.clear()
+        self._order.clear()
+        self._completed.clear()
+        self._completed_at.clear()
+
+    # Index maintenance
+
+    def reindex(self, state: "IncidentProcessingState") -> None:
+        """Move a state between index buckets after it changed."""
+        incident_id = state.incident_id
+        if self._states.get(incident_id) is not state:
+            return
+
+        key = (incident_status(state), _severity_of(state), state.phase.value if state.phase else "unknown")
+        previous = self._keys.get(incident_id)
+        if key == previous:
+            return
+
+        if previous is not None:
+            self._unindex(incident_id, previous)
+        self._keys[incident_id] = key
+        status, severity, phase = key
+        self._by_status[status].add(incident_id)
+        self._by_severity[severity].add(incident_id)
+        self._by_phase[phase].add(incident_id)
+        self._pair_counts[(status, severity)] += 1
+
+        if status != "active" and incident_id not in self._completed_at:
+            completed_at = state.end_time or datetime.utcnow()
+            self._completed_at[incident_id] = completed_at
+            self._completed.append((completed_at, incident_id))
+        elif status == "active":
+            self._completed_at.pop(incident_id, None)
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Evict finished incidents past retention or over the size cap.
+
+        Returns:
+            Number of evicted incidents.
+        """
+        cutoff = (now or datetime.utcnow()) - self.retention
+        evicted = 0
+
+        while self._completed:
+            completed_at, incident_id = self._completed[0]
+            if self._completed_at.get(incident_id) != completed_at:
+                # Reopened, re-completed or already removed
+                self._completed.popleft()
+                continue
+            if completed_at >= cutoff and len(self._completed_at) <= self.max_completed:
+                break
+            self._completed.popleft()
+            state = self._states[incident_id]
+            self._remove(incident_id)
+            evicted += 1
+            if self.on_evict is not None:
+                try:
+                    self.on_evict(state)
+                except Exception as e:
+                    logger.warning(f"Failed to archive incident {incident_id}: {e}")
+
+        if evicted:
+            self.evicted_count += evicted
+            logger.debug(f"Evicted {evicted} finished incidents from registry")
+        return evicted
+
+    def _remove(self, incident_id: str) -> None:
+        state = self._states.pop(incident_id)
+        state.attach_listener(None)
+        key = self._keys.pop(incident_id, None)
+        if key is not None:
+            self._unindex(incident_id, key)
+        order_key = self._order_keys.pop(incident_id)
+        position = bisect_left(self._order, order_key)
+        if position < len(self._order) and self._order[position] == order_key:
+            del self._order[position]
+        self._completed_at.pop(incident_id, None)
+
+    def _unindex(self, incident_id: str, key: _IndexKey) -> None:
+        status, severity, phase = key
+        for index, value in ((self._by_status, status), (self._by_severity, severity), (self._by_phase, phase)):
+            members = index.get(value)
+            if members is not None:
+                members.discard(incident_id)
+                if not members:
+                    del index[value]
+        self._pair_counts[(status, severity)] -= 1
+        if not self._pair_counts[(status, severity)]:
+            del self._pair_counts[(status, severity)]
+
+    # Queries
+
+    def count(self, status: Optional[str] = None, severity: Optional[str] = None,
+              phase: Optional[str] = None) -> int:
+        """Count incidents matching the filters; O(1) unless phase is combined with another filter."""
+        status = None if status == "all" else status
+        severity = None if severity == "all" else severity
+
+        if phase:
+            if not status and not severity:
+                return len(self._by_phase.get(phase, ()))
+            return len(self._matching_ids(status, severity, phase))
+        if status and severity:
+            return self._pair_counts.get((status, severity), 0)
+        if status:
+            return len(self._by_status.get(status, ()))
+        if severity:
+            return len(self._by_severity.get(severity, ()))
+        return len(self._states)
+
+    def query(self, status: Optional[str] = None, severity: Optional[str] = None,
+              phase: Optional[str] = None, limit: int = 50, offset: int = 0,
+              cursor: Optional[str] = None,
+              newest_first: bool = False) -> Tuple[List["IncidentProcessingState"], Optional[str]]:
+        """
+        Page through incidents in start-time order.
+
+        Args:
+            status: Filter by dashboard status
+            severity: Filter by severity
+            phase: Filter by processing phase
+            limit: Maximum states to return
+            offset: States to skip after the cursor
+            cursor: Resume after the position returned by a previous page
+            newest_first: Walk the time index backwards
+
+        Returns:
+            Matching states and the cursor for the next page, or None on the last page.
+
+        Raises:
+            ValueError: If limit is less than 1 or the cursor is malformed
+        """
+        if limit < 1:
+            raise ValueError(f"Incident page limit must be at least 1, got {limit}")
+        status = None if status == "all" else status
+        severity = None if severity == "all" else severity
+        after = decode_cursor(cursor) if cursor else None
+
+        if status or severity or phase:
+            candidates = self._matching_ids(status, severity, phase)
+            if len(candidates) * 8 < len(self._order):
+                # Selective filter: order the small candidate set directly
+                keys = sorted(self._order_keys[i] for i in candidates)
+                keys = self._after(keys, after, newest_first)
+                return self._page(keys, offset, limit)
+        else:
+            candidates = None
+
+        keys = self._after(self._order, after, newest_first)
+        if candidates is not None:
+            keys = (key for key in keys if key[1] in candidates)
+        return self._page(keys, offset, limit)
+
+    def _matching_ids(self, status: Optional[str], severity: Optional[str], phase: Optional[str]) -> Set[str]:
+        sets = []
+        if status:
+            sets.append(self._by_status.get(status, set()))
+        if severity:
+            sets.append(self._by_severity.get(severity, set()))
+        if phase:
+            sets.append(self._by_phase.get(phase, set()))
+        sets.sort(key=len)
+        return set.intersection(*sets) if len(sets) > 1 else set(sets[0])
+
+    @staticmethod
+    def _after(keys: List[_OrderKey], after: Optional[_OrderKey], newest_first: bool) -> Iterator[_OrderKey]:
+        """Iterate sorted keys strictly past the cursor position."""
+        if newest_first:
+            end = bisect_left(keys, after) if after else len(keys)
+            return (keys[i] for i in range(end - 1, -1, -1))
+        start = bisect_right(keys, after) if after else 0
+        return (keys[i] for i in range(start, len(keys)))
+
+    def _page(self, keys, offset: int, limit: int) -> Tuple[List["IncidentProcessingState"], Optional[str]]:
+        page: List["IncidentProcessingState"] = []
+        last_key = None
+        for key in keys:
+            if offset:
+                offset -= 1
+                continue
+            if len(page) == limit:
+                return page, encode_cursor(last_key)
+            page.append(self._states[key[1]])
+            last_key = key
+        return page, None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "incidents": len(self._states),
+            "by_status": {status: len(ids) for status, ids in self._by_status.items()},
+            "by_severity": {severity: len(ids) for severity, ids in self._by_severity.items()},
+            "by_phase": {phase: len(ids) for phase, ids in self._by_phase.items()},
+            "completed_tracked": len(self._completed_at),
+            "evicted": self.evicted_count
+        }
@@ -4,19 +4,21 @@ Agent swarm coordinator for orchestrating multi-agent incident processing.
 
 import asyncio
 import time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
+from typing import Callable, Dict, List, Optional, Any, Set
 from enum import Enum
 from dataclasses import dataclass, field
 
 from src.models.incident import Incident, IncidentStatus
 from src.models.agent import AgentRecommendation, AgentMessage, AgentType, ConsensusDecision
 from src.interfaces.agent import BaseAgent
+from src.orchestrator.incident_registry import IncidentRegistry, incident_status
 from src.services.consensus import get_consensus_engine
 from src.services.circuit_breaker import circuit_breaker_manager
 from src.services.message_bus import get_message_bus, MessagePriority
 from src.services.aws import AWSServiceFactory
-from src.utils.constants import AGENT_DEPENDENCY_ORDER, PERFORMANCE_TARGETS
+from src.utils.constants import AGENT_DEPENDENCY_ORDER, CONSENSUS_CONFIG, PERFORMANCE_TARGETS
 from src.utils.logging import get_logger
 from src.utils.exceptions import AgentTimeoutError, ConsensusTimeoutError
 from src.services.operator_controls import get_operator_control_service
@@ -125,11 +127,29 @@ class IncidentProcessingState:
     end_time: Optional[datetime] = None
     error: Optional[str] = None
     timeline: List[TimelineEvent] = field(default_factory=list)
+    time_saved_seconds: float = 0.0
+    _listener: Optional[Callable[["IncidentProcessingState"], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Fields that feed the incident registry's indexes
+    _INDEXED_FIELDS = frozenset({"phase", "end_time", "incident"})
     
     def __post_init__(self):
         if self.start_time is None:
             self.start_time = datetime.utcnow()
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self._INDEXED_FIELDS:
+            listener = self.__dict__.get("_listener")
+            if listener is not None:
+                listener(self)
+    
+    def attach_listener(self, listener: Optional[Callable[["IncidentProcessingState"], None]]) -> None:
+        """Register the callback notified when indexed fields change."""
+        self._listener = listener
+    
     @property
     def total_duration_seconds(self) -> float:
         """Calculate total processing duration."""
@@ -217,7 +237,7 @@ class AgentSwarmCoordinator:
     def __init__(self, service_factory: Optional[AWSServiceFactory] = None):
         """Initialize swarm coordinator."""
         self.agents: Dict[str, BaseAgent] = {}
-        self.processing_states: Dict[str, IncidentProcessingState] = {}
+        self._incident_registry = IncidentRegistry()
         self.consensus_engine = get_consensus_engine()
         
         # Message bus for inter-agent communication
@@ -225,13 +245,30 @@ class AgentSwarmCoordinator:
         self._owns_service_factory = service_factory is None
         self.message_bus = get_message_bus(self._service_factory)
         
+        # Stream analysis results into consensus and cancel agents that cannot change it
+        self.streaming_consensus = CONSENSUS_CONFIG["streaming_consensus"]
+        
         # Performance tracking
         self.processing_metrics = {
             "total_incidents": 0,
             "successful_incidents": 0,
             "failed_incidents": 0,
-            "average_processing_time": 0.0
+            "average_processing_time": 0.0,
+            "early_decisions": 0,
+            "time_saved_seconds": 0.0
         }
+        # Smoothed duration of successful runs per agent, for time-saved estimates
+        self._agent_durations: Dict[str, float] = {}
+    
+    @property
+    def processing_states(self) -> IncidentRegistry:
+        """Processing states keyed by incident id, indexed for listing."""
+        return self._incident_registry
+    
+    @processing_states.setter
+    def processing_states(self, states: Dict[str, IncidentProcessingState]) -> None:
+        self._incident_registry.clear()
+        self._incident_registry.update(states)
     
     async def register_agent(self, agent: BaseAgent) -> None:
         """Register an agent with the coordinator."""
@@ -302,13 +339,18 @@ class AgentSwarmCoordinator:
             # Phase 1: Detection (must complete first)
             await self._execute_detection_phase(processing_state)
             
-            # Phase 2 & 3: Diagnosis and Prediction (can run in parallel)
-            if processing_state.phase != ProcessingPhase.FAILED:
-                await self._execute_parallel_analysis_phases(processing_state)
-            
-            # Phase 4: Consensus (if we have recommendations)
-            if processing_state.phase != ProcessingPhase.FAILED:
-                await self._execute_consensus_phase(processing_state)
+            if self.streaming_consensus:
+                # Phase 2-4: Diagnosis and Prediction streamed into Consensus
+                if processing_state.phase != ProcessingPhase.FAILED:
+                    await self._execute_streaming_consensus(processing_state)
+            else:
+                # Phase 2 & 3: Diagnosis and Prediction (can run in parallel)
+                if processing_state.phase != ProcessingPhase.FAILED:
+                    await self._execute_parallel_analysis_phases(processing_state)
+                
+                # Phase 4: Consensus (if we have recommendations)
+                if processing_state.phase != ProcessingPhase.FAILED:
+                    await self._execute_consensus_phase(processing_state)
             
             # Phase 5 & 6: Resolution and Communication (can run in parallel if resolution doesn't require approval)
             if processing_state.phase != ProcessingPhase.FAILED and processing_state.consensus_decision:
@@ -756,53 +798,208 @@ class AgentSwarmCoordinator:
             consensus_decision = await self.consensus_engine.reach_consensus(
                 state.incident, all_recommendations
             )
+            self._apply_consensus_decision(state, consensus_decision)
 
-            state.consensus_decision = consensus_decision
-            operator_controls = get_operator_control_service()
-            operator_evaluation = operator_controls.evaluate_decision(
-                state.incident_id, consensus_decision
-            )
-            if operator_evaluation["requires_manual"]:
-                consensus_decision.requires_human_approval = True
-            state.phase = ProcessingPhase.COMPLETED
-            state.end_time = datetime.utcnow()
+        except Exception as e:
+            self._fail_consensus(state, e)
+    
+    async def _execute_streaming_consensus(self, state: IncidentProcessingState) -> None:
+        """
+        Run diagnosis and prediction agents, feeding each result into consensus as it lands.
+        
+        Once the agents still running can no longer change the selected
+        action or whether it needs approval, they are cancelled and the
+        decision is made without them.
+        """
+        logger.info(f"Starting streaming consensus for incident {state.incident_id}")
+        
+        # Detection recommendations are already in
+        tally = self.consensus_engine.open_tally()
+        for recommendation in state.get_all_recommendations():
+            tally.add(recommendation)
+        
+        votes_per_agent = CONSENSUS_CONFIG["max_recommendations_per_agent"]
+        outstanding: Counter = Counter()
+        tasks: Dict[asyncio.Task, BaseAgent] = {}
+        started_phases = []
+        
+        for phase in (ProcessingPhase.DIAGNOSIS, ProcessingPhase.PREDICTION):
+            phase_agents = [agent for agent in self.agents.values() if agent.agent_type.value == phase.value]
+            if not phase_agents:
+                logger.warning(f"No {phase.value} agents available for incident {state.incident_id}")
+                state.record_event(
+                    "phase_skipped",
+                    f"No {phase.value} agents available",
+                    phase=phase.value
+                )
+                continue
+            
+            started_phases.append(phase)
             state.record_event(
-                "operator_review",
-                "Operator controls evaluated consensus decision",
-                phase=ProcessingPhase.CONSENSUS.value,
-                metadata=operator_evaluation
+                "phase_started",
+                f"{phase.value.capitalize()} phase started",
+                phase=phase.value
             )
+            for agent in phase_agents:
+                task = asyncio.create_task(
+                    self._execute_agent_with_circuit_breaker(agent, state.incident, state, phase=phase)
+                )
+                tasks[task] = agent
+                outstanding[agent.agent_type.value] += votes_per_agent
+        
+        state.phase = ProcessingPhase.CONSENSUS
+        state.record_event(
+            "phase_started",
+            "Consensus phase started",
+            phase=ProcessingPhase.CONSENSUS.value
+        )
+        start_time = time.time()
+        
+        pending = set(tasks)
+        try:
+            while pending and not tally.is_settled(outstanding, self.consensus_engine.confidence_threshold):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    agent = tasks[task]
+                    outstanding[agent.agent_type.value] -= votes_per_agent
+                    execution = state.agent_executions.get(agent.name)
+                    if execution and execution.status == "completed":
+                        for recommendation in execution.recommendations:
+                            tally.add(recommendation)
+        except BaseException:
+            # Not a settled consensus: stop the agents without counting an early decision
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+        
+        cancelled = await self._cancel_stragglers(state, [tasks[task] for task in pending], pending)
+        
+        completed_agents = state.get_completed_agents()
+        for phase in started_phases:
             state.record_event(
-                "consensus_reached",
-                f"Consensus selected action {consensus_decision.selected_action}",
-                phase=ProcessingPhase.CONSENSUS.value,
-                metadata={
-                    "selected_action": consensus_decision.selected_action,
-                    "confidence": consensus_decision.final_confidence,
-                    "requires_human_approval": consensus_decision.requires_human_approval,
-                    "participating_agents": consensus_decision.participating_agents
-                }
+                "phase_completed",
+                f"{phase.value.capitalize()} phase completed",
+                phase=phase.value,
+                metadata={"completed_agents": [a for a in completed_agents if phase.value in a.lower()]}
             )
+        
+        if not tally.recommendations:
+            state.phase = ProcessingPhase.FAILED
+            state.error = "No recommendations available for consensus"
             state.record_event(
-                "phase_completed",
-                "Consensus phase completed",
+                "phase_failed",
+                "No recommendations available for consensus",
                 phase=ProcessingPhase.CONSENSUS.value
             )
-
-            logger.info(f"Consensus reached for incident {state.incident_id}: "
-                       f"action={consensus_decision.selected_action}, "
-                       f"confidence={consensus_decision.final_confidence:.2f}")
-
+            return
+        
+        try:
+            consensus_decision = await self.consensus_engine.decide(
+                state.incident, tally, start_time, outstanding=cancelled
+            )
+            self._apply_consensus_decision(state, consensus_decision)
         except Exception as e:
-            state.phase = ProcessingPhase.FAILED
-            state.error = f"Consensus failed: {str(e)}"
+            self._fail_consensus(state, e)
+    
+    async def _cancel_stragglers(self, state: IncidentProcessingState, agents: List[BaseAgent],
+                                 tasks: Set[asyncio.Task]) -> List[str]:
+        """Cancel agents whose results are no longer needed and record the time saved."""
+        if not tasks:
+            return []
+        
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        now = datetime.utcnow()
+        time_saved = 0.0
+        cancelled = []
+        for agent in agents:
+            execution = state.agent_executions.get(agent.name)
+            elapsed = 0.0
+            if execution:
+                execution.status = "cancelled"
+                execution.end_time = now
+                elapsed = execution.duration_seconds
+            
+            # Parallel agents overlap, so the phase ends as soon as the slowest would have
+            expected = self._agent_durations.get(
+                agent.name, PERFORMANCE_TARGETS.get(agent.agent_type.value, {}).get("target", 0.0)
+            )
+            time_saved = max(time_saved, expected - elapsed)
+            cancelled.append(agent.name)
             state.record_event(
-                "consensus_failed",
-                f"Consensus failed: {str(e)}",
-                phase=ProcessingPhase.CONSENSUS.value,
-                metadata={"error": str(e)}
+                "agent_cancelled",
+                f"Agent {agent.name} cancelled, its result could not change consensus",
+                phase=agent.agent_type.value,
+                agent=agent.name,
+                metadata={"elapsed_seconds": elapsed}
             )
-            logger.error(f"Consensus failed for incident {state.incident_id}: {e}")
+        
+        state.time_saved_seconds = time_saved
+        self.processing_metrics["early_decisions"] += 1
+        self.processing_metrics["time_saved_seconds"] += time_saved
+        state.record_event(
+            "consensus_short_circuit",
+            f"Consensus settled without {len(cancelled)} agent(s)",
+            phase=ProcessingPhase.CONSENSUS.value,
+            metadata={"cancelled_agents": cancelled, "time_saved_seconds": time_saved}
+        )
+        logger.info(f"Consensus for incident {state.incident_id} settled early, "
+                   f"cancelled {cancelled}, estimated {time_saved:.1f}s saved")
+        return cancelled
+    
+    def _apply_consensus_decision(self, state: IncidentProcessingState,
+                                  consensus_decision: ConsensusDecision) -> None:
+        """Apply operator controls to a consensus decision and complete the phase."""
+        state.consensus_decision = consensus_decision
+        operator_controls = get_operator_control_service()
+        operator_evaluation = operator_controls.evaluate_decision(
+            state.incident_id, consensus_decision
+        )
+        if operator_evaluation["requires_manual"]:
+            consensus_decision.requires_human_approval = True
+        state.phase = ProcessingPhase.COMPLETED
+        state.end_time = datetime.utcnow()
+        state.record_event(
+            "operator_review",
+            "Operator controls evaluated consensus decision",
+            phase=ProcessingPhase.CONSENSUS.value,
+            metadata=operator_evaluation
+        )
+        state.record_event(
+            "consensus_reached",
+            f"Consensus selected action {consensus_decision.selected_action}",
+            phase=ProcessingPhase.CONSENSUS.value,
+            metadata={
+                "selected_action": consensus_decision.selected_action,
+                "confidence": consensus_decision.final_confidence,
+                "requires_human_approval": consensus_decision.requires_human_approval,
+                "participating_agents": consensus_decision.participating_agents
+            }
+        )
+        state.record_event(
+            "phase_completed",
+            "Consensus phase completed",
+            phase=ProcessingPhase.CONSENSUS.value
+        )
+
+        logger.info(f"Consensus reached for incident {state.incident_id}: "
+                   f"action={consensus_decision.selected_action}, "
+                   f"confidence={consensus_decision.final_confidence:.2f}")
+    
+    def _fail_consensus(self, state: IncidentProcessingState, e: Exception) -> None:
+        """Mark the consensus phase as failed."""
+        state.phase = ProcessingPhase.FAILED
+        state.error = f"Consensus failed: {str(e)}"
+        state.record_event(
+            "consensus_failed",
+            f"Consensus failed: {str(e)}",
+            phase=ProcessingPhase.CONSENSUS.value,
+            metadata={"error": str(e)}
+        )
+        logger.error(f"Consensus failed for incident {state.incident_id}: {e}")
     
     async def _execute_agent_with_circuit_breaker(self, agent: BaseAgent,
                                                  incident: Incident,
@@ -873,6 +1070,11 @@ class AgentSwarmCoordinator:
 
             # Record success in circuit breaker
             circuit_breaker.record_success()
+            previous = self._agent_durations.get(agent_name)
+            self._agent_durations[agent_name] = (
+                execution.duration_seconds if previous is None
+                else 0.8 * previous + 0.2 * execution.duration_seconds
+            )
 
             logger.info(f"Agent {agent_name} completed successfully: "
                        f"{len(execution.recommendations)} recommendations in "
@@ -967,6 +1169,7 @@ class AgentSwarmCoordinator:
                 "requires_human_approval": state.consensus_decision.requires_human_approval
             } if state.consensus_decision else None,
             "error": state.error,
+            "time_saved_seconds": state.time_saved_seconds,
             "timeline_summary": state.summarize_timeline()
         }
     
@@ -997,10 +1200,7 @@ class AgentSwarmCoordinator:
                 self.processing_metrics["successful_incidents"] / 
                 max(1, self.processing_metrics["total_incidents"])
             ),
-            "active_incidents": len([
-                state for state in self.processing_states.values()
-                if state.phase not in [ProcessingPhase.COMPLETED, ProcessingPhase.FAILED]
-            ]),
+            "active_incidents": self._incident_registry.count(status="active"),
             "registered_agents": len(self.agents),
             "consensus_stats": self.consensus_engine.get_consensus_statistics()
         }
@@ -1046,35 +1246,46 @@ class AgentSwarmCoordinator:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """List incidents with optional filtering and pagination."""
-        incidents = []
+        return self.list_incidents_page(status, severity, limit, offset)["incidents"]
+    
+    def list_incidents_page(
+        self,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        phase: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of incidents from the indexed registry.
         
-        # Convert processing states to incident list
-        for incident_id, state in self.processing_states.items():
-            incident_data = {
-                "incident_id": incident_id,
-                "type": getattr(state.incident, 'incident_type', 'unknown'),
-                "severity": getattr(state.incident, 'severity', 'medium'),
-                "status": self._get_incident_status_string(state),
-                "detected_at": state.start_time.isoformat() if state.start_time else datetime.now().isoformat(),
-                "duration": state.total_duration_seconds if state.total_duration_seconds else 0,
-                "description": getattr(state.incident, 'description', f'Incident {incident_id}'),
-                "phase": state.phase.value if state.phase else 'unknown',
-                "agents_involved": len(state.agent_executions),
-                "resolution_confidence": self._calculate_resolution_confidence(state)
-            }
-            incidents.append(incident_data)
+        Args:
+            status: Filter by status (active, resolved, failed)
+            severity: Filter by severity
+            limit: Maximum incidents to return
+            offset: Incidents to skip after the cursor
+            cursor: Cursor returned with the previous page
+            phase: Filter by processing phase
+            
+        Returns:
+            Incidents on the page and the cursor for the next page
+        """
+        registry = self._incident_registry
+        registry.evict_expired()
         
         # Add some sample incidents if none exist (for demo purposes)
-        if not incidents:
-            incidents = self._generate_sample_incidents()
-        
-        # Apply filters
-        filtered_incidents = self._apply_incident_filters(incidents, status, severity)
-        
-        # Apply pagination
-        paginated_incidents = filtered_incidents[offset:offset + limit]
+        if not registry:
+            incidents = self._apply_incident_filters(self._generate_sample_incidents(), status, severity)
+            return {"incidents": incidents[offset:offset + limit], "next_cursor": None}
         
-        return paginated_incidents
+        states, next_cursor = registry.query(
+            status=status, severity=severity, phase=phase, limit=limit, offset=offset, cursor=cursor
+        )
+        return {
+            "incidents": [self._summarize_incident(state) for state in states],
+            "next_cursor": next_cursor
+        }
     
     def get_incidents_count(
         self,
@@ -1082,32 +1293,33 @@ class AgentSwarmCoordinator:
         severity: Optional[str] = None
     ) -> int:
         """Get total count of incidents matching filters."""
-        incidents = []
-        
-        # Convert processing states to incident list
-        for incident_id, state in self.processing_states.items():
-            incident_data = {
-                "status": self._get_incident_status_string(state),
-                "severity": getattr(state.incident, 'severity', 'medium')
-            }
-            incidents.append(incident_data)
+        registry = self._incident_registry
+        registry.evict_expired()
         
         # Add sample incidents if none exist
-        if not incidents:
-            incidents = self._generate_sample_incidents()
+        if not registry:
+            return len(self._apply_incident_filters(self._generate_sample_incidents(), status, severity))
         
-        # Apply filters and return count
-        filtered_incidents = self._apply_incident_filters(incidents, status, severity)
-        return len(filtered_incidents)
+        return registry.count(status=status, severity=severity)
+    
+    def _summarize_incident(self, state: 'IncidentProcessingState') -> Dict[str, Any]:
+        """Build the list view of a processing state."""
+        return {
+            "incident_id": state.incident_id,
+            "type": getattr(state.incident, 'incident_type', 'unknown'),
+            "severity": getattr(state.incident, 'severity', 'medium'),
+            "status": self._get_incident_status_string(state),
+            "detected_at": state.start_time.isoformat() if state.start_time else datetime.now().isoformat(),
+            "duration": state.total_duration_seconds if state.total_duration_seconds else 0,
+            "description": getattr(state.incident, 'description', f'Incident {state.incident_id}'),
+            "phase": state.phase.value if state.phase else 'unknown',
+            "agents_involved": len(state.agent_executions),
+            "resolution_confidence": self._calculate_resolution_confidence(state)
+        }
     
     def _get_incident_status_string(self, state: 'IncidentProcessingState') -> str:
         """Convert processing state to status string."""
-        if state.phase == ProcessingPhase.COMPLETED:
-            return "resolved"
-        elif state.phase == ProcessingPhase.FAILED:
-            return "failed"
-        else:
-            return "active"
+        return incident_status(state)
     
     def _calculate_resolution_confidence(self, state: 'IncidentProcessingState') -> float:
         """Calculate resolution confidence based on agent consensus."""
@@ -6,7 +6,8 @@ Handles up to f = (n-1)/3 malicious agents where n is total agents.
 
 Features:
 - 3-phase PBFT protocol (pre-prepare, prepare, commit)
-- Cryptographic message signatures
+- Cryptographic message signatures (Ed25519, RSA-PSS or HMAC-SHA256)
+- Batched signature verification off the event loop
 - Quorum verification
 - Malicious agent detection and isolation
 - View change for leader failures
@@ -21,12 +22,10 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.exceptions import InvalidSignature
 
 from src.models.incident import Incident
 from src.models.agent import AgentRecommendation, ConsensusDecision, AgentType, ActionType, RiskLevel
+from src.services.consensus_crypto import ConsensusSigner
 from src.utils.logging import get_logger
 from src.utils.exceptions import ByzantineConsensusError, MaliciousAgentDetected
 
@@ -63,6 +62,18 @@ class PBFTMessage:
     payload: Dict[str, Any]
     signature: Optional[bytes] = None
     
+    def canonical_bytes(self) -> bytes:
+        """Bytes covered by the signature, encoded from the current field values."""
+        return json.dumps({
+            "type": self.message_type.value,
+            "view": self.view,
+            "sequence": self.sequence,
+            "digest": self.digest,
+            "node_id": self.node_id,
+            "timestamp": self.timestamp.isoformat(),
+            "payload": self.payload
+        }, sort_keys=True).encode()
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary for serialization."""
         return {
@@ -135,7 +146,8 @@ class ByzantineFaultTolerantConsensus:
     Supports up to f = (n-1)/3 Byzantine (malicious) agents.
     """
     
-    def __init__(self, node_id: str, total_nodes: int, websocket_manager: Optional[Any] = None):
+    def __init__(self, node_id: str, total_nodes: int, websocket_manager: Optional[Any] = None,
+                 signature_scheme: Optional[str] = None, shared_secret: Optional[bytes] = None):
         """
         Initialize PBFT consensus engine.
         
@@ -143,6 +155,8 @@ class ByzantineFaultTolerantConsensus:
             node_id: Unique identifier for this node
             total_nodes: Total number of nodes in the system
             websocket_manager: Optional WebSocket manager for network broadcasting
+            signature_scheme: "rsa_pss", "ed25519" or "hmac_sha256"; all nodes must agree
+            shared_secret: Trust-domain secret for the HMAC scheme
         """
         self.node_id = node_id
         self.total_nodes = total_nodes
@@ -159,8 +173,9 @@ class ByzantineFaultTolerantConsensus:
         self.current_view = 0
         self.sequence_number = 0
         self.primary_node = self._calculate_primary(self.current_view)
-        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        self.public_key = self.private_key.public_key()
+        self.signer = ConsensusSigner(node_id, signature_scheme, shared_secret)
+        self.private_key = self.signer.private_key
+        self.public_key = self.signer.public_key
         
         # Consensus tracking
         self.active_rounds: Dict[int, ConsensusRound] = {}
@@ -186,6 +201,7 @@ class ByzantineFaultTolerantConsensus:
             public_key=public_key,
             last_seen=datetime.utcnow()
         )
+        self.signer.forget_peer(node_id)
         logger.info(f"Registered node {node_id}")
     
     async def propose_action(self, incident: Incident, 
@@ -258,26 +274,7 @@ class ByzantineFaultTolerantConsensus:
                 await self._record_suspicious_behavior(message.node_id, "invalid_signature")
                 return None
             
-            # Check if node is isolated
-            if message.node_id in self.isolated_nodes:
-                logger.debug(f"Ignoring message from isolated node {message.node_id}")
-                return None
-            
-            # Update node last seen
-            if message.node_id in self.nodes:
-                self.nodes[message.node_id].last_seen = datetime.utcnow()
-            
-            # Process based on message type
-            if message.message_type == MessageType.PRE_PREPARE:
-                return await self._handle_pre_prepare(message)
-            elif message.message_type == MessageType.PREPARE:
-                return await self._handle_prepare(message)
-            elif message.message_type == MessageType.COMMIT:
-                return await self._handle_commit(message)
-            elif message.message_type == MessageType.VIEW_CHANGE:
-                return await self._handle_view_change(message)
-            else:
-                logger.warning(f"Unknown message type: {message.message_type}")
+            return await self._dispatch_message(message)
                 
         except Exception as e:
             logger.error(f"Error handling message from {message.node_id}: {e}")
@@ -285,6 +282,62 @@ class ByzantineFaultTolerantConsensus:
             
         return None
     
+    async def handle_messages(self, messages: List[PBFTMessage]) -> List[Optional[ConsensusDecision]]:
+        """
+        Handle a batch of incoming PBFT messages.
+        
+        Signatures are verified together on the verification thread pool,
+        then messages are processed in order.
+        
+        Args:
+            messages: PBFT messages to process
+            
+        Returns:
+            Consensus decision (or None) for each message
+        """
+        valid = await self.verify_messages(messages)
+        results: List[Optional[ConsensusDecision]] = []
+        
+        for message, is_valid in zip(messages, valid):
+            try:
+                if not is_valid:
+                    logger.warning(f"Invalid signature from {message.node_id}")
+                    await self._record_suspicious_behavior(message.node_id, "invalid_signature")
+                    results.append(None)
+                    continue
+                results.append(await self._dispatch_message(message))
+            except Exception as e:
+                logger.error(f"Error handling message from {message.node_id}: {e}")
+                await self._record_suspicious_behavior(message.node_id, "message_processing_error")
+                results.append(None)
+        
+        return results
+    
+    async def _dispatch_message(self, message: PBFTMessage) -> Optional[ConsensusDecision]:
+        """Route a verified message to its phase handler."""
+        # Check if node is isolated
+        if message.node_id in self.isolated_nodes:
+            logger.debug(f"Ignoring message from isolated node {message.node_id}")
+            return None
+        
+        # Update node last seen
+        if message.node_id in self.nodes:
+            self.nodes[message.node_id].last_seen = datetime.utcnow()
+        
+        # Process based on message type
+        if message.message_type == MessageType.PRE_PREPARE:
+            return await self._handle_pre_prepare(message)
+        elif message.message_type == MessageType.PREPARE:
+            return await self._handle_prepare(message)
+        elif message.message_type == MessageType.COMMIT:
+            return await self._handle_commit(message)
+        elif message.message_type == MessageType.VIEW_CHANGE:
+            return await self._handle_view_change(message)
+        else:
+            logger.warning(f"Unknown message type: {message.message_type}")
+        
+        return None
+    
     async def _handle_pre_prepare(self, message: PBFTMessage) -> Optional[ConsensusDecision]:
         """Handle pre-prepare message (Phase 1)."""
         # Only accept pre-prepare from primary
@@ -537,61 +590,27 @@ class ByzantineFaultTolerantConsensus:
     
     def _sign_message(self, message: PBFTMessage) -> bytes:
         """Sign a PBFT message."""
-        message_data = json.dumps({
-            "type": message.message_type.value,
-            "view": message.view,
-            "sequence": message.sequence,
-            "digest": message.digest,
-            "node_id": message.node_id,
-            "timestamp": message.timestamp.isoformat(),
-            "payload": message.payload
-        }, sort_keys=True).encode()
-        
-        signature = self.private_key.sign(
-            message_data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        
-        return signature
+        return self.signer.sign(message.canonical_bytes())
     
     def _verify_signature(self, message: PBFTMessage) -> bool:
         """Verify message signature."""
         if not message.signature or message.node_id not in self.nodes:
             return False
         
-        try:
-            node_info = self.nodes[message.node_id]
-            public_key = serialization.load_der_public_key(node_info.public_key)
-            
-            message_data = json.dumps({
-                "type": message.message_type.value,
-                "view": message.view,
-                "sequence": message.sequence,
-                "digest": message.digest,
-                "node_id": message.node_id,
-                "timestamp": message.timestamp.isoformat(),
-                "payload": message.payload
-            }, sort_keys=True).encode()
-            
-            public_key.verify(
-                message.signature,
-                message_data,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            
-            return True
-            
-        except (InvalidSignature, Exception) as e:
-            logger.debug(f"Signature verification failed for {message.node_id}: {e}")
-            return False
+        return self.signer.verify(
+            message.node_id, self.nodes[message.node_id].public_key,
+            message.canonical_bytes(), message.signature
+        )
+    
+    async def verify_messages(self, messages: List[PBFTMessage]) -> List[bool]:
+        """Verify the signatures of a batch of messages off the event loop."""
+        valid = [bool(message.signature) and message.node_id in self.nodes for message in messages]
+        batch = [
+            (message.node_id, self.nodes[message.node_id].public_key, message.canonical_bytes(), message.signature)
+            for message, ok in zip(messages, valid) if ok
+        ]
+        results = iter(await self.signer.verify_batch(batch))
+        return [ok and next(results) for ok in valid]
     
     async def _record_suspicious_behavior(self, node_id: str, behavior_type: str):
         """Record suspicious behavior for Byzantine detection."""
@@ -4,9 +4,11 @@ Basic consensus engine implementation for agent coordination.
 
 import asyncio
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import AsyncIterator, Callable, Deque, Iterable, List, Dict, Any, Optional, Set, Tuple
+from collections import Counter, defaultdict, deque
+from itertools import combinations
 
 from src.interfaces.consensus import WeightedConsensusEngine, ConsensusEngine
 from src.models.incident import Incident
@@ -19,6 +21,186 @@ from src.utils.exceptions import ConsensusTimeoutError, InsufficientConfidenceEr
 logger = get_logger("consensus")
 
 
+def _agent_name(recommendation: AgentRecommendation) -> str:
+    return recommendation.agent_name.value if hasattr(recommendation.agent_name, 'value') else str(recommendation.agent_name)
+
+
+@dataclass(slots=True)
+class ConsensusRecord:
+    """Compact history entry for a consensus decision."""
+    incident_id: str
+    selected_action: str
+    final_confidence: float
+    requires_human_approval: bool
+    conflicts_detected: bool
+    processing_duration_ms: int
+    decision_time: datetime
+
+
+class WeightedTally:
+    """
+    Running weighted confidence per action, updated one recommendation at a time.
+
+    A recommendation flagged as suspicious withdraws every recommendation
+    from the same agent, matching the batch Byzantine filter.
+    """
+
+    __slots__ = (
+        "_agent_weights", "_is_suspicious", "recommendations", "_agents",
+        "suspicious_agents", "_scores", "_counts", "_first_seen",
+    )
+
+    def __init__(self, agent_weights: Dict[str, float],
+                 is_suspicious: Callable[[str, AgentRecommendation], bool]):
+        self._agent_weights = agent_weights
+        self._is_suspicious = is_suspicious
+        self.recommendations: List[AgentRecommendation] = []
+        self._agents: List[str] = []
+        self.suspicious_agents: Set[str] = set()
+        self._scores: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._first_seen: Dict[str, int] = {}
+
+    def add(self, recommendation: AgentRecommendation) -> str:
+        """Score one recommendation and return its agent name."""
+        agent_name = _agent_name(recommendation)
+        index = len(self.recommendations)
+        self.recommendations.append(recommendation)
+        self._agents.append(agent_name)
+
+        if agent_name in self.suspicious_agents:
+            return agent_name
+        if self._is_suspicious(agent_name, recommendation):
+            self.suspicious_agents.add(agent_name)
+            self._withdraw(agent_name)
+            return agent_name
+
+        action_id = recommendation.action_id
+        weighted_confidence = recommendation.confidence * self._agent_weights.get(agent_name, 0.1)
+        self._scores[action_id] = self._scores.get(action_id, 0.0) + weighted_confidence
+        self._counts[action_id] = self._counts.get(action_id, 0) + 1
+        self._first_seen.setdefault(action_id, index)
+        return agent_name
+
+    def leader(self) -> Optional[Tuple[AgentRecommendation, float]]:
+        """First recommendation for the highest scoring action, earliest action winning ties."""
+        best_action = None
+        best_score = 0.0
+        for action_id, total in self._scores.items():
+            score = total / self._counts[action_id]
+            if (best_action is None or score > best_score or
+                    (score == best_score and self._first_seen[action_id] < self._first_seen[best_action])):
+                best_action, best_score = action_id, score
+        if best_action is None:
+            return None
+        return self.recommendations[self._first_seen[best_action]], best_score
+
+    def confidences(self) -> Dict[str, float]:
+        """Normalized confidence per action, in order of first appearance."""
+        return {
+            action_id: self._scores[action_id] / self._counts[action_id]
+            for action_id in sorted(self._scores, key=self._first_seen.__getitem__)
+        }
+
+    def accepted(self) -> List[AgentRecommendation]:
+        """Recommendations from agents not flagged as suspicious."""
+        if not self.suspicious_agents:
+            return self.recommendations
+        return [r for r, agent in zip(self.recommendations, self._agents) if agent not in self.suspicious_agents]
+
+    def is_settled(self, outstanding: Dict[str, int], threshold: float) -> bool:
+        """
+        Check whether recommendations still to come can change the outcome.
+        
+        Args:
+            outstanding: Agent name to the number of recommendations it may
+                still send
+            threshold: Confidence needed to act without human approval
+        
+        Each outstanding recommendation may back any action with any
+        confidence, and an outstanding agent that has already voted may yet
+        be flagged as suspicious, withdrawing its earlier votes. The outcome
+        is settled when, for every such withdrawal, the leader's worst case
+        beats every rival's best case and stays on one side of the threshold.
+        """
+        ranked = sorted(
+            (self._agent_weights.get(agent, 0.1) for agent, votes in outstanding.items() for _ in range(votes)),
+            reverse=True
+        )
+        if not ranked:
+            return True
+
+        leader = self.leader()
+        if leader is None:
+            return False
+        leader_action = leader[0].action_id
+
+        voted = set(self._agents) - self.suspicious_agents
+        unstable = [agent for agent, votes in outstanding.items() if votes > 0 and agent in voted]
+        for size in range(len(unstable) + 1):
+            for withdrawn in combinations(unstable, size):
+                scores, counts = (self._scores, self._counts) if not withdrawn else self._rescore(set(withdrawn))
+                if not self._leader_holds(scores, counts, leader_action, ranked, threshold):
+                    return False
+        return True
+
+    @staticmethod
+    def _leader_holds(scores: Dict[str, float], counts: Dict[str, int], leader_action: str,
+                      ranked: List[float], threshold: float) -> bool:
+        if leader_action not in scores:
+            return False
+
+        # Every outstanding vote dilutes the leader at zero confidence
+        floor = scores[leader_action] / (counts[leader_action] + len(ranked))
+
+        # An action nobody has backed yet peaks at the heaviest outstanding vote
+        if floor <= ranked[0]:
+            return False
+        for action_id in scores:
+            if action_id != leader_action and floor <= WeightedTally._ceiling(scores[action_id], counts[action_id], ranked):
+                return False
+
+        return floor >= threshold or WeightedTally._ceiling(scores[leader_action], counts[leader_action], ranked) < threshold
+
+    @staticmethod
+    def _ceiling(total: float, count: int, ranked_weights: List[float]) -> float:
+        """Highest average reachable by adding full-confidence votes, heaviest first."""
+        for weight in ranked_weights:
+            if (total + weight) / (count + 1) <= total / count:
+                break
+            total += weight
+            count += 1
+        return total / count
+
+    def _rescore(self, excluded: Set[str]) -> Tuple[Dict[str, float], Dict[str, int]]:
+        scores: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for recommendation, agent in zip(self.recommendations, self._agents):
+            if agent in excluded or agent in self.suspicious_agents:
+                continue
+            action_id = recommendation.action_id
+            scores[action_id] = scores.get(action_id, 0.0) + recommendation.confidence * self._agent_weights.get(agent, 0.1)
+            counts[action_id] = counts.get(action_id, 0) + 1
+        return scores, counts
+
+    def _withdraw(self, agent_name: str) -> None:
+        """Re-score the actions an agent backed without its recommendations."""
+        affected = {r.action_id for r, agent in zip(self.recommendations, self._agents) if agent == agent_name}
+        for action_id in affected:
+            self._scores.pop(action_id, None)
+            self._counts.pop(action_id, None)
+            self._first_seen.pop(action_id, None)
+
+        for index, (recommendation, agent) in enumerate(zip(self.recommendations, self._agents)):
+            action_id = recommendation.action_id
+            if action_id not in affected or agent in self.suspicious_agents:
+                continue
+            weighted_confidence = recommendation.confidence * self._agent_weights.get(agent, 0.1)
+            self._scores[action_id] = self._scores.get(action_id, 0.0) + weighted_confidence
+            self._counts[action_id] = self._counts.get(action_id, 0) + 1
+            self._first_seen.setdefault(action_id, index)
+
+
 class BasicWeightedConsensusEngine(WeightedConsensusEngine):
     """Basic weighted consensus engine for Milestone 1."""
     
@@ -28,8 +210,10 @@ class BasicWeightedConsensusEngine(WeightedConsensusEngine):
         self.confidence_threshold = CONSENSUS_CONFIG["autonomous_confidence_threshold"]
         self.decision_timeout = CONSENSUS_CONFIG["decision_timeout"]
         
-        # Track consensus history for learning
-        self.consensus_history: List[ConsensusDecision] = []
+        # Track consensus history for learning (bounded ring of compact records)
+        self.consensus_history: Deque[ConsensusRecord] = deque(maxlen=CONSENSUS_CONFIG["history_size"])
+        self.latest_decision: Optional[ConsensusDecision] = None
+        self._total_decisions = 0
         
     async def reach_consensus(self, incident: Incident, 
                             recommendations: List[AgentRecommendation]) -> ConsensusDecision:
@@ -52,71 +236,139 @@ class BasicWeightedConsensusEngine(WeightedConsensusEngine):
             if not recommendations:
                 return await self._create_no_action_decision(incident, "No recommendations provided")
             
-            # Check for Byzantine faults
-            suspicious_agents = await self.detect_byzantine_faults(recommendations)
-            if suspicious_agents:
-                logger.warning(f"Detected suspicious agents: {suspicious_agents}")
-                # Filter out suspicious recommendations
-                recommendations = [r for r in recommendations 
-                                 if (r.agent_name.value if hasattr(r.agent_name, 'value') else str(r.agent_name)) not in suspicious_agents]
-            
-            # Calculate weighted confidence for each unique action
-            action_confidences = await self.calculate_weighted_confidence(recommendations)
-            
-            if not action_confidences:
-                return await self._create_no_action_decision(incident, "No valid recommendations after filtering")
+            # Byzantine filtering and weighted scoring in one pass
+            tally = self.open_tally()
+            for recommendation in recommendations:
+                tally.add(recommendation)
             
-            # Find the action with highest confidence
-            best_action_id = max(action_confidences.keys(), key=lambda k: action_confidences[k])
-            best_confidence = action_confidences[best_action_id]
+            return await self.decide(incident, tally, start_time)
             
-            # Get the recommendation for the best action
-            selected_recommendation = next(
-                (r for r in recommendations if r.action_id == best_action_id), 
-                None
-            )
-            
-            if not selected_recommendation:
-                return await self._create_no_action_decision(incident, "Could not find selected recommendation")
-            
-            # Check if confidence meets threshold
-            requires_escalation = best_confidence < self.confidence_threshold
-            
-            # Detect conflicts
-            conflicts_detected = len(action_confidences) > 1 and len(recommendations) > 1
-            
-            # Create consensus decision
-            decision = ConsensusDecision(
-                incident_id=incident.id,
-                selected_action=selected_recommendation.action_id,
-                action_type=selected_recommendation.action_type.value if hasattr(selected_recommendation.action_type, 'value') else str(selected_recommendation.action_type),
-                final_confidence=best_confidence,
-                participating_agents=[r.agent_name.value if hasattr(r.agent_name, 'value') else str(r.agent_name) for r in recommendations],
-                agent_recommendations=recommendations,
-                consensus_method="weighted_voting",
-                conflicts_detected=conflicts_detected,
-                requires_human_approval=requires_escalation,
-                approval_threshold=self.confidence_threshold,
-                processing_duration_ms=int((time.time() - start_time) * 1000),
-                decision_rationale=self._generate_decision_rationale(
-                    selected_recommendation, best_confidence, action_confidences
-                )
-            )
+        except Exception as e:
+            logger.error(f"Consensus failed for incident {incident.id}: {e}")
+            return await self._create_error_decision(incident, str(e))
+    
+    async def stream_consensus(self, incident: Incident,
+                               recommendations: AsyncIterator[AgentRecommendation],
+                               expected_agents: Iterable[str]) -> ConsensusDecision:
+        """
+        Reach consensus while recommendations arrive, deciding as early as possible.
+        
+        Each entry in expected_agents stands for one recommendation still to
+        come from that agent. Consumption stops as soon as the outstanding
+        recommendations can no longer change the selected action or whether
+        it needs human approval.
+        
+        Args:
+            incident: The incident requiring action
+            recommendations: Recommendations in arrival order
+            expected_agents: Agents whose recommendations are awaited
             
-            # Store in history
-            self.consensus_history.append(decision)
+        Returns:
+            Consensus decision
+        """
+        start_time = time.time()
+        outstanding = Counter(expected_agents)
+        
+        try:
+            tally = self.open_tally()
+            async for recommendation in recommendations:
+                agent_name = tally.add(recommendation)
+                if outstanding[agent_name] > 0:
+                    outstanding[agent_name] -= 1
+                if tally.is_settled(outstanding, self.confidence_threshold):
+                    break
             
-            # Log decision
-            logger.info(f"Consensus reached for incident {incident.id}: "
-                       f"action={decision.selected_action}, confidence={decision.final_confidence:.2f}, "
-                       f"escalation_required={decision.requires_human_approval}")
+            if not tally.recommendations:
+                return await self._create_no_action_decision(incident, "No recommendations provided")
             
-            return decision
+            pending = sorted(+outstanding)
+            if pending:
+                logger.info(f"Consensus for incident {incident.id} settled without {', '.join(pending)}")
+            return await self.decide(incident, tally, start_time, outstanding=pending)
             
         except Exception as e:
             logger.error(f"Consensus failed for incident {incident.id}: {e}")
             return await self._create_error_decision(incident, str(e))
     
+    def open_tally(self) -> WeightedTally:
+        """Create an empty running tally using this engine's weights and fault checks."""
+        return WeightedTally(self.agent_weights, self._is_suspicious)
+    
+    async def decide(self, incident: Incident, tally: WeightedTally, start_time: Optional[float] = None,
+                     outstanding: Optional[List[str]] = None) -> ConsensusDecision:
+        """
+        Turn a tally into a consensus decision and record it.
+        
+        Args:
+            incident: The incident requiring action
+            tally: Recommendations scored so far
+            start_time: When consensus started, for the processing duration
+            outstanding: Agents the decision was reached without
+        """
+        start_time = start_time or time.time()
+        if tally.suspicious_agents:
+            logger.warning(f"Detected suspicious agents: {list(tally.suspicious_agents)}")
+        
+        leader = tally.leader()
+        if leader is None:
+            return await self._create_no_action_decision(incident, "No valid recommendations after filtering")
+        selected_recommendation, best_confidence = leader
+        
+        accepted = tally.accepted()
+        action_confidences = tally.confidences()
+        
+        # Check if confidence meets threshold
+        requires_escalation = best_confidence < self.confidence_threshold
+        
+        # Detect conflicts
+        conflicts_detected = len(action_confidences) > 1 and len(accepted) > 1
+        
+        rationale = self._generate_decision_rationale(
+            selected_recommendation, best_confidence, action_confidences
+        )
+        if outstanding:
+            rationale += f". Decided before {', '.join(sorted(outstanding))} responded; their votes could not change the outcome"
+        
+        # Create consensus decision
+        decision = ConsensusDecision(
+            incident_id=incident.id,
+            selected_action=selected_recommendation.action_id,
+            action_type=selected_recommendation.action_type.value if hasattr(selected_recommendation.action_type, 'value') else str(selected_recommendation.action_type),
+            final_confidence=best_confidence,
+            participating_agents=[_agent_name(r) for r in accepted],
+            agent_recommendations=accepted,
+            consensus_method="weighted_voting",
+            conflicts_detected=conflicts_detected,
+            requires_human_approval=requires_escalation,
+            approval_threshold=self.confidence_threshold,
+            processing_duration_ms=int((time.time() - start_time) * 1000),
+            decision_rationale=rationale
+        )
+        
+        # Store in history
+        self._record_decision(decision)
+        
+        # Log decision
+        logger.info(f"Consensus reached for incident {incident.id}: "
+                   f"action={decision.selected_action}, confidence={decision.final_confidence:.2f}, "
+                   f"escalation_required={decision.requires_human_approval}")
+        
+        return decision
+    
+    def _record_decision(self, decision: ConsensusDecision) -> None:
+        """Keep the full latest decision and a compact record in the history ring."""
+        self.latest_decision = decision
+        self._total_decisions += 1
+        self.consensus_history.append(ConsensusRecord(
+            incident_id=decision.incident_id,
+            selected_action=decision.selected_action,
+            final_confidence=decision.final_confidence,
+            requires_human_approval=decision.requires_human_approval,
+            conflicts_detected=decision.conflicts_detected,
+            processing_duration_ms=decision.processing_duration_ms or 0,
+            decision_time=decision.decision_time
+        ))
+    
     async def calculate_weighted_confidence(self, recommendations: List[AgentRecommendation]) -> Dict[str, float]:
         """
         Calculate weighted confidence scores for each unique action.
@@ -191,32 +443,36 @@ class BasicWeightedConsensusEngine(WeightedConsensusEngine):
         suspicious_agents = []
         
         for recommendation in recommendations:
-            agent_name = recommendation.agent_name.value if hasattr(recommendation.agent_name, 'value') else str(recommendation.agent_name)
-            
-            # Check for impossible confidence scores
-            if recommendation.confidence < 0.0 or recommendation.confidence > 1.0:
-                logger.warning(f"Agent {agent_name} provided invalid confidence: {recommendation.confidence}")
-                suspicious_agents.append(agent_name)
-                continue
-            
-            # Check for extremely high confidence without evidence
-            if recommendation.confidence > 0.95 and len(recommendation.evidence) == 0:
-                logger.warning(f"Agent {agent_name} provided very high confidence without evidence")
+            agent_name = _agent_name(recommendation)
+            if self._is_suspicious(agent_name, recommendation):
                 suspicious_agents.append(agent_name)
-                continue
-            
-            # Check for contradictory evidence
-            if recommendation.evidence:
-                evidence_confidences = [e.confidence for e in recommendation.evidence]
-                avg_evidence_confidence = sum(evidence_confidences) / len(evidence_confidences)
-                
-                # If recommendation confidence is much higher than evidence supports
-                if recommendation.confidence > avg_evidence_confidence + 0.3:
-                    logger.warning(f"Agent {agent_name} confidence inconsistent with evidence")
-                    suspicious_agents.append(agent_name)
         
         return list(set(suspicious_agents))  # Remove duplicates
     
+    def _is_suspicious(self, agent_name: str, recommendation: AgentRecommendation) -> bool:
+        """Check a single recommendation for signs of a compromised agent."""
+        # Check for impossible confidence scores
+        if recommendation.confidence < 0.0 or recommendation.confidence > 1.0:
+            logger.warning(f"Agent {agent_name} provided invalid confidence: {recommendation.confidence}")
+            return True
+        
+        # Check for extremely high confidence without evidence
+        if recommendation.confidence > 0.95 and len(recommendation.evidence) == 0:
+            logger.warning(f"Agent {agent_name} provided very high confidence without evidence")
+            return True
+        
+        # Check for contradictory evidence
+        if recommendation.evidence:
+            evidence_confidences = [e.confidence for e in recommendation.evidence]
+            avg_evidence_confidence = sum(evidence_confidences) / len(evidence_confidences)
+            
+            # If recommendation confidence is much higher than evidence supports
+            if recommendation.confidence > avg_evidence_confidence + 0.3:
+                logger.warning(f"Agent {agent_name} confidence inconsistent with evidence")
+                return True
+        
+        return False
+    
     async def validate_agent_integrity(self, agent_name: str, 
                                      recommendation: AgentRecommendation) -> bool:
         """
@@ -354,7 +610,7 @@ class BasicWeightedConsensusEngine(WeightedConsensusEngine):
         )
     
     def get_consensus_statistics(self) -> Dict[str, Any]:
-        """Get consensus engine statistics."""
+        """Get consensus engine statistics over the retained history."""
         if not self.consensus_history:
             return {
                 "total_decisions": 0,
@@ -363,17 +619,24 @@ class BasicWeightedConsensusEngine(WeightedConsensusEngine):
                 "conflict_rate": 0.0
             }
         
-        total_decisions = len(self.consensus_history)
-        escalations = sum(1 for d in self.consensus_history if d.requires_human_approval)
-        conflicts = sum(1 for d in self.consensus_history if d.conflicts_detected)
-        avg_confidence = sum(d.final_confidence for d in self.consensus_history) / total_decisions
+        window = len(self.consensus_history)
+        escalations = 0
+        conflicts = 0
+        confidence_sum = 0.0
+        duration_sum = 0
+        for record in self.consensus_history:
+            escalations += record.requires_human_approval
+            conflicts += record.conflicts_detected
+            confidence_sum += record.final_confidence
+            duration_sum += record.processing_duration_ms
         
         return {
-            "total_decisions": total_decisions,
-            "average_confidence": avg_confidence,
-            "escalation_rate": escalations / total_decisions,
-            "conflict_rate": conflicts / total_decisions,
-            "average_processing_time_ms": sum(d.processing_duration_ms or 0 for d in self.consensus_history) / total_decisions
+            "total_decisions": self._total_decisions,
+            "history_window": window,
+            "average_confidence": confidence_sum / window,
+            "escalation_rate": escalations / window,
+            "conflict_rate": conflicts / window,
+            "average_processing_time_ms": duration_sum / window
         }
 
 
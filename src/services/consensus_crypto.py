@@ -0,0 +1,193 @@
+"""
+Message signing for the PBFT consensus engine.
+
+Supports RSA-PSS, Ed25519 and HMAC-SHA256 (for nodes inside one trust
+domain that share a secret). Peer public keys are parsed once and cached per
+node, and batches of signatures are verified on a thread pool so a PBFT
+round's O(N²) verifications stay off the event loop.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+
+from src.utils.constants import CONSENSUS_CRYPTO_CONFIG
+from src.utils.exceptions import ByzantineConsensusError
+from src.utils.logging import get_logger
+
+
+logger = get_logger("consensus_crypto")
+
+_PSS_PADDING = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+
+
+class SignatureScheme(Enum):
+    """Signature schemes available to consensus nodes."""
+    RSA_PSS = "rsa_pss"
+    ED25519 = "ed25519"
+    HMAC_SHA256 = "hmac_sha256"
+
+
+class ConsensusSigner:
+    """
+    Signs this node's messages and verifies peers' signatures.
+
+    With HMAC-SHA256 every node derives its key from the shared secret and
+    its node id, so any holder of the secret can sign as any node; use it
+    only when all nodes run inside one trust boundary.
+    """
+
+    def __init__(self, node_id: str, scheme: Optional[str] = None,
+                 shared_secret: Optional[bytes] = None, verify_workers: Optional[int] = None):
+        """
+        Initialize signer.
+
+        Args:
+            node_id: Identifier of the node this signer belongs to
+            scheme: Signature scheme name, defaults to CONSENSUS_CRYPTO_CONFIG
+            shared_secret: Trust-domain secret for HMAC-SHA256, defaults to
+                the CONSENSUS_HMAC_SECRET environment variable
+            verify_workers: Threads used for batch verification
+        """
+        self.node_id = node_id
+        self.scheme = SignatureScheme(scheme or CONSENSUS_CRYPTO_CONFIG["signature_scheme"])
+        self._verify_workers = verify_workers or CONSENSUS_CRYPTO_CONFIG["verify_workers"]
+        self._parallel_threshold = CONSENSUS_CRYPTO_CONFIG["parallel_verify_threshold"]
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # node_id -> (registered key bytes, loaded key or None when unparseable)
+        self._peer_keys: Dict[str, Tuple[bytes, Optional[object]]] = {}
+        self._hmac_keys: Dict[str, bytes] = {}
+
+        self.private_key = None
+        self.public_key = None
+        self._shared_secret: Optional[bytes] = None
+
+        if self.scheme == SignatureScheme.RSA_PSS:
+            self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            self.public_key = self.private_key.public_key()
+        elif self.scheme == SignatureScheme.ED25519:
+            self.private_key = ed25519.Ed25519PrivateKey.generate()
+            self.public_key = self.private_key.public_key()
+        else:
+            secret = shared_secret or os.getenv("CONSENSUS_HMAC_SECRET", "").encode()
+            if not secret:
+                raise ByzantineConsensusError("HMAC signature scheme requires a shared secret")
+            self._shared_secret = secret
+
+    def public_key_bytes(self) -> bytes:
+        """DER-encoded public key to register with peers (empty for HMAC)."""
+        if self.public_key is None:
+            return b""
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+
+    def sign(self, data: bytes) -> bytes:
+        """Sign canonical message bytes as this node."""
+        if self.scheme == SignatureScheme.RSA_PSS:
+            return self.private_key.sign(data, _PSS_PADDING, hashes.SHA256())
+        if self.scheme == SignatureScheme.ED25519:
+            return self.private_key.sign(data)
+        return hmac.new(self._hmac_key(self.node_id), data, hashlib.sha256).digest()
+
+    def verify(self, node_id: str, public_key: bytes, data: bytes, signature: bytes) -> bool:
+        """Verify a peer's signature over canonical message bytes."""
+        if self.scheme == SignatureScheme.HMAC_SHA256:
+            expected = hmac.new(self._hmac_key(node_id), data, hashlib.sha256).digest()
+            return hmac.compare_digest(expected, signature)
+
+        key = self._load_peer_key(node_id, public_key)
+        if key is None:
+            return False
+
+        try:
+            if self.scheme == SignatureScheme.RSA_PSS:
+                key.verify(signature, data, _PSS_PADDING, hashes.SHA256())
+            else:
+                key.verify(signature, data)
+            return True
+        except (InvalidSignature, TypeError, ValueError) as e:
+            logger.debug(f"Signature verification failed for {node_id}: {e}")
+            return False
+
+    async def verify_batch(self, items: Sequence[Tuple[str, bytes, bytes, bytes]]) -> List[bool]:
+        """
+        Verify many (node_id, public_key, data, signature) items.
+
+        Small batches are verified inline; larger ones are split across the
+        verification thread pool.
+        """
+        if len(items) < self._parallel_threshold:
+            return [self.verify(*item) for item in items]
+
+        # Parse keys on the loop thread so workers only read the cache
+        for node_id, public_key, _, _ in items:
+            if self.scheme != SignatureScheme.HMAC_SHA256:
+                self._load_peer_key(node_id, public_key)
+            else:
+                self._hmac_key(node_id)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunk_size = -(-len(items) // self._verify_workers)
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = await asyncio.gather(*[
+            loop.run_in_executor(executor, self._verify_chunk, chunk) for chunk in chunks
+        ])
+        return [valid for chunk_results in results for valid in chunk_results]
+
+    def forget_peer(self, node_id: str) -> None:
+        """Drop cached key material for a node."""
+        self._peer_keys.pop(node_id, None)
+        self._hmac_keys.pop(node_id, None)
+
+    def close(self) -> None:
+        """Shut down the verification thread pool."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _verify_chunk(self, chunk: Sequence[Tuple[str, bytes, bytes, bytes]]) -> List[bool]:
+        return [self.verify(*item) for item in chunk]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._verify_workers, thread_name_prefix=f"pbft-verify-{self.node_id}"
+            )
+        return self._executor
+
+    def _load_peer_key(self, node_id: str, public_key: bytes) -> Optional[object]:
+        """Parse a peer's DER public key once, re-parsing only when it is re-registered."""
+        cached = self._peer_keys.get(node_id)
+        if cached is not None and cached[0] == public_key:
+            return cached[1]
+
+        expected = rsa.RSAPublicKey if self.scheme == SignatureScheme.RSA_PSS else ed25519.Ed25519PublicKey
+        try:
+            key = serialization.load_der_public_key(public_key)
+            if not isinstance(key, expected):
+                raise TypeError(f"{type(key).__name__} does not match scheme {self.scheme.value}")
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Unusable public key registered for {node_id}: {e}")
+            key = None
+
+        self._peer_keys[node_id] = (public_key, key)
+        return key
+
+    def _hmac_key(self, node_id: str) -> bytes:
+        key = self._hmac_keys.get(node_id)
+        if key is None:
+            key = hmac.new(self._shared_secret, node_id.encode(), hashlib.sha256).digest()
+            self._hmac_keys[node_id] = key
+        return key
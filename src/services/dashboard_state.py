@@ -25,11 +25,7 @@ async def get_dashboard_state_summary() -> Dict[str, Any]:
 
     consensus_engine = get_consensus_engine()
     consensus_stats = consensus_engine.get_consensus_statistics() if consensus_engine else {}
-    latest_decision = (
-        consensus_engine.consensus_history[-1]
-        if consensus_engine and consensus_engine.consensus_history
-        else None
-    )
+    latest_decision = consensus_engine.latest_decision if consensus_engine else None
 
     finops_service, demo_manager = await asyncio.gather(
         get_finops_service(),
@@ -70,13 +66,13 @@ async def get_dashboard_state_summary() -> Dict[str, Any]:
 async def get_current_decision_brief() -> Dict[str, Any]:
     """Return a narrative-ready view of the most recent consensus decision."""
     consensus_engine = get_consensus_engine()
-    if not consensus_engine or not consensus_engine.consensus_history:
+    if not consensus_engine or not consensus_engine.latest_decision:
         return {
             "status": "idle",
             "message": "No consensus decisions have been recorded yet.",
         }
 
-    decision = consensus_engine.consensus_history[-1]
+    decision = consensus_engine.latest_decision
     lifecycle_manager = get_incident_lifecycle_manager()
     incident_status = lifecycle_manager.get_incident_status(decision.incident_id)
 
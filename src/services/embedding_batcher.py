@@ -0,0 +1,180 @@
+"""
+Micro-batching front end for embedding generation.
+
+Titan embedding models take one input text per request, so throughput comes
+from keeping a bounded number of calls in flight. Callers arriving within a
+short window are collected into one batch, duplicate texts in the batch are
+embedded once, cached texts skip Bedrock entirely and the remaining calls run
+concurrently under the Bedrock rate limiter's embedding slots.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from src.services.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.services.rate_limiter import BedrockRateLimitManager, bedrock_rate_limiter
+from src.utils.constants import EMBEDDING_BATCH_CONFIG
+from src.utils.logging import get_logger
+
+
+logger = get_logger("embedding_batcher")
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into rate-limited batches."""
+
+    def __init__(self, compute: Callable[[str], Awaitable[Sequence[float]]], model_id: str,
+                 dimension: int, cache: Optional[EmbeddingCache] = None,
+                 rate_limiter: Optional[BedrockRateLimitManager] = None,
+                 fallback: Optional[Callable[[str], Sequence[float]]] = None,
+                 window_seconds: Optional[float] = None, max_batch_size: Optional[int] = None):
+        """
+        Initialize embedding batcher.
+
+        Args:
+            compute: Coroutine function embedding a single text
+            model_id: Embedding model, part of the cache key and rate limit
+            dimension: Embedding dimension
+            cache: Embedding cache; the shared cache if None
+            rate_limiter: Bounds in-flight calls; the global Bedrock limiter if None
+            fallback: Produces an uncached embedding when compute fails; errors propagate if None
+            window_seconds: How long concurrent callers are collected into one batch
+            max_batch_size: Flush early once this many texts are waiting
+        """
+        self.compute = compute
+        self.model_id = model_id
+        self.dimension = dimension
+        self.cache = cache if cache is not None else get_embedding_cache()
+        self.rate_limiter = rate_limiter or bedrock_rate_limiter
+        self.fallback = fallback
+        self.window_seconds = (
+            window_seconds if window_seconds is not None else EMBEDDING_BATCH_CONFIG["window_seconds"]
+        )
+        self.max_batch_size = max_batch_size or EMBEDDING_BATCH_CONFIG["max_batch_size"]
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
+
+        self.batches = 0
+        self.texts_requested = 0
+        self.texts_coalesced = 0
+        self.fallbacks = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed a single text, sharing a batch with concurrent callers."""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts in as few rate-limited batches as possible.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Float32 array of shape (len(texts), dimension), rows in input order
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        futures = [self._submit(text) for text in texts]
+        # Shield so a cancelled caller does not cancel results shared with others
+        rows = await asyncio.gather(*(asyncio.shield(future) for future in futures))
+        return np.vstack(rows).astype(np.float32, copy=False)
+
+    def _submit(self, text: str) -> asyncio.Future:
+        self.texts_requested += 1
+        future = self._pending.get(text)
+        if future is not None:
+            self.texts_coalesced += 1
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[text] = future
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]) -> None:
+        try:
+            await self._resolve_batch(batch)
+        except BaseException as e:
+            # Never leave a caller waiting on a batch that was cancelled or failed unexpectedly
+            for future in batch.values():
+                if future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            raise
+
+    async def _resolve_batch(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        results = await asyncio.gather(
+            *(self.cache.get_or_compute(text, self._compute_limited, self.model_id) for text in texts),
+            return_exceptions=True
+        )
+
+        failed = 0
+        for text, result in zip(texts, results):
+            future = batch[text]
+            if future.done():
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+                continue
+            if isinstance(result, BaseException):
+                if self.fallback is None:
+                    future.set_exception(result)
+                    continue
+                failed += 1
+                result = np.asarray(self.fallback(text), dtype=np.float32)
+            future.set_result(result)
+
+        if failed:
+            self.fallbacks += failed
+            logger.warning(f"Embedding failed for {failed}/{len(texts)} texts, using fallback")
+
+    async def _compute_limited(self, text: str) -> Sequence[float]:
+        async with self.rate_limiter.embedding_slot(self.model_id):
+            return await self.compute(text)
+
+    async def drain(self) -> None:
+        """Flush waiting texts and wait for in-flight batches."""
+        self._flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching metrics."""
+        return {
+            "batches": self.batches,
+            "texts_requested": self.texts_requested,
+            "texts_coalesced": self.texts_coalesced,
+            "avg_batch_size": (
+                (self.texts_requested - self.texts_coalesced) / self.batches if self.batches else 0.0
+            ),
+            "fallbacks": self.fallbacks,
+            "pending": len(self._pending),
+            "in_flight_batches": len(self._batch_tasks)
+        }
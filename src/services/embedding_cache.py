@@ -0,0 +1,381 @@
+"""
+Shared embedding cache for RAG memory and the vector store.
+
+Embeddings are keyed by a stable SHA-256 of model id and text, held in a
+byte-budgeted LRU with TTL expiry, and optionally persisted to an append-only
+float32 file that is memory-mapped on restart. Concurrent requests for the
+same text share one in-flight computation.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.constants import EMBEDDING_CACHE_CONFIG
+from src.utils.logging import get_logger
+
+
+logger = get_logger("embedding_cache")
+
+# Per-entry bookkeeping on top of the vector bytes (key, entry, dict slot)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def content_key(text: str, model_id: str = "") -> str:
+    """Stable cache key for a text embedded by a model; identical across processes."""
+    digest = hashlib.sha256()
+    digest.update(model_id.encode())
+    digest.update(b"\0")
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    vector: np.ndarray
+    expires_at: float
+    size: int
+
+
+class _DiskTier:
+    """
+    Append-only on-disk tier.
+
+    Vectors are appended to a data file and their offsets to ``index.jsonl``.
+    On open, the index is replayed (last write wins) and the data file is
+    memory-mapped, so lookups after a restart read pages lazily. Once
+    superseded and expired records outnumber live ones, live vectors are
+    rewritten to a new data file; replacing the index, whose first line
+    names that file, switches to it atomically.
+    """
+
+    def __init__(self, path: str, compaction_min_dead: Optional[int] = None):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._index_path = os.path.join(path, "index.jsonl")
+        self._index: Dict[str, Tuple[int, int, float]] = {}  # key -> (offset, dimension, expires_at)
+        self._mmap: Optional[np.memmap] = None
+        self._mapped_items = 0
+        self._compaction_min_dead = (
+            compaction_min_dead or EMBEDDING_CACHE_CONFIG["disk_compaction_min_dead"]
+        )
+
+        data_name = "vectors.f32"
+        records = 0
+        if os.path.exists(self._index_path):
+            with open(self._index_path, "r") as index_file:
+                for line in index_file:
+                    try:
+                        record = json.loads(line)
+                        if "data" in record:
+                            data_name = record["data"]
+                            continue
+                        self._index[record["k"]] = (record["o"], record["d"], record["e"])
+                        records += 1
+                    except (ValueError, KeyError):
+                        continue  # Torn write at the tail
+        now = time.time()
+        self._index = {key: record for key, record in self._index.items() if record[2] > now}
+        self._dead = records - len(self._index)  # Superseded and expired records still on disk
+
+        # Left behind by a compaction interrupted before the index was replaced
+        for name in os.listdir(path):
+            if name.startswith("vectors") and name.endswith(".f32") and name != data_name:
+                os.remove(os.path.join(path, name))
+
+        self._data_path = os.path.join(path, data_name)
+        self._data = open(self._data_path, "ab")
+        self._index_file = open(self._index_path, "a")
+        self._maybe_compact()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, now: float) -> Optional[Tuple[np.ndarray, float]]:
+        record = self._index.get(key)
+        if record is None:
+            return None
+        offset, dimension, expires_at = record
+        if expires_at <= now:
+            del self._index[key]
+            self._dead += 1
+            return None
+
+        end = offset + dimension
+        if self._mmap is None or end > self._mapped_items:
+            self._data.flush()
+            self._mapped_items = os.path.getsize(self._data_path) // 4
+            if end > self._mapped_items:
+                return None
+            self._mmap = np.memmap(self._data_path, dtype=np.float32, mode="r", shape=(self._mapped_items,))
+        return np.array(self._mmap[offset:end]), expires_at
+
+    def put(self, key: str, vector: np.ndarray, expires_at: float) -> None:
+        if key in self._index:
+            self._dead += 1
+        offset = self._data.tell() // 4
+        self._data.write(vector.tobytes())
+        self._index_file.write(json.dumps({"k": key, "o": offset, "d": len(vector), "e": expires_at}) + "\n")
+        self._index[key] = (offset, len(vector), expires_at)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if self._dead >= max(self._compaction_min_dead, len(self._index)):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite live vectors to a new data file and switch to it by replacing the index."""
+        now = time.time()
+        self._data.flush()
+        size = os.path.getsize(self._data_path) // 4
+        source = np.memmap(self._data_path, dtype=np.float32, mode="r", shape=(size,)) if size else None
+
+        data_name = f"vectors-{time.time_ns()}.f32"
+        data_path = os.path.join(self._path, data_name)
+        index_tmp_path = self._index_path + ".tmp"
+        index: Dict[str, Tuple[int, int, float]] = {}
+        offset = 0
+        with open(data_path, "wb") as data_file, open(index_tmp_path, "w") as index_file:
+            index_file.write(json.dumps({"data": data_name}) + "\n")
+            for key, (old_offset, dimension, expires_at) in self._index.items():
+                if expires_at <= now or old_offset + dimension > size:
+                    continue
+                data_file.write(source[old_offset:old_offset + dimension].tobytes())
+                index_file.write(json.dumps({"k": key, "o": offset, "d": dimension, "e": expires_at}) + "\n")
+                index[key] = (offset, dimension, expires_at)
+                offset += dimension
+            data_file.flush()
+            os.fsync(data_file.fileno())
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        del source
+        self._mmap = None
+        self._mapped_items = 0
+        self._data.close()
+        self._index_file.close()
+        os.replace(index_tmp_path, self._index_path)
+        os.remove(self._data_path)
+
+        logger.info(f"Compacted embedding disk tier: {self._dead} dead records dropped, {len(index)} kept")
+        self._data_path = data_path
+        self._index = index
+        self._dead = 0
+        self._data = open(self._data_path, "ab")
+        self._index_file = open(self._index_path, "a")
+
+    def flush(self) -> None:
+        self._data.flush()
+        self._index_file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._mmap = None
+        self._data.close()
+        self._index_file.close()
+
+
+class EmbeddingCache:
+    """Byte-budgeted LRU/TTL cache of embedding vectors."""
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 disk_path: Optional[str] = None):
+        """
+        Initialize embedding cache.
+
+        Args:
+            max_bytes: Memory budget for cached vectors
+            ttl_seconds: Time after which an embedding is recomputed
+            disk_path: Directory for the persistent tier; memory only if None
+        """
+        self.max_bytes = max_bytes or EMBEDDING_CACHE_CONFIG["max_bytes"]
+        self.ttl_seconds = ttl_seconds or EMBEDDING_CACHE_CONFIG["ttl_seconds"]
+        disk_path = disk_path or EMBEDDING_CACHE_CONFIG["disk_path"]
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._disk = _DiskTier(disk_path) if disk_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str, model_id: str = "") -> Optional[np.ndarray]:
+        """Get a cached embedding, or None on a miss."""
+        vector = self._lookup(content_key(text, model_id))
+        if vector is None:
+            self.misses += 1
+        return vector
+
+    def put(self, text: str, vector: Sequence[float], model_id: str = "") -> np.ndarray:
+        """Cache an embedding and return it as a float32 array."""
+        return self._store(content_key(text, model_id), vector)
+
+    async def get_or_compute(self, text: str, compute: Callable[[str], Awaitable[Sequence[float]]],
+                             model_id: str = "") -> np.ndarray:
+        """
+        Return the cached embedding for text, computing it at most once.
+
+        Concurrent callers asking for the same text while it is being computed
+        await the same result. Failures are not cached.
+
+        Args:
+            text: Text to embed
+            compute: Coroutine function producing the embedding
+            model_id: Embedding model, part of the cache key
+
+        Returns:
+            Embedding as a float32 array
+        """
+        key = content_key(text, model_id)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            vector = self._store(key, await compute(text))
+            future.set_result(vector)
+            return vector
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    def invalidate(self, text: str, model_id: str = "") -> bool:
+        """Drop an embedding from the memory tier."""
+        entry = self._entries.pop(content_key(text, model_id), None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def purge_expired(self) -> int:
+        """
+        Drop expired embeddings from the memory tier.
+
+        Returns:
+            Number of purged embeddings.
+        """
+        now = time.time()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Drop every in-memory embedding."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def flush(self) -> None:
+        """Flush the persistent tier to disk."""
+        if self._disk is not None:
+            self._disk.flush()
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit-rate and occupancy metrics."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "deduplicated": self.deduplicated,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "in_flight": len(self._inflight),
+            "disk_entries": len(self._disk) if self._disk is not None else 0
+        }
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.vector
+            self._remove(key)
+            self.expirations += 1
+
+        if self._disk is not None:
+            found = self._disk.get(key, now)
+            if found is not None:
+                vector, expires_at = found
+                vector.flags.writeable = False
+                self._insert(key, vector, expires_at)
+                self.disk_hits += 1
+                return vector
+        return None
+
+    def _store(self, key: str, vector: Sequence[float]) -> np.ndarray:
+        array = np.array(vector, dtype=np.float32)
+        array.flags.writeable = False  # Shared by every caller
+        expires_at = time.time() + self.ttl_seconds
+        self._insert(key, array, expires_at)
+        if self._disk is not None:
+            self._disk.put(key, array, expires_at)
+        return array
+
+    def _insert(self, key: str, vector: np.ndarray, expires_at: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        size = vector.nbytes + _ENTRY_OVERHEAD_BYTES
+        self._entries[key] = _CacheEntry(vector, expires_at, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
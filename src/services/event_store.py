@@ -7,13 +7,14 @@ import hashlib
 import json
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, AsyncIterator
+from typing import Dict, List, Optional, Any, AsyncIterator, Iterator, Tuple
 from uuid import uuid4
 
 import aioboto3
 from botocore.exceptions import ClientError
 
 from src.interfaces.event_store import EventStore, CorruptionResistantEventStore, IncidentEvent, IncidentState
+from src.models.incident import Incident
 from src.services.aws import AWSServiceFactory
 from src.utils.config import config
 from src.utils.logging import get_logger
@@ -22,18 +23,44 @@ from src.utils.exceptions import OptimisticLockException, EventCorruptionError
 
 logger = get_logger("event_store")
 
+# DynamoDB accepts at most 100 items per TransactWriteItems call
+MAX_TRANSACTION_ITEMS = 100
+
+# Kinesis accepts at most 500 records per PutRecords call
+MAX_KINESIS_BATCH_RECORDS = 500
+
 
 class ScalableEventStore(EventStore):
     """Kinesis-based event store with DynamoDB persistence."""
     
-    def __init__(self, service_factory: AWSServiceFactory):
+    def __init__(self, service_factory: AWSServiceFactory, max_append_retries: int = 3,
+                 snapshot_every_events: int = 100, snapshot_every_bytes: int = 256 * 1024):
         """Initialize event store."""
         self._service_factory = service_factory
         self._kinesis_client = None
         self._dynamodb_resource = None
         self._stream_name = config.database.kinesis_stream_name
         self._table_name = config.get_table_name("events")
+        
+        # Last version known to be persisted per incident. The conditional
+        # write stays the source of truth; a conflict invalidates the entry.
         self._sequence_counters: Dict[str, int] = {}
+        self._max_append_retries = max_append_retries
+        
+        # Group commit state: appends queued while a write is in flight are
+        # coalesced into the next transaction / PutRecords call
+        self._append_locks: Dict[str, asyncio.Lock] = {}
+        self._pending_appends: Dict[str, List[Tuple[List[IncidentEvent], asyncio.Future]]] = {}
+        self._kinesis_lock = asyncio.Lock()
+        self._pending_records: List[Tuple[List[Dict[str, Any]], asyncio.Future]] = []
+        
+        # Automatic snapshotting keeps replay cost bounded by the tail since
+        # the last snapshot rather than the age of the incident
+        self._snapshot_every_events = snapshot_every_events
+        self._snapshot_every_bytes = snapshot_every_bytes
+        self._events_since_snapshot: Dict[str, int] = {}
+        self._bytes_since_snapshot: Dict[str, int] = {}
+        self._snapshot_tasks: Dict[str, asyncio.Task] = {}
     
     async def _get_kinesis_client(self):
         """Get or create Kinesis client."""
@@ -65,9 +92,22 @@ class ScalableEventStore(EventStore):
         json_str = json.dumps(event_data, sort_keys=True)
         return hashlib.sha256(json_str.encode()).hexdigest()
     
+    def _build_item(self, incident_id: str, event: IncidentEvent, partition_key: str) -> Dict[str, Any]:
+        """Build the DynamoDB item for a versioned event."""
+        return {
+            "incident_id": incident_id,
+            "version": event.sequence_number,
+            "event_type": event.event_type,
+            "event_data": event.event_data,
+            "timestamp": event.timestamp.isoformat(),
+            "checksum": event.checksum,
+            "partition_key": partition_key,
+            "ttl": int(time.time()) + (365 * 24 * 60 * 60)  # 1 year TTL
+        }
+    
     async def append_event(self, incident_id: str, event: IncidentEvent) -> int:
         """
-        Append event to both Kinesis stream and DynamoDB table.
+        Append event to both DynamoDB table and Kinesis stream.
         
         Args:
             incident_id: ID of the incident
@@ -76,75 +116,261 @@ class ScalableEventStore(EventStore):
         Returns:
             Version number after append
         """
-        try:
-            # Get current version for optimistic locking
-            current_version = await self.get_current_version(incident_id)
-            new_version = current_version + 1
-            
-            # Set event metadata
-            event.sequence_number = new_version
-            event.checksum = self._calculate_integrity_hash(event)
+        return await self.append_events(incident_id, [event])
+    
+    async def append_events(self, incident_id: str, events: List[IncidentEvent]) -> int:
+        """
+        Append events for an incident with versioned conditional writes.
+        
+        Concurrent appends for the same incident are coalesced into one
+        DynamoDB transaction, and records for all incidents are published
+        with Kinesis PutRecords.
+        
+        Args:
+            incident_id: ID of the incident
+            events: Events to append, in order
             
-            # Publish to Kinesis stream first (for real-time processing)
-            kinesis_client = await self._get_kinesis_client()
-            partition_key = self._generate_partition_key(incident_id)
+        Returns:
+            Version number after the last of these events
             
-            kinesis_record = {
-                "Data": json.dumps(event.to_dict()),
-                "PartitionKey": partition_key
-            }
+        Raises:
+            OptimisticLockException: If conflicts persist after retries
+        """
+        if not events:
+            return await self.get_current_version(incident_id)
+        
+        result = asyncio.get_running_loop().create_future()
+        self._pending_appends.setdefault(incident_id, []).append((list(events), result))
+        lock = self._append_locks.setdefault(incident_id, asyncio.Lock())
+        
+        try:
+            async with lock:
+                # An earlier holder may already have committed our events
+                if not result.done():
+                    batch = self._pending_appends.pop(incident_id, [])
+                    await self._commit_append_batch(incident_id, batch)
+        finally:
+            if incident_id not in self._pending_appends and not lock.locked():
+                self._append_locks.pop(incident_id, None)
+        
+        return await result
+    
+    async def _commit_append_batch(
+        self, incident_id: str, batch: List[Tuple[List[IncidentEvent], asyncio.Future]]
+    ) -> None:
+        """
+        Persist and publish a coalesced batch, resolving each caller's future.
+        
+        Requests are packed whole into transactions, so when a later
+        transaction fails the callers whose events already committed still
+        get their versions and their events are still published.
+        """
+        committed: List[Tuple[List[IncidentEvent], asyncio.Future, int]] = []
+        error: Optional[Exception] = None
+        
+        try:
+            try:
+                for group in self._transaction_groups(batch):
+                    version = await self._write_events(
+                        incident_id, [event for request_events, _ in group for event in request_events]
+                    )
+                    version -= sum(len(request_events) for request_events, _ in group)
+                    for request_events, future in group:
+                        version += len(request_events)
+                        committed.append((request_events, future, version))
+            except Exception as e:
+                if not isinstance(e, OptimisticLockException):
+                    logger.error(f"Failed to append events for incident {incident_id}: {e}")
+                error = e
+            
+            if committed:
+                events = [event for request_events, _, _ in committed for event in request_events]
+                records = [
+                    {
+                        "Data": json.dumps(event.to_dict()),
+                        "PartitionKey": self._generate_partition_key(incident_id)
+                    }
+                    for event in events
+                ]
+                try:
+                    await self._publish_to_kinesis(records)
+                except Exception as e:
+                    # DynamoDB already holds the events; stream consumers can catch up from it
+                    logger.error(f"Failed to publish {len(records)} events to Kinesis: {e}")
+                self._track_snapshot_progress(incident_id, len(events), sum(len(r["Data"]) for r in records))
+                logger.info(f"Appended {len(events)} events for incident {incident_id}, version {committed[-1][2]}")
+        finally:
+            # Committed callers keep their versions even if we are cancelled
+            for _, future, version in committed:
+                if not future.done():
+                    future.set_result(version)
+            for _, future in batch:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.cancel()
+    
+    @staticmethod
+    def _transaction_groups(
+        batch: List[Tuple[List[IncidentEvent], asyncio.Future]]
+    ) -> Iterator[List[Tuple[List[IncidentEvent], asyncio.Future]]]:
+        """Pack whole requests into groups that fit one transaction; a larger request is a group alone."""
+        group: List[Tuple[List[IncidentEvent], asyncio.Future]] = []
+        size = 0
+        for request in batch:
+            if group and size + len(request[0]) > MAX_TRANSACTION_ITEMS:
+                yield group
+                group, size = [], 0
+            group.append(request)
+            size += len(request[0])
+        if group:
+            yield group
+    
+    async def _write_events(self, incident_id: str, events: List[IncidentEvent]) -> int:
+        """Write events to DynamoDB, retrying from a fresh version on conflict."""
+        partition_key = self._generate_partition_key(incident_id)
+        remaining = events
+        conflicts = 0
+        
+        while remaining:
+            chunk = remaining[:MAX_TRANSACTION_ITEMS]
+            current_version = self._sequence_counters.get(incident_id)
+            if current_version is None:
+                current_version = await self.get_current_version(incident_id)
             
-            await kinesis_client.put_record(
-                StreamName=self._stream_name,
-                **kinesis_record
-            )
+            for offset, event in enumerate(chunk, start=1):
+                event.sequence_number = current_version + offset
+                event.checksum = self._calculate_integrity_hash(event)
             
-            # Store in DynamoDB for persistence and querying
-            dynamodb = await self._get_dynamodb_resource()
+            try:
+                await self._put_versioned_items(
+                    [self._build_item(incident_id, event, partition_key) for event in chunk]
+                )
+            except ClientError as e:
+                if not self._is_version_conflict(e):
+                    raise
+                self._sequence_counters.pop(incident_id, None)
+                conflicts += 1
+                if conflicts > self._max_append_retries:
+                    raise OptimisticLockException(f"Version conflict for incident {incident_id}")
+                logger.debug(f"Version conflict for incident {incident_id}, retrying ({conflicts})")
+                continue
+            
+            self._sequence_counters[incident_id] = current_version + len(chunk)
+            remaining = remaining[len(chunk):]
+        
+        return self._sequence_counters[incident_id]
+    
+    async def _put_versioned_items(self, items: List[Dict[str, Any]]) -> None:
+        """Conditionally write items so an existing version is never overwritten."""
+        dynamodb = await self._get_dynamodb_resource()
+        condition = "attribute_not_exists(version)"
+        
+        if len(items) == 1:
             table = await dynamodb.Table(self._table_name)
+            await table.put_item(Item=items[0], ConditionExpression=condition)
+            return
+        
+        await dynamodb.meta.client.transact_write_items(
+            TransactItems=[
+                {"Put": {"TableName": self._table_name, "Item": item, "ConditionExpression": condition}}
+                for item in items
+            ]
+        )
+    
+    @staticmethod
+    def _is_version_conflict(error: ClientError) -> bool:
+        """Check whether a write failed because the version already exists."""
+        code = error.response.get("Error", {}).get("Code")
+        if code == "ConditionalCheckFailedException":
+            return True
+        if code == "TransactionCanceledException":
+            reasons = error.response.get("CancellationReasons", [])
+            return any(reason.get("Code") == "ConditionalCheckFailed" for reason in reasons)
+        return False
+    
+    async def _publish_to_kinesis(self, records: List[Dict[str, Any]]) -> None:
+        """Publish records, coalescing with concurrent publishers into PutRecords calls."""
+        published = asyncio.get_running_loop().create_future()
+        self._pending_records.append((records, published))
+        
+        async with self._kinesis_lock:
+            if not published.done():
+                batch, self._pending_records = self._pending_records, []
+                try:
+                    await self._put_kinesis_records([r for batch_records, _ in batch for r in batch_records])
+                finally:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+        
+        await published
+    
+    async def _put_kinesis_records(self, records: List[Dict[str, Any]]) -> None:
+        """Send records with PutRecords, retrying individually failed entries."""
+        kinesis_client = await self._get_kinesis_client()
+        
+        for start in range(0, len(records), MAX_KINESIS_BATCH_RECORDS):
+            pending = records[start:start + MAX_KINESIS_BATCH_RECORDS]
+            
+            for attempt in range(self._max_append_retries + 1):
+                try:
+                    response = await kinesis_client.put_records(
+                        StreamName=self._stream_name,
+                        Records=pending
+                    )
+                except Exception as e:
+                    # DynamoDB already holds the events; stream consumers can catch up from it
+                    logger.error(f"Failed to publish {len(pending)} events to Kinesis: {e}")
+                    break
+                
+                if not response.get("FailedRecordCount"):
+                    break
+                pending = [
+                    record for record, result in zip(pending, response.get("Records", []))
+                    if result.get("ErrorCode")
+                ]
+                await asyncio.sleep(0.05 * (2 ** attempt))
+            else:
+                logger.error(f"Dropped {len(pending)} Kinesis records after {self._max_append_retries} retries")
+    
+    async def get_events(self, incident_id: str, from_version: int = 0) -> List[IncidentEvent]:
+        """Get events for an incident from DynamoDB, following every page."""
+        try:
+            return [event async for event in self.iter_events(incident_id, from_version)]
             
-            await table.put_item(
-                Item={
-                    "incident_id": incident_id,
-                    "version": new_version,
-                    "event_type": event.event_type,
-                    "event_data": event.event_data,
-                    "timestamp": event.timestamp.isoformat(),
-                    "checksum": event.checksum,
-                    "partition_key": partition_key,
-                    "ttl": int(time.time()) + (365 * 24 * 60 * 60)  # 1 year TTL
-                },
-                ConditionExpression="attribute_not_exists(version) OR version = :expected_version",
-                ExpressionAttributeValues={":expected_version": current_version}
-            )
-            
-            logger.info(f"Appended event {event.event_type} for incident {incident_id}, version {new_version}")
-            return new_version
-            
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise OptimisticLockException(f"Version conflict for incident {incident_id}")
-            raise
         except Exception as e:
-            logger.error(f"Failed to append event: {e}")
+            logger.error(f"Failed to get events for incident {incident_id}: {e}")
             raise
     
-    async def get_events(self, incident_id: str, from_version: int = 0) -> List[IncidentEvent]:
-        """Get events for an incident from DynamoDB."""
-        try:
-            dynamodb = await self._get_dynamodb_resource()
-            table = await dynamodb.Table(self._table_name)
+    async def iter_events(self, incident_id: str, from_version: int = 0) -> AsyncIterator[IncidentEvent]:
+        """
+        Stream events for an incident page by page in version order.
+        
+        Args:
+            incident_id: ID of the incident
+            from_version: First version to return
             
-            response = await table.query(
-                KeyConditionExpression="incident_id = :incident_id AND version >= :from_version",
-                ExpressionAttributeValues={
-                    ":incident_id": incident_id,
-                    ":from_version": from_version
-                },
-                ScanIndexForward=True  # Sort by version ascending
-            )
+        Yields:
+            Events with version >= from_version
+        """
+        dynamodb = await self._get_dynamodb_resource()
+        table = await dynamodb.Table(self._table_name)
+        
+        query_kwargs = {
+            "KeyConditionExpression": "incident_id = :incident_id AND version >= :from_version",
+            "ExpressionAttributeValues": {
+                ":incident_id": incident_id,
+                ":from_version": from_version
+            },
+            "ScanIndexForward": True  # Sort by version ascending
+        }
+        
+        while True:
+            response = await table.query(**query_kwargs)
             
-            events = []
             for item in response.get("Items", []):
                 event = IncidentEvent(
                     incident_id=item["incident_id"],
@@ -152,15 +378,14 @@ class ScalableEventStore(EventStore):
                     event_data=item["event_data"],
                     timestamp=datetime.fromisoformat(item["timestamp"])
                 )
-                event.sequence_number = item["version"]
+                event.sequence_number = int(item["version"])
                 event.checksum = item.get("checksum")
-                events.append(event)
+                yield event
             
-            return events
-            
-        except Exception as e:
-            logger.error(f"Failed to get events for incident {incident_id}: {e}")
-            raise
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_kwargs["ExclusiveStartKey"] = last_key
     
     async def get_current_version(self, incident_id: str) -> int:
         """Get current version for an incident."""
@@ -186,15 +411,45 @@ class ScalableEventStore(EventStore):
             return 0
     
     async def replay_events(self, incident_id: str) -> IncidentState:
-        """Replay events to reconstruct incident state."""
-        events = await self.get_events(incident_id)
+        """Replay events to reconstruct incident state, starting from the latest snapshot."""
+        state = await self.get_snapshot(incident_id) or IncidentState()
         
-        state = IncidentState()
-        for event in events:
+        async for event in self.iter_events(incident_id, from_version=state.version + 1):
             state = state.apply_event(event)
         
         return state
     
+    def _track_snapshot_progress(self, incident_id: str, event_count: int, byte_count: int) -> None:
+        """Schedule a background snapshot once enough events or bytes accumulate."""
+        events = self._events_since_snapshot.get(incident_id, 0) + event_count
+        size = self._bytes_since_snapshot.get(incident_id, 0) + byte_count
+        self._events_since_snapshot[incident_id] = events
+        self._bytes_since_snapshot[incident_id] = size
+        
+        due = ((self._snapshot_every_events and events >= self._snapshot_every_events) or
+               (self._snapshot_every_bytes and size >= self._snapshot_every_bytes))
+        if not due or incident_id in self._snapshot_tasks:
+            return
+        
+        self._events_since_snapshot[incident_id] = 0
+        self._bytes_since_snapshot[incident_id] = 0
+        task = asyncio.create_task(self._snapshot_incident(incident_id))
+        self._snapshot_tasks[incident_id] = task
+        task.add_done_callback(lambda _: self._snapshot_tasks.pop(incident_id, None))
+    
+    async def _snapshot_incident(self, incident_id: str) -> None:
+        """Replay from the previous snapshot and persist the new state."""
+        try:
+            state = await self.replay_events(incident_id)
+            await self.create_snapshot(incident_id, state)
+        except Exception as e:
+            logger.warning(f"Automatic snapshot failed for incident {incident_id}: {e}")
+    
+    async def wait_for_snapshots(self) -> None:
+        """Wait for in-flight automatic snapshots to finish."""
+        if self._snapshot_tasks:
+            await asyncio.gather(*list(self._snapshot_tasks.values()), return_exceptions=True)
+    
     async def stream_events(self, from_timestamp: Optional[datetime] = None) -> AsyncIterator[IncidentEvent]:
         """Stream events from Kinesis in real-time."""
         try:
@@ -259,7 +514,8 @@ class ScalableEventStore(EventStore):
                 Item={
                     "incident_id": incident_id,
                     "version": state.version,
-                    "state_data": state.__dict__,
+                    # Stored as JSON: DynamoDB rejects datetimes and floats
+                    "state_data": json.dumps(self._serialize_state(state)),
                     "created_at": datetime.utcnow().isoformat(),
                     "ttl": int(time.time()) + (30 * 24 * 60 * 60)  # 30 days TTL
                 }
@@ -271,6 +527,26 @@ class ScalableEventStore(EventStore):
             logger.error(f"Failed to create snapshot: {e}")
             raise
     
+    @staticmethod
+    def _serialize_state(state: IncidentState) -> Dict[str, Any]:
+        """Convert incident state to JSON-safe data."""
+        return {
+            "version": state.version,
+            "event_count": state.event_count,
+            "last_updated": state.last_updated.isoformat(),
+            "incident": state.incident.model_dump(mode="json") if state.incident else None
+        }
+    
+    @staticmethod
+    def _deserialize_state(data: Dict[str, Any]) -> IncidentState:
+        """Rebuild incident state from snapshot data."""
+        incident = Incident.model_validate(data["incident"]) if data.get("incident") else None
+        state = IncidentState(incident)
+        state.version = int(data["version"])
+        state.event_count = int(data["event_count"])
+        state.last_updated = datetime.fromisoformat(data["last_updated"])
+        return state
+    
     async def get_snapshot(self, incident_id: str) -> Optional[IncidentState]:
         """Get latest snapshot for an incident."""
         try:
@@ -285,9 +561,13 @@ class ScalableEventStore(EventStore):
                 return None
             
             item = response["Item"]
-            state = IncidentState()
-            state.__dict__.update(item["state_data"])
+            state_data = item["state_data"]
+            if isinstance(state_data, str):
+                return self._deserialize_state(json.loads(state_data))
             
+            # Snapshots written before state_data was JSON-encoded
+            state = IncidentState()
+            state.__dict__.update(state_data)
             return state
             
         except Exception as e:
@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 import boto3
 from botocore.exceptions import ClientError
 
+from src.services.pii_redaction import BulkPIIRedactor, PIIMatch, PIIRedactor, redactor_for
 from src.utils.logging import get_logger
 from src.utils.config import config
 from src.utils.exceptions import SecurityViolationError, GuardrailViolationError
@@ -101,6 +102,8 @@ class BedrockGuardrails:
             PIIType.PASSWORD: r'(?i)(?:password|passwd|pwd)[\s]*[:=][\s]*[^\s\n]{6,}'
         }
         
+        self._bulk_redactor = BulkPIIRedactor()
+        
         # Content filtering policies
         self.guardrail_policies = self._initialize_policies()
         
@@ -309,6 +312,9 @@ class BedrockGuardrails:
         """
         Detect and redact PII from text.
         
+        All PII types are found in one scan. Where matches overlap, the
+        leftmost wins, then the type listed first in pii_patterns.
+        
         Args:
             text: Input text to scan for PII
             
@@ -316,37 +322,60 @@ class BedrockGuardrails:
             Tuple of (redacted_text, list_of_detections)
         """
         start_time = datetime.utcnow()
-        detections = []
-        redacted_text = text
+        redacted_text, matches = self._pii_redactor().redact(text)
+        detections = self._record_pii_detections(matches, start_time)
         
-        for pii_type, pattern in self.pii_patterns.items():
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            
-            for match in matches:
-                detection = PIIDetection(
-                    pii_type=pii_type,
-                    original_text=match.group(),
-                    redacted_text=f'[REDACTED_{pii_type.value.upper()}]',
-                    confidence=0.9,  # High confidence for regex matches
-                    position=(match.start(), match.end())
-                )
-                detections.append(detection)
-                
-                # Replace in redacted text
-                redacted_text = redacted_text.replace(
-                    match.group(), 
-                    detection.redacted_text
-                )
+        if detections:
+            logger.info(f"Detected and redacted {len(detections)} PII instances")
+        
+        return redacted_text, detections
+    
+    async def detect_and_redact_pii_many(self, texts: List[str]) -> List[Tuple[str, List[PIIDetection]]]:
+        """
+        Detect and redact PII from many texts, on a process pool for large batches.
+        
+        Args:
+            texts: Input texts to scan for PII
+            
+        Returns:
+            (redacted_text, list_of_detections) for each text, in order
+        """
+        start_time = datetime.utcnow()
+        results = await self._bulk_redactor.redact_many(self._pii_redactor(), texts)
+        redacted = [
+            (redacted_text, self._record_pii_detections(matches, start_time))
+            for redacted_text, matches in results
+        ]
+        
+        total = sum(len(detections) for _, detections in redacted)
+        if total:
+            logger.info(f"Detected and redacted {total} PII instances in {len(texts)} texts")
+        
+        return redacted
+    
+    def _pii_redactor(self) -> PIIRedactor:
+        """Shared single-pass redactor for the current pii_patterns."""
+        return redactor_for({pii_type.value: pattern for pii_type, pattern in self.pii_patterns.items()})
+    
+    def _record_pii_detections(self, matches: List[PIIMatch], start_time: datetime) -> List[PIIDetection]:
+        """Convert redacted spans to detections and update metrics."""
+        detections = [
+            PIIDetection(
+                pii_type=PIIType(match.pii_type),
+                original_text=match.text,
+                redacted_text=f'[REDACTED_{match.pii_type.upper()}]',
+                confidence=0.9,  # High confidence for regex matches
+                position=(match.start, match.end)
+            )
+            for match in matches
+        ]
         
         # Update metrics
         self.pii_detections += len(detections)
         processing_time = (datetime.utcnow() - start_time).total_seconds() * 1000
         self.processing_times.append(processing_time)
         
-        if detections:
-            logger.info(f"Detected and redacted {len(detections)} PII instances")
-        
-        return redacted_text, detections
+        return detections
     
     async def filter_content(self, content: str) -> ContentFilterResult:
         """
@@ -505,44 +534,46 @@ class BedrockGuardrails:
         }
         
         # Process text fields
-        text_fields = ['title', 'description', 'error_message', 'logs']
+        text_fields = [
+            field for field in ['title', 'description', 'error_message', 'logs']
+            if field in sanitized_data and isinstance(sanitized_data[field], str)
+        ]
         
-        for field in text_fields:
-            if field in sanitized_data and isinstance(sanitized_data[field], str):
-                # Detect and redact PII
-                redacted_text, pii_detections = await self.detect_and_redact_pii(sanitized_data[field])
-                
-                # Filter content
-                filter_result = await self.filter_content(redacted_text)
-                
-                # Update data
-                sanitized_data[field] = filter_result.filtered_content
-                
-                # Track security annotations
-                if pii_detections:
-                    security_annotations['pii_detections'].extend([
-                        {
-                            'field': field,
-                            'type': detection.pii_type.value,
-                            'position': detection.position
-                        }
-                        for detection in pii_detections
-                    ])
-                    security_annotations['sanitization_applied'] = True
-                
-                if filter_result.violations:
-                    security_annotations['content_violations'].extend([
-                        {
-                            'field': field,
-                            'violation': violation
-                        }
-                        for violation in filter_result.violations
-                    ])
-                    security_annotations['sanitization_applied'] = True
-                
-                # Update risk assessment
-                if filter_result.risk_level.value != ContentRiskLevel.SAFE.value:
-                    security_annotations['risk_assessment'] = filter_result.risk_level.value
+        # Detect and redact PII
+        redactions = await self.detect_and_redact_pii_many([sanitized_data[field] for field in text_fields])
+        
+        for field, (redacted_text, pii_detections) in zip(text_fields, redactions):
+            # Filter content
+            filter_result = await self.filter_content(redacted_text)
+            
+            # Update data
+            sanitized_data[field] = filter_result.filtered_content
+            
+            # Track security annotations
+            if pii_detections:
+                security_annotations['pii_detections'].extend([
+                    {
+                        'field': field,
+                        'type': detection.pii_type.value,
+                        'position': detection.position
+                    }
+                    for detection in pii_detections
+                ])
+                security_annotations['sanitization_applied'] = True
+            
+            if filter_result.violations:
+                security_annotations['content_violations'].extend([
+                    {
+                        'field': field,
+                        'violation': violation
+                    }
+                    for violation in filter_result.violations
+                ])
+                security_annotations['sanitization_applied'] = True
+            
+            # Update risk assessment
+            if filter_result.risk_level.value != ContentRiskLevel.SAFE.value:
+                security_annotations['risk_assessment'] = filter_result.risk_level.value
         
         # Add security metadata
         sanitized_data['_security'] = security_annotations
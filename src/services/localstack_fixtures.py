@@ -12,6 +12,7 @@ import aioboto3
 from botocore.exceptions import ClientError
 
 from src.utils.config import config
+from src.utils.constants import AUDIT_LOG_CONFIG
 from src.utils.logging import get_logger
 from src.services.aws import AWSServiceFactory
 
@@ -152,6 +153,30 @@ class LocalStackManager:
                 ]
             )
             
+            # Create tamper-proof audit log table, indexed by hourly time bucket
+            await self._create_table_if_not_exists(
+                client,
+                table_name='incident-commander-audit-logs',
+                key_schema=[
+                    {'AttributeName': 'event_id', 'KeyType': 'HASH'}
+                ],
+                attribute_definitions=[
+                    {'AttributeName': 'event_id', 'AttributeType': 'S'},
+                    {'AttributeName': 'time_bucket', 'AttributeType': 'S'},
+                    {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+                ],
+                global_secondary_indexes=[
+                    {
+                        'IndexName': AUDIT_LOG_CONFIG['time_index_name'],
+                        'KeySchema': [
+                            {'AttributeName': 'time_bucket', 'KeyType': 'HASH'},
+                            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                        ],
+                        'Projection': {'ProjectionType': 'ALL'}
+                    }
+                ]
+            )
+            
             self._initialized_services.add('dynamodb')
             logger.info("DynamoDB tables initialized in LocalStack")
             
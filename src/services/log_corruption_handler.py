@@ -3,6 +3,13 @@ Log Corruption Handling and Sanitization (Task 5.3)
 
 Advanced log corruption detection, sanitization pipeline, and
 security validation for diagnosis agent log processing.
+
+Whole-buffer checks work on bytes: a NumPy byte histogram, taken a chunk
+at a time over a memoryview, gives the control character, null byte and
+entropy figures in one pass, and control characters are stripped with
+bytes.translate. Control characters are single bytes in UTF-8 that never
+occur inside a multi-byte sequence, so counts and deletions on the UTF-8
+encoding match those on the decoded text.
 """
 
 import asyncio
@@ -18,11 +25,28 @@ from enum import Enum
 import chardet
 import magic
 from collections import defaultdict, deque
+from itertools import islice
+
+import numpy as np
 
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+LogBuffer = Union[str, bytes, bytearray, memoryview]
+
+# Control characters other than tab, newline and carriage return
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in b'\t\n\r')
+_CONTROL_MASK = np.zeros(256, dtype=bool)
+_CONTROL_MASK[list(_CONTROL_BYTES)] = True
+_CONTROL_CHAR_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# bincount widens its input to intp, so histograms are taken in slices
+_SCAN_CHUNK_BYTES = 1024 * 1024
+
+# Lines made only of base64 characters; anything else cannot decode with validate=True
+_BASE64_LINE_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
 
 class CorruptionType(Enum):
     """Types of log corruption detected."""
@@ -129,13 +153,13 @@ class LogCorruptionHandler:
             self.file_magic = None
             self.logger.warning("python-magic not available, file type detection limited")
     
-    async def sanitize_log_content(self, content: Union[str, bytes], 
+    async def sanitize_log_content(self, content: LogBuffer, 
                                  source_info: Dict[str, Any] = None) -> SanitizationResult:
         """
         Sanitize log content with comprehensive corruption detection and removal.
         
         Args:
-            content: Raw log content (string or bytes)
+            content: Raw log content (string, bytes or any bytes-like buffer)
             source_info: Optional metadata about the log source
             
         Returns:
@@ -146,9 +170,13 @@ class LogCorruptionHandler:
         if source_info is None:
             source_info = {}
         
-        # Convert to string if bytes
-        if isinstance(content, bytes):
+        # Convert to string if bytes; valid UTF-8 input doubles as the byte view
+        raw = None
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            raw = content
             content, encoding_detection = self._handle_encoding(content)
+            if encoding_detection:
+                raw = None
         else:
             encoding_detection = None
         
@@ -161,6 +189,7 @@ class LogCorruptionHandler:
         if original_size > self.max_log_size:
             self.logger.warning(f"Log content exceeds size limit: {original_size} bytes")
             content = content[:self.max_log_size]
+            raw = None
             actions_taken.append((SanitizationAction.TRUNCATED, f"Truncated from {original_size} to {self.max_log_size} bytes"))
             corruptions_detected.append(CorruptionDetection(
                 corruption_type=CorruptionType.OVERSIZED_ENTRY,
@@ -176,22 +205,27 @@ class LogCorruptionHandler:
             corruptions_detected.append(encoding_detection)
             actions_taken.append((SanitizationAction.DECODED, f"Decoded from {encoding_detection.description}"))
         
+        # One byte histogram serves the binary, control and null byte checks
+        counts = _byte_counts(raw if raw is not None else _utf8(content))
+        
         # Binary data detection
-        binary_detection = self._detect_binary_data(content)
+        binary_detection = self._detect_binary_data(content, counts)
         if binary_detection:
             corruptions_detected.extend(binary_detection)
             content, binary_actions = self._sanitize_binary_data(content)
             actions_taken.extend(binary_actions)
+            counts = _without_control(counts)
         
         # Control character detection and removal
-        control_detection = self._detect_control_characters(content)
+        control_detection = self._detect_control_characters(content, counts)
         if control_detection:
             corruptions_detected.extend(control_detection)
             content, control_actions = self._sanitize_control_characters(content)
             actions_taken.extend(control_actions)
+            counts = _without_control(counts)
         
         # Null byte detection and removal
-        null_detection = self._detect_null_bytes(content)
+        null_detection = self._detect_null_bytes(content, counts)
         if null_detection:
             corruptions_detected.extend(null_detection)
             content, null_actions = self._sanitize_null_bytes(content)
@@ -253,14 +287,16 @@ class LogCorruptionHandler:
         
         return result
     
-    def _handle_encoding(self, content: bytes) -> Tuple[str, Optional[CorruptionDetection]]:
+    def _handle_encoding(self, content: Union[bytes, bytearray, memoryview]) -> Tuple[str, Optional[CorruptionDetection]]:
         """Handle encoding detection and conversion."""
         try:
             # Try UTF-8 first
-            return content.decode('utf-8'), None
+            return str(content, 'utf-8'), None
         except UnicodeDecodeError:
             pass
         
+        content = bytes(content)
+        
         # Use chardet for detection
         try:
             detected = chardet.detect(content)
@@ -295,12 +331,14 @@ class LogCorruptionHandler:
             
             return decoded_content, corruption
     
-    def _detect_binary_data(self, content: str) -> List[CorruptionDetection]:
-        """Detect binary data in text content."""
+    def _detect_binary_data(self, content: str, counts: Optional[np.ndarray] = None) -> List[CorruptionDetection]:
+        """Detect binary data in text content; counts is the byte histogram of its UTF-8 encoding."""
         corruptions = []
+        if counts is None:
+            counts = _byte_counts(_utf8(content))
         
         # Check for high ratio of non-printable characters
-        non_printable_count = sum(1 for c in content if ord(c) < 32 and c not in '\t\n\r')
+        non_printable_count = int(counts[_CONTROL_MASK].sum())
         non_printable_ratio = non_printable_count / len(content) if content else 0
         
         if non_printable_ratio > 0.1:  # More than 10% non-printable
@@ -338,7 +376,7 @@ class LogCorruptionHandler:
         actions = []
         
         # Remove non-printable characters except common whitespace
-        sanitized = ''.join(c for c in content if ord(c) >= 32 or c in '\t\n\r')
+        sanitized = _strip_control_characters(content)
         
         if len(sanitized) != len(content):
             removed_count = len(content) - len(sanitized)
@@ -346,25 +384,25 @@ class LogCorruptionHandler:
         
         return sanitized, actions
     
-    def _detect_control_characters(self, content: str) -> List[CorruptionDetection]:
+    def _detect_control_characters(self, content: str, counts: Optional[np.ndarray] = None) -> List[CorruptionDetection]:
         """Detect problematic control characters."""
         corruptions = []
+        if counts is None:
+            counts = _byte_counts(_utf8(content))
         
-        # Find control characters (excluding common whitespace)
-        control_chars = []
-        for i, char in enumerate(content):
-            if ord(char) < 32 and char not in '\t\n\r':
-                control_chars.append((i, char, ord(char)))
+        # Count control characters (excluding common whitespace)
+        control_count = int(counts[_CONTROL_MASK].sum())
         
-        if control_chars:
-            sample_chars = control_chars[:5]  # First 5 for sample
-            sample_data = ', '.join(f"\\x{ord_val:02x}@{pos}" for pos, char, ord_val in sample_chars)
+        if control_count:
+            # Positions of the first 5 for sample
+            sample_chars = [(match.start(), ord(match.group())) for match in islice(_CONTROL_CHAR_RE.finditer(content), 5)]
+            sample_data = ', '.join(f"\\x{ord_val:02x}@{pos}" for pos, ord_val in sample_chars)
             
             corruptions.append(CorruptionDetection(
                 corruption_type=CorruptionType.CONTROL_CHARACTERS,
                 severity="medium",
-                location=f"positions: {[pos for pos, _, _ in sample_chars]}",
-                description=f"Found {len(control_chars)} control characters",
+                location=f"positions: {[pos for pos, _ in sample_chars]}",
+                description=f"Found {control_count} control characters",
                 sample_data=sample_data,
                 confidence=0.8
             ))
@@ -376,7 +414,7 @@ class LogCorruptionHandler:
         actions = []
         
         # Remove control characters except tab, newline, carriage return
-        sanitized = ''.join(c for c in content if ord(c) >= 32 or c in '\t\n\r')
+        sanitized = _strip_control_characters(content)
         
         if len(sanitized) != len(content):
             removed_count = len(content) - len(sanitized)
@@ -384,18 +422,24 @@ class LogCorruptionHandler:
         
         return sanitized, actions
     
-    def _detect_null_bytes(self, content: str) -> List[CorruptionDetection]:
+    def _detect_null_bytes(self, content: str, counts: Optional[np.ndarray] = None) -> List[CorruptionDetection]:
         """Detect null bytes in content."""
         corruptions = []
-        
-        null_positions = [i for i, char in enumerate(content) if char == '\x00']
-        
-        if null_positions:
+        null_count = content.count('\x00') if counts is None else int(counts[0])
+        
+        if null_count:
+            # First 10 positions
+            null_positions = []
+            position = content.find('\x00')
+            while position >= 0 and len(null_positions) < 10:
+                null_positions.append(position)
+                position = content.find('\x00', position + 1)
+            
             corruptions.append(CorruptionDetection(
                 corruption_type=CorruptionType.NULL_BYTES,
                 severity="high",
-                location=f"positions: {null_positions[:10]}",  # First 10 positions
-                description=f"Found {len(null_positions)} null bytes",
+                location=f"positions: {null_positions}",
+                description=f"Found {null_count} null bytes",
                 sample_data=f"Null bytes at positions: {null_positions[:5]}",
                 confidence=1.0
             ))
@@ -640,7 +684,7 @@ class LogCorruptionHandler:
         corruptions = []
         
         # Check for base64 encoded compressed data
-        if len(line) > 100:
+        if len(line) > 100 and _BASE64_LINE_RE.fullmatch(line):
             try:
                 # Try to decode as base64
                 decoded = base64.b64decode(line, validate=True)
@@ -677,24 +721,15 @@ class LogCorruptionHandler:
         
         return False
     
-    def _calculate_entropy(self, data: bytes) -> float:
-        """Calculate Shannon entropy of data."""
-        if not data:
+    def _calculate_entropy(self, data: Union[bytes, bytearray, memoryview]) -> float:
+        """Calculate Shannon entropy of data in bits per byte."""
+        if not len(data):
             return 0
         
-        # Count byte frequencies
-        frequencies = defaultdict(int)
-        for byte in data:
-            frequencies[byte] += 1
-        
-        # Calculate entropy
-        entropy = 0
-        length = len(data)
-        for count in frequencies.values():
-            probability = count / length
-            entropy -= probability * (probability.bit_length() - 1)
-        
-        return entropy
+        # Byte frequencies, then -sum(p * log2(p)) over the bytes present
+        counts = _byte_counts(data)
+        probabilities = counts[counts > 0] / counts.sum()
+        return float(-(probabilities * np.log2(probabilities)).sum())
     
     def _handle_compressed_data(self, line: str) -> Tuple[Optional[str], List[Tuple[SanitizationAction, str]]]:
         """Attempt to decompress data."""
@@ -828,6 +863,32 @@ class LogCorruptionHandler:
         return results
 
 
+def _utf8(text: str) -> bytes:
+    """UTF-8 encoding of text, keeping any lone surrogates byte for byte."""
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _byte_counts(data: Union[bytes, bytearray, memoryview], chunk_size: int = _SCAN_CHUNK_BYTES) -> np.ndarray:
+    """Histogram of byte values in a buffer, taken a chunk at a time without copying."""
+    view = memoryview(data).cast('B')
+    counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, len(view), chunk_size):
+        counts += np.bincount(np.frombuffer(view[start:start + chunk_size], dtype=np.uint8), minlength=256)
+    return counts
+
+
+def _without_control(counts: np.ndarray) -> np.ndarray:
+    """Byte histogram after every control character has been stripped."""
+    counts = counts.copy()
+    counts[_CONTROL_MASK] = 0
+    return counts
+
+
+def _strip_control_characters(text: str) -> str:
+    """Remove control characters other than tab, newline and carriage return."""
+    return _utf8(text).translate(None, _CONTROL_BYTES).decode('utf-8', 'surrogatepass')
+
+
 # Example usage and testing
 async def main():
     """Example usage of log corruption handler."""
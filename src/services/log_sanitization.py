@@ -3,13 +3,24 @@ Corrupted Log Sanitization Pipeline and Anomaly Filters (Task 5.3)
 
 Advanced log processing pipeline with corruption detection, sanitization,
 and anomaly filtering for secure and reliable log analysis.
+
+Every regex is compiled once. Injection patterns are screened by the literal
+substrings each one requires, so clean entries skip the regex engine, and
+anomaly counters are maintained incrementally. The stateless sanitization
+steps run on a process pool for large batches; the stateful anomaly step
+always runs in order in the calling process, so results match sequential
+processing.
 """
 
+import asyncio
+import os
 import re
 import json
 import base64
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
@@ -19,9 +30,69 @@ from collections import defaultdict, deque
 from src.utils.logging import get_logger
 from src.utils.exceptions import ValidationError
 
+# The regex parser is private to the re module; without it injection
+# patterns are not screened by literals and always run in full
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    try:
+        import sre_parse
+    except ImportError:
+        sre_parse = None
+
 
 logger = get_logger(__name__)
 
+_INJECTION_FLAGS = re.IGNORECASE | re.MULTILINE
+_INJECTION_REPLACEMENT = '[SANITIZED_INJECTION]'
+
+_VALID_TIMESTAMP_RES = tuple(re.compile(pattern) for pattern in (
+    r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}',  # ISO format
+    r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}',      # US format
+    r'\d{10,13}',                                  # Unix timestamp
+    r'\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2}'        # Syslog format
+))
+
+# ASCII characters that are neither printable nor whitespace
+_NON_PRINTABLE_ASCII_RE = re.compile('[%s]' % re.escape(''.join(
+    chr(i) for i in range(128) if not (chr(i).isprintable() or chr(i).isspace())
+)))
+# Control characters other than tab, newline and carriage return
+_CONTROL_CHARS_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_UNQUOTED_KEY_RE = re.compile(r'(\w+):')
+_LOG_TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})')
+_LOG_LEVEL_PATTERN = r'\b(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b'
+_LOG_LEVEL_RE = re.compile(_LOG_LEVEL_PATTERN, re.IGNORECASE)
+# Case-sensitive twin for uppercased ASCII text, where positions are unchanged
+_LOG_LEVEL_UPPER_RE = re.compile(_LOG_LEVEL_PATTERN)
+
+_DIGITS_RE = re.compile(r'\d+')
+_UUID_RE = re.compile(r'\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+_FREQUENCY_WINDOW = timedelta(seconds=60)
+
+_SUSPICIOUS_KEYWORDS = (
+    'password', 'secret', 'token', 'key', 'credential',
+    'exploit', 'vulnerability', 'attack', 'malware',
+    'unauthorized', 'breach', 'compromise'
+)
+
+# "YYYY-MM-DD[T ]HH:MM:SS[.ffffff][Z]", which _TIMESTAMP_FORMATS either parses
+# as written or (T without Z, or a space with Z) does not parse at all
+_ISO_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})([T ])(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z?)')
+
+_TIMESTAMP_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S'
+)
+
 
 class LogCorruptionType(Enum):
     """Types of log corruption detected."""
@@ -45,6 +116,18 @@ class LogAnomalyType(Enum):
     SOURCE_ANOMALY = "source_anomaly"
 
 
+_CRITICAL_CORRUPTIONS = (
+    LogCorruptionType.BINARY_DATA,
+    LogCorruptionType.INJECTION_ATTEMPT,
+    LogCorruptionType.OVERSIZED_ENTRY
+)
+
+_SEVERE_ANOMALIES = (
+    LogAnomalyType.SUSPICIOUS_CONTENT,
+    LogAnomalyType.FREQUENCY_SPIKE
+)
+
+
 @dataclass
 class LogEntry:
     """Structured log entry after processing."""
@@ -71,14 +154,41 @@ class SanitizationResult:
     rejection_reason: Optional[str] = None
 
 
+@dataclass
+class _InjectionRule:
+    """Compiled injection pattern with the lowercase substrings any match must contain."""
+    injection_type: str
+    regex: re.Pattern
+    literals: Tuple[str, ...]
+
+
+@dataclass
+class _PreparedEntry:
+    """Outcome of the stateless sanitization steps for one raw entry."""
+    corruptions_found: List[LogCorruptionType]
+    sanitization_applied: List[str]
+    log_entry: Optional[LogEntry] = None
+    rejection_reason: Optional[str] = None
+    error: Optional[str] = None
+
+
 class LogSanitizationPipeline:
     """
     Advanced log sanitization pipeline with corruption detection,
     sanitization, and anomaly filtering capabilities.
     """
     
-    def __init__(self):
+    def __init__(self, process_pool_threshold: int = 5000, max_workers: Optional[int] = None):
+        """
+        Args:
+            process_pool_threshold: Batch size from which the stateless
+                sanitization steps are split across a process pool
+            max_workers: Process pool size (defaults to CPU count)
+        """
         self.logger = logger
+        self.process_pool_threshold = process_pool_threshold
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
         
         # Sanitization configuration
         self.max_log_size = 10 * 1024 * 1024  # 10MB max per log entry
@@ -123,11 +233,22 @@ class LogSanitizationPipeline:
             ]
         }
         
-        # Anomaly detection state
+        # Compiled from injection_patterns; edits apply from the next sanitize call
+        self._injection_rules: List[_InjectionRule] = []
+        self._injection_keys: Optional[re.Pattern] = None
+        self._injection_key: Optional[tuple] = None
+        self._refresh_injection_rules()
+        
+        # Anomaly detection state; log_frequency_history only holds the last minute
         self.log_frequency_history = deque(maxlen=1000)
         self.pattern_frequency = defaultdict(int)
         self.source_frequency = defaultdict(int)
         self.size_history = deque(maxlen=100)
+        self._size_total = 0
+        self._pattern_total = 0
+        
+        # Last JSON parse, reused while one entry is checked, repaired and parsed
+        self._json_memo: Optional[Tuple[str, Any, Optional[Exception]]] = None
         
         # Sanitization statistics
         self.sanitization_stats = {
@@ -139,12 +260,25 @@ class LogSanitizationPipeline:
         }
     
     async def process_log_batch(self, log_entries: List[str]) -> List[SanitizationResult]:
-        """Process a batch of log entries through the sanitization pipeline."""
-        results = []
+        """
+        Process a batch of log entries through the sanitization pipeline.
+        
+        The stateless steps run for the whole batch first, on a process pool
+        when the batch is large; anomaly detection then runs entry by entry
+        in order, so results are the same as sanitizing one at a time.
+        """
+        self._refresh_injection_rules()
+        if len(log_entries) >= self.process_pool_threshold:
+            prepared = await self._prepare_in_process_pool(log_entries)
+        else:
+            prepared = [self._prepare_entry_safely(entry) for entry in log_entries]
         
-        for entry in log_entries:
+        results = []
+        for entry, item in zip(log_entries, prepared):
             try:
-                result = await self.sanitize_log_entry(entry)
+                if item.error is not None:
+                    raise RuntimeError(item.error)
+                result = self._finish_entry(entry, item)
                 results.append(result)
                 
                 # Update statistics
@@ -166,8 +300,19 @@ class LogSanitizationPipeline:
     
     async def sanitize_log_entry(self, raw_entry: str) -> SanitizationResult:
         """Sanitize a single log entry."""
+        self._refresh_injection_rules()
+        return self._finish_entry(raw_entry, self._prepare_entry(raw_entry))
+    
+    def _prepare_entry_safely(self, raw_entry: str) -> _PreparedEntry:
+        """Stateless steps, reporting an exception instead of raising it."""
+        try:
+            return self._prepare_entry(raw_entry)
+        except Exception as e:
+            return _PreparedEntry(corruptions_found=[], sanitization_applied=[], error=str(e))
+    
+    def _prepare_entry(self, raw_entry: str) -> _PreparedEntry:
+        """Corruption checks, sanitization and parsing; touches no pipeline state."""
         corruptions_found = []
-        anomalies_found = []
         sanitization_applied = []
         
         # Step 1: Basic validation and corruption detection
@@ -177,15 +322,8 @@ class LogSanitizationPipeline:
         # Step 2: Size validation
         if len(raw_entry) > self.max_log_size:
             corruptions_found.append(LogCorruptionType.OVERSIZED_ENTRY)
-            return SanitizationResult(
-                original_entry=raw_entry[:100] + "...",
-                sanitized_entry=None,
-                corruptions_found=corruptions_found,
-                anomalies_found=anomalies_found,
-                sanitization_applied=sanitization_applied,
-                rejected=True,
-                rejection_reason="Entry exceeds maximum size limit"
-            )
+            return _PreparedEntry(corruptions_found, sanitization_applied,
+                                  rejection_reason="Entry exceeds maximum size limit")
         
         # Step 3: Encoding sanitization
         sanitized_text, encoding_applied = self._sanitize_encoding(raw_entry)
@@ -211,6 +349,21 @@ class LogSanitizationPipeline:
             log_entry.corruption_detected = corruptions_found
             
         except Exception as e:
+            return _PreparedEntry(corruptions_found, sanitization_applied,
+                                  rejection_reason=f"Failed to parse log entry: {str(e)}")
+        finally:
+            self._json_memo = None
+        
+        return _PreparedEntry(corruptions_found, sanitization_applied, log_entry=log_entry)
+    
+    def _finish_entry(self, raw_entry: str, prepared: _PreparedEntry) -> SanitizationResult:
+        """Anomaly detection and the final verdict, in submission order."""
+        corruptions_found = prepared.corruptions_found
+        sanitization_applied = prepared.sanitization_applied
+        anomalies_found = []
+        
+        log_entry = prepared.log_entry
+        if log_entry is None:
             return SanitizationResult(
                 original_entry=raw_entry[:100] + "...",
                 sanitized_entry=None,
@@ -218,7 +371,7 @@ class LogSanitizationPipeline:
                 anomalies_found=anomalies_found,
                 sanitization_applied=sanitization_applied,
                 rejected=True,
-                rejection_reason=f"Failed to parse log entry: {str(e)}"
+                rejection_reason=prepared.rejection_reason
             )
         
         # Step 7: Anomaly detection
@@ -246,6 +399,33 @@ class LogSanitizationPipeline:
             rejected=False
         )
     
+    async def _prepare_in_process_pool(self, log_entries: List[str]) -> List[_PreparedEntry]:
+        """Split the stateless steps of a large batch across worker processes."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        
+        workers = self.max_workers or os.cpu_count() or 1
+        chunk_size = -(-len(log_entries) // workers)
+        settings = self._worker_settings()
+        
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _prepare_batch, settings, log_entries[i:i + chunk_size])
+            for i in range(0, len(log_entries), chunk_size)
+        ])
+        return [item for chunk in chunks for item in chunk]
+    
+    def _worker_settings(self) -> tuple:
+        """Configuration a worker process needs to rebuild this pipeline."""
+        return (self.max_log_size, self.max_message_length, tuple(self.encoding_whitelist),
+                self._injection_settings())
+    
+    def close(self) -> None:
+        """Shut down the sanitization process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
     def _detect_corruption(self, entry: str) -> List[LogCorruptionType]:
         """Detect various types of corruption in log entry."""
         corruptions = []
@@ -255,10 +435,11 @@ class LogSanitizationPipeline:
             corruptions.append(LogCorruptionType.BINARY_DATA)
         
         # Encoding error detection
-        try:
-            entry.encode('utf-8').decode('utf-8')
-        except UnicodeError:
-            corruptions.append(LogCorruptionType.ENCODING_ERROR)
+        if not entry.isascii():
+            try:
+                entry.encode('utf-8').decode('utf-8')
+            except UnicodeError:
+                corruptions.append(LogCorruptionType.ENCODING_ERROR)
         
         # Malformed JSON detection (if entry looks like JSON)
         if entry.strip().startswith('{') and not self._is_valid_json(entry):
@@ -281,11 +462,18 @@ class LogSanitizationPipeline:
             return True
         
         # Check for high ratio of non-printable characters
-        printable_chars = sum(1 for c in text if c.isprintable() or c.isspace())
-        if len(text) > 0 and (printable_chars / len(text)) < 0.8:
-            return True
+        if not text.isprintable():
+            if text.isascii():
+                non_printable = len(_NON_PRINTABLE_ASCII_RE.findall(text))
+            else:
+                non_printable = sum(1 for c in text if not (c.isprintable() or c.isspace()))
+            if (len(text) - non_printable) / len(text) < 0.8:
+                return True
         
-        # Check for common binary file signatures
+        # Check for common binary file signatures; in ASCII text only the
+        # 'PK' of the zip signatures can occur
+        if text.isascii():
+            return 'PK' in text
         binary_signatures = [b'\x89PNG', b'\xFF\xD8\xFF', b'PK\x03\x04', b'\x50\x4B']
         text_bytes = text.encode('utf-8', errors='ignore')
         for sig in binary_signatures:
@@ -297,11 +485,24 @@ class LogSanitizationPipeline:
     def _is_valid_json(self, text: str) -> bool:
         """Check if text is valid JSON."""
         try:
-            json.loads(text)
+            self._loads_json(text)
             return True
         except (json.JSONDecodeError, ValueError):
             return False
     
+    def _loads_json(self, text: str) -> Any:
+        """json.loads, remembering the last text so one entry is parsed once."""
+        memo = self._json_memo
+        if memo is None or memo[0] is not text:
+            try:
+                memo = (text, json.loads(text), None)
+            except Exception as e:
+                memo = (text, None, e)
+            self._json_memo = memo
+        if memo[2] is not None:
+            raise memo[2]
+        return memo[1]
+    
     def _is_truncated_entry(self, entry: str) -> bool:
         """Detect if log entry appears to be truncated."""
         # Check for incomplete JSON structures
@@ -320,16 +521,8 @@ class LogSanitizationPipeline:
     
     def _has_valid_timestamp(self, entry: str) -> bool:
         """Check if entry has a valid timestamp."""
-        # Common timestamp patterns
-        timestamp_patterns = [
-            r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}',  # ISO format
-            r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}',      # US format
-            r'\d{10,13}',                                  # Unix timestamp
-            r'\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2}'        # Syslog format
-        ]
-        
-        for pattern in timestamp_patterns:
-            if re.search(pattern, entry):
+        for pattern in _VALID_TIMESTAMP_RES:
+            if pattern.search(entry):
                 return True
         
         return False
@@ -354,46 +547,79 @@ class LogSanitizationPipeline:
                 text = text.decode('utf-8', errors='replace')
                 applied = True
             
-            # Normalize unicode characters
-            normalized = unicodedata.normalize('NFKC', text)
-            if normalized != text:
-                applied = True
-                text = normalized
+            # Normalize unicode characters (ASCII is already NFKC)
+            if not text.isascii():
+                normalized = unicodedata.normalize('NFKC', text)
+                if normalized != text:
+                    applied = True
+                    text = normalized
             
-            # Remove or replace problematic characters
-            # Remove null bytes
-            if '\x00' in text:
-                text = text.replace('\x00', '')
+            # Remove null bytes and other control characters (except \n, \r, \t)
+            text, removed = _CONTROL_CHARS_RE.subn('', text)
+            if removed:
                 applied = True
             
-            # Replace other control characters (except common ones like \n, \t)
-            control_chars = ''.join(chr(i) for i in range(32) if i not in [9, 10, 13])
-            for char in control_chars:
-                if char in text:
-                    text = text.replace(char, '')
-                    applied = True
-            
         except Exception as e:
             self.logger.warning(f"Encoding sanitization error: {e}")
         
         return text, applied
     
     def _sanitize_injections(self, text: str) -> Tuple[str, List[str]]:
-        """Detect and sanitize injection attempts."""
+        """
+        Detect and sanitize injection attempts.
+        
+        Patterns apply in order, each to the output of the previous one. For
+        ASCII text a pattern is skipped when the lowercased text lacks one of
+        the substrings every match of it must contain, and the whole loop is
+        skipped when no pattern's first such substring occurs.
+        """
         applied = []
         sanitized_text = text
-        
-        for injection_type, patterns in self.injection_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, sanitized_text, re.IGNORECASE | re.MULTILINE)
-                if matches:
-                    # Replace with sanitized version
-                    sanitized_text = re.sub(pattern, '[SANITIZED_INJECTION]', sanitized_text, flags=re.IGNORECASE | re.MULTILINE)
-                    applied.append(f"{injection_type}_sanitization")
-                    self.logger.warning(f"Detected and sanitized {injection_type}: {matches}")
+        screen = text.isascii()
+        lowered = text.lower() if screen else None
+        if screen and self._injection_keys is not None and not self._injection_keys.search(lowered):
+            return sanitized_text, applied
+        
+        for rule in self._injection_rules:
+            if screen:
+                for literal in rule.literals:
+                    if literal not in lowered:
+                        break
+                else:
+                    literal = None
+                if literal is not None:
+                    continue
+            matches = rule.regex.findall(sanitized_text)
+            if matches:
+                # Replace with sanitized version
+                sanitized_text = rule.regex.sub(_INJECTION_REPLACEMENT, sanitized_text)
+                applied.append(f"{rule.injection_type}_sanitization")
+                self.logger.warning(f"Detected and sanitized {rule.injection_type}: {matches}")
+                if screen:
+                    lowered = sanitized_text.lower()
         
         return sanitized_text, applied
     
+    def _injection_settings(self) -> tuple:
+        return tuple((name, tuple(patterns)) for name, patterns in self.injection_patterns.items())
+    
+    def _refresh_injection_rules(self) -> List[_InjectionRule]:
+        """Compiled injection rules, rebuilt when injection_patterns has changed."""
+        key = self._injection_settings()
+        if key != self._injection_key:
+            self._injection_rules = [
+                _InjectionRule(name, re.compile(pattern, _INJECTION_FLAGS), _required_literals(pattern))
+                for name, patterns in key
+                for pattern in patterns
+            ]
+            # Only usable when every rule has a required substring
+            first_literals = [rule.literals[0] for rule in self._injection_rules if rule.literals]
+            self._injection_keys = None
+            if first_literals and len(first_literals) == len(self._injection_rules):
+                self._injection_keys = re.compile('|'.join(map(re.escape, sorted(set(first_literals)))))
+            self._injection_key = key
+        return self._injection_rules
+    
     def _sanitize_json_structure(self, text: str) -> Tuple[str, bool]:
         """Attempt to repair malformed JSON structures."""
         applied = False
@@ -403,7 +629,7 @@ class LogSanitizationPipeline:
         
         try:
             # Try to parse as-is first
-            json.loads(text)
+            self._loads_json(text)
             return text, applied
         except json.JSONDecodeError:
             pass
@@ -413,10 +639,10 @@ class LogSanitizationPipeline:
         
         # Fix common JSON issues
         # Remove trailing commas
-        repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
+        repaired = _TRAILING_COMMA_RE.sub(r'\1', repaired)
         
         # Fix unquoted keys
-        repaired = re.sub(r'(\w+):', r'"\1":', repaired)
+        repaired = _UNQUOTED_KEY_RE.sub(r'"\1":', repaired)
         
         # Fix single quotes to double quotes
         repaired = repaired.replace("'", '"')
@@ -454,11 +680,23 @@ class LogSanitizationPipeline:
         # Try to parse as JSON first
         if text.strip().startswith('{'):
             try:
-                data = json.loads(text)
+                data = self._loads_json(text)
+                # Fallbacks are only built when the keys are missing; a
+                # missing timestamp parses to the current time
+                if 'timestamp' in data:
+                    timestamp = self._parse_timestamp(data['timestamp'])
+                elif 'time' in data:
+                    timestamp = self._parse_timestamp(data['time'])
+                else:
+                    timestamp = datetime.utcnow()
+                if 'message' in data:
+                    message = data['message']
+                else:
+                    message = data['msg'] if 'msg' in data else str(data)
                 return LogEntry(
-                    timestamp=self._parse_timestamp(data.get('timestamp', data.get('time', datetime.utcnow().isoformat()))),
+                    timestamp=timestamp,
                     level=data.get('level', data.get('severity', 'INFO')),
-                    message=data.get('message', data.get('msg', str(data))),
+                    message=message,
                     source=data.get('source', data.get('logger', 'unknown')),
                     metadata={k: v for k, v in data.items() if k not in ['timestamp', 'time', 'level', 'severity', 'message', 'msg', 'source', 'logger']}
                 )
@@ -466,10 +704,13 @@ class LogSanitizationPipeline:
                 pass
         
         # Parse as structured text log
-        timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})', text)
-        level_match = re.search(r'\b(DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\b', text, re.IGNORECASE)
+        timestamp_match = _LOG_TIMESTAMP_RE.search(text)
+        if text.isascii():
+            level_match = _LOG_LEVEL_UPPER_RE.search(text.upper())
+        else:
+            level_match = _LOG_LEVEL_RE.search(text)
         
-        timestamp = self._parse_timestamp(timestamp_match.group(1) if timestamp_match else datetime.utcnow().isoformat())
+        timestamp = self._parse_timestamp(timestamp_match.group(1)) if timestamp_match else datetime.utcnow()
         level = level_match.group(1).upper() if level_match else 'INFO'
         
         # Extract message (everything after timestamp and level)
@@ -489,31 +730,15 @@ class LogSanitizationPipeline:
     
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse timestamp from various formats."""
-        timestamp_formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d %H:%M:%S.%f',
-            '%Y-%m-%d %H:%M:%S',
-            '%m/%d/%Y %H:%M:%S',
-            '%d/%m/%Y %H:%M:%S'
-        ]
-        
-        for fmt in timestamp_formats:
-            try:
-                return datetime.strptime(timestamp_str, fmt)
-            except ValueError:
-                continue
-        
-        # Try unix timestamp
-        try:
-            timestamp_float = float(timestamp_str)
-            if timestamp_float > 1000000000:  # Reasonable unix timestamp
-                return datetime.fromtimestamp(timestamp_float)
-        except (ValueError, OSError):
-            pass
+        if isinstance(timestamp_str, str):
+            parsed = _parse_iso_timestamp(timestamp_str)
+            if parsed is _UNPARSED:
+                parsed = _parse_timestamp_string(timestamp_str)
+        else:
+            parsed = _parse_timestamp_uncached(timestamp_str)
         
         # Fallback to current time
-        return datetime.utcnow()
+        return parsed if parsed is not None else datetime.utcnow()
     
     def _detect_anomalies(self, log_entry: LogEntry) -> List[LogAnomalyType]:
         """Detect anomalies in the log entry."""
@@ -521,29 +746,30 @@ class LogSanitizationPipeline:
         
         # Frequency spike detection
         current_time = datetime.utcnow()
-        self.log_frequency_history.append(current_time)
-        
-        # Check for frequency spikes (more than 100 logs per minute)
-        recent_logs = [t for t in self.log_frequency_history if (current_time - t).total_seconds() < 60]
-        if len(recent_logs) > 100:
+        history = self.log_frequency_history
+        history.append(current_time)
+        
+        # Check for frequency spikes (more than 100 logs per minute); entries
+        # leave the window from the left, so its length is the count
+        window_start = current_time - _FREQUENCY_WINDOW
+        while history[0] <= window_start:
+            history.popleft()
+        if len(history) > 100:
             anomalies.append(LogAnomalyType.FREQUENCY_SPIKE)
         
-        # Size anomaly detection
+        # Size anomaly detection, keeping a running total of the window
+        if len(self.size_history) == self.size_history.maxlen:
+            self._size_total -= self.size_history[0]
         self.size_history.append(log_entry.original_size)
+        self._size_total += log_entry.original_size
         if len(self.size_history) >= 10:
-            avg_size = sum(self.size_history) / len(self.size_history)
+            avg_size = self._size_total / len(self.size_history)
             if log_entry.original_size > avg_size * 5:  # 5x larger than average
                 anomalies.append(LogAnomalyType.SIZE_ANOMALY)
         
         # Suspicious content detection
-        suspicious_keywords = [
-            'password', 'secret', 'token', 'key', 'credential',
-            'exploit', 'vulnerability', 'attack', 'malware',
-            'unauthorized', 'breach', 'compromise'
-        ]
-        
         message_lower = log_entry.message.lower()
-        for keyword in suspicious_keywords:
+        for keyword in _SUSPICIOUS_KEYWORDS:
             if keyword in message_lower:
                 anomalies.append(LogAnomalyType.SUSPICIOUS_CONTENT)
                 break
@@ -551,10 +777,10 @@ class LogSanitizationPipeline:
         # Pattern frequency analysis
         message_pattern = self._extract_pattern(log_entry.message)
         self.pattern_frequency[message_pattern] += 1
+        self._pattern_total += 1
         
         # Unusual pattern detection (very rare patterns)
-        total_patterns = sum(self.pattern_frequency.values())
-        if total_patterns > 100 and self.pattern_frequency[message_pattern] == 1:
+        if self._pattern_total > 100 and self.pattern_frequency[message_pattern] == 1:
             anomalies.append(LogAnomalyType.UNUSUAL_PATTERN)
         
         # Source anomaly detection
@@ -572,12 +798,14 @@ class LogSanitizationPipeline:
     def _extract_pattern(self, message: str) -> str:
         """Extract a pattern from log message for frequency analysis."""
         # Replace numbers with placeholder
-        pattern = re.sub(r'\d+', 'NUM', message)
+        pattern = _DIGITS_RE.sub('NUM', message)
         
-        # Replace common variable parts
-        pattern = re.sub(r'\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b', 'UUID', pattern)
-        pattern = re.sub(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', 'IP', pattern)
-        pattern = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 'EMAIL', pattern)
+        # Replace common variable parts. IP addresses need digits, which are
+        # already gone, so only digit-free UUIDs and emails are left to find.
+        if '-' in pattern:
+            pattern = _UUID_RE.sub('UUID', pattern)
+        if '@' in pattern:
+            pattern = _EMAIL_RE.sub('EMAIL', pattern)
         
         # Truncate to reasonable length
         return pattern[:100]
@@ -586,22 +814,12 @@ class LogSanitizationPipeline:
                            anomalies: List[LogAnomalyType]) -> bool:
         """Determine if log entry should be rejected."""
         # Reject if critical corruptions detected
-        critical_corruptions = [
-            LogCorruptionType.BINARY_DATA,
-            LogCorruptionType.INJECTION_ATTEMPT,
-            LogCorruptionType.OVERSIZED_ENTRY
-        ]
-        
-        if any(corruption in corruptions for corruption in critical_corruptions):
-            return True
+        for corruption in corruptions:
+            if corruption in _CRITICAL_CORRUPTIONS:
+                return True
         
         # Reject if multiple severe anomalies
-        severe_anomalies = [
-            LogAnomalyType.SUSPICIOUS_CONTENT,
-            LogAnomalyType.FREQUENCY_SPIKE
-        ]
-        
-        severe_count = sum(1 for anomaly in anomalies if anomaly in severe_anomalies)
+        severe_count = sum(1 for anomaly in anomalies if anomaly in _SEVERE_ANOMALIES)
         if severe_count >= 2:
             return True
         
@@ -640,4 +858,101 @@ class LogSanitizationPipeline:
                                      key=lambda x: x[1], default=(None, 0))[0],
             "pattern_diversity": len(self.pattern_frequency),
             "source_diversity": len(self.source_frequency)
-        }
\ No newline at end of file
+        }
+
+
+def _required_literals(pattern: str) -> Tuple[str, ...]:
+    """
+    Lowercase ASCII substrings that every case-insensitive match of pattern
+    contains, taken from the literal runs of its top-level sequence. Empty if
+    the regex parser is unavailable or its output is not understood.
+    """
+    if sre_parse is None:
+        return ()
+    literals = []
+    
+    def walk(items) -> None:
+        run = []
+        for op, av in items:
+            if op is sre_parse.LITERAL and av < 128:
+                run.append(chr(av).lower())
+                continue
+            if run:
+                literals.append(''.join(run))
+                run = []
+            if op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+        if run:
+            literals.append(''.join(run))
+    
+    try:
+        walk(sre_parse.parse(pattern, _INJECTION_FLAGS))
+    except Exception as e:
+        logger.debug(f"Cannot extract literals from injection pattern {pattern!r}: {e}")
+        return ()
+    # Most selective first: punctuation is rarer in log text than words, then longer
+    return tuple(sorted(set(literals), key=lambda literal: (not literal.isalnum(), len(literal)), reverse=True))
+
+
+def _parse_timestamp_uncached(timestamp_str) -> Optional[datetime]:
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp_str, fmt)
+        except ValueError:
+            continue
+    
+    # Try unix timestamp
+    try:
+        timestamp_float = float(timestamp_str)
+        if timestamp_float > 1000000000:  # Reasonable unix timestamp
+            return datetime.fromtimestamp(timestamp_float)
+    except (ValueError, OSError):
+        pass
+    
+    return None
+
+
+_UNPARSED = object()
+
+
+def _parse_iso_timestamp(timestamp_str: str):
+    """
+    What _TIMESTAMP_FORMATS gives for a strict ISO timestamp, without
+    strptime; _UNPARSED when the string is not one.
+    """
+    match = _ISO_TIMESTAMP_RE.fullmatch(timestamp_str)
+    if match is None:
+        return _UNPARSED
+    year, month, day, separator, hour, minute, second, fraction, zulu = match.groups()
+    if (separator == 'T') != bool(zulu):
+        return None
+    try:
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                        int(fraction.ljust(6, '0')) if fraction else 0)
+    except ValueError:
+        return _UNPARSED
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_string(timestamp_str: str) -> Optional[datetime]:
+    """Parsed timestamp, or None when no format applies; log timestamps repeat heavily."""
+    return _parse_timestamp_uncached(timestamp_str)
+
+
+# Pipelines rebuilt inside worker processes, keyed by their settings
+_WORKER_PIPELINES: Dict[tuple, LogSanitizationPipeline] = {}
+
+
+def _prepare_batch(settings: tuple, log_entries: List[str]) -> List[_PreparedEntry]:
+    """Run the stateless sanitization steps for a chunk in a worker process."""
+    pipeline = _WORKER_PIPELINES.get(settings)
+    if pipeline is None:
+        max_log_size, max_message_length, encoding_whitelist, injection_patterns = settings
+        pipeline = LogSanitizationPipeline()
+        pipeline.max_log_size = max_log_size
+        pipeline.max_message_length = max_message_length
+        pipeline.encoding_whitelist = list(encoding_whitelist)
+        pipeline.injection_patterns = {name: list(patterns) for name, patterns in injection_patterns}
+        pipeline._refresh_injection_rules()
+        _WORKER_PIPELINES[settings] = pipeline
+    return [pipeline._prepare_entry_safely(entry) for entry in log_entries]
@@ -6,11 +6,12 @@ import asyncio
 import json
 import os
 import random
+import socket
 import time
 from collections import defaultdict
 from contextlib import suppress
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Awaitable, Dict, Iterable, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from uuid import uuid4
@@ -23,6 +24,7 @@ from src.models.agent import AgentMessage, AgentType
 from src.services.aws import AWSServiceFactory
 from src.services.circuit_breaker import circuit_breaker_manager
 from src.utils.config import config
+from src.utils.constants import MESSAGE_BUS_CONFIG
 from src.utils.logging import get_logger
 from src.utils.exceptions import MessageBusError, MessageDeliveryError
 
@@ -95,11 +97,32 @@ class MessageEnvelope:
         return self.retry_count < self.max_retries and not self.is_expired()
 
 
+@dataclass
+class StreamEntry:
+    """Envelope read from a Redis stream, pending until acknowledged."""
+    stream: str
+    entry_id: str
+    envelope: MessageEnvelope
+
+
 class ResilientMessageBus:
     """Resilient message bus with Redis and SQS backends."""
     
-    def __init__(self, service_factory: AWSServiceFactory):
-        """Initialize message bus."""
+    def __init__(self, service_factory: AWSServiceFactory, receive_batch_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None, redis_block_seconds: Optional[float] = None,
+                 sqs_wait_seconds: Optional[int] = None, redis_transport: Optional[str] = None):
+        """
+        Initialize message bus.
+        
+        Args:
+            service_factory: AWS service factory for SQS
+            receive_batch_size: Messages drained per Redis round trip
+            max_concurrency: Handlers running at once per subscribed agent
+            redis_block_seconds: How long an idle Redis receive blocks
+            sqs_wait_seconds: SQS long poll duration
+            redis_transport: "list" for destructive pops, "streams" for
+                consumer groups with explicit acknowledgement
+        """
         self._service_factory = service_factory
         self._redis_client = None
         self._sqs_client = None
@@ -109,6 +132,27 @@ class ResilientMessageBus:
         self._redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
         self._queue_prefix = "incident_commander"
         self._dlq_suffix = "_dlq"
+        self._receive_batch_size = receive_batch_size or MESSAGE_BUS_CONFIG["receive_batch_size"]
+        self._max_concurrency = max_concurrency or MESSAGE_BUS_CONFIG["max_concurrency"]
+        self._redis_block_seconds = redis_block_seconds or MESSAGE_BUS_CONFIG["redis_block_seconds"]
+        self._sqs_wait_seconds = (
+            sqs_wait_seconds if sqs_wait_seconds is not None else MESSAGE_BUS_CONFIG["sqs_wait_seconds"]
+        )
+        self._sqs_idle_delay = MESSAGE_BUS_CONFIG["sqs_idle_delay_seconds"]
+        self._redis_supports_blmpop = True
+        self._sqs_queue_urls: Dict[str, str] = {}
+
+        # Redis Streams transport
+        self._redis_transport = redis_transport or os.getenv(
+            "MESSAGE_BUS_REDIS_TRANSPORT", MESSAGE_BUS_CONFIG["redis_transport"]
+        )
+        if self._redis_transport not in ("list", "streams"):
+            raise ValueError(f"Unknown Redis transport: {self._redis_transport}")
+        self._stream_maxlen = MESSAGE_BUS_CONFIG["stream_maxlen"]
+        self._reclaim_idle_ms = int(MESSAGE_BUS_CONFIG["reclaim_idle_seconds"] * 1000)
+        self._reclaim_interval = MESSAGE_BUS_CONFIG["reclaim_interval_seconds"]
+        self._consumer_name = f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+        self._stream_groups_ready: Set[str] = set()
 
         # Message handlers
         self._message_handlers: Dict[str, Callable] = {}
@@ -124,7 +168,9 @@ class ResilientMessageBus:
             "delivered": 0,
             "failed": 0,
             "retried": 0,
-            "dlq_messages": 0
+            "dlq_messages": 0,
+            "received": 0,
+            "receive_batches": 0
         }
         
         # Circuit breaker for message bus health
@@ -175,6 +221,15 @@ class ResilientMessageBus:
         """Get dead letter queue name for agent."""
         return f"{self._queue_prefix}_{agent_name}{self._dlq_suffix}"
     
+    def _get_stream_names(self, agent_name: str) -> Tuple[str, str]:
+        """Get the priority and normal stream names for agent, read in that order."""
+        queue_name = self._get_queue_name(agent_name)
+        return f"{queue_name}:stream:priority", f"{queue_name}:stream"
+    
+    def _get_consumer_group(self, agent_name: str) -> str:
+        """Get the consumer group shared by all subscribers of an agent."""
+        return f"{self._get_queue_name(agent_name)}_group"
+    
     async def send_with_resilience(self, message: AgentMessage, target_agent: str,
                                   priority: MessagePriority = MessagePriority.MEDIUM,
                                   ttl_seconds: int = 300) -> str:
@@ -277,14 +332,26 @@ class ResilientMessageBus:
         queue_name = self._get_queue_name(envelope.recipient_agent)
         message_data = json.dumps(envelope.to_dict())
 
+        is_priority = envelope.priority in [MessagePriority.HIGH, MessagePriority.CRITICAL]
+
         try:
-            if envelope.priority in [MessagePriority.HIGH, MessagePriority.CRITICAL]:
-                await redis_client.lpush(queue_name, message_data)
+            if self._redis_transport == "streams":
+                # Streams keep their consumer groups, so they are trimmed rather than expired
+                priority_stream, normal_stream = self._get_stream_names(envelope.recipient_agent)
+                await redis_client.xadd(
+                    priority_stream if is_priority else normal_stream,
+                    {"envelope": message_data},
+                    maxlen=self._stream_maxlen,
+                    approximate=True
+                )
             else:
-                await redis_client.rpush(queue_name, message_data)
+                if is_priority:
+                    await redis_client.lpush(queue_name, message_data)
+                else:
+                    await redis_client.rpush(queue_name, message_data)
 
-            ttl_seconds = max(1, int(envelope.expires_at.timestamp() - datetime.utcnow().timestamp()))
-            await redis_client.expire(queue_name, ttl_seconds)
+                ttl_seconds = max(1, int(envelope.expires_at.timestamp() - datetime.utcnow().timestamp()))
+                await redis_client.expire(queue_name, ttl_seconds)
             self._message_breaker.record_success()
 
         except Exception as exc:
@@ -328,9 +395,13 @@ class ResilientMessageBus:
         sqs_client = await self._get_sqs_client()
 
         queue_name = self._get_dlq_name(agent_name) if dlq else self._get_queue_name(agent_name)
+        cached_url = self._sqs_queue_urls.get(queue_name)
+        if cached_url:
+            return cached_url
 
         try:
             response = await sqs_client.get_queue_url(QueueName=queue_name)
+            self._sqs_queue_urls[queue_name] = response["QueueUrl"]
             return response["QueueUrl"]
 
         except ClientError as e:
@@ -361,6 +432,7 @@ class ResilientMessageBus:
                 Attributes=attributes
             )
             logger.info(f"Created SQS queue {queue_name}")
+            self._sqs_queue_urls[queue_name] = response["QueueUrl"]
             return response["QueueUrl"]
     
     async def subscribe(self, agent_name: str, 
@@ -399,127 +471,352 @@ class ResilientMessageBus:
         logger.info(f"Agent {agent_name} unsubscribed from message bus")
     
     async def _message_subscriber(self, agent_name: str) -> None:
-        """Message subscriber loop for an agent."""
-        while not self._shutdown:
+        """
+        Message subscriber for an agent.
+        
+        Redis and SQS are received from in parallel, each draining a batch
+        per round trip, and messages are handled by at most
+        ``max_concurrency`` concurrent handler calls. With the streams
+        transport a third loop reclaims entries left pending by failed
+        handlers or crashed consumers.
+        """
+        slots = asyncio.Semaphore(self._max_concurrency)
+        handlers: Set[asyncio.Task] = set()
+        # asyncio.wait_for (used by redis-py socket timeouts) can swallow a
+        # cancellation on Python 3.11, so receivers also watch this event
+        stopping = asyncio.Event()
+        if self._redis_transport == "streams":
+            sources = [
+                ("redis", self._receive_batch_from_stream, self._process_stream_entry),
+                ("redis-reclaim", self._reclaim_batch_from_stream, self._process_stream_entry)
+            ]
+        else:
+            sources = [("redis", self._receive_batch_from_redis, self._process_message)]
+        sources.append(("sqs", self._receive_batch_from_sqs, self._process_message))
+        receivers = [
+            asyncio.create_task(self._receive_loop(agent_name, source, receive, process, slots, handlers, stopping))
+            for source, receive, process in sources
+        ]
+        
+        try:
+            await asyncio.gather(*receivers)
+        except asyncio.CancelledError:
+            logger.info(f"Message subscriber for {agent_name} cancelled")
+        finally:
+            stopping.set()
+            for task in receivers + list(handlers):
+                task.cancel()
+            await asyncio.gather(*receivers, *handlers, return_exceptions=True)
+
+        logger.info(f"Message subscriber for {agent_name} stopped (shutdown={self._shutdown})")
+    
+    async def _receive_loop(self, agent_name: str, source: str,
+                            receive: Callable[[str, int], Awaitable[List[Any]]],
+                            process: Callable[[str, Any], Awaitable[None]],
+                            slots: asyncio.Semaphore, handlers: Set[asyncio.Task],
+                            stopping: asyncio.Event) -> None:
+        """Receive batches from one transport and hand each message to a handler slot."""
+        failure_key = f"{agent_name}:{source}"
+        while not self._shutdown and not stopping.is_set():
             try:
-                # Try Redis first
-                message = await self._receive_from_redis(agent_name)
-                
-                if not message:
-                    # Fallback to SQS
-                    message = await self._receive_from_sqs(agent_name)
-                
-                if message:
-                    await self._process_message(agent_name, message)
-                    self._subscriber_failures[agent_name] = 0
-                else:
-                    # No messages, brief pause
-                    await asyncio.sleep(0.5)
-                
+                deliveries = await receive(agent_name, self._receive_batch_size)
+                self._subscriber_failures[failure_key] = 0
             except asyncio.CancelledError:
-                logger.info(f"Message subscriber for {agent_name} cancelled")
-                break
+                raise
             except Exception as e:
-                self._subscriber_failures[agent_name] += 1
-                failure_count = self._subscriber_failures[agent_name]
+                self._subscriber_failures[failure_key] += 1
+                failure_count = self._subscriber_failures[failure_key]
                 delay = min(30.0, 0.5 * (2 ** failure_count)) + random.uniform(0, 0.5)
                 self._message_breaker.record_failure()
-                logger.error(f"Error in message subscriber for {agent_name}: {e}. Backing off for {delay:.2f}s")
+                logger.error(f"Error receiving {source} messages for {agent_name}: {e}. Backing off for {delay:.2f}s")
                 await asyncio.sleep(delay)
-
-        logger.info(f"Message subscriber for {agent_name} stopped (shutdown={self._shutdown})")
-    
-    async def _receive_from_redis(self, agent_name: str) -> Optional[MessageEnvelope]:
-        """Receive message from Redis."""
-        try:
-            redis_client = await self._get_redis_client()
-            queue_name = self._get_queue_name(agent_name)
+                continue
             
-            # Non-blocking pop from queue
-            message_data = await redis_client.lpop(queue_name)
-            
-            if message_data:
-                envelope = MessageEnvelope.from_dict(json.loads(message_data))
-                
-                # Check if message expired
-                if envelope.is_expired():
-                    logger.warning(f"Discarding expired message {envelope.message_id}")
-                    return None
-                
-                self._message_breaker.record_success()
-                return envelope
-            
-            return None
+            if deliveries:
+                self._message_stats["received"] += len(deliveries)
+                self._message_stats["receive_batches"] += 1
             
+            for delivery in deliveries:
+                await slots.acquire()
+                task = asyncio.create_task(self._handle_with_slot(process, agent_name, delivery, slots))
+                handlers.add(task)
+                task.add_done_callback(handlers.discard)
+    
+    async def _handle_with_slot(self, process: Callable[[str, Any], Awaitable[None]], agent_name: str,
+                                delivery: Any, slots: asyncio.Semaphore) -> None:
+        try:
+            await process(agent_name, delivery)
+        finally:
+            slots.release()
+    
+    async def _receive_batch_from_redis(self, agent_name: str, max_messages: int) -> List[MessageEnvelope]:
+        """
+        Receive up to max_messages from Redis in one round trip.
+        
+        Blocks for up to ``redis_block_seconds`` when the queue is empty, so an
+        idle agent picks up the next message as soon as it is pushed.
+        """
+        redis_client = await self._get_redis_client()
+        queue_name = self._get_queue_name(agent_name)
+        
+        try:
+            batch = await self._blocking_multi_pop(redis_client, queue_name, max_messages)
+            self._message_breaker.record_success()
         except Exception as e:
-            logger.warning(f"Redis receive failed: {e}")
             self._message_breaker.record_failure()
-            return None
+            logger.warning(f"Redis receive failed: {e}")
+            raise
+        
+        return self._decode_envelopes(batch)
     
-    async def _receive_from_sqs(self, agent_name: str) -> Optional[MessageEnvelope]:
-        """Receive message from SQS."""
-        try:
-            sqs_client = await self._get_sqs_client()
-            queue_url = await self._get_or_create_sqs_queue(agent_name)
+    async def _blocking_multi_pop(self, redis_client: redis.Redis, queue_name: str,
+                                  max_messages: int) -> List[str]:
+        """Pop up to max_messages from the head of a list, blocking while it is empty."""
+        if self._redis_supports_blmpop:
+            try:
+                popped = await redis_client.blmpop(
+                    self._redis_block_seconds, 1, queue_name, direction="LEFT", count=max_messages
+                )
+                return popped[1] if popped else []
+            except redis.ResponseError as e:
+                if "unknown command" not in str(e).lower():
+                    raise
+                # BLMPOP needs Redis 7; drain with BLPOP plus a counted LPOP instead
+                logger.info("Redis server lacks BLMPOP, falling back to BLPOP with LPOP count")
+                self._redis_supports_blmpop = False
+        
+        popped = await redis_client.blpop([queue_name], timeout=self._redis_block_seconds)
+        if not popped:
+            return []
+        batch = [popped[1]]
+        if max_messages > 1:
+            batch.extend(await redis_client.lpop(queue_name, max_messages - 1) or [])
+        return batch
+    
+    async def _receive_batch_from_sqs(self, agent_name: str, max_messages: int) -> List[MessageEnvelope]:
+        """Receive up to 10 messages from SQS with one long poll and delete them in one batch call."""
+        sqs_client = await self._get_sqs_client()
+        queue_url = await self._get_or_create_sqs_queue(agent_name)
 
-            # Receive message with long polling
+        try:
             response = await sqs_client.receive_message(
                 QueueUrl=queue_url,
-                MaxNumberOfMessages=1,
-                WaitTimeSeconds=5,
+                MaxNumberOfMessages=max(1, min(10, max_messages)),  # SQS limit per receive
+                WaitTimeSeconds=self._sqs_wait_seconds,
                 MessageAttributeNames=["All"]
             )
             
             messages = response.get("Messages", [])
-            if messages:
-                sqs_message = messages[0]
-                envelope = MessageEnvelope.from_dict(json.loads(sqs_message["Body"]))
-                
-                # Delete message from queue
-                await sqs_client.delete_message(
-                    QueueUrl=queue_url,
-                    ReceiptHandle=sqs_message["ReceiptHandle"]
-                )
-                
-                # Check if message expired
-                if envelope.is_expired():
-                    logger.warning(f"Discarding expired message {envelope.message_id}")
-                    return None
-                
+            if not messages:
                 self._message_breaker.record_success()
-                return envelope
+                await asyncio.sleep(self._sqs_idle_delay)
+                return []
             
-            return None
+            delete_response = await sqs_client.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {"Id": str(index), "ReceiptHandle": sqs_message["ReceiptHandle"]}
+                    for index, sqs_message in enumerate(messages)
+                ]
+            )
+            failed = (delete_response or {}).get("Failed", [])
+            if failed:
+                logger.warning(f"Failed to delete {len(failed)} SQS messages for {agent_name}; they may be redelivered")
+            
+            self._message_breaker.record_success()
             
         except Exception as e:
             logger.warning(f"SQS receive failed: {e}")
             self._message_breaker.record_failure()
+            raise
+        
+        return self._decode_envelopes(sqs_message["Body"] for sqs_message in messages)
+    
+    async def _ensure_consumer_groups(self, redis_client: redis.Redis, agent_name: str) -> None:
+        """Create the agent's consumer group on both streams once per process."""
+        group = self._get_consumer_group(agent_name)
+        for stream in self._get_stream_names(agent_name):
+            if stream in self._stream_groups_ready:
+                continue
+            try:
+                await redis_client.xgroup_create(stream, group, id="0", mkstream=True)
+                logger.info(f"Created consumer group {group} on {stream}")
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._stream_groups_ready.add(stream)
+    
+    async def _receive_batch_from_stream(self, agent_name: str, max_messages: int) -> List[StreamEntry]:
+        """
+        Read new entries for this consumer from the agent's streams.
+        
+        Entries stay in the group's pending list until acknowledged, so a
+        consumer that dies mid-handler leaves them to be reclaimed by another.
+        """
+        redis_client = await self._get_redis_client()
+        streams = self._get_stream_names(agent_name)
+        
+        try:
+            await self._ensure_consumer_groups(redis_client, agent_name)
+            response = await redis_client.xreadgroup(
+                self._get_consumer_group(agent_name),
+                self._consumer_name,
+                {stream: ">" for stream in streams},
+                count=max_messages,
+                block=max(1, int(self._redis_block_seconds * 1000))
+            )
+            self._message_breaker.record_success()
+        except Exception as e:
+            if "NOGROUP" in str(e):
+                # Stream or group was deleted underneath us; recreate on the next read
+                self._stream_groups_ready.difference_update(streams)
+            self._message_breaker.record_failure()
+            logger.warning(f"Redis stream receive failed: {e}")
+            raise
+        
+        entries = []
+        for stream, stream_entries in response or []:
+            for entry_id, fields in stream_entries:
+                entry = await self._decode_stream_entry(redis_client, agent_name, stream, entry_id, fields)
+                if entry:
+                    entries.append(entry)
+        return entries
+    
+    async def _reclaim_batch_from_stream(self, agent_name: str, max_messages: int) -> List[StreamEntry]:
+        """
+        Claim entries other consumers (or this one) left pending for too long.
+        
+        Each reclaim counts as a retry of the envelope; entries that have used
+        up their retries are dead-lettered and acknowledged instead.
+        """
+        await asyncio.sleep(self._reclaim_interval)
+        
+        redis_client = await self._get_redis_client()
+        group = self._get_consumer_group(agent_name)
+        entries = []
+        
+        try:
+            await self._ensure_consumer_groups(redis_client, agent_name)
+            for stream in self._get_stream_names(agent_name):
+                pending = await redis_client.xpending_range(
+                    stream, group, min="-", max="+", count=max_messages, idle=self._reclaim_idle_ms
+                )
+                if not pending:
+                    continue
+                
+                deliveries = {item["message_id"]: item["times_delivered"] for item in pending}
+                claimed = await redis_client.xclaim(
+                    stream, group, self._consumer_name, self._reclaim_idle_ms, list(deliveries)
+                )
+                for entry_id, fields in claimed:
+                    entry = await self._decode_stream_entry(redis_client, agent_name, stream, entry_id, fields)
+                    if not entry:
+                        continue
+                    
+                    # The first delivery was not a retry
+                    entry.envelope.retry_count = deliveries.get(entry_id, 1) - 1
+                    if not entry.envelope.should_retry():
+                        await self._send_to_dlq(
+                            entry.envelope, f"Max retries exceeded after {deliveries.get(entry_id)} deliveries"
+                        )
+                        await self._ack_stream_entry(agent_name, entry)
+                        continue
+                    
+                    entry.envelope.retry_count += 1
+                    self._message_stats["retried"] += 1
+                    entries.append(entry)
+            
+            self._message_breaker.record_success()
+        except Exception as e:
+            self._message_breaker.record_failure()
+            logger.warning(f"Redis stream reclaim failed: {e}")
+            raise
+        
+        if entries:
+            logger.info(f"Reclaimed {len(entries)} pending stream entries for {agent_name}")
+        return entries
+    
+    async def _decode_stream_entry(self, redis_client: redis.Redis, agent_name: str, stream: str,
+                                   entry_id: str, fields: Optional[Dict[str, str]]) -> Optional[StreamEntry]:
+        """Decode a stream entry, acknowledging entries that can never be delivered."""
+        envelope = self._decode_envelope((fields or {}).get("envelope"))
+        if envelope is None:
+            await redis_client.xack(stream, self._get_consumer_group(agent_name), entry_id)
             return None
+        return StreamEntry(stream=stream, entry_id=entry_id, envelope=envelope)
+    
+    async def _ack_stream_entry(self, agent_name: str, entry: StreamEntry) -> None:
+        """Acknowledge a stream entry so no consumer receives it again."""
+        try:
+            redis_client = await self._get_redis_client()
+            await redis_client.xack(entry.stream, self._get_consumer_group(agent_name), entry.entry_id)
+        except Exception as e:
+            # The entry stays pending and will be reclaimed and redelivered
+            logger.warning(f"Failed to ack stream entry {entry.entry_id}: {e}")
+    
+    def _decode_envelopes(self, raw_messages: Iterable[str]) -> List[MessageEnvelope]:
+        """Parse received message bodies, dropping expired and malformed ones."""
+        envelopes = []
+        for message_data in raw_messages:
+            envelope = self._decode_envelope(message_data)
+            if envelope:
+                envelopes.append(envelope)
+        return envelopes
+    
+    def _decode_envelope(self, message_data: Optional[str]) -> Optional[MessageEnvelope]:
+        """Parse one message body, returning None when it is malformed or expired."""
+        try:
+            envelope = MessageEnvelope.from_dict(json.loads(message_data))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Discarding malformed message: {e}")
+            return None
+        
+        # Check if message expired
+        if envelope.is_expired():
+            logger.warning(f"Discarding expired message {envelope.message_id}")
+            return None
+        
+        return envelope
+    
+    async def _deliver_message(self, agent_name: str, envelope: MessageEnvelope) -> None:
+        """Hand an envelope to the agent's handler, dead-lettering it when none is registered."""
+        # Convert envelope back to AgentMessage
+        agent_message = AgentMessage(
+            sender_agent=AgentType(envelope.sender_agent),
+            recipient_agent=AgentType(envelope.recipient_agent),
+            message_type=envelope.message_type,
+            payload=envelope.payload,
+            correlation_id=envelope.correlation_id
+        )
+        
+        # Call message handler
+        handler = self._message_handlers.get(agent_name)
+        if handler:
+            await handler(agent_message)
+            self._message_stats["delivered"] += 1
+            self._message_breaker.record_success()
+            logger.debug(f"Delivered message {envelope.message_id} to {agent_name}")
+        else:
+            logger.warning(f"No handler for agent {agent_name}")
+            self._message_breaker.record_failure()
+            await self._send_to_dlq(envelope, "No message handler")
+    
+    async def _process_stream_entry(self, agent_name: str, entry: StreamEntry) -> None:
+        """Process a stream entry, acknowledging it only after the handler succeeds."""
+        try:
+            await self._deliver_message(agent_name, entry.envelope)
+        except Exception as e:
+            # Left pending; the reclaim loop retries it once it has been idle long enough
+            logger.error(f"Failed to process message {entry.envelope.message_id}, leaving it pending: {e}")
+            self._message_breaker.record_failure()
+            return
+        
+        await self._ack_stream_entry(agent_name, entry)
     
     async def _process_message(self, agent_name: str, envelope: MessageEnvelope) -> None:
         """Process received message."""
         try:
-            # Convert envelope back to AgentMessage
-            agent_message = AgentMessage(
-                sender_agent=AgentType(envelope.sender_agent),
-                recipient_agent=AgentType(envelope.recipient_agent),
-                message_type=envelope.message_type,
-                payload=envelope.payload,
-                correlation_id=envelope.correlation_id
-            )
-            
-            # Call message handler
-            handler = self._message_handlers.get(agent_name)
-            if handler:
-                await handler(agent_message)
-                self._message_stats["delivered"] += 1
-                self._message_breaker.record_success()
-                logger.debug(f"Delivered message {envelope.message_id} to {agent_name}")
-            else:
-                logger.warning(f"No handler for agent {agent_name}")
-                self._message_breaker.record_failure()
-                await self._send_to_dlq(envelope, "No message handler")
-            
+            await self._deliver_message(agent_name, envelope)
         except Exception as e:
             logger.error(f"Failed to process message {envelope.message_id}: {e}")
             self._message_breaker.record_failure()
@@ -555,8 +852,9 @@ class ResilientMessageBus:
         task = asyncio.create_task(_retry())
 
         def _cleanup(t: asyncio.Task) -> None:
-            with suppress(Exception):
-                t.result()
+            if not t.cancelled():
+                with suppress(Exception):
+                    t.result()
             self._retry_tasks.discard(t)
 
         task.add_done_callback(_cleanup)
@@ -602,8 +900,17 @@ class ResilientMessageBus:
         try:
             # Redis queue length
             redis_client = await self._get_redis_client()
-            queue_name = self._get_queue_name(agent_name)
-            stats["redis_queue_length"] = await redis_client.llen(queue_name)
+            if self._redis_transport == "streams":
+                streams = self._get_stream_names(agent_name)
+                stats["redis_queue_length"] = sum([await redis_client.xlen(stream) for stream in streams])
+                stats["pending_entries"] = 0
+                for stream in streams:
+                    with suppress(redis.ResponseError):
+                        summary = await redis_client.xpending(stream, self._get_consumer_group(agent_name))
+                        stats["pending_entries"] += summary["pending"]
+            else:
+                queue_name = self._get_queue_name(agent_name)
+                stats["redis_queue_length"] = await redis_client.llen(queue_name)
             
             # DLQ length
             dlq_name = self._get_dlq_name(agent_name)
@@ -633,6 +940,7 @@ class ResilientMessageBus:
         if service_factory is None or service_factory is self._service_factory:
             return
         self._service_factory = service_factory
+        self._sqs_queue_urls.clear()
 
     async def shutdown(self) -> None:
         """Shutdown message bus, cancelling subscribers and closing connections."""
@@ -684,6 +992,10 @@ class ResilientMessageBus:
             "consecutive_failures": self._consecutive_failures,
             "active_subscribers": len(self._subscriber_tasks),
             "registered_handlers": len(self._message_handlers),
+            "receive_batch_size": self._receive_batch_size,
+            "max_concurrency_per_agent": self._max_concurrency,
+            "redis_transport": self._redis_transport,
+            "consumer_name": self._consumer_name,
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -4,13 +4,19 @@ Model Router Service
 Implements intelligent model routing with cost optimization and performance-based selection.
 Routes requests to appropriate models (Haiku/Sonnet) based on latency, cost, and accuracy requirements.
 
+Models are ranked once per (task type, strategy, severity class) into a
+routing table, kept until model metrics or configuration change. Routing
+walks the ranked candidates and normally stops at the first: one health bit
+read from the health cache and the request's limits. Health checks run in
+the background and never on the routing path.
+
 Requirements: 8.1, 8.2, 8.3
 """
 
 import asyncio
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, NamedTuple, Optional, List, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 from enum import Enum
@@ -23,6 +29,16 @@ from src.services.aws import get_aws_service_factory, BedrockClient
 
 logger = get_logger(__name__)
 
+# Severities routed with accuracy and availability weighted first
+_HIGH_SEVERITIES = frozenset({"critical", "high"})
+
+# Smoothing of live latency and cost estimates
+_EWMA_ALPHA = 0.1
+
+# Completions re-rank routing tables only once a ranked input has moved this far
+_AVAILABILITY_RERANK_DELTA = 0.01  # Absolute change in availability score
+_LATENCY_RERANK_FRACTION = 0.1  # Relative change in a model's latency EWMA
+
 
 class ModelTier(Enum):
     """Model tier based on cost and capability."""
@@ -88,6 +104,23 @@ class ModelMetrics:
     total_tokens: int = 0
     last_used: Optional[datetime] = None
     error_rate: float = 0.0
+    cost_per_1k_tokens: float = 0.0  # Moving average of observed cost
+
+
+class _Candidate(NamedTuple):
+    """Model attributes checked against a request's limits."""
+    model_name: str
+    accuracy_score: float
+    avg_response_time_ms: int
+    cost_per_1k_tokens: float
+
+
+class _RoutingTable(NamedTuple):
+    """Candidates for one routing key, best first, and in fallback order."""
+    ranked: Tuple[_Candidate, ...]
+    fallback_order: Tuple[_Candidate, ...]
+    min_accuracy: float
+    max_latency_ms: int
 
 
 @dataclass
@@ -183,6 +216,14 @@ class ModelRouter:
         self.routing_history = deque(maxlen=10000)  # Last 10k routing decisions
         self.model_health_cache: Dict[str, Tuple[bool, datetime]] = {}
         
+        # Ranked candidates per (task type, strategy, high severity), built on first use
+        self._routing_tables: Dict[Tuple[Optional[str], RoutingStrategy, bool], _RoutingTable] = {}
+        # Availability and observed latency per model when the tables were last invalidated
+        self._ranked_availability: Dict[str, float] = {
+            model_name: config.availability_score for model_name, config in self.model_configs.items()
+        }
+        self._ranked_latency_ms: Dict[str, float] = {}
+        
         # AWS clients
         self.aws_factory = get_aws_service_factory()
         self.bedrock_client: Optional[BedrockClient] = None
@@ -223,26 +264,14 @@ class ModelRouter:
             Routing result with selected model and metadata
         """
         try:
-            # Get task preferences
-            task_prefs = self.task_preferences.get(request.task_type, {})
-            
-            # Filter available models based on requirements
-            available_models = await self._filter_available_models(request, task_prefs)
-            
-            if not available_models:
-                raise ModelRoutingError("No models available that meet requirements")
-            
-            # Select optimal model based on strategy
-            selected_model = self._select_optimal_model(available_models, request, task_prefs)
+            # Select optimal model and fallbacks from the routing table
+            selected_model, fallback_models = self.select_models(request)
             
             # Calculate estimates
             model_config = self.model_configs[selected_model]
             estimated_cost = self._estimate_cost(model_config, request.context_length)
             estimated_latency = self._estimate_latency(model_config, request.context_length)
             
-            # Generate fallback options
-            fallback_models = self._generate_fallback_options(selected_model, available_models)
-            
             # Create routing result
             result = RoutingResult(
                 selected_model=selected_model,
@@ -263,117 +292,172 @@ class ModelRouter:
             self.logger.error(f"Model routing failed: {e}")
             raise ModelRoutingError(f"Routing failed: {e}")
     
-    async def _filter_available_models(self, request: RoutingRequest, task_prefs: Dict[str, Any]) -> List[str]:
-        """Filter models based on availability and requirements."""
-        available_models = []
-        
-        for model_name, config in self.model_configs.items():
-            # Check model health
-            if not await self._is_model_healthy(model_name):
-                continue
-            
-            # Check accuracy requirements
-            min_accuracy = max(request.required_accuracy, task_prefs.get("min_accuracy", 0.8))
-            if config.accuracy_score < min_accuracy:
-                continue
-            
-            # Check latency requirements
-            max_latency = request.max_latency_ms or task_prefs.get("max_latency_ms", 5000)
-            if config.avg_response_time_ms > max_latency:
-                continue
-            
-            # Check cost requirements
-            if request.max_cost_per_1k_tokens and config.cost_per_1k_tokens > request.max_cost_per_1k_tokens:
-                continue
-            
-            available_models.append(model_name)
+    def select_models(self, request: RoutingRequest) -> Tuple[str, List[str]]:
+        """
+        Select the best healthy model meeting the request's requirements, and up to two fallbacks.
         
-        return available_models
+        Models without a health check yet count as healthy.
+        
+        Raises:
+            ModelRoutingError: If no model is available
+        """
+        table = self._routing_table(request)
+        min_accuracy = max(request.required_accuracy, table.min_accuracy)
+        max_latency = request.max_latency_ms or table.max_latency_ms
+        max_cost = request.max_cost_per_1k_tokens
+        health = self.model_health_cache
+        
+        def eligible(candidate: _Candidate) -> bool:
+            entry = health.get(candidate.model_name)
+            return ((entry is None or entry[0])
+                    and candidate.accuracy_score >= min_accuracy
+                    and candidate.avg_response_time_ms <= max_latency
+                    and not (max_cost and candidate.cost_per_1k_tokens > max_cost))
+        
+        for candidate in table.ranked:
+            if eligible(candidate):
+                selected_model = candidate.model_name
+                break
+        else:
+            raise ModelRoutingError("No models available that meet requirements")
+        
+        fallback_models = []
+        for candidate in table.fallback_order:
+            if candidate.model_name != selected_model and eligible(candidate):
+                fallback_models.append(candidate.model_name)
+                if len(fallback_models) == 2:
+                    break
+        
+        return selected_model, fallback_models
     
-    def _select_optimal_model(self, available_models: List[str], 
-                            request: RoutingRequest, 
-                            task_prefs: Dict[str, Any]) -> str:
-        """Select optimal model based on routing strategy."""
-        if len(available_models) == 1:
-            return available_models[0]
-        
-        # Calculate scores for each model
-        model_scores = {}
-        
-        for model_name in available_models:
-            config = self.model_configs[model_name]
-            metrics = self.model_metrics[model_name]
-            
-            if request.strategy == RoutingStrategy.COST_OPTIMIZED:
-                # Prioritize lowest cost
-                score = 1.0 / (config.cost_per_1k_tokens + 0.01)
-            elif request.strategy == RoutingStrategy.LATENCY_OPTIMIZED:
-                # Prioritize lowest latency
-                actual_latency = metrics.avg_response_time_ms or config.avg_response_time_ms
-                score = 1.0 / (actual_latency + 1)
-            elif request.strategy == RoutingStrategy.ACCURACY_OPTIMIZED:
-                # Prioritize highest accuracy
-                score = config.accuracy_score
-            else:  # BALANCED
-                # Balance cost, latency, and accuracy
-                cost_score = 1.0 / (config.cost_per_1k_tokens + 0.01)
-                latency_score = 1.0 / (config.avg_response_time_ms + 1)
-                accuracy_score = config.accuracy_score
-                availability_score = config.availability_score
-                
-                # Weight based on incident severity
-                if request.incident_severity in ["critical", "high"]:
-                    # Prioritize accuracy and availability for critical incidents
-                    score = (accuracy_score * 0.4 + availability_score * 0.3 + 
-                            latency_score * 0.2 + cost_score * 0.1)
-                else:
-                    # Balance all factors for normal incidents
-                    score = (cost_score * 0.3 + latency_score * 0.25 + 
-                            accuracy_score * 0.25 + availability_score * 0.2)
-            
-            # Apply task preference bonus
-            preferred_tier = task_prefs.get("preferred_tier")
-            if preferred_tier and config.tier == preferred_tier:
-                score *= 1.2
-            
-            model_scores[model_name] = score
+    def invalidate_routing_tables(self) -> None:
+        """Drop precomputed rankings; call after changing model_configs or task_preferences directly."""
+        self._routing_tables.clear()
+    
+    def _rerank_after_completion(self, model_name: str) -> None:
+        """
+        Drop the routing tables a completion has made stale.
         
-        # Select model with highest score
-        return max(model_scores.keys(), key=lambda m: model_scores[m])
+        Availability feeds every table and observed latency only the
+        latency-optimized ones. Small moves are ignored, so steady traffic
+        keeps selection a table lookup instead of a rebuild per request.
+        """
+        availability = self.model_configs[model_name].availability_score
+        if abs(availability - self._ranked_availability.get(model_name, availability)) >= _AVAILABILITY_RERANK_DELTA:
+            self._ranked_availability[model_name] = availability
+            self.invalidate_routing_tables()
+            return
+        
+        latency = self.model_metrics[model_name].avg_response_time_ms
+        ranked_latency = self._ranked_latency_ms.get(model_name)
+        if ranked_latency is None or abs(latency - ranked_latency) > ranked_latency * _LATENCY_RERANK_FRACTION:
+            self._ranked_latency_ms[model_name] = latency
+            for key in [key for key in self._routing_tables if key[1] == RoutingStrategy.LATENCY_OPTIMIZED]:
+                del self._routing_tables[key]
+    
+    def _routing_table(self, request: RoutingRequest) -> _RoutingTable:
+        """Routing table for the request's task type, strategy and severity class."""
+        task_type = request.task_type if request.task_type in self.task_preferences else None
+        high_severity = (request.strategy == RoutingStrategy.BALANCED
+                         and request.incident_severity in _HIGH_SEVERITIES)
+        key = (task_type, request.strategy, high_severity)
+        
+        table = self._routing_tables.get(key)
+        if table is None:
+            table = self._routing_tables[key] = self._build_routing_table(task_type, request.strategy, high_severity)
+        return table
+    
+    def _build_routing_table(self, task_type: Optional[str], strategy: RoutingStrategy,
+                             high_severity: bool) -> _RoutingTable:
+        """Rank every configured model for one routing key."""
+        task_prefs = self.task_preferences.get(task_type, {})
+        preferred_tier = task_prefs.get("preferred_tier")
+        candidates = {
+            model_name: _Candidate(
+                model_name, config.accuracy_score, config.avg_response_time_ms, config.cost_per_1k_tokens
+            )
+            for model_name, config in self.model_configs.items()
+        }
+        
+        # Stable sorts keep configuration order between equal scores
+        ranked = sorted(
+            self.model_configs,
+            key=lambda m: self._score_model(m, strategy, high_severity, preferred_tier),
+            reverse=True
+        )
+        fallback_order = sorted(
+            self.model_configs,
+            key=lambda m: self.model_configs[m].availability_score,
+            reverse=True
+        )
+        
+        return _RoutingTable(
+            ranked=tuple(candidates[m] for m in ranked),
+            fallback_order=tuple(candidates[m] for m in fallback_order),
+            min_accuracy=task_prefs.get("min_accuracy", 0.8),
+            max_latency_ms=task_prefs.get("max_latency_ms", 5000)
+        )
+    
+    def _score_model(self, model_name: str, strategy: RoutingStrategy, high_severity: bool,
+                     preferred_tier: Optional[ModelTier]) -> float:
+        """Score a model for a routing strategy; higher is better."""
+        config = self.model_configs[model_name]
+        metrics = self.model_metrics[model_name]
+        
+        if strategy == RoutingStrategy.COST_OPTIMIZED:
+            # Prioritize lowest cost
+            score = 1.0 / (config.cost_per_1k_tokens + 0.01)
+        elif strategy == RoutingStrategy.LATENCY_OPTIMIZED:
+            # Prioritize lowest latency
+            actual_latency = metrics.avg_response_time_ms or config.avg_response_time_ms
+            score = 1.0 / (actual_latency + 1)
+        elif strategy == RoutingStrategy.ACCURACY_OPTIMIZED:
+            # Prioritize highest accuracy
+            score = config.accuracy_score
+        else:  # BALANCED
+            # Balance cost, latency, and accuracy
+            cost_score = 1.0 / (config.cost_per_1k_tokens + 0.01)
+            latency_score = 1.0 / (config.avg_response_time_ms + 1)
+            accuracy_score = config.accuracy_score
+            availability_score = config.availability_score
+            
+            # Weight based on incident severity
+            if high_severity:
+                # Prioritize accuracy and availability for critical incidents
+                score = (accuracy_score * 0.4 + availability_score * 0.3 + 
+                        latency_score * 0.2 + cost_score * 0.1)
+            else:
+                # Balance all factors for normal incidents
+                score = (cost_score * 0.3 + latency_score * 0.25 + 
+                        accuracy_score * 0.25 + availability_score * 0.2)
+        
+        # Apply task preference bonus
+        if preferred_tier and config.tier == preferred_tier:
+            score *= 1.2
+        
+        return score
     
     def _estimate_cost(self, config: ModelConfig, context_length: int) -> float:
-        """Estimate cost for request based on context length."""
+        """Estimate cost for request based on context length and observed cost per token."""
         # Estimate total tokens (input + output)
         estimated_input_tokens = context_length
         estimated_output_tokens = min(config.max_tokens // 4, 500)  # Conservative estimate
         total_tokens = estimated_input_tokens + estimated_output_tokens
         
-        return (total_tokens / 1000.0) * config.cost_per_1k_tokens
+        metrics = self.model_metrics.get(config.model_name)
+        cost_per_1k_tokens = (metrics and metrics.cost_per_1k_tokens) or config.cost_per_1k_tokens
+        return (total_tokens / 1000.0) * cost_per_1k_tokens
     
     def _estimate_latency(self, config: ModelConfig, context_length: int) -> int:
-        """Estimate latency based on model config and context length."""
-        base_latency = config.avg_response_time_ms
+        """Estimate latency based on observed or configured latency and context length."""
+        metrics = self.model_metrics.get(config.model_name)
+        base_latency = (metrics and metrics.avg_response_time_ms) or config.avg_response_time_ms
         
         # Add latency based on context length (longer context = more processing time)
         context_latency = (context_length / 1000) * 50  # 50ms per 1k tokens
         
         return int(base_latency + context_latency)
     
-    def _generate_fallback_options(self, selected_model: str, available_models: List[str]) -> List[str]:
-        """Generate fallback model options."""
-        fallbacks = []
-        
-        # Remove selected model from available options
-        remaining_models = [m for m in available_models if m != selected_model]
-        
-        # Sort by reliability (availability score) and add top 2 as fallbacks
-        remaining_models.sort(
-            key=lambda m: self.model_configs[m].availability_score, 
-            reverse=True
-        )
-        
-        return remaining_models[:2]
-    
     def _generate_routing_reason(self, selected_model: str, request: RoutingRequest) -> str:
         """Generate human-readable routing reason."""
         config = self.model_configs[selected_model]
@@ -467,13 +551,21 @@ class ModelRouter:
         else:
             # Exponential moving average with alpha=0.1
             metrics.avg_response_time_ms = (
-                0.9 * metrics.avg_response_time_ms + 0.1 * actual_latency_ms
+                (1 - _EWMA_ALPHA) * metrics.avg_response_time_ms + _EWMA_ALPHA * actual_latency_ms
             )
         
         # Update cost and token tracking
         metrics.total_cost += actual_cost
         metrics.total_tokens += tokens_used
         metrics.last_used = datetime.utcnow()
+        if tokens_used > 0:
+            observed_cost_per_1k = actual_cost * 1000.0 / tokens_used
+            if metrics.cost_per_1k_tokens == 0:
+                metrics.cost_per_1k_tokens = observed_cost_per_1k
+            else:
+                metrics.cost_per_1k_tokens = (
+                    (1 - _EWMA_ALPHA) * metrics.cost_per_1k_tokens + _EWMA_ALPHA * observed_cost_per_1k
+                )
         
         # Update error rate
         metrics.error_rate = metrics.failed_requests / metrics.total_requests
@@ -483,6 +575,8 @@ class ModelRouter:
             recent_success_rate = metrics.successful_requests / metrics.total_requests
             self.model_configs[model_name].availability_score = recent_success_rate
         
+        self._rerank_after_completion(model_name)
+        
         self.logger.debug(f"Recorded completion for {model_name}: success={success}, latency={actual_latency_ms}ms")
     
     async def _is_model_healthy(self, model_name: str) -> bool:
@@ -677,6 +771,7 @@ class ModelRouter:
         for field, value in updates.items():
             if field in allowed_fields and hasattr(config, field):
                 setattr(config, field, value)
+        self.invalidate_routing_tables()
         
         self.logger.info(f"Updated configuration for model {model_name}: {updates}")
     
@@ -0,0 +1,225 @@
+"""
+Single-pass PII redaction shared by the guardrails and the audit logger.
+
+A service's PII patterns are compiled into one alternation with a named
+group per PII type, in priority order, which finds the first match, if any,
+in one pass whatever the number of types; text without PII is scanned only
+once. From there each type is matched on its own and overlapping matches are
+merged, so a value straddling two matches of different types (an IP address
+running into an SSN) is covered whole. The scan yields sorted,
+non-overlapping spans, typed by their leftmost match and at the same position
+the earlier pattern, and the redacted text is built in one pass from the
+slices between them, so a value that occurs twice, or inside another match,
+is never replaced twice.
+
+Nested dicts and lists are redacted leaf by leaf. JSON documents are
+scanned string literal by string literal, and between literals, so they are
+neither parsed nor re-serialized and a match cannot run across JSON syntax;
+placeholders outside literals are quoted to keep the document valid. Large
+batches of texts are redacted on a process pool.
+"""
+
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# JSON string literal, quotes included
+_JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+# Flags set for a whole pattern, which must become scoped inside an alternation
+_GLOBAL_FLAGS_RE = re.compile(r'^\(\?([aiLmsux]+)\)')
+
+
+class PIIMatch(NamedTuple):
+    """One redacted span of the original text."""
+    pii_type: str
+    start: int
+    end: int
+    text: str
+
+
+def placeholder(pii_type: str) -> str:
+    """Text that replaces a match of the given PII type."""
+    return f'[REDACTED_{pii_type.upper()}]'
+
+
+class PIIRedactor:
+    """
+    PII patterns compiled into a single scanner.
+
+    Redactors are immutable; use redactor_for to get the shared instance for
+    a set of patterns, so every service holding the same patterns compiles
+    them once.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, str]], flags: int = re.IGNORECASE):
+        """
+        Args:
+            patterns: (PII type, regex) pairs in priority order; types must
+                be valid identifiers
+            flags: Flags for the whole scanner
+        """
+        self.patterns = tuple(patterns)
+        self.flags = flags
+        self._placeholders = {pii_type: placeholder(pii_type) for pii_type, _ in self.patterns}
+        self._scanner = re.compile(
+            '|'.join(f'(?P<{pii_type}>{_scoped(pattern)})' for pii_type, pattern in self.patterns),
+            flags
+        ) if self.patterns else None
+        self._type_scanners = tuple((pii_type, re.compile(pattern, flags)) for pii_type, pattern in self.patterns)
+
+    def scan(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> List[PIIMatch]:
+        """Sorted, non-overlapping PII spans of text[pos:endpos], overlapping matches merged."""
+        endpos = len(text) if endpos is None else endpos
+        first = self._scanner.search(text, pos, endpos) if self._scanner is not None else None
+        if first is None:
+            return []
+
+        # No type matches before the alternation's first match
+        found = sorted(
+            (match.start(), priority, match.end(), pii_type)
+            for priority, (pii_type, scanner) in enumerate(self._type_scanners)
+            for match in scanner.finditer(text, first.start(), endpos)
+        )
+        spans: List[List[Any]] = []
+        for start, _, end, pii_type in found:
+            if spans and start < spans[-1][2]:
+                spans[-1][2] = max(spans[-1][2], end)
+            else:
+                spans.append([pii_type, start, end])
+        return [PIIMatch(pii_type, start, end, text[start:end]) for pii_type, start, end in spans]
+
+    def redact(self, text: str) -> Tuple[str, List[PIIMatch]]:
+        """Redacted text and the spans replaced."""
+        matches = self.scan(text)
+        return self._splice(text, matches), matches
+
+    def redact_json(self, document: str) -> Tuple[str, List[PIIMatch]]:
+        """
+        Redact a JSON document without parsing it.
+
+        Matches never cross a string literal's quotes. Bare values such as
+        numbers become quoted placeholders.
+        """
+        matches: List[PIIMatch] = []
+        bare = set()
+        position = 0
+        for literal in _JSON_STRING_RE.finditer(document):
+            outside = self.scan(document, position, literal.start())
+            bare.update(match.start for match in outside)
+            matches.extend(outside)
+            matches.extend(self.scan(document, literal.start() + 1, literal.end() - 1))
+            position = literal.end()
+        outside = self.scan(document, position)
+        bare.update(match.start for match in outside)
+        matches.extend(outside)
+        return self._splice(document, matches, bare), matches
+
+    def redact_value(self, value: Any) -> Any:
+        """
+        Copy of a value with every string in it redacted.
+
+        Dicts, lists and tuples are walked recursively; strings holding a
+        JSON object or array are redacted as JSON. Other values are returned
+        unchanged.
+        """
+        if isinstance(value, str):
+            if value.lstrip()[:1] in ('{', '['):
+                return self.redact_json(value)[0]
+            return self.redact(value)[0]
+        if isinstance(value, dict):
+            return {key: self.redact_value(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.redact_value(item) for item in value)
+        return value
+
+    def _splice(self, text: str, matches: List[PIIMatch], quoted: Collection[int] = ()) -> str:
+        """Build the redacted text from the slices between sorted spans, quoting placeholders at quoted starts."""
+        if not matches:
+            return text
+        parts = []
+        position = 0
+        for match in matches:
+            parts.append(text[position:match.start])
+            if match.start in quoted:
+                parts.append(f'"{self._placeholders[match.pii_type]}"')
+            else:
+                parts.append(self._placeholders[match.pii_type])
+            position = match.end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=64)
+def _cached_redactor(patterns: Tuple[Tuple[str, str], ...], flags: int) -> PIIRedactor:
+    return PIIRedactor(patterns, flags)
+
+
+def redactor_for(patterns: Dict[str, str], flags: int = re.IGNORECASE) -> PIIRedactor:
+    """
+    Shared redactor for a PII type to regex mapping, in its iteration order.
+
+    Callers pass their current patterns on every use, so edits to the
+    mapping take effect on the next call.
+    """
+    return _cached_redactor(tuple(patterns.items()), flags)
+
+
+class BulkPIIRedactor:
+    """Redacts batches of texts, on a process pool from a size threshold."""
+
+    def __init__(self, process_pool_threshold: int = 2000, max_workers: Optional[int] = None):
+        """
+        Args:
+            process_pool_threshold: Batch size from which texts are split
+                across a process pool
+            max_workers: Process pool size (defaults to CPU count)
+        """
+        self.process_pool_threshold = process_pool_threshold
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def redact_many(self, redactor: PIIRedactor, texts: List[str]) -> List[Tuple[str, List[PIIMatch]]]:
+        """Redacted text and spans for each text, in order."""
+        if len(texts) < self.process_pool_threshold:
+            return [redactor.redact(text) for text in texts]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        workers = self.max_workers or os.cpu_count() or 1
+        chunk_size = -(-len(texts) // workers)
+
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(
+                self._executor, _redact_batch, redactor.patterns, redactor.flags, texts[i:i + chunk_size]
+            )
+            for i in range(0, len(texts), chunk_size)
+        ])
+        return [result for chunk in chunks for result in chunk]
+
+    def close(self) -> None:
+        """Shut down the redaction process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _scoped(pattern: str) -> str:
+    """Turn a leading global flag group like (?i) into a group scoped to the pattern."""
+    flags = _GLOBAL_FLAGS_RE.match(pattern)
+    if flags is None:
+        return pattern
+    return f'(?{flags.group(1)}:{pattern[flags.end():]})'
+
+
+def _redact_batch(patterns: Tuple[Tuple[str, str], ...], flags: int,
+                  texts: List[str]) -> List[Tuple[str, List[PIIMatch]]]:
+    """Redact a chunk of texts in a worker process."""
+    redactor = _cached_redactor(patterns, flags)
+    return [redactor.redact(text) for text in texts]
@@ -11,12 +11,16 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from uuid import uuid4
 
+import numpy as np
 from opensearchpy import AsyncOpenSearch, RequestsHttpConnection
 from opensearchpy.exceptions import OpenSearchException
 
 from src.models.incident import Incident
 from src.services.aws import AWSServiceFactory, BedrockClient
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_cache import EmbeddingCache, get_embedding_cache
 from src.utils.config import config
+from src.utils.constants import LEARNING_CONFIG
 from src.utils.logging import get_logger
 from src.utils.exceptions import ResourceLimitError
 
@@ -51,17 +55,25 @@ class SimilarityResult:
 class ScalableRAGMemory:
     """RAG Memory system with OpenSearch Serverless for scalable vector search."""
     
-    def __init__(self, service_factory: AWSServiceFactory):
+    def __init__(self, service_factory: AWSServiceFactory, embedding_cache: Optional[EmbeddingCache] = None):
         """Initialize RAG memory system."""
         self._service_factory = service_factory
         self._opensearch_client = None
         self._bedrock_client = None
         self._index_name = "incident-patterns"
         self._embedding_dimension = 1536  # Titan embedding dimension
+        self._embedding_model_id = LEARNING_CONFIG["embedding_model_id"]
         self._max_patterns = 100000  # 100K pattern limit
         
         # Performance optimization
-        self._embedding_cache: Dict[str, List[float]] = {}
+        self._embedding_cache = embedding_cache if embedding_cache is not None else get_embedding_cache()
+        self._embedding_batcher = EmbeddingBatcher(
+            lambda text: self._invoke_titan_embedding(text),
+            self._embedding_model_id,
+            self._embedding_dimension,
+            cache=self._embedding_cache,
+            fallback=self._generate_simulated_embedding
+        )
         self._pattern_cache: Dict[str, IncidentPattern] = {}
         self._cache_ttl = timedelta(hours=1)
         self._last_cache_cleanup = datetime.utcnow()
@@ -165,57 +177,57 @@ class ScalableRAGMemory:
             raise
     
     async def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text using Bedrock Titan."""
-        # Check cache first
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        if text_hash in self._embedding_cache:
-            return self._embedding_cache[text_hash]
-        
+        """Generate embedding for text using Bedrock Titan, batched with concurrent callers."""
         try:
-            bedrock_client = await self._get_bedrock_client()
-            
-            # Use real Titan embedding model
-            embedding_request = {
-                "inputText": text[:8000]  # Limit input size for Titan
-            }
-            
-            try:
-                # Call Amazon Titan Embeddings model
-                response = await bedrock_client.invoke_model_async(
-                    modelId="amazon.titan-embed-text-v1",
-                    body=json.dumps(embedding_request),
-                    contentType="application/json"
-                )
-                
-                # Parse Titan response
-                response_body = json.loads(response['body'].read())
-                embedding = response_body.get('embedding', [])
-                
-                if not embedding or len(embedding) != self._embedding_dimension:
-                    logger.warning(f"Invalid Titan embedding response, falling back to simulated")
-                    embedding = self._generate_simulated_embedding(text)
-                
-                logger.debug(f"Generated Titan embedding for text: {text[:50]}...")
-                
-            except Exception as titan_error:
-                logger.warning(f"Titan embedding failed, using simulated: {titan_error}")
-                # Fallback to simulated embedding for development
-                embedding = self._generate_simulated_embedding(text)
-            
-            # Cache the embedding
-            self._embedding_cache[text_hash] = embedding
-            
-            # Clean cache if too large
-            if len(self._embedding_cache) > 1000:
-                await self._cleanup_embedding_cache()
-            
-            return embedding
+            embedding = await self._embedding_batcher.embed(text)
+            return embedding.tolist()
             
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             # Return zero vector as fallback
             return [0.0] * self._embedding_dimension
     
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts in rate-limited micro-batches.
+        
+        Texts whose Titan call fails get a simulated embedding, as in
+        generate_embedding.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Float32 array of shape (len(texts), embedding dimension)
+        """
+        return await self._embedding_batcher.embed_many(texts)
+    
+    async def _invoke_titan_embedding(self, text: str) -> List[float]:
+        """Call Titan for a single embedding; raises if the response is unusable."""
+        bedrock_client = await self._get_bedrock_client()
+        
+        # Use real Titan embedding model
+        embedding_request = {
+            "inputText": text[:8000]  # Limit input size for Titan
+        }
+        
+        # Call Amazon Titan Embeddings model
+        response = await bedrock_client.invoke_model_async(
+            modelId=self._embedding_model_id,
+            body=json.dumps(embedding_request),
+            contentType="application/json"
+        )
+        
+        # Parse Titan response
+        response_body = json.loads(response['body'].read())
+        embedding = response_body.get('embedding', [])
+        
+        if not embedding or len(embedding) != self._embedding_dimension:
+            raise ValueError("Invalid Titan embedding response")
+        
+        logger.debug(f"Generated Titan embedding for text: {text[:50]}...")
+        return embedding
+    
     def _generate_simulated_embedding(self, text: str) -> List[float]:
         """Generate simulated embedding for development/testing."""
         # Create deterministic embedding based on text hash
@@ -242,19 +254,7 @@ class ScalableRAGMemory:
                                    success_rate: float = 1.0) -> str:
         """Store incident pattern in RAG memory."""
         try:
-            # Create pattern from incident
-            pattern = IncidentPattern(
-                pattern_id=str(uuid4()),
-                incident_type=f"{incident.severity}_{incident.business_impact.service_tier.value}",
-                symptoms=[incident.title, incident.description],
-                root_causes=[],  # Would be populated from diagnosis
-                resolution_actions=resolution_actions,
-                success_rate=success_rate,
-                confidence=0.8,  # Initial confidence
-                created_at=datetime.utcnow(),
-                last_used=datetime.utcnow(),
-                usage_count=1
-            )
+            pattern = self._build_pattern(incident, resolution_actions, success_rate)
             
             # Generate text representation for embedding
             text_content = self._pattern_to_text(pattern)
@@ -265,30 +265,10 @@ class ScalableRAGMemory:
             # Store in OpenSearch
             client = await self._get_opensearch_client()
             
-            document = {
-                "pattern_id": pattern.pattern_id,
-                "incident_type": pattern.incident_type,
-                "symptoms": pattern.symptoms,
-                "root_causes": pattern.root_causes,
-                "resolution_actions": pattern.resolution_actions,
-                "success_rate": pattern.success_rate,
-                "confidence": pattern.confidence,
-                "created_at": pattern.created_at.isoformat(),
-                "last_used": pattern.last_used.isoformat(),
-                "usage_count": pattern.usage_count,
-                "embedding": embedding,
-                "text_content": text_content,
-                "metadata": {
-                    "incident_id": incident.id,
-                    "service_tier": incident.business_impact.service_tier.value,
-                    "severity": incident.severity
-                }
-            }
-            
             await client.index(
                 index=self._index_name,
                 id=pattern.pattern_id,
-                body=document
+                body=self._pattern_document(pattern, incident, text_content, embedding)
             )
             
             # Cache the pattern
@@ -301,6 +281,90 @@ class ScalableRAGMemory:
             logger.error(f"Failed to store incident pattern: {e}")
             raise
     
+    async def store_incident_patterns(self, items: List[Tuple[Incident, List[str], float]]) -> List[str]:
+        """
+        Store many incident patterns, e.g. when backfilling history.
+        
+        Embeddings are generated in one batched call and documents are
+        written with a single bulk request.
+        
+        Args:
+            items: (incident, resolution_actions, success_rate) tuples
+            
+        Returns:
+            Pattern IDs in input order
+        """
+        try:
+            patterns = [self._build_pattern(*item) for item in items]
+            if not patterns:
+                return []
+            
+            texts = [self._pattern_to_text(pattern) for pattern in patterns]
+            embeddings = await self.generate_embeddings(texts)
+            
+            actions: List[Dict[str, Any]] = []
+            for item, pattern, text_content, embedding in zip(items, patterns, texts, embeddings):
+                actions.append({"index": {"_index": self._index_name, "_id": pattern.pattern_id}})
+                actions.append(self._pattern_document(pattern, item[0], text_content, embedding.tolist()))
+            
+            client = await self._get_opensearch_client()
+            response = await client.bulk(body=actions)
+            if response.get("errors"):
+                failed = [
+                    entry["index"]["_id"] for entry in response.get("items", [])
+                    if entry.get("index", {}).get("error")
+                ]
+                raise RuntimeError(f"Bulk indexing failed for {len(failed)} patterns: {failed[:5]}")
+            
+            for pattern in patterns:
+                self._pattern_cache[pattern.pattern_id] = pattern
+            
+            logger.info(f"Stored {len(patterns)} incident patterns")
+            return [pattern.pattern_id for pattern in patterns]
+            
+        except Exception as e:
+            logger.error(f"Failed to store incident patterns: {e}")
+            raise
+    
+    def _build_pattern(self, incident: Incident, resolution_actions: List[str],
+                       success_rate: float = 1.0) -> IncidentPattern:
+        """Create a new pattern from a resolved incident."""
+        return IncidentPattern(
+            pattern_id=str(uuid4()),
+            incident_type=f"{incident.severity}_{incident.business_impact.service_tier.value}",
+            symptoms=[incident.title, incident.description],
+            root_causes=[],  # Would be populated from diagnosis
+            resolution_actions=resolution_actions,
+            success_rate=success_rate,
+            confidence=0.8,  # Initial confidence
+            created_at=datetime.utcnow(),
+            last_used=datetime.utcnow(),
+            usage_count=1
+        )
+    
+    def _pattern_document(self, pattern: IncidentPattern, incident: Incident,
+                          text_content: str, embedding: List[float]) -> Dict[str, Any]:
+        """OpenSearch document for a pattern."""
+        return {
+            "pattern_id": pattern.pattern_id,
+            "incident_type": pattern.incident_type,
+            "symptoms": pattern.symptoms,
+            "root_causes": pattern.root_causes,
+            "resolution_actions": pattern.resolution_actions,
+            "success_rate": pattern.success_rate,
+            "confidence": pattern.confidence,
+            "created_at": pattern.created_at.isoformat(),
+            "last_used": pattern.last_used.isoformat(),
+            "usage_count": pattern.usage_count,
+            "embedding": embedding,
+            "text_content": text_content,
+            "metadata": {
+                "incident_id": incident.id,
+                "service_tier": incident.business_impact.service_tier.value,
+                "severity": incident.severity
+            }
+        }
+    
     def _pattern_to_text(self, pattern: IncidentPattern) -> str:
         """Convert pattern to text representation for embedding."""
         text_parts = [
@@ -557,6 +621,8 @@ class ScalableRAGMemory:
                 "usage_distribution": agg_response["aggregations"]["usage_distribution"]["buckets"],
                 "cache_stats": {
                     "embedding_cache_size": len(self._embedding_cache),
+                    "embedding_cache": self._embedding_cache.get_stats(),
+                    "embedding_batcher": self._embedding_batcher.get_stats(),
                     "pattern_cache_size": len(self._pattern_cache)
                 }
             }
@@ -611,17 +677,6 @@ class ScalableRAGMemory:
             logger.error(f"Failed to cleanup old patterns: {e}")
             return 0
     
-    async def _cleanup_embedding_cache(self) -> None:
-        """Clean up embedding cache to prevent memory issues."""
-        # Remove oldest 50% of cache entries
-        cache_items = list(self._embedding_cache.items())
-        cache_items.sort(key=lambda x: len(x[0]))  # Sort by key length as proxy for age
-        
-        keep_count = len(cache_items) // 2
-        self._embedding_cache = dict(cache_items[:keep_count])
-        
-        logger.info(f"Cleaned embedding cache, kept {keep_count} entries")
-    
     async def archive_to_s3(self, archive_older_than_days: int = 365) -> str:
         """Archive old patterns to S3 cold storage."""
         try:
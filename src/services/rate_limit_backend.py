@@ -0,0 +1,127 @@
+"""
+Shared token bucket state for rate limits that span workers.
+
+Each bucket is a Redis hash of its token count and last refill time, updated
+by one Lua script so refill, refund and take are atomic across every API
+worker and Lambda instance. The script reads the server clock, so worker
+clock skew cannot mint tokens. Buckets idle long enough to be full expire.
+"""
+
+import os
+from typing import Optional, Tuple
+
+import redis.asyncio as redis
+
+from src.utils.constants import DISTRIBUTED_RATE_LIMIT_CONFIG
+from src.utils.logging import get_logger
+
+
+logger = get_logger("rate_limit_backend")
+
+
+# KEYS[1]: bucket hash; ARGV: capacity, refill rate, tokens requested, tokens refunded,
+# 1 to grant every requested token even if that leaves the bucket in debt.
+# Returns tokens granted and, as a string, seconds until the bucket holds a whole token.
+_TAKE_TOKENS_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local force = ARGV[5] == '1'
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + refund)
+
+local granted = requested
+if not force then
+    granted = math.max(0, math.min(requested, math.floor(tokens)))
+end
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+-- Kept until refilled to capacity, so a debt cannot expire with the key
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+return {granted, tostring(wait)}
+"""
+
+
+class RedisTokenBucketBackend:
+    """Token buckets shared between processes through an atomic Redis script."""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, redis_url: Optional[str] = None,
+                 key_prefix: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            redis_client: Client to use; one is created from redis_url on first use if None
+            redis_url: Redis URL (RATE_LIMIT_REDIS_URL, then REDIS_URL, if None)
+            key_prefix: Prefix of the bucket keys
+        """
+        self._redis_client = redis_client
+        self._redis_url = (
+            redis_url or os.getenv("RATE_LIMIT_REDIS_URL") or os.getenv("REDIS_URL") or "redis://localhost:6379"
+        )
+        self.key_prefix = key_prefix or DISTRIBUTED_RATE_LIMIT_CONFIG["key_prefix"]
+        self._script = None
+
+    def _get_script(self):
+        """Registered take script; EVALSHA, reloaded by redis-py if the server lost it."""
+        if self._script is None:
+            if self._redis_client is None:
+                self._redis_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+            self._script = self._redis_client.register_script(_TAKE_TOKENS_SCRIPT)
+        return self._script
+
+    async def take(self, name: str, capacity: float, refill_rate: float,
+                   requested: int, refund: float = 0.0, force: bool = False) -> Tuple[int, float]:
+        """
+        Refill a shared bucket, return refunded tokens to it and take up to requested tokens.
+
+        Args:
+            name: Bucket name, unique per rate limit
+            capacity: Maximum number of tokens
+            refill_rate: Tokens added per second
+            requested: Tokens wanted
+            refund: Unspent tokens given back
+            force: Grant every requested token, leaving the bucket in debt if it is short
+
+        Returns:
+            Tokens granted, and seconds until the bucket holds a whole token
+        """
+        granted, wait = await self._get_script()(
+            keys=[f"{self.key_prefix}:{name}"],
+            args=[capacity, refill_rate, requested, refund, int(force)]
+        )
+        return int(granted), float(wait)
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._redis_client is not None:
+            await self._redis_client.close()
+            self._redis_client = None
+            self._script = None
+
+
+def rate_limit_backend_from_env() -> Optional[RedisTokenBucketBackend]:
+    """The shared backend if RATE_LIMIT_BACKEND=redis, else None for per-process limits."""
+    backend = os.getenv("RATE_LIMIT_BACKEND", "local").lower()
+    if backend == "redis":
+        logger.info("Rate limits shared through Redis")
+        return RedisTokenBucketBackend()
+    if backend != "local":
+        logger.warning(f"Unknown rate limit backend {backend!r}; using per-process limits")
+    return None
@@ -1,16 +1,31 @@
 """
 Rate limiting implementation with token bucket algorithm and intelligent routing.
+
+High-priority Bedrock requests that find every suitable model throttled wait
+in an admission queue: a heap ordered by priority, then by a per-incident
+fair-queuing tag so concurrent incidents share refills round robin. Waiters
+are granted as soon as a bucket refills; the scheduler sleeps until the
+computed time of the next token rather than polling, and drops waiters that
+cannot get a token before their deadline.
 """
 
 import asyncio
+import heapq
+import itertools
+import math
 import time
+from bisect import bisect_left
 from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, Optional, List, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
-from src.utils.constants import RATE_LIMITS
+from src.utils.constants import (
+    BEDROCK_ADMISSION_CONFIG, DISTRIBUTED_RATE_LIMIT_CONFIG, EMBEDDING_BATCH_CONFIG, LEARNING_CONFIG, RATE_LIMITS
+)
+from src.services.rate_limit_backend import rate_limit_backend_from_env
 from src.utils.logging import get_logger
 from src.utils.exceptions import RateLimitError
 
@@ -76,13 +91,58 @@ class TokenBucket:
             True if tokens were consumed, False if not enough tokens
         """
         async with self._lock:
-            self._refill()
-            
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
+            return self.try_consume(tokens)
+    
+    def try_consume(self, tokens: int = 1) -> bool:
+        """
+        Consume tokens if available, from synchronous code on the event loop.
+        
+        Args:
+            tokens: Number of tokens to consume
             
-            return False
+        Returns:
+            True if tokens were consumed, False if not enough tokens
+        """
+        self._refill()
+        
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        
+        return False
+    
+    def time_until_available(self, tokens: int = 1) -> float:
+        """Seconds until the bucket holds the given number of tokens."""
+        self._refill()
+        return max(tokens - self.tokens, 0) / self.refill_rate
+    
+    async def charge(self, tokens: int = 1) -> None:
+        """
+        Consume tokens even if the bucket is short, leaving it in debt until refilled.
+        
+        Args:
+            tokens: Number of tokens to consume
+        """
+        async with self._lock:
+            self._refill()
+            self.tokens -= tokens
+    
+    def release(self, tokens: int = 1) -> None:
+        """Return consumed tokens that were not used."""
+        self.tokens = min(self.capacity, self.tokens + tokens)
+    
+    async def refresh(self, tokens: int = 1) -> None:
+        """Make tokens due to the bucket visible to try_consume; local buckets refill on every read."""
+    
+    async def acquire(self, tokens: int = 1) -> None:
+        """
+        Wait until tokens can be consumed from bucket.
+        
+        Args:
+            tokens: Number of tokens to consume
+        """
+        while not await self.consume(tokens):
+            await asyncio.sleep(self.time_until_available(tokens))
     
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
@@ -105,18 +165,232 @@ class TokenBucket:
         }
 
 
+class DistributedTokenBucket(TokenBucket):
+    """
+    Token bucket whose tokens are shared with other workers through a backend.
+    
+    Tokens are leased from the shared bucket a few at a time and spent
+    locally, so most admissions make no round trip; tokens holds the local
+    lease. Leases expire after lease_ttl seconds and their unspent tokens are
+    refunded with the next lease, so a worker cannot hoard tokens and spend
+    them on top of a refilled shared bucket. While the backend is failing,
+    leases come from a per-process bucket instead.
+    """
+    
+    def __init__(self, name: str, capacity: int, refill_rate: float, backend,
+                 lease_size: Optional[int] = None, lease_ttl: Optional[float] = None):
+        """
+        Initialize distributed token bucket.
+        
+        Args:
+            name: Shared bucket name, the same in every worker
+            capacity: Maximum number of tokens across all workers
+            refill_rate: Tokens added per second across all workers
+            backend: Shared state, such as RedisTokenBucketBackend
+            lease_size: Tokens leased per round trip (from DISTRIBUTED_RATE_LIMIT_CONFIG if None)
+            lease_ttl: Seconds a lease may be spent (from DISTRIBUTED_RATE_LIMIT_CONFIG if None)
+        """
+        super().__init__(capacity, refill_rate)
+        self.name = name
+        self.backend = backend
+        self.lease_ttl = lease_ttl or DISTRIBUTED_RATE_LIMIT_CONFIG["lease_ttl_seconds"]
+        # No larger than what refills while the lease lasts, so leases are rarely refunded
+        self.lease_size = lease_size or max(1, int(min(
+            capacity * DISTRIBUTED_RATE_LIMIT_CONFIG["lease_fraction"], refill_rate * self.lease_ttl
+        )))
+        self.tokens = 0
+        self.round_trips = 0
+        self._lease_expires_at = 0.0
+        self._next_token_at = 0.0  # When the shared bucket is next expected to hold a token
+        self._refund = 0.0
+        self._backend_retry_at = 0.0
+        self._fallback = TokenBucket(capacity, refill_rate)
+    
+    async def consume(self, tokens: int = 1) -> bool:
+        """
+        Try to consume tokens, leasing more from the shared bucket if needed.
+        
+        Args:
+            tokens: Number of tokens to consume
+            
+        Returns:
+            True if tokens were consumed, False if not enough tokens
+        """
+        if self.try_consume(tokens):
+            return True
+        await self.refresh(tokens)
+        return self.try_consume(tokens)
+    
+    async def refresh(self, tokens: int = 1) -> None:
+        """Lease tokens if the local lease is short and the shared bucket may have refilled."""
+        async with self._lock:
+            self._refill()
+            now = time.monotonic()
+            if self.tokens >= tokens or now < self._next_token_at:
+                return
+            
+            requested = max(self.lease_size, tokens - int(self.tokens))
+            refund, self._refund = self._refund, 0.0
+            granted = None
+            if now >= self._backend_retry_at:
+                try:
+                    granted, wait = await self.backend.take(
+                        self.name, self.capacity, self.refill_rate, requested, refund
+                    )
+                    self.round_trips += 1
+                except Exception as e:
+                    logger.warning(f"Shared rate limit {self.name} unavailable, limiting locally: {e}")
+                    self._backend_retry_at = now + DISTRIBUTED_RATE_LIMIT_CONFIG["backend_retry_seconds"]
+            
+            if granted is None:
+                granted = 0
+                while granted < requested and self._fallback.try_consume():
+                    granted += 1
+                wait = self._fallback.time_until_available()
+            
+            now = time.monotonic()
+            self.tokens += granted
+            self._lease_expires_at = now + self.lease_ttl
+            self._next_token_at = now + wait
+    
+    async def charge(self, tokens: int = 1) -> None:
+        """
+        Consume tokens even if the shared bucket is short, leaving it in debt until refilled.
+        
+        Args:
+            tokens: Number of tokens to consume
+        """
+        if self.try_consume(tokens):
+            return
+        async with self._lock:
+            self._refill()
+            leased = min(int(self.tokens), tokens)
+            self.tokens -= leased
+            owed = tokens - leased
+            now = time.monotonic()
+            if now >= self._backend_retry_at:
+                refund, self._refund = self._refund, 0.0
+                try:
+                    _, wait = await self.backend.take(
+                        self.name, self.capacity, self.refill_rate, owed, refund, force=True
+                    )
+                    self.round_trips += 1
+                    self._next_token_at = time.monotonic() + wait
+                    return
+                except Exception as e:
+                    logger.warning(f"Shared rate limit {self.name} unavailable, limiting locally: {e}")
+                    self._backend_retry_at = now + DISTRIBUTED_RATE_LIMIT_CONFIG["backend_retry_seconds"]
+            await self._fallback.charge(owed)
+    
+    def release(self, tokens: int = 1) -> None:
+        """Return consumed tokens that were not used to the lease, which refunds them when it expires."""
+        self.tokens += tokens
+    
+    def time_until_available(self, tokens: int = 1) -> float:
+        """Seconds until the lease holds the tokens or the shared bucket is expected to refill."""
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return max(self._next_token_at - time.monotonic(), 0.0)
+    
+    def _refill(self) -> None:
+        """Expire the lease once its time is up, keeping its tokens for refund."""
+        if self.tokens > 0 and time.monotonic() >= self._lease_expires_at:
+            self._refund += self.tokens
+            self.tokens = 0
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get current bucket status; tokens are this worker's lease."""
+        status = super().get_status()
+        status.update({
+            "shared": True,
+            "lease_size": self.lease_size,
+            "round_trips": self.round_trips,
+            "backend_available": time.monotonic() >= self._backend_retry_at
+        })
+        return status
+
+
+class WaitTimeHistogram:
+    """Histogram of queue wait times with fixed upper bounds in seconds."""
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """Record one wait."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Cumulative counts keyed by upper bound, Prometheus style."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == math.inf else str(bound)] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+@dataclass(eq=False)
+class _AdmissionWaiter:
+    """Queued model request; times are event loop times."""
+    preferred_model: str
+    complexity_score: float
+    priority: RequestPriority
+    queued_at: float
+    deadline: float
+    future: asyncio.Future
+
+
+# Priorities that wait in the admission queue instead of failing fast
+_QUEUED_PRIORITIES = (RequestPriority.HIGH, RequestPriority.CRITICAL)
+
+
 class BedrockRateLimitManager:
     """Rate limit manager for Bedrock with intelligent model routing."""
     
-    def __init__(self):
-        """Initialize Bedrock rate limit manager."""
+    def __init__(self, backend=None):
+        """
+        Initialize Bedrock rate limit manager.
+        
+        Args:
+            backend: Shared token bucket state, such as RedisTokenBucketBackend,
+                so limits hold across workers; per-process limits if None
+        """
+        self.backend = backend
         self.model_buckets: Dict[str, TokenBucket] = {}
         self.model_health: Dict[str, float] = {}  # Health score 0.0-1.0
         self.model_costs: Dict[str, float] = {
             "anthropic.claude-3-sonnet-20240229-v1:0": 1.0,  # Base cost
             "anthropic.claude-3-haiku-20240307-v1:0": 0.3,   # Cheaper model
         }
-        self.request_queue: deque = deque()
+        
+        # Admission queue heap of (-priority, fair-queuing tag, sequence, waiter)
+        self._admission_queue: List[Tuple[int, float, int, _AdmissionWaiter]] = []
+        self._admission_loop = None
+        self._admission_sequence = itertools.count()
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._wake_task: Optional[asyncio.Task] = None
+        self._virtual_time = 0.0
+        self._incident_tags: Dict[str, float] = {}
+        self.max_queue_wait_seconds = BEDROCK_ADMISSION_CONFIG["max_queue_wait_seconds"]
+        self.queue_wait_histograms = {
+            priority: WaitTimeHistogram(BEDROCK_ADMISSION_CONFIG["queue_wait_buckets"])
+            for priority in _QUEUED_PRIORITIES
+        }
+        self.requests_queued = 0
+        self.queue_timeouts = 0
+        
+        # Embedding models are never routed to, only throttled
+        self.embedding_buckets: Dict[str, TokenBucket] = {}
+        self.max_embedding_concurrency = EMBEDDING_BATCH_CONFIG["max_concurrency"]
+        self._embedding_semaphore: Optional[asyncio.Semaphore] = None
+        self._embedding_semaphore_loop = None
         self._setup_model_buckets()
     
     def _setup_model_buckets(self) -> None:
@@ -124,12 +398,14 @@ class BedrockRateLimitManager:
         bedrock_config = RATE_LIMITS.get("bedrock", {"requests": 100, "period": 60})
         
         # Create buckets for each model with different capacities
-        self.model_buckets["anthropic.claude-3-sonnet-20240229-v1:0"] = TokenBucket(
+        self.model_buckets["anthropic.claude-3-sonnet-20240229-v1:0"] = _new_bucket(
+            self.backend, "bedrock:anthropic.claude-3-sonnet-20240229-v1:0",
             capacity=bedrock_config["requests"],
             refill_rate=bedrock_config["requests"] / bedrock_config["period"]
         )
         
-        self.model_buckets["anthropic.claude-3-haiku-20240307-v1:0"] = TokenBucket(
+        self.model_buckets["anthropic.claude-3-haiku-20240307-v1:0"] = _new_bucket(
+            self.backend, "bedrock:anthropic.claude-3-haiku-20240307-v1:0",
             capacity=bedrock_config["requests"] * 2,  # Higher capacity for cheaper model
             refill_rate=(bedrock_config["requests"] * 2) / bedrock_config["period"]
         )
@@ -137,111 +413,247 @@ class BedrockRateLimitManager:
         # Initialize health scores
         for model in self.model_buckets.keys():
             self.model_health[model] = 1.0
+        
+        embedding_config = RATE_LIMITS.get("bedrock_embeddings", bedrock_config)
+        self.embedding_buckets[LEARNING_CONFIG["embedding_model_id"]] = _new_bucket(
+            self.backend, f"bedrock_embeddings:{LEARNING_CONFIG['embedding_model_id']}",
+            capacity=embedding_config["requests"],
+            refill_rate=embedding_config["requests"] / embedding_config["period"]
+        )
+    
+    @asynccontextmanager
+    async def embedding_slot(self, model_id: str) -> AsyncIterator[None]:
+        """
+        Hold one of the bounded in-flight embedding call slots.
+        
+        Waits for a free slot, then for a token from the model's bucket, so
+        bulk embedding jobs queue instead of failing on throttling.
+        
+        Args:
+            model_id: Embedding model ID
+        """
+        async with self._get_embedding_semaphore():
+            bucket = self.embedding_buckets.get(model_id)
+            if bucket is not None:
+                await bucket.acquire()
+            yield
+    
+    def _get_embedding_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding embedding calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._embedding_semaphore is None or self._embedding_semaphore_loop is not loop:
+            self._embedding_semaphore = asyncio.Semaphore(self.max_embedding_concurrency)
+            self._embedding_semaphore_loop = loop
+        return self._embedding_semaphore
     
     async def request_model_access(self, preferred_model: str, 
                                  complexity_score: float = 0.5,
-                                 priority: RequestPriority = RequestPriority.MEDIUM) -> str:
+                                 priority: RequestPriority = RequestPriority.MEDIUM,
+                                 incident_id: Optional[str] = None,
+                                 timeout: Optional[float] = None) -> str:
         """
         Request access to a model with intelligent routing.
         
+        High and critical priority requests that find no model available
+        wait in the admission queue until a suitable bucket refills.
+        
         Args:
             preferred_model: Preferred model ID
             complexity_score: Task complexity (0.0-1.0)
             priority: Request priority
+            incident_id: Incident the request serves; queued requests are
+                shared fairly between incidents
+            timeout: Longest queue wait in seconds (max_queue_wait_seconds if None)
             
         Returns:
             Selected model ID
             
         Raises:
-            RateLimitError: If no models are available
+            RateLimitError: If no models are available, or none before the deadline
         """
+        # Queued requests go first, so this one only takes tokens no waiter can use
+        await self._refresh_model_buckets(
+            [preferred_model, *self._alternative_models(complexity_score, exclude=preferred_model)]
+        )
+        self._dispatch_waiters()
+        
+        model_id = self._take_model(preferred_model, complexity_score)
+        if model_id:
+            return model_id
+        
+        if priority in _QUEUED_PRIORITIES:
+            return await self._wait_for_model(preferred_model, complexity_score, priority, incident_id,
+                                              self.max_queue_wait_seconds if timeout is None else timeout)
+        
+        raise RateLimitError(f"No models available. Preferred: {preferred_model}")
+    
+    def _take_model(self, preferred_model: str, complexity_score: float) -> Optional[str]:
+        """Consume a token from the preferred model if healthy, else from the best alternative."""
         # Try preferred model first if healthy and available
         if (preferred_model in self.model_buckets and 
             self.model_health.get(preferred_model, 0) > 0.5):
             
-            if await self.model_buckets[preferred_model].consume():
+            if self.model_buckets[preferred_model].try_consume():
                 logger.debug(f"Granted access to preferred model: {preferred_model}")
                 return preferred_model
         
         # Find alternative model based on complexity and availability
-        alternative_model = await self._find_alternative_model(
-            complexity_score, priority, exclude=preferred_model
-        )
+        alternative_model = self._take_alternative_model(complexity_score, exclude=preferred_model)
         
         if alternative_model:
             logger.info(f"Routing to alternative model: {alternative_model} (preferred: {preferred_model})")
-            return alternative_model
-        
-        # If high priority, queue the request
-        if priority in [RequestPriority.HIGH, RequestPriority.CRITICAL]:
-            await self._queue_request(preferred_model, priority)
-            
-            # Wait briefly and try again
-            await asyncio.sleep(1)
-            return await self.request_model_access(preferred_model, complexity_score, priority)
-        
-        raise RateLimitError(f"No models available. Preferred: {preferred_model}")
+        return alternative_model
     
-    async def _find_alternative_model(self, complexity_score: float, 
-                                    priority: RequestPriority,
-                                    exclude: str = None) -> Optional[str]:
-        """Find alternative model based on complexity and availability."""
-        candidates = []
+    def _take_alternative_model(self, complexity_score: float, exclude: str = None) -> Optional[str]:
+        """Consume a token from the most suitable available alternative model."""
+        best_model = None
+        best_suitability = -1.0
         
-        for model_id, bucket in self.model_buckets.items():
-            if model_id == exclude:
-                continue
-            
+        for model_id in self._alternative_models(complexity_score, exclude):
             health = self.model_health.get(model_id, 0)
             cost = self.model_costs.get(model_id, 1.0)
             
-            # Check if model can handle the complexity
-            if model_id.endswith("haiku") and complexity_score > 0.8:
-                continue  # Haiku not suitable for very complex tasks
-            
             # Check availability
-            bucket_status = bucket.get_status()
+            bucket_status = self.model_buckets[model_id].get_status()
             if bucket_status["tokens"] < 1:
                 continue
             
-            # Calculate suitability score
+            # Calculate suitability score; the first of equal scores wins
             suitability = health * (1 / cost) * bucket_status["utilization"]
-            candidates.append((model_id, suitability))
-        
-        if not candidates:
-            return None
+            if suitability > best_suitability:
+                best_model, best_suitability = model_id, suitability
         
-        # Sort by suitability and try to consume token
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        for model_id, _ in candidates:
-            if await self.model_buckets[model_id].consume():
-                return model_id
+        if best_model and self.model_buckets[best_model].try_consume():
+            return best_model
         
         return None
     
-    async def _queue_request(self, model_id: str, priority: RequestPriority) -> None:
-        """Queue high-priority request for later processing."""
-        request = QueuedRequest(
-            request_id=f"req_{int(time.time() * 1000)}",
-            priority=priority,
-            queued_at=datetime.utcnow(),
-            service=model_id,
-            metadata={}
-        )
-        
-        # Insert based on priority
-        inserted = False
-        for i, queued_req in enumerate(self.request_queue):
-            if priority.value > queued_req.priority.value:
-                self.request_queue.insert(i, request)
-                inserted = True
+    def _alternative_models(self, complexity_score: float, exclude: str = None) -> Iterator[str]:
+        """Models other than exclude that can handle the complexity."""
+        for model_id in self.model_buckets:
+            if model_id == exclude:
+                continue
+            
+            # Check if model can handle the complexity
+            if "haiku" in model_id and complexity_score > 0.8:
+                continue  # Haiku not suitable for very complex tasks
+            
+            yield model_id
+    
+    def _time_until_model(self, preferred_model: str, complexity_score: float) -> float:
+        """Seconds until any model the request accepts has a token; inf if none qualifies."""
+        models = list(self._alternative_models(complexity_score, exclude=preferred_model))
+        if preferred_model in self.model_buckets and self.model_health.get(preferred_model, 0) > 0.5:
+            models.append(preferred_model)
+        return min((self.model_buckets[m].time_until_available() for m in models), default=math.inf)
+    
+    async def _wait_for_model(self, preferred_model: str, complexity_score: float,
+                              priority: RequestPriority, incident_id: Optional[str],
+                              timeout: float) -> str:
+        """Queue a request until the scheduler grants it a model or its deadline passes."""
+        loop = asyncio.get_running_loop()
+        self._bind_admission_loop(loop)
+        now = loop.time()
+        waiter = _AdmissionWaiter(preferred_model, complexity_score, priority, now, now + timeout,
+                                  loop.create_future())
+        
+        # Fair queuing: an incident's next request is tagged after its previous one
+        tag = self._virtual_time + 1
+        if incident_id is not None:
+            tag = max(tag, self._incident_tags.get(incident_id, 0) + 1)
+            self._incident_tags[incident_id] = tag
+        
+        heapq.heappush(self._admission_queue, (-priority.value, tag, next(self._admission_sequence), waiter))
+        self.requests_queued += 1
+        logger.info(f"Queued {priority.name} priority request for {preferred_model}")
+        self._dispatch_waiters()
+        
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            raise RateLimitError(f"No models available within {timeout}s. Preferred: {preferred_model}")
+    
+    def _dispatch_waiters(self) -> None:
+        """Grant queued requests in order while tokens last, then sleep until the next refill."""
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        
+        queue = self._admission_queue
+        if not queue:
+            return
+        loop = asyncio.get_running_loop()
+        if loop is not self._admission_loop:
+            self._bind_admission_loop(loop)
+            return
+        
+        now = loop.time()
+        deferred = []
+        next_wake = math.inf
+        while queue:
+            entry = heapq.heappop(queue)
+            waiter = entry[-1]
+            if waiter.future.done():  # Timed out or cancelled
+                continue
+            
+            model_id = self._take_model(waiter.preferred_model, waiter.complexity_score)
+            if model_id:
+                self._virtual_time = max(self._virtual_time, entry[1])
+                self.queue_wait_histograms[waiter.priority].observe(now - waiter.queued_at)
+                waiter.future.set_result(model_id)
+                continue
+            
+            wait = self._time_until_model(waiter.preferred_model, waiter.complexity_score)
+            if now + wait > waiter.deadline:
+                # No token can arrive in time, whatever is ahead in the queue
+                self.queue_timeouts += 1
+                waiter.future.set_exception(RateLimitError(
+                    f"No models available before deadline. Preferred: {waiter.preferred_model}"
+                ))
+                continue
+            
+            # Later waiters may accept other models that still have tokens
+            deferred.append(entry)
+            next_wake = min(next_wake, wait)
+            if all(bucket.time_until_available() > 0 for bucket in self.model_buckets.values()):
                 break
         
-        if not inserted:
-            self.request_queue.append(request)
+        if queue:
+            # Not examined: wake on the first refill anywhere
+            next_wake = min([next_wake] + [b.time_until_available() for b in self.model_buckets.values()])
+        for entry in deferred:
+            heapq.heappush(queue, entry)
         
-        logger.info(f"Queued {priority.name} priority request for {model_id}")
+        if not queue:
+            self._incident_tags.clear()
+        elif next_wake < math.inf:
+            self._wake_handle = loop.call_later(next_wake, self._wake_waiters)
+    
+    def _wake_waiters(self) -> None:
+        """Timer callback: lease due tokens, then dispatch."""
+        self._wake_handle = None
+        self._wake_task = asyncio.get_running_loop().create_task(self._refresh_and_dispatch())
+    
+    async def _refresh_and_dispatch(self) -> None:
+        """Grant waiters from the buckets as they stand after leasing."""
+        await self._refresh_model_buckets()
+        self._dispatch_waiters()
+    
+    async def _refresh_model_buckets(self, model_ids: Optional[Iterable[str]] = None) -> None:
+        """Lease due tokens for the shared buckets of model_ids (all models if None); a no-op for local ones."""
+        for model_id in self.model_buckets if model_ids is None else model_ids:
+            bucket = self.model_buckets.get(model_id)
+            if bucket is not None:
+                await bucket.refresh()
+    
+    def _bind_admission_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drop waiters queued on another event loop, which can never be woken."""
+        if self._admission_loop is not loop:
+            self._admission_queue.clear()
+            self._incident_tags.clear()
+            self._wake_handle = None
+            self._admission_loop = loop
     
     def update_model_health(self, model_id: str, health_score: float) -> None:
         """Update model health score based on recent performance."""
@@ -257,8 +669,13 @@ class BedrockRateLimitManager:
         status = {
             "timestamp": datetime.utcnow().isoformat(),
             "models": {},
-            "queue_length": len(self.request_queue),
-            "total_requests_queued": len(self.request_queue)
+            "embedding_models": {},
+            "queue_length": sum(not entry[-1].future.done() for entry in self._admission_queue),
+            "total_requests_queued": self.requests_queued,
+            "queue_timeouts": self.queue_timeouts,
+            "queue_wait_seconds": {
+                priority.name: histogram.to_dict() for priority, histogram in self.queue_wait_histograms.items()
+            }
         }
         
         for model_id, bucket in self.model_buckets.items():
@@ -271,14 +688,30 @@ class BedrockRateLimitManager:
                 "utilization": bucket_status["utilization"]
             }
         
+        for model_id, bucket in self.embedding_buckets.items():
+            bucket_status = bucket.get_status()
+            status["embedding_models"][model_id] = {
+                "tokens_available": bucket_status["tokens"],
+                "capacity": bucket_status["capacity"],
+                "utilization": bucket_status["utilization"],
+                "max_concurrency": self.max_embedding_concurrency
+            }
+        
         return status
 
 
 class ExternalServiceRateLimiter:
     """Rate limiter for external services (Datadog, PagerDuty, Slack)."""
     
-    def __init__(self):
-        """Initialize external service rate limiter."""
+    def __init__(self, backend=None):
+        """
+        Initialize external service rate limiter.
+        
+        Args:
+            backend: Shared token bucket state, such as RedisTokenBucketBackend,
+                so limits hold across workers; per-process limits if None
+        """
+        self.backend = backend
         self.service_buckets: Dict[str, TokenBucket] = {}
         self.request_queues: Dict[str, deque] = defaultdict(deque)
         self._setup_service_buckets()
@@ -286,10 +719,11 @@ class ExternalServiceRateLimiter:
     def _setup_service_buckets(self) -> None:
         """Setup token buckets for external services."""
         for service, config in RATE_LIMITS.items():
-            if service == "bedrock":  # Skip Bedrock, handled separately
+            if service.startswith("bedrock"):  # Skip Bedrock, handled separately
                 continue
             
-            self.service_buckets[service] = TokenBucket(
+            self.service_buckets[service] = _new_bucket(
+                self.backend, f"external:{service}",
                 capacity=config["requests"] * 2,  # Allow burst
                 refill_rate=config["requests"] / config["period"]
             )
@@ -402,6 +836,14 @@ class ExternalServiceRateLimiter:
         }
 
 
+def _new_bucket(backend, name: str, capacity: int, refill_rate: float) -> TokenBucket:
+    """Token bucket shared through the backend, or local to this process without one."""
+    if backend is None:
+        return TokenBucket(capacity=capacity, refill_rate=refill_rate)
+    return DistributedTokenBucket(name, capacity=capacity, refill_rate=refill_rate, backend=backend)
+
+
 # Global rate limiter instances
-bedrock_rate_limiter = BedrockRateLimitManager()
-external_service_rate_limiter = ExternalServiceRateLimiter()
\ No newline at end of file
+rate_limit_backend = rate_limit_backend_from_env()
+bedrock_rate_limiter = BedrockRateLimitManager(backend=rate_limit_backend)
+external_service_rate_limiter = ExternalServiceRateLimiter(backend=rate_limit_backend)
\ No newline at end of file
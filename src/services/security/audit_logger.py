@@ -3,14 +3,26 @@ Tamper-proof audit logging service for comprehensive compliance.
 
 This module implements cryptographically secure audit logging with
 7-year data retention, PII redaction, and regulatory compliance features.
+
+Events are chained in call order and written in batches: events logged
+while a write is in flight are committed together with BatchWriteItem.
+Every event carries an hourly time bucket indexed by a GSI, so a date range
+is read bucket by bucket instead of scanning the table. The chain is split
+into segments, at most one hour and checkpoint_every_events events long,
+each sealed by an HMAC-signed checkpoint over the Merkle root of its chain
+hashes. Verification of a period starts from the signed checkpoint before
+it, so its cost follows the period verified, not the age of the chain.
 """
 
 import asyncio
 import hashlib
+import hmac
 import json
-import re
+import os
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from decimal import Decimal
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from uuid import uuid4
 
 import boto3
@@ -21,12 +33,23 @@ from src.models.security import (
     AuditEvent, SecurityEventType, SecuritySeverity,
     PIIRedactionResult, ComplianceReport
 )
+from src.services.aws import AWSServiceFactory
+from src.services.pii_redaction import redactor_for
 from src.utils.config import ConfigManager
+from src.utils.constants import AUDIT_LOG_CONFIG
 from src.utils.exceptions import SecurityError
 
 
 logger = structlog.get_logger(__name__)
 
+_CHECKPOINT_PREFIX = "audit_checkpoint#"
+
+# Checkpoint attributes covered by its signature
+_CHECKPOINT_FIELDS = (
+    "chain_id", "first_sequence", "last_sequence", "previous_hash",
+    "chain_hash", "merkle_root", "time_bucket"
+)
+
 
 class TamperProofAuditLogger:
     """
@@ -40,15 +63,32 @@ class TamperProofAuditLogger:
     - Immutable audit trail with blockchain-like chaining
     """
     
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, service_factory: Optional[AWSServiceFactory] = None,
+                 checkpoint_secret: Optional[bytes] = None, checkpoint_every_events: Optional[int] = None):
+        """
+        Args:
+            config: Configuration manager
+            service_factory: Source of the async DynamoDB resource
+            checkpoint_secret: Key signing chain checkpoints, defaults to the
+                audit_checkpoint_secret setting or AUDIT_CHECKPOINT_SECRET
+            checkpoint_every_events: Longest chain segment sealed by one checkpoint
+        """
         self.config = config
-        self.dynamodb = boto3.resource('dynamodb', region_name=config.aws.region)
         self.s3 = boto3.client('s3', region_name=config.aws.region)
+        self._service_factory = service_factory
+        self._dynamodb_resource = None
         
         # Audit storage configuration
         self.audit_table_name = config.get('audit_table_name', 'incident-commander-audit-logs')
         self.audit_bucket_name = config.get('audit_bucket_name', 'incident-commander-audit-archive')
         self.retention_years = config.get('audit_retention_years', 7)
+        self.time_index_name = AUDIT_LOG_CONFIG["time_index_name"]
+        self.checkpoint_every_events = checkpoint_every_events or AUDIT_LOG_CONFIG["checkpoint_every_events"]
+        
+        secret = checkpoint_secret or config.get('audit_checkpoint_secret', None) or os.getenv("AUDIT_CHECKPOINT_SECRET", "")
+        if not secret:
+            raise SecurityError("Audit checkpoints require a signing secret")
+        self._checkpoint_key = secret.encode() if isinstance(secret, str) else secret
         
         # PII redaction patterns
         self.pii_patterns = {
@@ -61,9 +101,23 @@ class TamperProofAuditLogger:
             'aws_secret_key': r'\b[A-Za-z0-9/+=]{40}\b'
         }
         
-        # Chain hash for immutable audit trail
+        # Chain state for the immutable audit trail. Each logger instance
+        # starts its own chain; appending never awaits, so events are chained
+        # in call order without a lock.
+        self.chain_id = str(uuid4())
+        self._next_sequence = 0
         self._last_chain_hash: Optional[str] = None
-        self._chain_lock = asyncio.Lock()
+        self._last_timestamp: Optional[datetime] = None
+        
+        # Open segment: chain hashes since the last checkpoint
+        self._segment_hashes: List[str] = []
+        self._segment_previous_hash: Optional[str] = None
+        self._segment_bucket: Optional[str] = None
+        
+        # Group commit state: writes queued while a batch is in flight go
+        # out together in the next one
+        self._write_lock = asyncio.Lock()
+        self._pending_writes: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], asyncio.Future]] = []
     
     async def log_security_event(
         self,
@@ -95,16 +149,12 @@ class TamperProofAuditLogger:
             AuditEvent: The logged audit event
         """
         try:
-            # Generate unique event ID
-            event_id = str(uuid4())
-            
             # Redact PII from details
             if details:
                 details = await self._redact_pii_from_dict(details)
             
-            # Create audit event
-            audit_event = AuditEvent(
-                event_id=event_id,
+            # Create audit event and add it to the immutable chain
+            audit_event, checkpoints = self._append_to_chain(
                 event_type=event_type,
                 severity=severity,
                 agent_id=agent_id,
@@ -116,20 +166,13 @@ class TamperProofAuditLogger:
                 details=details or {}
             )
             
-            # Add to immutable chain
-            async with self._chain_lock:
-                chain_hash = await self._calculate_chain_hash(audit_event)
-                audit_event.details['chain_hash'] = chain_hash
-                audit_event.details['previous_hash'] = self._last_chain_hash
-                self._last_chain_hash = chain_hash
-            
-            # Store in DynamoDB
-            await self._store_audit_event(audit_event)
+            # Store in DynamoDB with the next batch
+            await self._store_audit_event(audit_event, checkpoints)
             
             # Log for immediate monitoring
             await logger.ainfo(
                 "Security event logged",
-                event_id=event_id,
+                event_id=audit_event.event_id,
                 event_type=event_type,
                 severity=severity,
                 agent_id=agent_id,
@@ -152,6 +195,13 @@ class TamperProofAuditLogger:
         """
         Verify the integrity of the audit chain for a given time period.
         
+        Whole hourly buckets covering the period are read through the time
+        index. Each chain found there is anchored at the signed checkpoint
+        sealing the segment before its first event (or at its genesis), then
+        walked in sequence: no gaps, every integrity hash and chain link
+        recomputed, and every checkpoint's signature and Merkle root checked
+        against the segment it seals.
+        
         Args:
             start_date: Start of verification period
             end_date: End of verification period
@@ -160,41 +210,35 @@ class TamperProofAuditLogger:
             bool: True if chain integrity is verified
         """
         try:
-            # Retrieve audit events in chronological order
-            events = await self._get_audit_events_by_date_range(start_date, end_date)
+            await self._flush_pending_writes()
+            events, checkpoints = await self._get_audit_records(start_date, end_date)
             
-            if not events:
+            if not events and not checkpoints:
                 return True  # Empty chain is valid
             
-            # Verify each event's integrity hash
+            chain_events: Dict[str, List[AuditEvent]] = defaultdict(list)
             for event in events:
-                if not event.verify_integrity():
+                chain_events[event.details.get('chain_id')].append(event)
+            chain_checkpoints: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for checkpoint in checkpoints:
+                chain_checkpoints[checkpoint.get('chain_id')].append(checkpoint)
+            
+            for chain_id in set(chain_events) | set(chain_checkpoints):
+                failure = await self._verify_chain(chain_id, chain_events[chain_id], chain_checkpoints[chain_id])
+                if failure:
                     await logger.aerror(
-                        "Audit event integrity verification failed",
-                        event_id=event.event_id,
-                        timestamp=event.timestamp
+                        "Audit chain verification failed",
+                        chain_id=chain_id,
+                        reason=failure
                     )
                     return False
             
-            # Verify chain continuity
-            previous_hash = None
-            for event in events:
-                expected_previous = event.details.get('previous_hash')
-                if previous_hash != expected_previous:
-                    await logger.aerror(
-                        "Audit chain continuity broken",
-                        event_id=event.event_id,
-                        expected_previous=expected_previous,
-                        actual_previous=previous_hash
-                    )
-                    return False
-                previous_hash = event.details.get('chain_hash')
-            
             await logger.ainfo(
                 "Audit chain integrity verified",
                 start_date=start_date,
                 end_date=end_date,
-                events_verified=len(events)
+                events_verified=len(events),
+                checkpoints_verified=len(checkpoints)
             )
             
             return True
@@ -218,26 +262,16 @@ class TamperProofAuditLogger:
         Returns:
             PIIRedactionResult: Redaction results with confidence score
         """
-        redacted_text = text
-        redacted_items = []
-        total_matches = 0
-        
-        for pii_type, pattern in self.pii_patterns.items():
-            matches = re.finditer(pattern, redacted_text, re.IGNORECASE)
-            for match in matches:
-                redacted_items.append({
-                    'type': pii_type,
-                    'pattern': match.group(),
-                    'start': match.start(),
-                    'end': match.end()
-                })
-                total_matches += 1
-                
-                # Replace with redacted placeholder
-                redacted_text = redacted_text.replace(
-                    match.group(),
-                    f'[REDACTED_{pii_type.upper()}]'
-                )
+        redacted_text, matches = redactor_for(self.pii_patterns).redact(text)
+        redacted_items = [
+            {
+                'type': match.pii_type,
+                'pattern': match.text,
+                'start': match.start,
+                'end': match.end
+            }
+            for match in matches
+        ]
         
         # Calculate confidence score based on pattern matching
         confidence_score = min(1.0, len(redacted_items) / max(1, len(text.split()) * 0.1))
@@ -402,41 +436,217 @@ class TamperProofAuditLogger:
     # Private helper methods
     
     async def _redact_pii_from_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively redact PII from dictionary values."""
-        redacted_data = {}
-        
-        for key, value in data.items():
-            if isinstance(value, str):
-                redaction_result = await self.redact_pii(value)
-                redacted_data[key] = redaction_result.redacted_text
-            elif isinstance(value, dict):
-                redacted_data[key] = await self._redact_pii_from_dict(value)
-            elif isinstance(value, list):
-                redacted_data[key] = [
-                    (await self.redact_pii(item)).redacted_text if isinstance(item, str) else item
-                    for item in value
-                ]
-            else:
-                redacted_data[key] = value
+        """Recursively redact PII from dictionary values, JSON strings included."""
+        return redactor_for(self.pii_patterns).redact_value(data)
+    
+    def _append_to_chain(self, **fields) -> Tuple[AuditEvent, List[Dict[str, Any]]]:
+        """
+        Create the next event of this logger's chain.
+        
+        Returns the event and the checkpoints it sealed: the open segment is
+        sealed before an event from a new hour and after its last allowed
+        event. Timestamps never go backwards along the chain.
+        """
+        timestamp = datetime.utcnow()
+        if self._last_timestamp and timestamp < self._last_timestamp:
+            timestamp = self._last_timestamp
+        bucket = _time_bucket(timestamp)
         
-        return redacted_data
+        checkpoints = []
+        if self._segment_hashes and bucket != self._segment_bucket:
+            checkpoints.append(self._seal_segment())
+        
+        event = AuditEvent(event_id=str(uuid4()), timestamp=timestamp, **fields)
+        chain_hash = _chain_hash(event, self._last_chain_hash)
+        event.details['chain_id'] = self.chain_id
+        event.details['chain_sequence'] = self._next_sequence
+        event.details['chain_hash'] = chain_hash
+        event.details['previous_hash'] = self._last_chain_hash
+        
+        self._next_sequence += 1
+        self._last_chain_hash = chain_hash
+        self._last_timestamp = timestamp
+        self._segment_bucket = bucket
+        self._segment_hashes.append(chain_hash)
+        if len(self._segment_hashes) >= self.checkpoint_every_events:
+            checkpoints.append(self._seal_segment())
+        
+        return event, checkpoints
     
-    async def _calculate_chain_hash(self, event: AuditEvent) -> str:
-        """Calculate chain hash for immutable audit trail."""
-        chain_data = {
-            'event_id': event.event_id,
-            'timestamp': event.timestamp.isoformat(),
-            'integrity_hash': event.integrity_hash,
-            'previous_hash': self._last_chain_hash
+    def _seal_segment(self) -> Dict[str, Any]:
+        """Signed checkpoint item for the open segment, starting a new one."""
+        checkpoint = {
+            'chain_id': self.chain_id,
+            'first_sequence': self._next_sequence - len(self._segment_hashes),
+            'last_sequence': self._next_sequence - 1,
+            'previous_hash': self._segment_previous_hash,
+            'chain_hash': self._last_chain_hash,
+            'merkle_root': _merkle_root(self._segment_hashes),
+            'time_bucket': self._segment_bucket
         }
+        checkpoint['signature'] = self._sign_checkpoint(checkpoint)
+        checkpoint.update({
+            'event_id': _checkpoint_id(self.chain_id, checkpoint['last_sequence']),
+            'record_type': 'checkpoint',
+            'timestamp': self._last_timestamp.isoformat(),
+            'ttl': self._ttl()
+        })
         
-        chain_str = json.dumps(chain_data, sort_keys=True)
-        return hashlib.sha256(chain_str.encode()).hexdigest()
+        self._segment_hashes = []
+        self._segment_previous_hash = self._last_chain_hash
+        return checkpoint
+    
+    def _sign_checkpoint(self, checkpoint: Dict[str, Any]) -> str:
+        """HMAC-SHA256 over the checkpoint's signed fields."""
+        body = json.dumps({field: checkpoint.get(field) for field in _CHECKPOINT_FIELDS}, sort_keys=True)
+        return hmac.new(self._checkpoint_key, body.encode(), hashlib.sha256).hexdigest()
+    
+    def _checkpoint_signature_valid(self, checkpoint: Dict[str, Any]) -> bool:
+        return hmac.compare_digest(self._sign_checkpoint(checkpoint), str(checkpoint.get('signature', '')))
     
-    async def _store_audit_event(self, event: AuditEvent) -> None:
-        """Store audit event in DynamoDB."""
-        table = self.dynamodb.Table(self.audit_table_name)
+    async def _verify_chain(self, chain_id: str, events: List[AuditEvent],
+                            checkpoints: List[Dict[str, Any]]) -> Optional[str]:
+        """Reason one chain's records fail verification, or None when they verify."""
+        if not events:
+            return "checkpoint without events"
+        
+        events = sorted(events, key=lambda event: event.details.get('chain_sequence', -1))
+        pending = deque(sorted(checkpoints, key=lambda checkpoint: checkpoint['last_sequence']))
+        sequence = events[0].details.get('chain_sequence')
+        if not isinstance(sequence, int):
+            return f"event {events[0].event_id} has no chain sequence"
+        
+        # Checkpoints of earlier segments whose events were archived; the
+        # last one is the anchor
+        anchor = None
+        while pending and pending[0]['last_sequence'] < sequence:
+            anchor = pending.popleft()
+        
+        # Anchor at the checkpoint sealing the previous segment
+        previous_hash = None
+        if sequence > 0:
+            if anchor is None or anchor['last_sequence'] != sequence - 1:
+                anchor = await self._get_checkpoint(chain_id, sequence - 1)
+            if anchor is None or not self._checkpoint_signature_valid(anchor):
+                return f"no valid checkpoint before sequence {sequence}"
+            previous_hash = anchor['chain_hash']
         
+        segment: List[str] = []
+        for event in events:
+            details = event.details
+            if details.get('chain_sequence') != sequence:
+                return f"sequence gap before {details.get('chain_sequence')}, expected {sequence}"
+            if not event.verify_integrity():
+                return f"integrity hash mismatch for event {event.event_id}"
+            chain_hash = _chain_hash(event, previous_hash)
+            if details.get('previous_hash') != previous_hash or details.get('chain_hash') != chain_hash:
+                return f"chain link broken at event {event.event_id}"
+            
+            segment.append(chain_hash)
+            previous_hash = chain_hash
+            sequence += 1
+            
+            if pending and pending[0]['last_sequence'] == sequence - 1:
+                checkpoint = pending.popleft()
+                if not (self._checkpoint_signature_valid(checkpoint)
+                        and checkpoint['first_sequence'] == sequence - len(segment)
+                        and checkpoint['chain_hash'] == chain_hash
+                        and checkpoint['merkle_root'] == _merkle_root(segment)):
+                    return f"checkpoint {checkpoint['event_id']} does not match its segment"
+                segment = []
+        
+        if pending:
+            return f"checkpoint {pending[0]['event_id']} seals events that are missing"
+        return None
+    
+    async def _get_dynamodb_resource(self):
+        """Get or create the async DynamoDB resource."""
+        if not self._dynamodb_resource:
+            if self._service_factory is None:
+                self._service_factory = AWSServiceFactory()
+            self._dynamodb_resource = await self._service_factory.create_resource('dynamodb')
+        return self._dynamodb_resource
+    
+    async def _get_audit_table(self):
+        dynamodb = await self._get_dynamodb_resource()
+        return await dynamodb.Table(self.audit_table_name)
+    
+    def _ttl(self) -> int:
+        return int((datetime.utcnow() + timedelta(days=self.retention_years * 365)).timestamp())
+    
+    async def _store_audit_event(self, event: AuditEvent, checkpoints: Sequence[Dict[str, Any]] = ()) -> None:
+        """Queue an event, and the checkpoints it sealed, for the next batch write; wait until written."""
+        written = asyncio.get_running_loop().create_future()
+        self._pending_writes.append(([self._build_event_item(event)], list(checkpoints), written))
+        
+        async with self._write_lock:
+            # An earlier holder may already have written our event
+            if not written.done():
+                batch, self._pending_writes = self._pending_writes, []
+                await self._commit_write_batch(batch)
+        
+        await written
+    
+    async def _commit_write_batch(
+        self, batch: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], asyncio.Future]]
+    ) -> None:
+        """Write a coalesced batch, checkpoints after the events they seal, resolving each caller's future."""
+        events = [item for items, _, _ in batch for item in items]
+        checkpoints = [item for _, items, _ in batch for item in items]
+        
+        try:
+            await self._batch_write([{'PutRequest': {'Item': item}} for item in events])
+            if checkpoints:
+                await self._batch_write([{'PutRequest': {'Item': item}} for item in checkpoints])
+        except BaseException as e:
+            # The events already hold their place in the chain: keep them, as
+            # chained, ahead of later writes so the next write persists them
+            # and the stored chain has no gap
+            self._pending_writes[:0] = batch
+            for _, _, future in batch:
+                if not future.done():
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+    
+    async def _flush_pending_writes(self) -> None:
+        """Write events queued or left over by a failed write."""
+        async with self._write_lock:
+            if self._pending_writes:
+                batch, self._pending_writes = self._pending_writes, []
+                await self._commit_write_batch(batch)
+    
+    async def _batch_write(self, requests: List[Dict[str, Any]]) -> None:
+        """Send write requests in concurrent BatchWriteItem calls."""
+        dynamodb = await self._get_dynamodb_resource()
+        size = AUDIT_LOG_CONFIG["write_batch_items"]
+        await asyncio.gather(*[
+            self._write_chunk(dynamodb.meta.client, requests[i:i + size])
+            for i in range(0, len(requests), size)
+        ])
+    
+    async def _write_chunk(self, client, requests: List[Dict[str, Any]]) -> None:
+        """One BatchWriteItem call, retrying unprocessed items with backoff."""
+        retries = AUDIT_LOG_CONFIG["max_write_retries"]
+        for attempt in range(retries + 1):
+            response = await client.batch_write_item(RequestItems={self.audit_table_name: requests})
+            requests = response.get('UnprocessedItems', {}).get(self.audit_table_name, [])
+            if not requests:
+                return
+            if attempt < retries:
+                await asyncio.sleep(min(1.0, 0.05 * 2 ** attempt))
+        raise SecurityError(f"{len(requests)} audit writes still unprocessed after {retries} retries")
+    
+    def _build_event_item(self, event: AuditEvent) -> Dict[str, Any]:
+        """Build the DynamoDB item for an audit event."""
         item = {
             'event_id': event.event_id,
             'timestamp': event.timestamp.isoformat(),
@@ -450,47 +660,102 @@ class TamperProofAuditLogger:
             'outcome': event.outcome,
             'details': event.details,
             'integrity_hash': event.integrity_hash,
-            'ttl': int((datetime.utcnow() + timedelta(days=self.retention_years * 365)).timestamp())
+            'time_bucket': _time_bucket(event.timestamp),
+            'ttl': self._ttl()
         }
         
         # Remove None values
-        item = {k: v for k, v in item.items() if v is not None}
-        
-        await asyncio.to_thread(table.put_item, Item=item)
+        return {k: v for k, v in item.items() if v is not None}
     
     async def _get_audit_events_by_date_range(
         self,
         start_date: datetime,
         end_date: datetime
     ) -> List[AuditEvent]:
-        """Retrieve audit events within date range."""
-        # This is a simplified implementation
-        # In production, you'd use DynamoDB GSI for efficient date range queries
-        table = self.dynamodb.Table(self.audit_table_name)
+        """Retrieve audit events within date range through the time bucket index."""
+        items = await self._query_time_buckets(start_date, end_date, bounded=True)
+        events = [_item_to_event(item) for item in items if item.get('record_type') != 'checkpoint']
+        return sorted(events, key=lambda x: (x.timestamp, x.details.get('chain_sequence', 0)))
+    
+    async def _get_audit_records(
+        self,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Tuple[List[AuditEvent], List[Dict[str, Any]]]:
+        """Events and checkpoints of every hourly bucket overlapping the date range."""
+        items = await self._query_time_buckets(start_date, end_date, bounded=False)
+        events = [_item_to_event(item) for item in items if item.get('record_type') != 'checkpoint']
+        checkpoints = [_from_dynamodb(item) for item in items if item.get('record_type') == 'checkpoint']
+        return events, checkpoints
+    
+    async def _get_checkpoint(self, chain_id: str, last_sequence: int) -> Optional[Dict[str, Any]]:
+        """Checkpoint sealing the segment of a chain that ends at last_sequence."""
+        table = await self._get_audit_table()
+        response = await table.get_item(Key={'event_id': _checkpoint_id(chain_id, last_sequence)})
+        item = response.get('Item')
+        return _from_dynamodb(item) if item else None
+    
+    async def _query_time_buckets(self, start_date: datetime, end_date: datetime,
+                                  bounded: bool) -> List[Dict[str, Any]]:
+        """
+        Query each hourly bucket from start_date to end_date, a few at a time.
         
-        response = await asyncio.to_thread(table.scan)
-        events = []
+        With bounded, items are limited to the exact range; otherwise whole
+        buckets are returned.
+        """
+        buckets = _time_buckets(start_date, end_date)
+        bounds = (start_date.isoformat(), end_date.isoformat()) if bounded else None
+        concurrency = AUDIT_LOG_CONFIG["query_concurrency"]
         
-        for item in response.get('Items', []):
-            event_time = datetime.fromisoformat(item['timestamp'])
-            if start_date <= event_time <= end_date:
-                events.append(AuditEvent(**item))
+        items: List[Dict[str, Any]] = []
+        for i in range(0, len(buckets), concurrency):
+            pages = await asyncio.gather(*[
+                self._query_time_bucket(bucket, bounds) for bucket in buckets[i:i + concurrency]
+            ])
+            for page in pages:
+                items.extend(page)
+        return items
+    
+    async def _query_time_bucket(self, bucket: str, bounds: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """All items of one hourly bucket, optionally between two ISO timestamps."""
+        table = await self._get_audit_table()
+        query = {
+            'IndexName': self.time_index_name,
+            'KeyConditionExpression': 'time_bucket = :time_bucket',
+            'ExpressionAttributeValues': {':time_bucket': bucket}
+        }
+        if bounds:
+            query['KeyConditionExpression'] += ' AND #ts BETWEEN :start AND :end'
+            query['ExpressionAttributeNames'] = {'#ts': 'timestamp'}
+            query['ExpressionAttributeValues'].update({':start': bounds[0], ':end': bounds[1]})
         
-        return sorted(events, key=lambda x: x.timestamp)
+        items = []
+        while True:
+            response = await table.query(**query)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            query['ExclusiveStartKey'] = last_key
     
     async def _get_audit_events_before_date(self, cutoff_date: datetime) -> List[AuditEvent]:
         """Get audit events before specified date for archival."""
-        table = self.dynamodb.Table(self.audit_table_name)
-        
-        response = await asyncio.to_thread(table.scan)
+        table = await self._get_audit_table()
+        scan = {}
         events = []
         
-        for item in response.get('Items', []):
-            event_time = datetime.fromisoformat(item['timestamp'])
-            if event_time < cutoff_date:
-                events.append(AuditEvent(**item))
-        
-        return events
+        while True:
+            response = await table.scan(**scan)
+            for item in response.get('Items', []):
+                if item.get('record_type') == 'checkpoint' or 'event_type' not in item:
+                    continue
+                event_time = datetime.fromisoformat(item['timestamp'])
+                if event_time < cutoff_date:
+                    events.append(_item_to_event(item))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return events
+            scan['ExclusiveStartKey'] = last_key
     
     async def _verify_data_retention(self, retention_cutoff: datetime) -> bool:
         """Verify data retention policy compliance."""
@@ -516,7 +781,7 @@ class TamperProofAuditLogger:
     
     async def _store_compliance_report(self, report: ComplianceReport) -> None:
         """Store compliance report in DynamoDB."""
-        table = self.dynamodb.Table(self.audit_table_name)
+        table = await self._get_audit_table()
         
         item = {
             'event_id': f"compliance_report_{report.report_id}",
@@ -526,10 +791,10 @@ class TamperProofAuditLogger:
             'action': 'generate_compliance_report',
             'outcome': 'success',
             'details': report.dict(),
-            'ttl': int((datetime.utcnow() + timedelta(days=self.retention_years * 365)).timestamp())
+            'ttl': self._ttl()
         }
         
-        await asyncio.to_thread(table.put_item, Item=item)
+        await table.put_item(Item=item)
     
     async def _upload_to_s3(self, bucket: str, key: str, data: str) -> None:
         """Upload data to S3 with encryption."""
@@ -543,10 +808,62 @@ class TamperProofAuditLogger:
     
     async def _delete_archived_events(self, events: List[AuditEvent]) -> None:
         """Delete archived events from hot storage."""
-        table = self.dynamodb.Table(self.audit_table_name)
-        
-        for event in events:
-            await asyncio.to_thread(
-                table.delete_item,
-                Key={'event_id': event.event_id}
-            )
\ No newline at end of file
+        await self._batch_write([{'DeleteRequest': {'Key': {'event_id': event.event_id}}} for event in events])
+
+
+def _chain_hash(event: AuditEvent, previous_hash: Optional[str]) -> str:
+    """Calculate chain hash for immutable audit trail."""
+    chain_data = {
+        'event_id': event.event_id,
+        'timestamp': event.timestamp.isoformat(),
+        'integrity_hash': event.integrity_hash,
+        'previous_hash': previous_hash
+    }
+    
+    chain_str = json.dumps(chain_data, sort_keys=True)
+    return hashlib.sha256(chain_str.encode()).hexdigest()
+
+
+def _merkle_root(chain_hashes: List[str]) -> str:
+    """Merkle root of a segment's chain hashes, with RFC 6962 leaf and node prefixes."""
+    level = [hashlib.sha256(b"\x00" + bytes.fromhex(chain_hash)).digest() for chain_hash in chain_hashes]
+    while len(level) > 1:
+        paired = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0].hex()
+
+
+def _checkpoint_id(chain_id: str, last_sequence: int) -> str:
+    return f"{_CHECKPOINT_PREFIX}{chain_id}#{last_sequence:012d}"
+
+
+def _time_bucket(timestamp: datetime) -> str:
+    """Hourly partition of the time index."""
+    return timestamp.strftime("%Y-%m-%dT%H")
+
+
+def _time_buckets(start_date: datetime, end_date: datetime) -> List[str]:
+    """Hourly buckets from the one holding start_date to the one holding end_date."""
+    hour = start_date.replace(minute=0, second=0, microsecond=0)
+    buckets = []
+    while hour <= end_date:
+        buckets.append(_time_bucket(hour))
+        hour += timedelta(hours=1)
+    return buckets
+
+
+def _from_dynamodb(value: Any) -> Any:
+    """Undo DynamoDB's Decimal numbers so stored events hash as they were logged."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _from_dynamodb(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_dynamodb(item) for item in value]
+    return value
+
+
+def _item_to_event(item: Dict[str, Any]) -> AuditEvent:
+    return AuditEvent(**_from_dynamodb(item))
\ No newline at end of file
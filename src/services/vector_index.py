@@ -0,0 +1,262 @@
+"""
+In-process embedding index for vector similarity search.
+
+Embeddings are kept in a contiguous, pre-normalized float32 matrix so a
+cosine search is a single matrix-vector product instead of a Python loop
+over documents. An optional IVF (inverted file) mode clusters the rows
+with k-means and only scores the ``nprobe`` closest clusters per query.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class EmbeddingIndex:
+    """Matrix-backed cosine similarity index with optional IVF approximation."""
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024,
+                 nlist: int = 0, nprobe: int = 8):
+        """
+        Args:
+            dimension: Embedding dimension.
+            initial_capacity: Rows preallocated before the first resize.
+            nlist: Number of IVF clusters; 0 keeps the index exact.
+            nprobe: Clusters scanned per query in IVF mode.
+        """
+        self.dimension = dimension
+        self.nlist = nlist
+        self.nprobe = nprobe
+
+        capacity = max(1, initial_capacity)
+        self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self._type_codes = np.zeros(capacity, dtype=np.int32)
+        self._assignments = np.full(capacity, -1, dtype=np.int32)
+        self._size = 0
+
+        # Row <-> id mapping; rows stay dense by swapping the last row into
+        # the slot freed by a delete.
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        self._type_to_code: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether IVF centroids are available for approximate search."""
+        return self._centroids is not None
+
+    def add(self, doc_id: str, embedding: Sequence[float], document_type: str = "") -> None:
+        """Add or replace a single embedding."""
+        self.add_batch([doc_id], np.asarray(embedding, dtype=np.float32)[None, :],
+                       [document_type])
+
+    def add_batch(self, doc_ids: Sequence[str], embeddings: np.ndarray,
+                  document_types: Optional[Sequence[str]] = None) -> None:
+        """Add or replace many embeddings in one vectorized pass."""
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        if vectors.shape != (len(doc_ids), self.dimension):
+            raise ValueError(
+                f"Expected embeddings of shape ({len(doc_ids)}, {self.dimension}), "
+                f"got {vectors.shape}"
+            )
+        types = document_types if document_types is not None else [""] * len(doc_ids)
+
+        rows = np.empty(len(doc_ids), dtype=np.int64)
+        for i, doc_id in enumerate(doc_ids):
+            row = self._rows.get(doc_id)
+            if row is None:
+                self._ensure_capacity(self._size + 1)
+                row = self._size
+                self._rows[doc_id] = row
+                self._ids.append(doc_id)
+                self._size += 1
+            rows[i] = row
+            self._type_codes[row] = self._code_for(types[i])
+
+        self._matrix[rows] = vectors
+        if self._centroids is not None:
+            self._assignments[rows] = self._assign(vectors)
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove an embedding; returns False if the id is unknown."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._type_codes[row] = self._type_codes[last]
+            self._assignments[row] = self._assignments[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+
+        self._ids.pop()
+        self._matrix[last] = 0.0
+        self._assignments[last] = -1
+        self._size = last
+        return True
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> None:
+        """Cluster the current rows with k-means and switch to IVF search."""
+        nlist = nlist or self.nlist
+        if nlist <= 0:
+            raise ValueError("nlist must be positive to train an IVF index")
+        if self._size < nlist:
+            logger.debug(f"Skipping IVF training: {self._size} rows < {nlist} clusters")
+            return
+
+        data = self._matrix[:self._size]
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(self._size, size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = data[assignments == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+
+        self.nlist = nlist
+        self._centroids = centroids
+        self._assignments[:self._size] = self._assign(data)
+        logger.info(f"Trained IVF index with {nlist} clusters over {self._size} rows")
+
+    def search(self, queries: np.ndarray, k: Optional[int] = 10,
+               document_type: Optional[str] = None, min_score: float = -1.0,
+               exclude_ids: Optional[Iterable[str]] = None,
+               exact: bool = False) -> List[List[Tuple[str, float]]]:
+        """
+        Batched top-k cosine search.
+
+        Args:
+            queries: A single ``(d,)`` vector or a ``(q, d)`` matrix.
+            k: Results per query; ``None`` returns every match above ``min_score``.
+            document_type: Only consider rows added with this type.
+            min_score: Minimum cosine similarity to include.
+            exclude_ids: Document ids that must not be returned.
+            exact: Force a full scan even when the index is trained.
+
+        Returns:
+            One ``[(doc_id, score), ...]`` list per query, best match first.
+        """
+        query_matrix = np.asarray(queries, dtype=np.float32)
+        if query_matrix.ndim == 1:
+            query_matrix = query_matrix[None, :]
+        query_matrix = self._normalize(query_matrix)
+
+        if self._size == 0:
+            return [[] for _ in range(len(query_matrix))]
+
+        base_mask = np.ones(self._size, dtype=bool)
+        if document_type is not None:
+            code = self._type_to_code.get(document_type)
+            if code is None:
+                return [[] for _ in range(len(query_matrix))]
+            base_mask &= self._type_codes[:self._size] == code
+        if exclude_ids:
+            excluded = [self._rows[i] for i in exclude_ids if i in self._rows]
+            base_mask[excluded] = False
+
+        use_ivf = self._centroids is not None and not exact
+        data = self._matrix[:self._size]
+        results = []
+
+        if not use_ivf:
+            candidates = np.flatnonzero(base_mask)
+            # Avoid copying the whole matrix when nothing is filtered out
+            rows = data if len(candidates) == self._size else data[candidates]
+            scores = query_matrix @ rows.T
+            for query_scores in scores:
+                results.append(self._top_k(candidates, query_scores, k, min_score))
+            return results
+
+        probes = min(self.nprobe, self.nlist)
+        centroid_scores = query_matrix @ self._centroids.T
+        assignments = self._assignments[:self._size]
+        for query, query_centroid_scores in zip(query_matrix, centroid_scores):
+            probe_lists = np.argpartition(-query_centroid_scores, probes - 1)[:probes]
+            candidates = np.flatnonzero(base_mask & np.isin(assignments, probe_lists))
+            query_scores = data[candidates] @ query
+            results.append(self._top_k(candidates, query_scores, k, min_score))
+        return results
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get index statistics."""
+        return {
+            "size": self._size,
+            "capacity": len(self._matrix),
+            "dimension": self.dimension,
+            "mode": "ivf" if self._centroids is not None else "exact",
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "memory_bytes": int(self._matrix.nbytes),
+        }
+
+    def _top_k(self, candidates: np.ndarray, scores: np.ndarray,
+               k: Optional[int], min_score: float) -> List[Tuple[str, float]]:
+        """Select the best-scoring candidates above ``min_score``."""
+        if k is not None and k <= 0:
+            return []
+        keep = scores >= min_score
+        candidates = candidates[keep]
+        scores = scores[keep]
+
+        if k is not None and len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates = candidates[top]
+            scores = scores[top]
+
+        order = np.argsort(-scores, kind="stable")
+        return [(self._ids[candidates[i]], float(scores[i])) for i in order]
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Assign normalized vectors to their nearest IVF centroid."""
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _code_for(self, document_type: str) -> int:
+        code = self._type_to_code.get(document_type)
+        if code is None:
+            code = len(self._type_to_code)
+            self._type_to_code[document_type] = code
+        return code
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow the backing arrays geometrically."""
+        capacity = len(self._matrix)
+        if required <= capacity:
+            return
+        new_capacity = max(required, capacity * 2)
+
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        type_codes = np.zeros(new_capacity, dtype=np.int32)
+        type_codes[:self._size] = self._type_codes[:self._size]
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[:self._size] = self._assignments[:self._size]
+
+        self._matrix = matrix
+        self._type_codes = type_codes
+        self._assignments = assignments
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows, leaving zero vectors as zeros."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32, copy=False)
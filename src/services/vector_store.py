@@ -10,11 +10,15 @@ from typing import Dict, List, Optional, Any, Tuple
 from uuid import uuid4
 
 import numpy as np
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from src.models.incident import Incident
 from src.models.agent import AgentRecommendation
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.services.vector_index import EmbeddingIndex
 from src.utils.config import config
+from src.utils.constants import LEARNING_CONFIG
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -23,7 +27,7 @@ logger = get_logger(__name__)
 class VectorDocument(BaseModel):
     """Document stored in vector database."""
     
-    id: str = str(uuid4())
+    id: str = Field(default_factory=lambda: str(uuid4()))
     content: str
     metadata: Dict[str, Any] = {}
     embedding: Optional[List[float]] = None
@@ -66,16 +70,28 @@ class SimilarityResult(BaseModel):
 class VectorStoreService:
     """Service for managing vector embeddings and similarity search."""
     
-    def __init__(self):
+    def __init__(self, embedding_cache: Optional[EmbeddingCache] = None):
         self.logger = get_logger(self.__class__.__name__)
         self.documents: Dict[str, VectorDocument] = {}
-        self.embeddings_cache: Dict[str, List[float]] = {}
+        self.embeddings_cache = embedding_cache if embedding_cache is not None else get_embedding_cache()
         
         # Configuration
         self.embedding_dimension = 1536  # Bedrock Titan embedding size
+        self.embedding_model_id = LEARNING_CONFIG["embedding_model_id"]
         self.similarity_threshold = 0.7
         self.max_results = 10
         self.cache_ttl_hours = 24
+        self.embedding_batcher = EmbeddingBatcher(
+            lambda text: self._invoke_titan_embedding(text),
+            self.embedding_model_id,
+            self.embedding_dimension,
+            cache=self.embeddings_cache,
+            fallback=self._simulated_embedding
+        )
+        
+        # Matrix-backed similarity index over document embeddings
+        self.index = EmbeddingIndex(self.embedding_dimension)
+        self._incident_documents: Dict[str, List[str]] = {}
     
     async def add_incident_document(self, incident: Incident, 
                                   recommendations: List[AgentRecommendation]) -> str:
@@ -111,7 +127,8 @@ class VectorStoreService:
             document.embedding = embedding
             
             # Store document
-            self.documents[document.id] = document
+            self._store_document(document)
+            self._incident_documents.setdefault(incident.id, []).append(document.id)
             
             self.logger.info(f"Added incident document: {incident.id}")
             return document.id
@@ -120,6 +137,31 @@ class VectorStoreService:
             self.logger.error(f"Error adding incident document: {e}")
             raise
     
+    def _store_document(self, document: VectorDocument) -> None:
+        """Store a document and index its embedding for similarity search."""
+        self.documents[document.id] = document
+        if document.embedding:
+            self.index.add(document.id, document.embedding, document.document_type)
+    
+    async def remove_document(self, document_id: str) -> bool:
+        """Remove a document and its embedding from the store."""
+        
+        document = self.documents.pop(document_id, None)
+        if document is None:
+            return False
+        
+        self.index.remove(document_id)
+        incident_id = document.metadata.get("incident_id")
+        if incident_id in self._incident_documents:
+            self._incident_documents[incident_id] = [
+                doc_id for doc_id in self._incident_documents[incident_id] if doc_id != document_id
+            ]
+            if not self._incident_documents[incident_id]:
+                del self._incident_documents[incident_id]
+        
+        self.logger.debug(f"Removed document {document_id}")
+        return True
+    
     def _create_incident_content(self, incident: Incident, 
                                recommendations: List[AgentRecommendation]) -> str:
         """Create searchable content from incident and recommendations."""
@@ -155,62 +197,64 @@ class VectorStoreService:
         return " | ".join(content_parts)
     
     async def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding vector for text using Bedrock Titan."""
-        
-        # Check cache first
-        cache_key = hash(text)
-        if str(cache_key) in self.embeddings_cache:
-            return self.embeddings_cache[str(cache_key)]
+        """Generate embedding vector for text using Bedrock Titan, batched with concurrent callers."""
         
         try:
-            # Use real Bedrock Titan Embeddings
-            bedrock_client = self.aws_factory.get_bedrock_client()
-            
-            embedding_request = {
-                "inputText": text[:8000]  # Limit input size for Titan
-            }
-            
-            try:
-                # Call Amazon Titan Embeddings model
-                response = await bedrock_client.invoke_model(
-                    modelId="amazon.titan-embed-text-v2:0",
-                    body=json.dumps(embedding_request),
-                    contentType="application/json"
-                )
-                
-                # Parse Titan response
-                response_body_bytes = await response['body'].read()
-                response_body = json.loads(response_body_bytes.decode())
-                embedding = response_body.get('embedding', [])
-                
-                if not embedding or len(embedding) != self.embedding_dimension:
-                    logger.warning(f"Invalid Titan embedding response, falling back to simulated")
-                    # Fallback to simulated embedding
-                    embedding = np.random.normal(0, 1, self.embedding_dimension).tolist()
-                    norm = np.linalg.norm(embedding)
-                    if norm > 0:
-                        embedding = (np.array(embedding) / norm).tolist()
-                
-                logger.debug(f"Generated Titan embedding for text: {text[:50]}...")
-                
-            except Exception as titan_error:
-                logger.warning(f"Titan embedding failed, using simulated: {titan_error}")
-                # Fallback to simulated embedding for development
-                embedding = np.random.normal(0, 1, self.embedding_dimension).tolist()
-                norm = np.linalg.norm(embedding)
-                if norm > 0:
-                    embedding = (np.array(embedding) / norm).tolist()
-            
-            # Cache result
-            self.embeddings_cache[str(cache_key)] = embedding
-            
-            return embedding
+            embedding = await self.embedding_batcher.embed(text)
+            return embedding.tolist()
             
         except Exception as e:
             self.logger.error(f"Error generating embedding: {e}")
             # Return zero vector as fallback
             return [0.0] * self.embedding_dimension
     
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts in rate-limited micro-batches.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Float32 array of shape (len(texts), embedding dimension)
+        """
+        return await self.embedding_batcher.embed_many(texts)
+    
+    def _simulated_embedding(self, text: str) -> np.ndarray:
+        """Random unit vector used when Titan is unavailable; never cached."""
+        embedding = np.random.normal(0, 1, self.embedding_dimension)
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+        return embedding
+    
+    async def _invoke_titan_embedding(self, text: str) -> List[float]:
+        """Call Titan for a single embedding; raises if the response is unusable."""
+        # Use real Bedrock Titan Embeddings
+        bedrock_client = self.aws_factory.get_bedrock_client()
+        
+        embedding_request = {
+            "inputText": text[:8000]  # Limit input size for Titan
+        }
+        
+        # Call Amazon Titan Embeddings model
+        response = await bedrock_client.invoke_model(
+            modelId=self.embedding_model_id,
+            body=json.dumps(embedding_request),
+            contentType="application/json"
+        )
+        
+        # Parse Titan response
+        response_body_bytes = await response['body'].read()
+        response_body = json.loads(response_body_bytes.decode())
+        embedding = response_body.get('embedding', [])
+        
+        if not embedding or len(embedding) != self.embedding_dimension:
+            raise ValueError("Invalid Titan embedding response")
+        
+        logger.debug(f"Generated Titan embedding for text: {text[:50]}...")
+        return embedding
+    
     async def search_similar_incidents(self, query_incident: Incident, 
                                      max_results: Optional[int] = None) -> List[SimilarityResult]:
         """Search for incidents similar to the query incident."""
@@ -220,39 +264,20 @@ class VectorStoreService:
             query_content = self._create_query_content(query_incident)
             query_embedding = await self._generate_embedding(query_content)
             
-            # Search through stored documents
-            results = []
-            for doc_id, document in self.documents.items():
-                if document.document_type != "incident" or not document.embedding:
-                    continue
-                
-                # Skip same incident
-                if document.metadata.get("incident_id") == query_incident.id:
-                    continue
-                
-                # Calculate similarity
-                similarity = self._calculate_cosine_similarity(query_embedding, document.embedding)
-                
-                if similarity >= self.similarity_threshold:
-                    result = SimilarityResult(
-                        document=document,
-                        similarity_score=similarity,
-                        rank=0,  # Will be set after sorting
-                        query_embedding=query_embedding
-                    )
-                    results.append(result)
-            
-            # Sort by similarity score
-            results.sort(key=lambda x: x.similarity_score, reverse=True)
-            
-            # Set ranks and limit results
+            # Top-k search over indexed incident documents, skipping the same incident
             max_results = max_results or self.max_results
-            for i, result in enumerate(results[:max_results]):
-                result.rank = i + 1
-                result.document.update_access()  # Update access statistics
+            matches = self.index.search(
+                np.asarray(query_embedding, dtype=np.float32),
+                k=max_results,
+                document_type="incident",
+                min_score=self.similarity_threshold,
+                exclude_ids=self._incident_documents.get(query_incident.id)
+            )[0]
+            
+            results = self._build_results(matches, query_embedding)
             
             self.logger.info(f"Found {len(results)} similar incidents for {query_incident.id}")
-            return results[:max_results]
+            return results
             
         except Exception as e:
             self.logger.error(f"Error searching similar incidents: {e}")
@@ -275,6 +300,23 @@ class VectorStoreService:
         
         return " ".join(content_parts)
     
+    def _build_results(self, matches: List[Tuple[str, float]],
+                       query_embedding: List[float]) -> List[SimilarityResult]:
+        """Build ranked similarity results from index matches."""
+        
+        results = []
+        for rank, (doc_id, similarity) in enumerate(matches, start=1):
+            document = self.documents[doc_id]
+            document.update_access()  # Update access statistics
+            results.append(SimilarityResult(
+                document=document,
+                similarity_score=similarity,
+                rank=rank,
+                query_embedding=query_embedding
+            ))
+        
+        return results
+    
     def _calculate_cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         
@@ -306,19 +348,14 @@ class VectorStoreService:
             content = self._create_pattern_content(pattern_name, pattern_data)
             
             # Create document
-            document = VectorDocument(
-                content=content,
-                metadata=pattern_data,
-                document_type="pattern",
-                source="pattern_discovery"
-            )
+            document = self._create_pattern_document(content, pattern_data)
             
             # Generate embedding
             embedding = await self._generate_embedding(content)
             document.embedding = embedding
             
             # Store document
-            self.documents[document.id] = document
+            self._store_document(document)
             
             self.logger.info(f"Added knowledge pattern: {pattern_name}")
             return document.id
@@ -327,6 +364,48 @@ class VectorStoreService:
             self.logger.error(f"Error adding knowledge pattern: {e}")
             raise
     
+    async def add_knowledge_patterns(self, patterns: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Add many knowledge patterns with one batched embedding call.
+        
+        Args:
+            patterns: Pattern data keyed by pattern name
+            
+        Returns:
+            Document IDs in the order of patterns
+        """
+        
+        try:
+            contents = [
+                self._create_pattern_content(pattern_name, pattern_data)
+                for pattern_name, pattern_data in patterns.items()
+            ]
+            embeddings = await self.generate_embeddings(contents)
+            
+            document_ids = []
+            for content, pattern_data, embedding in zip(contents, patterns.values(), embeddings):
+                document = self._create_pattern_document(content, pattern_data)
+                document.embedding = embedding.tolist()
+                self._store_document(document)
+                document_ids.append(document.id)
+            
+            self.logger.info(f"Added {len(document_ids)} knowledge patterns")
+            return document_ids
+            
+        except Exception as e:
+            self.logger.error(f"Error adding knowledge patterns: {e}")
+            raise
+    
+    def _create_pattern_document(self, content: str, pattern_data: Dict[str, Any]) -> VectorDocument:
+        """Create an unembedded pattern document."""
+        
+        return VectorDocument(
+            content=content,
+            metadata=pattern_data,
+            document_type="pattern",
+            source="pattern_discovery"
+        )
+    
     def _create_pattern_content(self, pattern_name: str, pattern_data: Dict[str, Any]) -> str:
         """Create searchable content from pattern data."""
         
@@ -350,35 +429,22 @@ class VectorStoreService:
             # Generate query embedding
             query_embedding = await self._generate_embedding(query)
             
-            # Search through pattern documents
-            results = []
-            for doc_id, document in self.documents.items():
-                if document.document_type != "pattern" or not document.embedding:
-                    continue
-                
-                # Filter by pattern type if specified
-                if pattern_type and document.metadata.get("pattern_type") != pattern_type:
-                    continue
-                
-                # Calculate similarity
-                similarity = self._calculate_cosine_similarity(query_embedding, document.embedding)
-                
-                if similarity >= self.similarity_threshold:
-                    result = SimilarityResult(
-                        document=document,
-                        similarity_score=similarity,
-                        rank=0,
-                        query_embedding=query_embedding
-                    )
-                    results.append(result)
-            
-            # Sort and rank results
-            results.sort(key=lambda x: x.similarity_score, reverse=True)
-            for i, result in enumerate(results[:self.max_results]):
-                result.rank = i + 1
-                result.document.update_access()
-            
-            return results[:self.max_results]
+            # Pattern type lives in metadata, so fetch every match above the
+            # threshold when filtering on it and trim after filtering
+            matches = self.index.search(
+                np.asarray(query_embedding, dtype=np.float32),
+                k=None if pattern_type else self.max_results,
+                document_type="pattern",
+                min_score=self.similarity_threshold
+            )[0]
+            
+            if pattern_type:
+                matches = [
+                    (doc_id, score) for doc_id, score in matches
+                    if self.documents[doc_id].metadata.get("pattern_type") == pattern_type
+                ][:self.max_results]
+            
+            return self._build_results(matches, query_embedding)
             
         except Exception as e:
             self.logger.error(f"Error searching patterns: {e}")
@@ -418,22 +484,20 @@ class VectorStoreService:
             "total_accesses": total_accesses,
             "average_relevance": avg_relevance,
             "cache_size": len(self.embeddings_cache),
+            "embedding_cache": self.embeddings_cache.get_stats(),
+            "embedding_batcher": self.embedding_batcher.get_stats(),
+            "index": self.index.get_stats(),
             "embedding_dimension": self.embedding_dimension,
             "similarity_threshold": self.similarity_threshold
         }
     
     async def cleanup_old_embeddings(self, max_age_hours: int = 24) -> None:
-        """Clean up old cached embeddings."""
+        """Clean up expired cached embeddings."""
         
-        # In production, this would check timestamp-based cache expiry
-        # For now, just limit cache size
-        if len(self.embeddings_cache) > 1000:
-            # Remove oldest half of cache entries
-            keys_to_remove = list(self.embeddings_cache.keys())[:500]
-            for key in keys_to_remove:
-                del self.embeddings_cache[key]
-            
-            self.logger.info(f"Cleaned up {len(keys_to_remove)} cached embeddings")
+        # Expiry is governed by the shared cache TTL; this just reclaims memory early
+        purged = self.embeddings_cache.purge_expired()
+        if purged:
+            self.logger.info(f"Cleaned up {purged} cached embeddings")
 
 
 # Global vector store service instance
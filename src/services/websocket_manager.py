@@ -2,7 +2,11 @@
 WebSocket Manager for Real-time Dashboard Updates
 
 Handles WebSocket connections, agent state broadcasting, and incident flow visualization.
-Supports batching and backpressure for 1,000+ concurrent viewers.
+Supports batching and backpressure for 10,000 concurrent viewers per worker.
+
+Broadcasts are serialized once and the encoded payload is shared by every
+subscriber. Each connection has a bounded ring buffer, and a connection is
+flushed when a message is enqueued rather than on a fixed polling tick.
 """
 
 import asyncio
@@ -11,7 +15,8 @@ import time
 from datetime import datetime
 from typing import Dict, List, Set, Any, Optional
 from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from collections import deque
+from enum import Enum
 import weakref
 
 from fastapi import WebSocket, WebSocketDisconnect
@@ -40,6 +45,23 @@ class ConnectionMetrics:
     messages_received: int = 0
     last_ping: Optional[datetime] = None
     latency_ms: Optional[float] = None
+    messages_dropped: int = 0
+    messages_coalesced: int = 0
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's send buffer is full."""
+    DROP = "drop"              # Drop low priority messages, evict old ones for high priority
+    COALESCE = "coalesce"      # Replace the queued message of the same type with the newest
+    DISCONNECT = "disconnect"  # Close the connection
+
+
+@dataclass(frozen=True)
+class EncodedMessage:
+    """Message serialized once and shared by every connection it is queued on."""
+    type: str
+    priority: int
+    payload: str
 
 
 class WebSocketManager:
@@ -55,19 +77,39 @@ class WebSocketManager:
     - Performance monitoring
     """
     
-    def __init__(self, max_connections: int = 1000, batch_size: int = 10, batch_interval: float = 0.1):
+    def __init__(self, max_connections: int = 10000, batch_size: int = 10, batch_interval: float = 0.1,
+                 queue_size: int = 100,
+                 slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP):
+        """
+        Initialize WebSocket manager.
+        
+        Args:
+            max_connections: Maximum concurrent connections
+            batch_size: Maximum messages per frame sent to a client
+            batch_interval: Kept for configuration compatibility; sends are
+                triggered by enqueue rather than by polling
+            queue_size: Capacity of each connection's ring buffer
+            slow_consumer_policy: Behaviour when a connection's buffer is full
+        """
         self.max_connections = max_connections
         self.batch_size = batch_size
         self.batch_interval = batch_interval
+        self.queue_size = queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
         
         # Connection management
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metrics: Dict[str, ConnectionMetrics] = {}
-        self.connection_queues: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.connection_queues: Dict[str, deque] = {}
         
-        # Message batching
-        self.pending_messages: Dict[str, List[WebSocketMessage]] = defaultdict(list)
+        # Event-driven fan-out: connections with queued messages are put on
+        # the ready queue once and flushed by their own send task
         self.batch_task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._scheduled: Set[str] = set()
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._closing: Set[str] = set()
+        self._disconnect_tasks: Set[asyncio.Task] = set()
         
         # Agent state tracking
         self.agent_states: Dict[str, str] = {}
@@ -75,12 +117,18 @@ class WebSocketManager:
         
         # Performance monitoring
         self.total_messages_sent = 0
+        self.total_messages_dropped = 0
+        self.total_messages_coalesced = 0
+        self.slow_consumer_disconnects = 0
         self.total_connections = 0
         self.start_time = datetime.utcnow()
         
     async def start(self):
         """Start the WebSocket manager and background tasks."""
         logger.info("Starting WebSocket manager")
+        self._ready = asyncio.Queue()
+        for connection_id in self._scheduled:
+            self._ready.put_nowait(connection_id)
         self.batch_task = asyncio.create_task(self._batch_processor())
         
     async def stop(self):
@@ -92,6 +140,14 @@ class WebSocketManager:
                 await self.batch_task
             except asyncio.CancelledError:
                 pass
+        
+        for task in list(self._flush_tasks.values()):
+            task.cancel()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks.values(), return_exceptions=True)
+        if self._disconnect_tasks:
+            await asyncio.gather(*self._disconnect_tasks, return_exceptions=True)
+        self._ready = None
                 
         # Close all connections
         for connection_id in list(self.active_connections.keys()):
@@ -119,6 +175,7 @@ class WebSocketManager:
             self.connection_metrics[connection_id] = ConnectionMetrics(
                 connected_at=datetime.utcnow()
             )
+            self.connection_queues[connection_id] = deque(maxlen=self.queue_size)
             self.total_connections += 1
             
             logger.info(f"WebSocket connected: {connection_id} ({len(self.active_connections)} total)")
@@ -132,21 +189,22 @@ class WebSocketManager:
             logger.error(f"Failed to accept connection {connection_id}: {e}")
             return False
             
-    async def disconnect(self, connection_id: str):
+    async def disconnect(self, connection_id: str, code: int = 1000):
         """Disconnect a WebSocket connection."""
         if connection_id in self.active_connections:
+            websocket = self.active_connections.pop(connection_id)
             try:
-                websocket = self.active_connections[connection_id]
-                await websocket.close()
+                await websocket.close(code=code)
             except Exception as e:
                 logger.warning(f"Error closing connection {connection_id}: {e}")
             finally:
-                del self.active_connections[connection_id]
-                del self.connection_metrics[connection_id]
-                if connection_id in self.connection_queues:
-                    del self.connection_queues[connection_id]
-                if connection_id in self.pending_messages:
-                    del self.pending_messages[connection_id]
+                self.connection_metrics.pop(connection_id, None)
+                self.connection_queues.pop(connection_id, None)
+                self._scheduled.discard(connection_id)
+                self._closing.discard(connection_id)
+                flush_task = self._flush_tasks.pop(connection_id, None)
+                if flush_task is not None and flush_task is not asyncio.current_task():
+                    flush_task.cancel()
                     
                 logger.info(f"WebSocket disconnected: {connection_id} ({len(self.active_connections)} remaining)")
                 
@@ -325,51 +383,124 @@ class WebSocketManager:
         
     async def _queue_broadcast(self, message: WebSocketMessage):
         """Queue message for broadcast to all connections."""
-        for connection_id in self.active_connections.keys():
-            await self._queue_message(connection_id, message)
+        encoded = self._encode_message(message)
+        for connection_id in list(self.active_connections.keys()):
+            self._enqueue(connection_id, encoded)
             
     async def _queue_message(self, connection_id: str, message: WebSocketMessage):
         """Queue message for specific connection with backpressure handling."""
         if connection_id not in self.active_connections:
             return
             
-        queue = self.connection_queues[connection_id]
+        self._enqueue(connection_id, self._encode_message(message))
+    
+    @staticmethod
+    def _encode_message(message: WebSocketMessage) -> EncodedMessage:
+        """Serialize a message once so every subscriber can share the payload."""
+        payload = json.dumps({
+            "type": message.type,
+            "timestamp": message.timestamp.isoformat(),
+            "data": message.data
+        }, default=str)
+        return EncodedMessage(type=message.type, priority=message.priority, payload=payload)
+    
+    def _enqueue(self, connection_id: str, message: EncodedMessage) -> bool:
+        """
+        Add an encoded message to a connection's ring buffer and wake its sender.
         
-        # Backpressure: drop low priority messages if queue is full
-        if len(queue) >= queue.maxlen and message.priority < 3:
+        Returns:
+            True if the message was queued
+        """
+        queue = self.connection_queues.get(connection_id)
+        if queue is None or connection_id in self._closing:
+            return False
+        
+        if len(queue) >= queue.maxlen and not self._make_room(connection_id, queue, message):
+            return False
+        
+        queue.append(message)
+        self._schedule(connection_id)
+        return True
+    
+    def _make_room(self, connection_id: str, queue: deque, message: EncodedMessage) -> bool:
+        """Apply the slow-consumer policy to a full buffer."""
+        metrics = self.connection_metrics[connection_id]
+        
+        if self.slow_consumer_policy == SlowConsumerPolicy.DISCONNECT:
+            logger.warning(f"Disconnecting slow consumer {connection_id} (queue full)")
+            self._closing.add(connection_id)
+            self.slow_consumer_disconnects += 1
+            task = asyncio.create_task(self.disconnect(connection_id, code=1013))
+            # Hold a reference so the close is not garbage collected mid-flight
+            self._disconnect_tasks.add(task)
+            task.add_done_callback(self._disconnect_tasks.discard)
+            return False
+        
+        if self.slow_consumer_policy == SlowConsumerPolicy.COALESCE:
+            for i, queued in enumerate(queue):
+                if queued.type == message.type:
+                    del queue[i]
+                    metrics.messages_coalesced += 1
+                    self.total_messages_coalesced += 1
+                    return True
+        
+        # Drop low priority messages; high priority ones evict the oldest
+        # low priority message, or the oldest message if there is none
+        metrics.messages_dropped += 1
+        self.total_messages_dropped += 1
+        if message.priority < 3:
             logger.debug(f"Dropping low priority message for {connection_id} (queue full)")
+            return False
+        for i, queued in enumerate(queue):
+            if queued.priority < 3:
+                del queue[i]
+                return True
+        queue.popleft()
+        return True
+    
+    def _schedule(self, connection_id: str):
+        """Put a connection on the ready queue unless it is already pending."""
+        if connection_id in self._scheduled:
             return
-            
-        queue.append(message)
-        self.pending_messages[connection_id].append(message)
+        self._scheduled.add(connection_id)
+        if self._ready is not None:
+            self._ready.put_nowait(connection_id)
         
     async def _batch_processor(self):
-        """Background task to process message batches."""
+        """Background task that starts a flush for each connection woken by an enqueue."""
         while True:
             try:
-                await asyncio.sleep(self.batch_interval)
-                
-                # Process batches for each connection
-                for connection_id in list(self.pending_messages.keys()):
-                    if connection_id not in self.active_connections:
-                        continue
-                        
-                    messages = self.pending_messages[connection_id][:self.batch_size]
-                    if not messages:
-                        continue
-                        
-                    # Remove processed messages
-                    self.pending_messages[connection_id] = self.pending_messages[connection_id][self.batch_size:]
-                    
-                    # Send batch
-                    await self._send_message_batch(connection_id, messages)
+                connection_id = await self._ready.get()
+                self._start_flush(connection_id)
+                while not self._ready.empty():
+                    self._start_flush(self._ready.get_nowait())
                     
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in batch processor: {e}")
+    
+    def _start_flush(self, connection_id: str):
+        """Start the send task for a ready connection."""
+        if connection_id not in self.active_connections:
+            self._scheduled.discard(connection_id)
+            return
+        self._flush_tasks[connection_id] = asyncio.create_task(self._flush_connection(connection_id))
+    
+    async def _flush_connection(self, connection_id: str):
+        """Drain a connection's ring buffer in frames of up to batch_size messages."""
+        try:
+            queue = self.connection_queues.get(connection_id)
+            while queue and connection_id in self.active_connections:
+                messages = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+                await self._send_message_batch(connection_id, messages)
+        finally:
+            # No await after the final emptiness check, so an enqueue cannot be missed
+            if self._flush_tasks.get(connection_id) is asyncio.current_task():
+                self._scheduled.discard(connection_id)
+                del self._flush_tasks[connection_id]
                 
-    async def _send_message_batch(self, connection_id: str, messages: List[WebSocketMessage]):
+    async def _send_message_batch(self, connection_id: str, messages: List[EncodedMessage]):
         """Send a batch of messages to a specific connection."""
         if connection_id not in self.active_connections:
             return
@@ -377,21 +508,13 @@ class WebSocketManager:
         websocket = self.active_connections[connection_id]
         
         try:
-            # Create batch message
-            batch_data = {
-                "type": "message_batch",
-                "timestamp": datetime.utcnow().isoformat(),
-                "messages": [
-                    {
-                        "type": msg.type,
-                        "timestamp": msg.timestamp.isoformat(),
-                        "data": msg.data
-                    }
-                    for msg in messages
-                ]
-            }
+            # Splice the pre-encoded payloads into the batch frame
+            batch_text = (
+                '{"type": "message_batch", "timestamp": "' + datetime.utcnow().isoformat() +
+                '", "messages": [' + ", ".join(msg.payload for msg in messages) + ']}'
+            )
             
-            await websocket.send_text(json.dumps(batch_data))
+            await websocket.send_text(batch_text)
             
             # Update metrics
             metrics = self.connection_metrics[connection_id]
@@ -633,6 +756,11 @@ class WebSocketManager:
             "active_connections": len(self.active_connections),
             "total_connections": self.total_connections,
             "total_messages_sent": self.total_messages_sent,
+            "total_messages_dropped": self.total_messages_dropped,
+            "total_messages_coalesced": self.total_messages_coalesced,
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            "slow_consumer_policy": self.slow_consumer_policy.value,
+            "queued_messages": sum(len(queue) for queue in self.connection_queues.values()),
             "uptime_seconds": uptime,
             "messages_per_second": self.total_messages_sent / max(uptime, 1),
             "connection_metrics": {
@@ -31,7 +31,17 @@ CONSENSUS_CONFIG = {
         # Note: Communication agent (0.0 weight) is non-voting - not included in consensus
     },
     "autonomous_confidence_threshold": 0.85,  # Byzantine consensus threshold
-    "decision_timeout": 300  # 5 minutes
+    "decision_timeout": 300,  # 5 minutes
+    "history_size": 1000,  # Compact decision records kept for statistics
+    "streaming_consensus": True,  # Decide as agents finish, cancelling ones that cannot change the outcome
+    "max_recommendations_per_agent": 1  # Votes a still-running agent is assumed to cast
+}
+
+# PBFT message signing
+CONSENSUS_CRYPTO_CONFIG = {
+    "signature_scheme": "rsa_pss",  # "rsa_pss", "ed25519", or "hmac_sha256" within one trust domain
+    "verify_workers": 4,  # Threads for batch signature verification
+    "parallel_verify_threshold": 16  # Smaller batches are verified inline
 }
 
 # Circuit Breaker Configuration
@@ -56,7 +66,8 @@ RATE_LIMITS = {
     "pagerduty": {"requests": 2, "period": 60},  # 2/min
     "email": {"requests": 10, "period": 1},  # 10/sec
     "datadog": {"requests": 20, "period": 1},  # 20/sec
-    "bedrock": {"requests": 100, "period": 60}  # 100/min
+    "bedrock": {"requests": 100, "period": 60},  # 100/min
+    "bedrock_embeddings": {"requests": 2000, "period": 60}  # 2000/min, Titan embeddings
 }
 
 # Shared Retry Policies
@@ -74,7 +85,51 @@ RESOURCE_LIMITS = {
     "alert_buffer_size": 1000,  # Maximum alerts in buffer
     "log_analysis_limit": 100 * 1024 * 1024,  # 100MB
     "correlation_depth": 5,  # Maximum correlation depth
-    "checkpoint_interval": 300  # 5 minutes
+    "checkpoint_interval": 300,  # 5 minutes
+    "completed_incident_retention_seconds": 86400,  # Keep finished incidents for 24 hours
+    "max_completed_incidents": 10000  # Hard cap on finished incidents held in memory
+}
+
+# Shared embedding cache
+EMBEDDING_CACHE_CONFIG = {
+    "max_bytes": 64 * 1024 * 1024,  # ~10k Titan embeddings
+    "ttl_seconds": 7 * 24 * 3600,
+    "disk_path": None,  # Directory for the persistent tier; memory only when unset
+    "disk_compaction_min_dead": 1024  # Superseded or expired disk records before the tier may be rewritten
+}
+
+# Inter-agent message bus receive engine
+MESSAGE_BUS_CONFIG = {
+    "receive_batch_size": 32,  # Messages drained per Redis round trip
+    "max_concurrency": 8,  # Handlers running at once per agent
+    "redis_block_seconds": 1.0,  # Blocking pop timeout; bounds how long shutdown waits
+    "sqs_wait_seconds": 20,  # SQS long poll, runs alongside the Redis receiver
+    "sqs_idle_delay_seconds": 0.1,  # Pause after an empty SQS receive
+    "redis_transport": "list",  # "list" or "streams" (consumer groups with XACK)
+    "stream_maxlen": 100000,  # Approximate cap on entries kept per agent stream
+    "reclaim_idle_seconds": 30.0,  # Pending entries idle this long are reclaimed and retried
+    "reclaim_interval_seconds": 5.0  # How often each consumer looks for idle pending entries
+}
+
+# Embedding micro-batching
+EMBEDDING_BATCH_CONFIG = {
+    "window_seconds": 0.005,  # How long concurrent callers are collected into one batch
+    "max_batch_size": 64,  # Flush early once this many texts are waiting
+    "max_concurrency": 16  # In-flight Bedrock embedding calls per process
+}
+
+# Bedrock Admission Queue
+BEDROCK_ADMISSION_CONFIG = {
+    "max_queue_wait_seconds": 30.0,  # Default deadline for a queued high-priority model request
+    "queue_wait_buckets": (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)  # Histogram bounds, seconds
+}
+
+# Distributed Rate Limiting (enabled with RATE_LIMIT_BACKEND=redis)
+DISTRIBUTED_RATE_LIMIT_CONFIG = {
+    "key_prefix": "incident_commander:rate_limit",
+    "lease_fraction": 0.1,  # Largest token lease, as a fraction of bucket capacity
+    "lease_ttl_seconds": 1.0,  # Leased tokens unspent after this are refunded to the shared bucket
+    "backend_retry_seconds": 5.0  # Buckets refill locally for this long after a backend failure
 }
 
 # Agent Dependency Ordering
@@ -95,6 +150,7 @@ LEARNING_CONFIG = {
     "checkpoint_cadence_minutes": 15,
     "knowledge_retention_days": 2555,  # 7 years for compliance
     "embedding_dimension": 1536,  # Bedrock Titan embedding size
+    "embedding_model_id": "amazon.titan-embed-text-v1",  # Produces embedding_dimension vectors
     "similarity_threshold": 0.7,
     "max_vector_cache_size": 1000,
     "data_quality_threshold": 0.6
@@ -111,6 +167,15 @@ SECURITY_CONFIG = {
     "integrity_check_enabled": True
 }
 
+# Tamper-proof audit log pipeline
+AUDIT_LOG_CONFIG = {
+    "time_index_name": "time_bucket-timestamp-index",  # GSI keyed by hourly bucket and ISO timestamp
+    "checkpoint_every_events": 1000,  # Chain segment length sealed by a signed Merkle root
+    "write_batch_items": 25,  # DynamoDB BatchWriteItem limit
+    "max_write_retries": 5,  # Retries for unprocessed batch items
+    "query_concurrency": 8  # Hourly buckets queried at once
+}
+
 # System Health and Monitoring
 HEALTH_CONFIG = {
     "health_check_interval_seconds": 30,
@@ -136,6 +201,9 @@ AGENT_CONFIG = {
         "max_alert_rate": 100,  # alerts per second
         "alert_sampling_threshold": 0.8,  # priority score threshold
         "correlation_timeout": 30,  # seconds
+        "correlation_window_seconds": 300,  # max gap between alerts in one group
+        "correlation_retention_seconds": 3600,  # evict groups idle this long
+        "max_active_correlation_groups": 10000,
         "simple_grouping_fallback": True
     },
     "resolution": {
@@ -147,6 +215,10 @@ AGENT_CONFIG = {
     },
     "diagnosis": {
         "max_log_analysis_size_mb": 100,
+        "log_chunk_bytes": 64 * 1024,  # Line-aligned chunk size read from log sources
+        "log_sample_lines": 1000,  # Lines sampled from the part of a log past the scan budget
+        "log_sample_strata": 48,  # Hourly strata the sample is spread across
+        "log_root": None,  # Directory local log files may be read from; None disables file sources
         "trace_analysis_timeout": 120,  # seconds
         "root_cause_confidence_threshold": 0.7
     },
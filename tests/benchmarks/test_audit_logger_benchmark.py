@@ -0,0 +1,129 @@
+"""
+Audit Log Benchmark
+
+Measures the two costs of the tamper-proof audit log: writing a burst of
+concurrent security events, and verifying one hour of a week-old chain.
+Batched writes are compared with the per-event put_item calls they replaced,
+and indexed verification with the full table scan it replaced.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.models.security import SecurityEventType, SecuritySeverity
+from src.services.security import audit_logger as audit_module
+from src.services.security.audit_logger import TamperProofAuditLogger
+from src.utils.logging import get_logger
+from tests.mocks.aws_mocks import MockAuditLogServiceFactory
+
+
+logger = get_logger(__name__)
+
+BURST_EVENTS = 500
+ROUND_TRIP = 0.002
+WEEK_HOURS = 24 * 7
+EVENTS_PER_HOUR = 20
+START = datetime(2024, 3, 1)
+
+
+class _Clock(datetime):
+    now = START
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+def _audit_logger(factory: MockAuditLogServiceFactory) -> TamperProofAuditLogger:
+    config = Mock()
+    config.get = lambda key, default=None: default
+    config.aws.region = "us-east-1"
+    with patch("boto3.client"):
+        return TamperProofAuditLogger(config, service_factory=factory, checkpoint_secret=b"benchmark")
+
+
+async def _log(audit_logger: TamperProofAuditLogger, n: int):
+    await audit_logger.log_security_event(
+        event_type=SecurityEventType.DATA_ACCESS,
+        severity=SecuritySeverity.LOW,
+        action=f"read-{n}",
+        outcome="success"
+    )
+
+
+async def _legacy_burst(items) -> None:
+    """The previous write path: one blocking put_item per event on the default thread pool."""
+    def put_item(item):
+        time.sleep(ROUND_TRIP)
+
+    await asyncio.gather(*[asyncio.to_thread(put_item, item) for item in items])
+
+
+async def _legacy_scan_reads(factory: MockAuditLogServiceFactory) -> int:
+    """Items the previous verification read: every page of a full table scan."""
+    table = factory.table
+    table.items_read = 0
+    scan = {}
+    while True:
+        response = await table.scan(**scan)
+        if "LastEvaluatedKey" not in response:
+            return table.items_read
+        scan["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestAuditLogBenchmark:
+    """Audit log write throughput and verification reads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_event_burst(self):
+        factory = MockAuditLogServiceFactory(latency=ROUND_TRIP)
+        audit_logger = _audit_logger(factory)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[_log(audit_logger, n) for n in range(BURST_EVENTS)])
+        current = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await _legacy_burst(list(factory.table.items.values()))
+        legacy = time.perf_counter() - start
+
+        calls = factory.dynamodb.meta.client.batch_write_count
+        logger.info(f"{BURST_EVENTS} concurrent audit events: legacy={legacy * 1000:.0f}ms, "
+                    f"batched={current * 1000:.0f}ms in {calls} BatchWriteItem calls")
+
+        assert len(factory.table.items) >= BURST_EVENTS
+        assert calls < BURST_EVENTS / 10
+        assert current < legacy
+
+    @pytest.mark.asyncio
+    async def test_verify_one_hour_of_a_week(self):
+        factory = MockAuditLogServiceFactory(page_size=100)
+        with patch.object(audit_module, "datetime", _Clock):
+            audit_logger = _audit_logger(factory)
+            for hour in range(WEEK_HOURS):
+                for n in range(EVENTS_PER_HOUR):
+                    _Clock.now = START + timedelta(hours=hour, seconds=n)
+                    await _log(audit_logger, n)
+
+            factory.table.query_count = 0
+            factory.table.items_read = 0
+            last_hour = START + timedelta(hours=WEEK_HOURS - 1)
+            start = time.perf_counter()
+            verified = await audit_logger.verify_audit_chain(last_hour, last_hour + timedelta(minutes=59))
+            elapsed = time.perf_counter() - start
+
+        current_reads = factory.table.items_read
+        legacy_reads = await _legacy_scan_reads(factory)
+        logger.info(f"Verify 1h of a {WEEK_HOURS}h chain: {elapsed * 1000:.1f}ms, "
+                    f"{factory.table.query_count} index queries reading {current_reads} items "
+                    f"vs a {legacy_reads}-item scan")
+
+        assert verified
+        assert factory.table.query_count == 1
+        assert current_reads * 20 < legacy_reads
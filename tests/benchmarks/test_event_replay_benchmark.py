@@ -0,0 +1,76 @@
+"""
+Event Replay Benchmark
+
+Measures replay latency for incidents of increasing age. With automatic
+snapshots, replay reads only the tail since the last snapshot, so latency
+stays flat instead of growing with the length of the history.
+"""
+
+import time
+from typing import Dict
+
+import pytest
+
+from src.interfaces.event_store import IncidentEvent
+from src.services.event_store import ScalableEventStore
+from src.utils.logging import get_logger
+from tests.mocks.aws_mocks import MockEventStoreServiceFactory
+
+
+logger = get_logger(__name__)
+
+INCIDENT_AGES = (200, 2000, 10000)
+PAGE_SIZE = 100
+SNAPSHOT_EVERY = 100
+APPEND_BATCH = 250
+
+
+async def _replay_ms(history: int, snapshots: bool) -> float:
+    factory = MockEventStoreServiceFactory(event_page_size=PAGE_SIZE)
+    event_store = ScalableEventStore(
+        factory,
+        snapshot_every_events=SNAPSHOT_EVERY if snapshots else 0,
+        snapshot_every_bytes=0
+    )
+
+    for start in range(0, history, APPEND_BATCH):
+        events = [
+            IncidentEvent(incident_id="inc-1", event_type="status_changed", event_data={"n": n})
+            for n in range(start, min(start + APPEND_BATCH, history))
+        ]
+        await event_store.append_events("inc-1", events)
+        await event_store.wait_for_snapshots()
+
+    # Simulate one round trip per DynamoDB call during the measured replay
+    factory.events_table.latency = 0.001
+    factory.snapshots_table.latency = 0.001
+
+    start = time.perf_counter()
+    state = await event_store.replay_events("inc-1")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    assert state.version == history
+    return elapsed
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestEventReplayBenchmark:
+    """Replay latency with and without automatic snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_replay_latency_is_flat_with_snapshots(self):
+        full: Dict[int, float] = {}
+        snapshotted: Dict[int, float] = {}
+
+        for history in INCIDENT_AGES:
+            full[history] = await _replay_ms(history, snapshots=False)
+            snapshotted[history] = await _replay_ms(history, snapshots=True)
+            logger.info(
+                f"Replay of {history} events: full={full[history]:.1f}ms, "
+                f"snapshot={snapshotted[history]:.1f}ms"
+            )
+
+        oldest, youngest = INCIDENT_AGES[-1], INCIDENT_AGES[0]
+        assert snapshotted[oldest] < full[oldest]
+        assert snapshotted[oldest] < snapshotted[youngest] * 5
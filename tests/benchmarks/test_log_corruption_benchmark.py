@@ -0,0 +1,78 @@
+"""
+Log Corruption Detection Benchmark
+
+Measures the whole-buffer checks of a multi-megabyte log dump (binary
+ratio, control character and null byte detection, control character
+removal and entropy) against the character-by-character loops they
+replaced.
+"""
+
+import os
+import time
+from collections import defaultdict
+
+import pytest
+
+from src.services.log_corruption_handler import LogCorruptionHandler
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+LINES = 80000
+
+
+def _dump() -> str:
+    return "".join(
+        f"2024-01-01T00:00:00Z INFO request {i} served in {i % 97}ms\x1b[0m{chr(0) if i % 1000 == 0 else ''}\n"
+        for i in range(LINES)
+    )
+
+
+def _legacy_checks(content: str, data: bytes) -> float:
+    """The previous per-character scans and dictionary entropy."""
+    sum(1 for c in content if ord(c) < 32 and c not in '\t\n\r')
+    [(i, c, ord(c)) for i, c in enumerate(content) if ord(c) < 32 and c not in '\t\n\r']
+    ''.join(c for c in content if ord(c) >= 32 or c in '\t\n\r')
+    [i for i, c in enumerate(content) if c == '\x00']
+    frequencies = defaultdict(int)
+    for byte in data:
+        frequencies[byte] += 1
+    return len(frequencies)
+
+
+def _current_checks(handler: LogCorruptionHandler, content: str, data: bytes) -> float:
+    handler._detect_binary_data(content)
+    handler._detect_control_characters(content)
+    handler._sanitize_control_characters(content)
+    handler._detect_null_bytes(content)
+    return handler._calculate_entropy(data)
+
+
+def _best_seconds(check, rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        check()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestLogCorruptionBenchmark:
+    """Whole-buffer corruption checks on a multi-megabyte dump."""
+
+    def test_buffer_checks(self):
+        content = _dump()
+        data = os.urandom(4 * 1024 * 1024)
+        handler = LogCorruptionHandler()
+
+        legacy = _best_seconds(lambda: _legacy_checks(content, data), rounds=1)
+        current = _best_seconds(lambda: _current_checks(handler, content, data))
+
+        logger.info(f"Corruption checks on {len(content) / 1e6:.1f} MB text + 4 MB binary: "
+                    f"legacy={legacy * 1000:.0f}ms, current={current * 1000:.0f}ms")
+
+        assert current < 0.2
+        assert current * 10 < legacy
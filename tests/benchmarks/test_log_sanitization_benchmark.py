@@ -0,0 +1,171 @@
+"""
+Log Sanitization Benchmark
+
+Measures LogSanitizationPipeline entries per second on a mix of structured,
+JSON, syslog and hostile entries, against a pipeline restoring the previous
+per-entry paths: raw regex strings evaluated one by one, per-character
+binary checks, a rebuilt one-minute window and summed pattern counts on
+every entry.
+"""
+
+import json
+import random
+import re
+import time
+import unicodedata
+from datetime import datetime
+from typing import List, Tuple
+
+import pytest
+
+from src.services import log_sanitization
+from src.services.log_sanitization import LogAnomalyType, LogEntry, LogSanitizationPipeline
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+ENTRY_COUNT = 20000
+ROUNDS = 3
+
+
+def _entries(count: int) -> List[str]:
+    rng = random.Random(11)
+    entries = []
+    for i in range(count):
+        kind = i % 20
+        if kind < 8:
+            entries.append(
+                f"2024-01-01T12:{i % 60:02d}:{i % 60:02d}Z INFO Request {i} processed for "
+                f"user{i % 97}@example.com in {rng.randint(1, 500)}ms"
+            )
+        elif kind < 14:
+            entries.append(json.dumps({
+                "timestamp": f"2024-01-01 12:{i % 60:02d}:00", "level": "WARN",
+                "message": f"Cache miss for key session:{rng.randint(1, 10 ** 6)}",
+                "source": f"svc-{i % 5}", "request_id": "1b4e28ba-2fa1-11d2-883f-0016cb0f3d2f"
+            }))
+        elif kind < 16:
+            entries.append(f"Jan 01 12:00:00 host sshd[{i}]: Accepted publickey for deploy from 10.0.{i % 255}.{i % 200}")
+        elif kind == 16:
+            entries.append(f"2024-01-01T12:00:00Z ERROR query failed: SELECT * FROM users WHERE id = '1' OR '1'='1' -- {i}")
+        elif kind == 17:
+            entries.append(json.dumps({"timestamp": "2024-01-01T12:00:00Z", "level": "INFO",
+                                       "message": f"payload <script>alert({i})</script>"}))
+        elif kind == 18:
+            entries.append(f"2024-01-01T12:00:00Z INFO fetch ../../etc/passwd from client {i}")
+        else:
+            entries.append(f"{{'timestamp': '2024-01-01 12:00:00', level: 'ERROR', message: 'broken json {i}',}}")
+    return entries
+
+
+class LegacySanitizationPipeline(LogSanitizationPipeline):
+    """Previous implementations of the per-entry hot paths."""
+
+    def _contains_binary_data(self, text: str) -> bool:
+        if '\x00' in text:
+            return True
+        printable_chars = sum(1 for c in text if c.isprintable() or c.isspace())
+        if len(text) > 0 and (printable_chars / len(text)) < 0.8:
+            return True
+        text_bytes = text.encode('utf-8', errors='ignore')
+        return any(sig in text_bytes for sig in [b'\x89PNG', b'\xFF\xD8\xFF', b'PK\x03\x04', b'\x50\x4B'])
+
+    def _has_valid_timestamp(self, entry: str) -> bool:
+        timestamp_patterns = [
+            r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}',
+            r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}',
+            r'\d{10,13}',
+            r'\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2}'
+        ]
+        return any(re.search(pattern, entry) for pattern in timestamp_patterns)
+
+    def _sanitize_encoding(self, text: str) -> Tuple[str, bool]:
+        applied = False
+        normalized = unicodedata.normalize('NFKC', text)
+        if normalized != text:
+            applied, text = True, normalized
+        for char in ''.join(chr(i) for i in range(32) if i not in [9, 10, 13]):
+            if char in text:
+                text = text.replace(char, '')
+                applied = True
+        return text, applied
+
+    def _sanitize_injections(self, text: str) -> Tuple[str, List[str]]:
+        applied = []
+        for injection_type, patterns in self.injection_patterns.items():
+            for pattern in patterns:
+                matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
+                if matches:
+                    text = re.sub(pattern, '[SANITIZED_INJECTION]', text, flags=re.IGNORECASE | re.MULTILINE)
+                    applied.append(f"{injection_type}_sanitization")
+        return text, applied
+
+    def _parse_timestamp(self, timestamp_str: str) -> datetime:
+        for fmt in ('%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S.%f',
+                    '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M:%S'):
+            try:
+                return datetime.strptime(timestamp_str, fmt)
+            except ValueError:
+                continue
+        return datetime.utcnow()
+
+    def _detect_anomalies(self, log_entry: LogEntry) -> List[LogAnomalyType]:
+        anomalies = []
+        current_time = datetime.utcnow()
+        self.log_frequency_history.append(current_time)
+        recent_logs = [t for t in self.log_frequency_history if (current_time - t).total_seconds() < 60]
+        if len(recent_logs) > 100:
+            anomalies.append(LogAnomalyType.FREQUENCY_SPIKE)
+        self.size_history.append(log_entry.original_size)
+        if len(self.size_history) >= 10:
+            if log_entry.original_size > sum(self.size_history) / len(self.size_history) * 5:
+                anomalies.append(LogAnomalyType.SIZE_ANOMALY)
+        message_pattern = self._extract_pattern(log_entry.message)
+        self.pattern_frequency[message_pattern] += 1
+        if sum(self.pattern_frequency.values()) > 100 and self.pattern_frequency[message_pattern] == 1:
+            anomalies.append(LogAnomalyType.UNUSUAL_PATTERN)
+        self.source_frequency[log_entry.source] += 1
+        if abs((current_time - log_entry.timestamp).total_seconds()) > 86400:
+            anomalies.append(LogAnomalyType.TIMING_ANOMALY)
+        return anomalies
+
+    def _extract_pattern(self, message: str) -> str:
+        pattern = re.sub(r'\d+', 'NUM', message)
+        pattern = re.sub(r'\b[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\b', 'UUID', pattern)
+        pattern = re.sub(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', 'IP', pattern)
+        pattern = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 'EMAIL', pattern)
+        return pattern[:100]
+
+
+async def _entries_per_second(pipeline: LogSanitizationPipeline, entries: List[str]) -> float:
+    start = time.perf_counter()
+    await pipeline.process_log_batch(entries)
+    return len(entries) / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestLogSanitizationBenchmark:
+    """Sanitization throughput in entries per second."""
+
+    @pytest.mark.asyncio
+    async def test_batch_throughput(self):
+        entries = _entries(ENTRY_COUNT)
+        # Both pipelines would log every injection; keep formatting out of the timing
+        log_sanitization.logger.disabled = True
+        try:
+            legacy, current = 0.0, 0.0
+            for _ in range(ROUNDS):
+                legacy = max(legacy, await _entries_per_second(LegacySanitizationPipeline(), entries))
+                current = max(current, await _entries_per_second(
+                    LogSanitizationPipeline(process_pool_threshold=ENTRY_COUNT + 1), entries
+                ))
+        finally:
+            log_sanitization.logger.disabled = False
+
+        logger.info(f"Log sanitization entries/s: legacy={legacy:.0f}, current={current:.0f}, "
+                    f"speedup={current / legacy:.1f}x")
+
+        # Single-process comparison; the process pool only adds headroom with spare cores
+        assert current > 3 * legacy
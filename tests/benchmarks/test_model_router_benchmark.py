@@ -0,0 +1,147 @@
+"""
+Model Router Benchmark
+
+Measures routing decisions over a mix of task types, strategies and
+severities: lookups in the precomputed routing tables against the
+filter-then-score pass over every model that they replaced, and the same
+lookups when every decision is followed by a recorded completion.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.model_router import _HIGH_SEVERITIES, ModelRouter, RoutingRequest, RoutingStrategy
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+DECISIONS = 100_000
+TASK_TYPES = ["detection", "diagnosis", "prediction", "resolution", "communication", None]
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+
+def _router() -> ModelRouter:
+    router = ModelRouter()
+    router.bedrock_client = AsyncMock()
+    router.aws_factory = Mock()
+    now = datetime.utcnow()
+    for model_name in router.model_configs:
+        router.model_health_cache[model_name] = (True, now)
+    return router
+
+
+def _requests():
+    strategies = list(RoutingStrategy)
+    return [
+        RoutingRequest(
+            task_type=TASK_TYPES[i % len(TASK_TYPES)],
+            strategy=strategies[i % len(strategies)],
+            incident_severity=SEVERITIES[i % len(SEVERITIES)],
+            max_latency_ms=3000
+        )
+        for i in range(60)
+    ]
+
+
+def _legacy_select(router: ModelRouter, request: RoutingRequest):
+    """The previous selection: filter every model, then score the survivors."""
+    task_prefs = router.task_preferences.get(request.task_type, {})
+    min_accuracy = max(request.required_accuracy, task_prefs.get("min_accuracy", 0.8))
+    max_latency = request.max_latency_ms or task_prefs.get("max_latency_ms", 5000)
+    available_models = [
+        model_name for model_name, config in router.model_configs.items()
+        if router.model_health_cache[model_name][0]
+        and config.accuracy_score >= min_accuracy
+        and config.avg_response_time_ms <= max_latency
+        and not (request.max_cost_per_1k_tokens and config.cost_per_1k_tokens > request.max_cost_per_1k_tokens)
+    ]
+    if len(available_models) == 1:
+        selected_model = available_models[0]
+    else:
+        high_severity = request.incident_severity in _HIGH_SEVERITIES
+        preferred_tier = task_prefs.get("preferred_tier")
+        model_scores = {
+            model_name: router._score_model(model_name, request.strategy, high_severity, preferred_tier)
+            for model_name in available_models
+        }
+        selected_model = max(model_scores.keys(), key=lambda m: model_scores[m])
+    fallback_models = sorted(
+        (m for m in available_models if m != selected_model),
+        key=lambda m: router.model_configs[m].availability_score,
+        reverse=True
+    )
+    return selected_model, fallback_models[:2]
+
+
+def _best_seconds(check, rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        check()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestModelRouterBenchmark:
+    """Routing decision throughput."""
+
+    def test_routing_decisions_per_second(self):
+        router = _router()
+        requests = _requests()
+        batch = requests * (DECISIONS // len(requests))
+
+        def current():
+            for request in batch:
+                router.select_models(request)
+
+        def legacy():
+            for request in batch:
+                _legacy_select(router, request)
+
+        current_seconds = _best_seconds(current)
+        legacy_seconds = _best_seconds(legacy, rounds=1)
+
+        logger.info(f"{len(batch)} routing decisions: legacy={legacy_seconds * 1000:.0f}ms, "
+                    f"tables={current_seconds * 1000:.0f}ms "
+                    f"({len(batch) / current_seconds / 1000:.0f}k decisions/s)")
+
+        assert [router.select_models(r)[0] for r in requests] == [_legacy_select(router, r)[0] for r in requests]
+        assert len(batch) / current_seconds > 100_000
+        assert current_seconds * 1.5 < legacy_seconds
+
+    def test_routing_with_completions(self):
+        """Completions with jittered latency and occasional failures rarely rebuild a table."""
+        router = _router()
+        requests = _requests()
+        batch = requests * (DECISIONS // len(requests))
+        builds = []
+        build_routing_table = router._build_routing_table
+
+        def counting_build(*args):
+            builds.append(args)
+            return build_routing_table(*args)
+
+        router._build_routing_table = counting_build
+
+        async def route_and_complete():
+            for i, request in enumerate(batch):
+                model_name, _ = router.select_models(request)
+                latency = router.model_configs[model_name].avg_response_time_ms * (0.9 + 0.02 * (i * 7 % 10))
+                await router.record_request_completion(model_name, i % 50 != 0, latency, 0.001, 500)
+
+        start = time.perf_counter()
+        asyncio.run(route_and_complete())
+        seconds = time.perf_counter() - start
+
+        logger.info(f"{len(batch)} routing decisions with completions: {seconds * 1000:.0f}ms "
+                    f"({len(batch) / seconds / 1000:.0f}k decisions/s), {len(builds)} table builds")
+
+        assert len(builds) * 100 < len(batch)
+        assert len(batch) / seconds > 100_000
@@ -0,0 +1,77 @@
+"""
+Shared Rate Limit Benchmark
+
+Four workers drain the Titan embedding quota concurrently. Per-process
+buckets admit the quota once per worker; buckets shared through the Redis
+script admit it once in total. Admission latency with token leases is
+compared with a round trip to Redis for every request.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.services.rate_limit_backend import RedisTokenBucketBackend
+from src.services.rate_limiter import DistributedTokenBucket, TokenBucket
+from src.utils.constants import RATE_LIMITS
+from src.utils.logging import get_logger
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+logger = get_logger(__name__)
+
+WORKERS = 4
+CAPACITY = RATE_LIMITS["bedrock_embeddings"]["requests"]
+REFILL_RATE = CAPACITY / RATE_LIMITS["bedrock_embeddings"]["period"]
+
+
+def _backend() -> RedisTokenBucketBackend:
+    client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    return RedisTokenBucketBackend(redis_client=client, key_prefix="benchmark")
+
+
+async def _drain(bucket: TokenBucket) -> int:
+    granted = 0
+    while await bucket.consume():
+        granted += 1
+    return granted
+
+
+async def _drain_workers(buckets) -> tuple:
+    """Tokens admitted by all workers, and seconds per admission."""
+    start = time.perf_counter()
+    granted = sum(await asyncio.gather(*[_drain(bucket) for bucket in buckets]))
+    elapsed = time.perf_counter() - start
+    return granted, elapsed, elapsed / granted
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestSharedRateLimitBenchmark:
+    """Global admission and per-request latency across workers."""
+
+    @pytest.mark.asyncio
+    async def test_workers_draining_embedding_quota(self):
+        local, _, _ = await _drain_workers([TokenBucket(CAPACITY, REFILL_RATE) for _ in range(WORKERS)])
+
+        backend = _backend()
+        leased = [DistributedTokenBucket("titan", CAPACITY, REFILL_RATE, backend) for _ in range(WORKERS)]
+        shared, elapsed, per_admission = await _drain_workers(leased)
+        round_trips = sum(bucket.round_trips for bucket in leased)
+
+        unleased = [DistributedTokenBucket("titan", CAPACITY, REFILL_RATE, _backend(), lease_size=1)
+                    for _ in range(WORKERS)]
+        _, _, per_round_trip = await _drain_workers(unleased)
+
+        logger.info(f"{WORKERS} workers draining {CAPACITY} tokens: per-process admitted {local}, "
+                    f"shared admitted {shared} with {round_trips} round trips; "
+                    f"{per_admission * 1e6:.0f}us per leased admission vs {per_round_trip * 1e6:.0f}us per round trip")
+
+        assert local == WORKERS * CAPACITY
+        assert shared <= CAPACITY + REFILL_RATE * elapsed + 1
+        assert round_trips * 10 < shared
+        assert per_admission < 0.001
+        assert per_admission * 5 < per_round_trip
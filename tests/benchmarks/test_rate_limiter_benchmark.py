@@ -0,0 +1,100 @@
+"""
+Bedrock Admission Benchmark
+
+Simulates high-priority requests from several incidents arriving just below
+a throttled model's refill rate, so bursts briefly exhaust the bucket.
+Queue waits under the admission scheduler are compared with the fixed
+one-second sleep and recursive retry that it replaced.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+import pytest
+
+from src.services.rate_limiter import BedrockRateLimitManager, RequestPriority, TokenBucket
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+SONNET = "anthropic.claude-3-sonnet-20240229-v1:0"
+REQUESTS = 120
+ARRIVALS_PER_SECOND = 40.0
+REFILLS_PER_SECOND = 50.0
+INCIDENTS = 4
+
+
+def _manager() -> BedrockRateLimitManager:
+    manager = BedrockRateLimitManager()
+    manager.model_buckets = {SONNET: TokenBucket(capacity=2, refill_rate=REFILLS_PER_SECOND)}
+    return manager
+
+
+async def _legacy_request(manager: BedrockRateLimitManager, queue: list, priority: RequestPriority) -> str:
+    """The previous path: linear-scan list insert, fixed 1s sleep, recursive retry."""
+    model_id = manager._take_model(SONNET, 0.5)
+    if model_id:
+        return model_id
+
+    for i, queued_priority in enumerate(queue):
+        if priority.value > queued_priority:
+            queue.insert(i, priority.value)
+            break
+    else:
+        queue.append(priority.value)
+
+    await asyncio.sleep(1)
+    return await _legacy_request(manager, queue, priority)
+
+
+async def _simulate(request) -> list:
+    """Queue wait of each request arriving on a jittered schedule."""
+    rng = random.Random(7)
+    waits = []
+
+    async def timed(n: int) -> None:
+        start = time.perf_counter()
+        priority = RequestPriority.CRITICAL if n % 10 == 0 else RequestPriority.HIGH
+        await request(priority, f"incident-{n % INCIDENTS}")
+        waits.append(time.perf_counter() - start)
+
+    tasks = []
+    for n in range(REQUESTS):
+        tasks.append(asyncio.create_task(timed(n)))
+        await asyncio.sleep(rng.expovariate(ARRIVALS_PER_SECOND))
+    await asyncio.gather(*tasks)
+    return sorted(waits)
+
+
+def _p99(waits: list) -> float:
+    return waits[int(len(waits) * 0.99) - 1]
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestBedrockAdmissionBenchmark:
+    """Queue waits for throttled high-priority model requests."""
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_under_throttling(self):
+        manager = _manager()
+        current = await _simulate(
+            lambda priority, incident: manager.request_model_access(SONNET, priority=priority, incident_id=incident)
+        )
+
+        legacy_manager = _manager()
+        legacy_queue = []
+        legacy = await _simulate(lambda priority, incident: _legacy_request(legacy_manager, legacy_queue, priority))
+
+        logger.info(f"{REQUESTS} requests at {ARRIVALS_PER_SECOND:.0f}/s, {REFILLS_PER_SECOND:.0f} refills/s: "
+                    f"legacy mean={statistics.mean(legacy) * 1000:.0f}ms p99={_p99(legacy) * 1000:.0f}ms, "
+                    f"scheduler mean={statistics.mean(current) * 1000:.0f}ms p99={_p99(current) * 1000:.0f}ms")
+
+        histogram = manager.get_status()["queue_wait_seconds"]
+        assert sum(h["count"] for h in histogram.values()) == manager.requests_queued
+        assert _p99(current) < 0.5
+        assert _p99(legacy) >= 1.0
+        assert statistics.mean(current) * 4 < statistics.mean(legacy)
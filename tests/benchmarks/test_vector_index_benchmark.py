@@ -0,0 +1,92 @@
+"""
+Vector Index Recall/Latency Benchmark
+
+Compares the matrix-backed EmbeddingIndex (exact and IVF modes) against the
+per-document linear cosine scan previously used by VectorStoreService.
+"""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from src.services.vector_index import EmbeddingIndex
+from src.utils.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+DOCUMENT_COUNT = 5000
+DIMENSION = 128
+QUERY_COUNT = 20
+TOP_K = 10
+
+
+def _clustered_corpus(seed: int = 11) -> np.ndarray:
+    """Synthetic embeddings grouped around topics, like real incident text."""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(64, DIMENSION))
+    labels = rng.integers(0, len(topics), size=DOCUMENT_COUNT)
+    return (topics[labels] + 0.35 * rng.normal(size=(DOCUMENT_COUNT, DIMENSION))).astype(np.float32)
+
+
+def _linear_scan(documents: List[List[float]], query: List[float], k: int) -> List[int]:
+    """Baseline: one NumPy conversion and cosine per document."""
+    scores = []
+    for i, embedding in enumerate(documents):
+        a = np.array(query)
+        b = np.array(embedding)
+        norm_a = np.linalg.norm(a)
+        norm_b = np.linalg.norm(b)
+        similarity = 0.0 if norm_a == 0 or norm_b == 0 else float(np.dot(a, b) / (norm_a * norm_b))
+        scores.append((similarity, i))
+    scores.sort(reverse=True)
+    return [i for _, i in scores[:k]]
+
+
+def _recall(expected: List[List[int]], actual: List[List[int]]) -> float:
+    hits = sum(len(set(e) & set(a)) for e, a in zip(expected, actual))
+    return hits / sum(len(e) for e in expected)
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+class TestVectorIndexBenchmark:
+    """Recall and latency of index modes versus the linear scan."""
+
+    def test_recall_and_latency_against_linear_scan(self):
+        corpus = _clustered_corpus()
+        rng = np.random.default_rng(3)
+        queries = corpus[rng.choice(DOCUMENT_COUNT, QUERY_COUNT, replace=False)]
+        queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+
+        documents = corpus.tolist()
+        start = time.perf_counter()
+        expected = [_linear_scan(documents, q.tolist(), TOP_K) for q in queries]
+        linear_ms = (time.perf_counter() - start) * 1000 / QUERY_COUNT
+
+        ids = [str(i) for i in range(DOCUMENT_COUNT)]
+        timings: Dict[str, float] = {}
+        recalls: Dict[str, float] = {}
+
+        for mode, nlist in (("exact", 0), ("ivf", 64)):
+            index = EmbeddingIndex(DIMENSION, initial_capacity=DOCUMENT_COUNT, nlist=nlist, nprobe=8)
+            index.add_batch(ids, corpus)
+            if nlist:
+                index.train()
+
+            start = time.perf_counter()
+            results = index.search(queries, k=TOP_K)
+            timings[mode] = (time.perf_counter() - start) * 1000 / QUERY_COUNT
+            recalls[mode] = _recall(expected, [[int(d) for d, _ in r] for r in results])
+
+        logger.info(
+            f"Vector search over {DOCUMENT_COUNT} docs: linear={linear_ms:.2f}ms/query, "
+            f"exact={timings['exact']:.3f}ms/query (recall {recalls['exact']:.3f}), "
+            f"ivf={timings['ivf']:.3f}ms/query (recall {recalls['ivf']:.3f})"
+        )
+
+        assert recalls["exact"] >= 0.99
+        assert recalls["ivf"] >= 0.8
+        assert timings["exact"] < linear_ms
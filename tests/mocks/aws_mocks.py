@@ -86,6 +86,211 @@ class MockDynamoDBClient:
         return {"Items": [], "Count": 0}
 
 
+class MockDynamoDBTable:
+    """In-memory DynamoDB table resource keyed by hash and optional range key."""
+    
+    def __init__(self, name: str, hash_key: str, range_key: Optional[str] = None, page_size: int = 1000,
+                 latency: float = 0.0):
+        self.name = name
+        self.latency = latency  # Simulated round trip; always yields to the event loop
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.page_size = page_size  # Items per page, standing in for the 1MB limit
+        self.items: Dict[Any, Dict[str, Any]] = {}
+        self.indexes: Dict[str, tuple] = {}  # Global secondary index name -> (hash key, range key)
+        self.query_count = 0
+        self.scan_count = 0
+        self.items_read = 0  # Items returned by queries and scans
+        self.put_count = 0
+    
+    def _key(self, item: Dict[str, Any]) -> Any:
+        if self.range_key:
+            return (item[self.hash_key], item[self.range_key])
+        return item[self.hash_key]
+    
+    def check_condition(self, item: Dict[str, Any], condition: Optional[str]) -> bool:
+        """Evaluate the attribute_not_exists conditions used by the services."""
+        if condition and condition.startswith("attribute_not_exists"):
+            return self._key(item) not in self.items
+        return True
+    
+    async def put_item(self, Item: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                       **kwargs) -> Dict[str, Any]:
+        """Put item, honouring attribute_not_exists conditions."""
+        from botocore.exceptions import ClientError
+        
+        await asyncio.sleep(self.latency)
+        if not self.check_condition(Item, ConditionExpression):
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": "exists"}},
+                "PutItem"
+            )
+        self.items[self._key(Item)] = dict(Item)
+        self.put_count += 1
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    
+    async def get_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Get item by key."""
+        await asyncio.sleep(self.latency)
+        item = self.items.get(self._key(Key))
+        return {"Item": dict(item)} if item is not None else {}
+    
+    def add_index(self, name: str, hash_key: str, range_key: str) -> None:
+        """Register a global secondary index."""
+        self.indexes[name] = (hash_key, range_key)
+    
+    async def delete_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Delete item by key."""
+        await asyncio.sleep(self.latency)
+        self.items.pop(self._key(Key), None)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    
+    async def query(self, ExpressionAttributeValues: Dict[str, Any], ScanIndexForward: bool = True,
+                    Limit: Optional[int] = None, ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+                    IndexName: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Query one hash key of the table or of an index.
+        
+        The range key is filtered by ``:from_version`` as a lower bound, or by
+        ``:start`` and ``:end`` as an inclusive range, when given.
+        """
+        self.query_count += 1
+        await asyncio.sleep(self.latency)
+        hash_key, range_key = self.indexes[IndexName] if IndexName else (self.hash_key, self.range_key)
+        hash_value = ExpressionAttributeValues[f":{hash_key}"]
+        lower_bound = ExpressionAttributeValues.get(":from_version", ExpressionAttributeValues.get(":start"))
+        upper_bound = ExpressionAttributeValues.get(":end")
+        
+        # Index entries are unique by index range key plus table key
+        def position(item):
+            return (item[range_key], str(self._key(item)))
+        
+        items = sorted(
+            (item for item in self.items.values() if item.get(hash_key) == hash_value
+             and range_key in item
+             and (lower_bound is None or item[range_key] >= lower_bound)
+             and (upper_bound is None or item[range_key] <= upper_bound)),
+            key=position,
+            reverse=not ScanIndexForward
+        )
+        if ExclusiveStartKey is not None:
+            start = position(ExclusiveStartKey)
+            items = [item for item in items
+                     if (position(item) > start if ScanIndexForward else position(item) < start)]
+        
+        page_size = min(Limit or self.page_size, self.page_size)
+        page = items[:page_size]
+        response: Dict[str, Any] = {"Items": [dict(item) for item in page], "Count": len(page)}
+        self.items_read += len(page)
+        if len(items) > page_size:
+            last = page[-1]
+            response["LastEvaluatedKey"] = {
+                key: last[key] for key in {hash_key, range_key, self.hash_key, self.range_key} if key
+            }
+        return response
+    
+    async def scan(self, ExclusiveStartKey: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """Scan the table a page at a time in key order."""
+        self.scan_count += 1
+        await asyncio.sleep(self.latency)
+        keys = sorted(self.items, key=str)
+        if ExclusiveStartKey is not None:
+            start = str(self._key(ExclusiveStartKey))
+            keys = [key for key in keys if str(key) > start]
+        
+        page = [self.items[key] for key in keys[:self.page_size]]
+        response: Dict[str, Any] = {"Items": [dict(item) for item in page], "Count": len(page)}
+        self.items_read += len(page)
+        if len(keys) > self.page_size:
+            last = page[-1]
+            response["LastEvaluatedKey"] = {key: last[key] for key in (self.hash_key, self.range_key) if key}
+        return response
+
+
+class MockDynamoDBResourceClient:
+    """Low-level client exposed as ``resource.meta.client``."""
+    
+    def __init__(self, resource: "MockDynamoDBResource"):
+        self._resource = resource
+        self.transaction_count = 0
+        self.batch_write_count = 0
+        self.unprocessed_per_batch = 0  # Requests left unprocessed by each call, to exercise retries
+        self.failing_batch_writes = 0  # Next BatchWriteItem calls that raise, to exercise failures
+    
+    async def transact_write_items(self, TransactItems: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Apply conditional puts atomically."""
+        from botocore.exceptions import ClientError
+        
+        puts = [entry["Put"] for entry in TransactItems]
+        await asyncio.sleep(max(self._resource.tables[put["TableName"]].latency for put in puts))
+        reasons = []
+        for put in puts:
+            table = self._resource.tables[put["TableName"]]
+            ok = table.check_condition(put["Item"], put.get("ConditionExpression"))
+            reasons.append({"Code": "None" if ok else "ConditionalCheckFailed"})
+        
+        if any(reason["Code"] != "None" for reason in reasons):
+            raise ClientError(
+                {"Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+                 "CancellationReasons": reasons},
+                "TransactWriteItems"
+            )
+        
+        for put in puts:
+            table = self._resource.tables[put["TableName"]]
+            table.items[table._key(put["Item"])] = dict(put["Item"])
+        self.transaction_count += 1
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    
+    async def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs) -> Dict[str, Any]:
+        """Apply puts and deletes of up to 25 requests, leaving the last few unprocessed if configured."""
+        requests = [(name, request) for name, entries in RequestItems.items() for request in entries]
+        if len(requests) > 25:
+            raise ValueError("BatchWriteItem accepts at most 25 requests")
+        await asyncio.sleep(max(self._resource.tables[name].latency for name, _ in requests))
+        if self.failing_batch_writes:
+            from botocore.exceptions import ClientError
+            
+            self.failing_batch_writes -= 1
+            raise ClientError(
+                {"Error": {"Code": "InternalServerError", "Message": "injected failure"}}, "BatchWriteItem"
+            )
+        self.batch_write_count += 1
+        
+        processed = len(requests) - min(self.unprocessed_per_batch, len(requests) - 1)
+        unprocessed: Dict[str, List[Dict[str, Any]]] = {}
+        for name, request in requests[processed:]:
+            unprocessed.setdefault(name, []).append(request)
+        for name, request in requests[:processed]:
+            table = self._resource.tables[name]
+            if "PutRequest" in request:
+                item = request["PutRequest"]["Item"]
+                table.items[table._key(item)] = dict(item)
+                table.put_count += 1
+            else:
+                table.items.pop(table._key(request["DeleteRequest"]["Key"]), None)
+        return {"UnprocessedItems": unprocessed}
+
+
+class MockDynamoDBResource:
+    """In-memory aioboto3-style DynamoDB resource."""
+    
+    def __init__(self):
+        self.tables: Dict[str, MockDynamoDBTable] = {}
+        self.meta = MagicMock()
+        self.meta.client = MockDynamoDBResourceClient(self)
+    
+    def add_table(self, name: str, hash_key: str, range_key: Optional[str] = None,
+                  page_size: int = 1000) -> MockDynamoDBTable:
+        """Register a table with its key schema."""
+        self.tables[name] = MockDynamoDBTable(name, hash_key, range_key, page_size)
+        return self.tables[name]
+    
+    async def Table(self, name: str) -> MockDynamoDBTable:
+        """Get a table resource."""
+        return self.tables[name]
+
+
 class MockBedrockClient:
     """Mock Bedrock client for testing."""
     
@@ -166,6 +371,7 @@ class MockKinesisClient:
     
     def __init__(self):
         self.streams = {}
+        self.put_records_calls = 0
     
     async def create_stream(self, **kwargs) -> Dict[str, Any]:
         """Create stream."""
@@ -186,6 +392,22 @@ class MockKinesisClient:
             "ShardId": "shardId-000000000000",
             "SequenceNumber": "12345"
         }
+    
+    async def put_records(self, **kwargs) -> Dict[str, Any]:
+        """Put a batch of records."""
+        stream_name = kwargs.get('StreamName')
+        records = kwargs.get('Records', [])
+        
+        if stream_name not in self.streams:
+            self.streams[stream_name] = []
+        
+        self.streams[stream_name].extend(record["Data"] for record in records)
+        self.put_records_calls += 1
+        return {
+            "FailedRecordCount": 0,
+            "Records": [{"ShardId": "shardId-000000000000", "SequenceNumber": str(i)}
+                        for i in range(len(records))]
+        }
 
 
 class MockAWSServiceFactory:
@@ -224,6 +446,48 @@ class MockAWSServiceFactory:
         return self._kinesis_client
 
 
+class MockEventStoreServiceFactory:
+    """Service factory serving in-memory DynamoDB tables and Kinesis to the event store."""
+    
+    def __init__(self, event_page_size: int = 1000):
+        from src.utils.config import config
+        
+        self.dynamodb = MockDynamoDBResource()
+        self.events_table = self.dynamodb.add_table(
+            config.get_table_name("events"), "incident_id", "version", page_size=event_page_size
+        )
+        self.snapshots_table = self.dynamodb.add_table(config.get_table_name("snapshots"), "incident_id")
+        self.kinesis = MockKinesisClient()
+        self.region = "us-east-1"
+    
+    async def create_client(self, service_name: str, **kwargs):
+        """Create a client."""
+        if service_name == 'kinesis':
+            return self.kinesis
+        return AsyncMock()
+    
+    async def create_resource(self, service_name: str, **kwargs):
+        """Create a resource."""
+        return self.dynamodb
+
+
+class MockAuditLogServiceFactory:
+    """Service factory serving an in-memory audit log table with its time bucket index."""
+    
+    def __init__(self, table_name: str = "incident-commander-audit-logs", page_size: int = 1000,
+                 latency: float = 0.0):
+        from src.utils.constants import AUDIT_LOG_CONFIG
+        
+        self.dynamodb = MockDynamoDBResource()
+        self.table = self.dynamodb.add_table(table_name, "event_id", page_size=page_size)
+        self.table.latency = latency
+        self.table.add_index(AUDIT_LOG_CONFIG["time_index_name"], "time_bucket", "timestamp")
+    
+    async def create_resource(self, service_name: str, **kwargs):
+        """Create a resource."""
+        return self.dynamodb
+
+
 def create_mock_aws_session():
     """Create a mock aioboto3 session."""
     session = MagicMock()
@@ -111,17 +111,15 @@ class TestTamperProofAuditLogger:
     @pytest.mark.asyncio
     async def test_verify_audit_chain(self, mock_audit_logger):
         """Test audit chain integrity verification."""
-        # Mock the get events method
-        mock_events = [
-            AuditEvent(
-                event_id=str(uuid4()),
-                event_type=SecurityEventType.AGENT_AUTHENTICATION,
-                severity=SecuritySeverity.LOW,
-                action="test",
-                outcome="success"
-            )
-        ]
-        mock_audit_logger._get_audit_events_by_date_range = AsyncMock(return_value=mock_events)
+        # Mock the get records method with a chained event
+        mock_event, checkpoints = mock_audit_logger._append_to_chain(
+            event_type=SecurityEventType.AGENT_AUTHENTICATION,
+            severity=SecuritySeverity.LOW,
+            action="test",
+            outcome="success",
+            details={}
+        )
+        mock_audit_logger._get_audit_records = AsyncMock(return_value=([mock_event], checkpoints))
         
         # Verify chain
         start_date = datetime.utcnow() - timedelta(days=1)
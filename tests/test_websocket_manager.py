@@ -193,7 +193,8 @@ class TestPerformanceFeatures:
         """Test message batching is configured."""
         assert ws_manager_instance.batch_size > 0
         assert ws_manager_instance.batch_interval > 0
-        assert ws_manager_instance.pending_messages is not None
+        assert ws_manager_instance.queue_size > 0
+        assert ws_manager_instance.connection_queues == {}
 
     @pytest.mark.asyncio
     async def test_connection_queues(self, ws_manager_instance, mock_websocket):
@@ -0,0 +1,129 @@
+"""
+Unit tests for the streaming alert correlation engine.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.detection.agent import RobustDetectionAgent
+from agents.detection.correlation import AlertCorrelationEngine, AlertSample
+
+
+def _alert(alert_id: str, source: str, at: datetime, service: str = None) -> AlertSample:
+    return AlertSample(
+        alert_id=alert_id,
+        timestamp=at,
+        severity="high",
+        source=source,
+        message=f"{source} failure",
+        metadata={"service": service} if service else {}
+    )
+
+
+class TestAlertCorrelationEngine:
+    """Test cases for AlertCorrelationEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        return AlertCorrelationEngine(window_seconds=60, retention_seconds=600,
+                                      max_active_groups=100)
+
+    def test_groups_alerts_by_source_within_window(self, engine):
+        """Alerts from one source within the window share a group."""
+        now = datetime(2024, 1, 1, 12, 0)
+        groups = engine.add_alerts([
+            _alert("a1", "api", now),
+            _alert("d1", "db", now),
+            _alert("a2", "api", now + timedelta(seconds=30)),
+        ])
+
+        assert [len(g.alerts) for g in groups] == [2, 1]
+        assert groups[0].correlation_score == pytest.approx(0.4)
+        assert engine.get_open_group_for_source("api") is groups[0]
+
+    def test_gap_beyond_window_opens_new_group(self, engine):
+        """A quiet period longer than the window starts a new group."""
+        now = datetime(2024, 1, 1, 12, 0)
+        first = engine.add_alert(_alert("a1", "api", now))
+        second = engine.add_alert(_alert("a2", "api", now + timedelta(minutes=5)))
+
+        assert first.group_id != second.group_id
+        assert engine.get_open_group_for_source("api") is second
+
+    def test_incremental_updates_across_batches(self, engine):
+        """Later batches extend existing groups instead of re-correlating."""
+        now = datetime(2024, 1, 1, 12, 0)
+        first = engine.add_alerts([_alert("a1", "api", now)])
+        second = engine.add_alerts([_alert("a2", "api", now + timedelta(seconds=10))])
+
+        assert first[0] is second[0]
+        assert len(second[0].alerts) == 2
+
+    def test_duplicate_fingerprints_are_ignored(self, engine):
+        """Replayed alert ids are counted but not grouped twice."""
+        now = datetime(2024, 1, 1, 12, 0)
+        engine.add_alert(_alert("a1", "api", now))
+
+        assert engine.add_alert(_alert("a1", "api", now)) is None
+        assert engine.duplicate_count == 1
+        assert engine.get_group_for_fingerprint("a1") is not None
+
+    def test_service_index(self, engine):
+        """Groups are indexed by the service in alert metadata."""
+        now = datetime(2024, 1, 1, 12, 0)
+        engine.add_alert(_alert("a1", "api-1", now, service="checkout"))
+        engine.add_alert(_alert("a2", "api-2", now, service="checkout"))
+
+        assert len(engine.get_groups_for_service("checkout")) == 2
+        assert engine.get_groups_for_service("api-1") == []
+
+    def test_expire_evicts_idle_groups_and_indexes(self, engine):
+        """Idle groups leave every index once past retention."""
+        now = datetime(2024, 1, 1, 12, 0)
+        engine.add_alert(_alert("a1", "api", now, service="checkout"))
+
+        assert engine.expire(now + timedelta(minutes=5)) == 0
+        assert engine.expire(now + timedelta(hours=1)) == 1
+        assert len(engine) == 0
+        assert engine.get_group_for_fingerprint("a1") is None
+        assert engine.get_groups_for_service("checkout") == []
+        assert engine.get_open_group_for_source("api") is None
+
+    def test_capacity_limit(self):
+        """New groups are rejected once the engine is full."""
+        engine = AlertCorrelationEngine(window_seconds=60, retention_seconds=600,
+                                        max_active_groups=1)
+        now = datetime(2024, 1, 1, 12, 0)
+        engine.add_alert(_alert("a1", "api", now))
+
+        assert engine.add_alert(_alert("d1", "db", now)) is None
+        assert engine.add_alert(_alert("a2", "api", now)) is not None
+        assert engine.rejected_count == 1
+
+    def test_mixed_timezone_awareness(self, engine):
+        """Aware and naive UTC timestamps correlate together."""
+        now = datetime(2024, 1, 1, 12, 0)
+        engine.add_alert(_alert("a1", "api", now))
+        group = engine.add_alert(_alert("a2", "api", now.replace(tzinfo=timezone.utc)))
+
+        assert len(group.alerts) == 2
+
+
+class TestDetectionAgentCorrelation:
+    """Detection agent integration with the streaming engine."""
+
+    @pytest.mark.asyncio
+    async def test_correlate_events_groups_by_source(self):
+        agent = RobustDetectionAgent("test_detection")
+        events = [
+            {"alert_id": f"alert-{i}", "source": f"service-{i % 3}", "severity": "high",
+             "message": "error", "metadata": {}}
+            for i in range(9)
+        ]
+
+        groups = await agent.correlate_events(events)
+
+        assert sorted(len(g.alerts) for g in groups) == [3, 3, 3]
+        # Batch correlation does not leak into the streaming state
+        assert agent.correlation_groups == {}
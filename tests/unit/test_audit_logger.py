@@ -0,0 +1,186 @@
+"""
+Unit tests for the batched, checkpointed audit log pipeline.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.models.security import SecurityEventType, SecuritySeverity
+from src.services.security import audit_logger as audit_module
+from src.services.security.audit_logger import TamperProofAuditLogger, _merkle_root
+from src.utils.exceptions import SecurityError
+from tests.mocks.aws_mocks import MockAuditLogServiceFactory
+
+
+START = datetime(2024, 3, 1, 10, 0, 0)
+
+
+class _Clock(datetime):
+    """datetime whose utcnow is set by the test."""
+    now = START
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+def _config():
+    config = Mock()
+    config.get = lambda key, default=None: default
+    config.aws.region = "us-east-1"
+    return config
+
+
+async def _log(logger: TamperProofAuditLogger, n: int):
+    return await logger.log_security_event(
+        event_type=SecurityEventType.DATA_ACCESS,
+        severity=SecuritySeverity.LOW,
+        action=f"read-{n}",
+        outcome="success",
+        details={"n": n}
+    )
+
+
+class TestTamperProofAuditLogger:
+    """Test cases for batched writes, checkpoints and indexed verification."""
+
+    @pytest.fixture
+    def factory(self):
+        return MockAuditLogServiceFactory(page_size=7)
+
+    @pytest.fixture
+    def clock(self):
+        _Clock.now = START
+        with patch.object(audit_module, "datetime", _Clock):
+            yield _Clock
+
+    @pytest.fixture
+    def audit_logger(self, factory, clock):
+        with patch("boto3.client"):
+            return TamperProofAuditLogger(
+                _config(), service_factory=factory, checkpoint_secret=b"secret", checkpoint_every_events=10
+            )
+
+    def _stored(self, factory, record_type=None):
+        return [item for item in factory.table.items.values() if item.get("record_type") == record_type]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_events_are_batched(self, audit_logger, factory):
+        """Concurrent events share BatchWriteItem calls and form one contiguous chain."""
+        events = await asyncio.gather(*[_log(audit_logger, i) for i in range(60)])
+
+        assert [e.details["chain_sequence"] for e in events] == list(range(60))
+        assert len(self._stored(factory)) == 60
+        assert len(self._stored(factory, "checkpoint")) == 6
+        assert factory.dynamodb.meta.client.batch_write_count < 20
+        assert await audit_logger.verify_audit_chain(START, START + timedelta(minutes=1))
+
+    @pytest.mark.asyncio
+    async def test_unprocessed_items_are_retried(self, audit_logger, factory):
+        """Items BatchWriteItem leaves unprocessed are written on retry."""
+        factory.dynamodb.meta.client.unprocessed_per_batch = 3
+
+        await asyncio.gather(*[_log(audit_logger, i) for i in range(30)])
+
+        assert len(self._stored(factory)) == 30
+
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_no_gap_in_chain(self, audit_logger, factory):
+        """Events of a failed batch keep their place in the chain and are written before later ones."""
+        for n in range(5):
+            await _log(audit_logger, n)
+        factory.dynamodb.meta.client.failing_batch_writes = 1
+
+        results = await asyncio.gather(*[_log(audit_logger, n) for n in range(5, 12)], return_exceptions=True)
+        assert any(isinstance(result, SecurityError) for result in results)
+
+        for n in range(12, 15):
+            await _log(audit_logger, n)
+
+        assert sorted(item["details"]["chain_sequence"] for item in self._stored(factory)) == list(range(15))
+        assert len(self._stored(factory, "checkpoint")) == 1
+        assert await audit_logger.verify_audit_chain(START, START + timedelta(minutes=1))
+
+    @pytest.mark.asyncio
+    async def test_verification_flushes_failed_writes(self, audit_logger, factory):
+        """A verification after the store recovers sees events whose write had failed."""
+        await _log(audit_logger, 0)
+        factory.dynamodb.meta.client.failing_batch_writes = 1
+        with pytest.raises(SecurityError):
+            await _log(audit_logger, 1)
+
+        assert await audit_logger.verify_audit_chain(START, START + timedelta(minutes=1))
+        assert len(self._stored(factory)) == 2
+
+    @pytest.mark.asyncio
+    async def test_verification_reads_only_the_period(self, audit_logger, factory, clock):
+        """A later hour verifies from the signed checkpoint sealing the hour before it."""
+        for i in range(25):
+            await _log(audit_logger, i)
+        clock.now = START + timedelta(hours=1, minutes=5)
+        for i in range(3):
+            await _log(audit_logger, i)
+
+        checkpoint, = [c for c in self._stored(factory, "checkpoint") if c["last_sequence"] == 24]
+        assert checkpoint["time_bucket"] == "2024-03-01T10"
+
+        factory.table.query_count = 0
+        start = START + timedelta(hours=1)
+        assert await audit_logger.verify_audit_chain(start, start + timedelta(minutes=30))
+        assert factory.table.query_count == 1
+
+        events = await audit_logger._get_audit_events_by_date_range(START, START + timedelta(hours=23, minutes=59))
+        assert len(events) == 28
+        # One query per hourly bucket of the day, the busy hour taking four pages
+        assert factory.table.query_count == 1 + 24 + 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tamper", ["details", "delete", "signature", "missing_anchor"])
+    async def test_tampering_is_detected(self, audit_logger, factory, tamper):
+        """Edited or missing events and forged or missing checkpoints fail verification."""
+        events = [await _log(audit_logger, i) for i in range(25)]
+        table = factory.table.items
+
+        if tamper == "details":
+            table[events[13].event_id]["details"]["n"] = 99
+        elif tamper == "delete":
+            del table[events[13].event_id]
+        elif tamper == "signature":
+            checkpoint, = [c for c in self._stored(factory, "checkpoint") if c["last_sequence"] == 19]
+            checkpoint["merkle_root"] = _merkle_root([events[10].details["chain_hash"]])
+        else:
+            for event in events[:10]:
+                del table[event.event_id]
+            checkpoint, = [c for c in self._stored(factory, "checkpoint") if c["last_sequence"] == 9]
+            del table[checkpoint["event_id"]]
+
+        assert not await audit_logger.verify_audit_chain(START, START + timedelta(minutes=1))
+
+    @pytest.mark.asyncio
+    async def test_archived_prefix_verifies_from_checkpoint(self, audit_logger, factory):
+        """Once the first segments are archived, the rest verifies from the kept checkpoint."""
+        events = [await _log(audit_logger, i) for i in range(25)]
+
+        await audit_logger._delete_archived_events(events[:10])
+
+        assert len(self._stored(factory)) == 15
+        assert await audit_logger.verify_audit_chain(START, START + timedelta(minutes=1))
+
+    def test_merkle_root(self):
+        """Leaves and nodes are domain separated and an odd node is promoted."""
+        hashes = [hashlib.sha256(bytes([i])).hexdigest() for i in range(3)]
+        leaf = [hashlib.sha256(b"\x00" + bytes.fromhex(h)).digest() for h in hashes]
+        pair = hashlib.sha256(b"\x01" + leaf[0] + leaf[1]).digest()
+
+        assert _merkle_root(hashes[:1]) == leaf[0].hex()
+        assert _merkle_root(hashes) == hashlib.sha256(b"\x01" + pair + leaf[2]).hexdigest()
+
+    def test_checkpoint_secret_required(self, factory):
+        """A logger without a signing secret cannot be created."""
+        with patch("boto3.client"), patch.dict("os.environ", {"AUDIT_CHECKPOINT_SECRET": ""}):
+            with pytest.raises(Exception, match="signing secret"):
+                TamperProofAuditLogger(_config(), service_factory=factory)
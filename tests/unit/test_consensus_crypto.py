@@ -0,0 +1,134 @@
+"""
+Unit tests for PBFT message signing and batch verification.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.services.byzantine_consensus import ByzantineFaultTolerantConsensus, MessageType, PBFTMessage
+from src.services.consensus_crypto import ConsensusSigner, SignatureScheme
+from src.utils.exceptions import ByzantineConsensusError
+
+
+SECRET = b"trust-domain-secret"
+
+
+def _network(size: int, scheme: str):
+    engines = [
+        ByzantineFaultTolerantConsensus(f"node_{i}", size, signature_scheme=scheme, shared_secret=SECRET)
+        for i in range(size)
+    ]
+    for engine in engines:
+        for peer in engines:
+            engine.register_node(peer.node_id, peer.signer.public_key_bytes())
+    return engines
+
+
+def _prepare(engine: ByzantineFaultTolerantConsensus, sequence: int = 1) -> PBFTMessage:
+    message = PBFTMessage(
+        message_type=MessageType.PREPARE,
+        view=0,
+        sequence=sequence,
+        digest="abc123",
+        node_id=engine.node_id,
+        timestamp=datetime.utcnow(),
+        payload={}
+    )
+    message.signature = engine._sign_message(message)
+    return message
+
+
+class TestConsensusSigner:
+    """Test cases for consensus message signing."""
+
+    @pytest.mark.parametrize("scheme", [s.value for s in SignatureScheme])
+    def test_peer_signatures_verify(self, scheme):
+        """Every scheme verifies a peer's signed message and rejects tampering."""
+        sender, receiver = _network(2, scheme)
+        message = _prepare(sender)
+
+        assert receiver._verify_signature(message)
+
+        tampered = PBFTMessage.from_dict({**message.to_dict(), "digest": "forged"})
+        assert not receiver._verify_signature(tampered)
+
+    def test_public_key_is_parsed_once(self, monkeypatch):
+        """Peer keys are loaded on first use and reused afterwards."""
+        sender, receiver = _network(2, "ed25519")
+        loads = []
+        original = receiver.signer._load_peer_key.__func__
+
+        def counting_load(self, node_id, public_key):
+            if node_id not in self._peer_keys:
+                loads.append(node_id)
+            return original(self, node_id, public_key)
+
+        monkeypatch.setattr(ConsensusSigner, "_load_peer_key", counting_load)
+        for sequence in range(5):
+            assert receiver._verify_signature(_prepare(sender, sequence))
+
+        assert loads == ["node_0"]
+
+    def test_reregistered_key_replaces_cached_key(self):
+        """Registering a new key for a node invalidates the cached one."""
+        sender, receiver = _network(2, "ed25519")
+        assert receiver._verify_signature(_prepare(sender))
+
+        impostor = ConsensusSigner("node_0", "ed25519")
+        receiver.register_node("node_0", impostor.public_key_bytes())
+
+        assert not receiver._verify_signature(_prepare(sender))
+
+    def test_placeholder_key_is_rejected(self):
+        """Unparseable registered keys fail verification instead of raising."""
+        sender, receiver = _network(2, "ed25519")
+        receiver.register_node("node_0", b"placeholder_public_key_node_0")
+
+        assert not receiver._verify_signature(_prepare(sender))
+
+    def test_hmac_requires_shared_secret(self, monkeypatch):
+        """The HMAC scheme refuses to start without a trust-domain secret."""
+        monkeypatch.delenv("CONSENSUS_HMAC_SECRET", raising=False)
+
+        with pytest.raises(ByzantineConsensusError):
+            ConsensusSigner("node_0", "hmac_sha256")
+
+    def test_message_changed_after_verification_is_rejected(self):
+        """Signatures are checked against the message as it is now, not as first encoded."""
+        engines = _network(4, "ed25519")
+        message = _prepare(engines[1])
+        assert engines[0]._verify_signature(message)
+
+        message.digest = "tampered"
+
+        assert not engines[0]._verify_signature(message)
+
+    @pytest.mark.asyncio
+    async def test_batch_verification_matches_single(self):
+        """Thread-pool batch verification agrees with one-by-one verification."""
+        engines = _network(7, "ed25519")
+        receiver = engines[0]
+        messages = [_prepare(engine, sequence) for sequence in range(4) for engine in engines[1:]]
+        messages[3] = PBFTMessage.from_dict({**messages[3].to_dict(), "sequence": 99})
+        messages[5].signature = None
+
+        results = await receiver.verify_messages(messages)
+
+        assert len(messages) >= receiver.signer._parallel_threshold
+        assert results == [receiver._verify_signature(message) for message in messages]
+        assert results.count(False) == 2
+        receiver.signer.close()
+
+    @pytest.mark.asyncio
+    async def test_handle_messages_flags_invalid_signatures(self):
+        """Batch handling records invalid signatures as suspicious behaviour."""
+        engines = _network(4, "ed25519")
+        receiver = engines[0]
+        forged = _prepare(engines[1])
+        forged.signature = engines[2]._sign_message(forged)
+
+        results = await receiver.handle_messages([_prepare(engines[1]), forged])
+
+        assert results == [None, None]
+        assert len(receiver.suspicious_patterns["node_1"]) == 1
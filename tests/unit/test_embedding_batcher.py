@@ -0,0 +1,195 @@
+"""
+Unit tests for the micro-batching embedding front end.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_cache import EmbeddingCache
+from src.services.rate_limiter import BedrockRateLimitManager, TokenBucket
+from src.services.vector_store import VectorStoreService
+
+
+DIMENSION = 8
+
+
+def _vector_for(text: str) -> list:
+    return [float(len(text))] * DIMENSION
+
+
+class _Titan:
+    """Fake single-text embedding endpoint recording call concurrency."""
+
+    def __init__(self, delay: float = 0.0, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, text: str):
+        self.calls.append(text)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if text in self.fail_on:
+                raise RuntimeError("throttled")
+            return _vector_for(text)
+        finally:
+            self.in_flight -= 1
+
+
+def _batcher(titan, **kwargs):
+    kwargs.setdefault("cache", EmbeddingCache())
+    kwargs.setdefault("rate_limiter", BedrockRateLimitManager())
+    return EmbeddingBatcher(titan, "titan", DIMENSION, **kwargs)
+
+
+class TestEmbeddingBatcher:
+    """Test cases for EmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_embed_many_returns_float32_rows_in_order(self):
+        """Results are one float32 row per input text."""
+        batcher = _batcher(_Titan())
+
+        result = await batcher.embed_many(["a", "bbb", "cc"])
+
+        assert result.dtype == np.float32
+        assert result.shape == (3, DIMENSION)
+        assert result[:, 0].tolist() == [1.0, 3.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_a_batch(self):
+        """Callers within one window are flushed together and duplicates embedded once."""
+        titan = _Titan()
+        batcher = _batcher(titan, window_seconds=0.05)
+
+        results = await asyncio.gather(
+            batcher.embed("disk full"), batcher.embed("oom"), batcher.embed("disk full")
+        )
+
+        assert sorted(titan.calls) == ["disk full", "oom"]
+        assert batcher.get_stats()["batches"] == 1
+        assert batcher.get_stats()["texts_coalesced"] == 1
+        assert np.array_equal(results[0], results[2])
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        """Reaching max_batch_size flushes before the window elapses."""
+        batcher = _batcher(_Titan(), window_seconds=10.0, max_batch_size=4)
+
+        result = await asyncio.wait_for(batcher.embed_many([f"t{i}" for i in range(8)]), timeout=1.0)
+
+        assert result.shape == (8, DIMENSION)
+        assert batcher.get_stats()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_rate_limiter(self):
+        """In-flight calls never exceed the limiter's embedding slots."""
+        titan = _Titan(delay=0.01)
+        limiter = BedrockRateLimitManager()
+        limiter.max_embedding_concurrency = 3
+        batcher = _batcher(titan, rate_limiter=limiter)
+
+        await batcher.embed_many([f"text {i}" for i in range(20)])
+
+        assert len(titan.calls) == 20
+        assert titan.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_texts_skip_bedrock(self):
+        """Texts already in the shared cache are not re-embedded."""
+        cache = EmbeddingCache()
+        cache.put("known", _vector_for("unknown"), model_id="titan")
+        titan = _Titan()
+        batcher = _batcher(titan, cache=cache)
+
+        result = await batcher.embed_many(["known", "new"])
+
+        assert titan.calls == ["new"]
+        assert result[0, 0] == 7.0
+
+    @pytest.mark.asyncio
+    async def test_failures_use_uncached_fallback(self):
+        """Failed texts get the fallback embedding and are retried next time."""
+        titan = _Titan(fail_on={"bad"})
+        cache = EmbeddingCache()
+        batcher = _batcher(titan, cache=cache, fallback=lambda text: [-1.0] * DIMENSION)
+
+        result = await batcher.embed_many(["good", "bad"])
+
+        assert result[1].tolist() == [-1.0] * DIMENSION
+        assert cache.get("bad", model_id="titan") is None
+        assert batcher.get_stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_propagate_without_fallback(self):
+        """Without a fallback the caller sees the embedding error."""
+        batcher = _batcher(_Titan(fail_on={"bad"}))
+
+        with pytest.raises(RuntimeError):
+            await batcher.embed_many(["good", "bad"])
+
+    @pytest.mark.asyncio
+    async def test_failing_fallback_resolves_every_caller(self):
+        """An error outside the per-text results still reaches every waiting caller."""
+        def fallback(text):
+            raise ValueError("no fallback model")
+
+        batcher = _batcher(_Titan(fail_on={"bad"}), fallback=fallback)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.embed("bad"), batcher.embed("good"), return_exceptions=True), timeout=1
+        )
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_cancels_waiting_callers(self):
+        """Callers are released when their batch is cancelled, for example at shutdown."""
+        batcher = _batcher(_Titan(delay=10), window_seconds=0)
+        caller = asyncio.create_task(batcher.embed("slow"))
+        await asyncio.sleep(0.01)
+
+        for task in batcher._batch_tasks:
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(caller, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_acquire_waits_for_refill(self):
+        """Exhausted buckets delay callers instead of rejecting them."""
+        bucket = TokenBucket(capacity=1, refill_rate=50)
+        await bucket.acquire()
+
+        started = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - started >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_vector_store_bulk_patterns_use_one_batch(self):
+        """Bulk knowledge ingest embeds every pattern in a single batch."""
+        store = VectorStoreService(embedding_cache=EmbeddingCache())
+        titan = _Titan()
+
+        async def invoke(text):
+            await titan(text)
+            return [1.0] * store.embedding_dimension
+
+        store._invoke_titan_embedding = invoke
+        patterns = {f"pattern_{i}": {"pattern_type": "decision", "index": i} for i in range(10)}
+
+        document_ids = await store.add_knowledge_patterns(patterns)
+
+        assert len(document_ids) == 10
+        assert len(titan.calls) == 10
+        assert store.embedding_batcher.get_stats()["batches"] == 1
+        assert store.index.get_stats()["size"] == 10
@@ -0,0 +1,171 @@
+"""
+Unit tests for the shared embedding cache.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.services.embedding_cache import EmbeddingCache, content_key
+from src.services.vector_store import VectorStoreService
+from src.utils.constants import EMBEDDING_CACHE_CONFIG
+
+
+def _vector(seed: int, dimension: int = 8):
+    return np.random.default_rng(seed).normal(size=dimension).tolist()
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_content_key_is_stable_and_model_scoped(self):
+        """Keys are content hashes, independent of process hash seeds."""
+        assert content_key("disk full", "titan") == content_key("disk full", "titan")
+        assert content_key("disk full", "titan") != content_key("disk full", "other")
+        assert len(content_key("disk full")) == 64
+
+    def test_lru_eviction_respects_byte_budget(self):
+        """Least recently used vectors are evicted once the budget is exceeded."""
+        entry_bytes = 8 * 4 + 200
+        cache = EmbeddingCache(max_bytes=entry_bytes * 3)
+        for i in range(3):
+            cache.put(f"text-{i}", _vector(i))
+        cache.get("text-0")  # Refresh text-0
+
+        cache.put("text-3", _vector(3))
+
+        assert cache.get("text-1") is None
+        assert cache.get("text-0") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["bytes"] <= cache.max_bytes
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Expired vectors are treated as misses."""
+        now = [1000.0]
+        monkeypatch.setattr("src.services.embedding_cache.time.time", lambda: now[0])
+        cache = EmbeddingCache(ttl_seconds=60)
+        cache.put("text", _vector(1))
+
+        now[0] += 30
+        assert cache.get("text") is not None
+        now[0] += 31
+        assert cache.get("text") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_purge_expired(self, monkeypatch):
+        """purge_expired reclaims expired entries without lookups."""
+        now = [1000.0]
+        monkeypatch.setattr("src.services.embedding_cache.time.time", lambda: now[0])
+        cache = EmbeddingCache(ttl_seconds=60)
+        cache.put("a", _vector(1))
+        now[0] += 61
+        cache.put("b", _vector(2))
+
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_deduplicated(self):
+        """Concurrent misses for one text run the computation once."""
+        cache = EmbeddingCache()
+        calls = []
+
+        async def compute(text):
+            calls.append(text)
+            await asyncio.sleep(0.01)
+            return _vector(7)
+
+        results = await asyncio.gather(*[cache.get_or_compute("same", compute) for _ in range(10)])
+
+        assert calls == ["same"]
+        assert all(np.array_equal(r, results[0]) for r in results)
+        assert results[0].dtype == np.float32
+        stats = cache.get_stats()
+        assert stats["deduplicated"] == 9
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """A failed computation propagates to all waiters and is retried later."""
+        cache = EmbeddingCache()
+        attempts = []
+
+        async def flaky(text):
+            attempts.append(text)
+            await asyncio.sleep(0)
+            if len(attempts) == 1:
+                raise RuntimeError("throttled")
+            return _vector(3)
+
+        results = await asyncio.gather(
+            cache.get_or_compute("text", flaky), cache.get_or_compute("text", flaky),
+            return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        vector = await cache.get_or_compute("text", flaky)
+        assert len(attempts) == 2
+        assert vector is not None
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Vectors written to the disk tier are served after reopening."""
+        cache = EmbeddingCache(disk_path=str(tmp_path))
+        stored = cache.put("incident text", _vector(5), model_id="titan")
+        cache.close()
+
+        reopened = EmbeddingCache(disk_path=str(tmp_path))
+        vector = reopened.get("incident text", model_id="titan")
+
+        assert np.array_equal(vector, stored)
+        assert reopened.get_stats()["disk_hits"] == 1
+        assert reopened.get("incident text", model_id="other") is None
+        reopened.close()
+
+    def test_disk_tier_compacts_superseded_records(self, tmp_path, monkeypatch):
+        """Rewritten texts do not grow the data file without bound, and survive a restart."""
+        monkeypatch.setitem(EMBEDDING_CACHE_CONFIG, "disk_compaction_min_dead", 4)
+        cache = EmbeddingCache(disk_path=str(tmp_path))
+        for seed in range(20):
+            cache.put("incident text", _vector(seed), model_id="titan")
+            cache.put("other text", _vector(seed + 100), model_id="titan")
+        cache.close()
+
+        data_files = [path for path in tmp_path.iterdir() if path.suffix == ".f32"]
+        assert len(data_files) == 1
+        assert data_files[0].stat().st_size <= 6 * 8 * 4
+
+        reopened = EmbeddingCache(disk_path=str(tmp_path))
+        assert np.allclose(reopened.get("incident text", model_id="titan"), _vector(19))
+        assert np.allclose(reopened.get("other text", model_id="titan"), _vector(119))
+        assert reopened.get_stats()["disk_entries"] == 2
+        reopened.close()
+
+    def test_hit_rate(self):
+        """Hit rate counts memory hits against all lookups."""
+        cache = EmbeddingCache()
+        cache.put("a", _vector(1))
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.get_stats()["hit_rate"] == pytest.approx(2 / 3)
+
+    @pytest.mark.asyncio
+    async def test_vector_store_uses_shared_cache(self):
+        """Repeated texts are served from the cache instead of Titan."""
+        cache = EmbeddingCache()
+        store = VectorStoreService(embedding_cache=cache)
+        calls = []
+
+        async def titan(text):
+            calls.append(text)
+            return _vector(9, store.embedding_dimension)
+
+        store._invoke_titan_embedding = titan
+        first = await store._generate_embedding("database timeout")
+        second = await store._generate_embedding("database timeout")
+
+        assert calls == ["database timeout"]
+        assert first == second
+        assert cache.get_stats()["hits"] == 1
@@ -0,0 +1,131 @@
+"""
+Unit tests for the ScalableEventStore append pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from src.interfaces.event_store import IncidentEvent
+from src.services.event_store import ScalableEventStore
+from src.utils.exceptions import OptimisticLockException
+from tests.mocks.aws_mocks import MockEventStoreServiceFactory
+
+
+def _event(incident_id: str, n: int) -> IncidentEvent:
+    return IncidentEvent(incident_id=incident_id, event_type="status_changed", event_data={"n": n})
+
+
+class TestEventStoreAppend:
+    """Test cases for versioned, batched appends."""
+
+    @pytest.fixture
+    def factory(self):
+        return MockEventStoreServiceFactory()
+
+    @pytest.fixture
+    def event_store(self, factory):
+        return ScalableEventStore(factory)
+
+    @pytest.mark.asyncio
+    async def test_sequential_appends_use_version_cache(self, event_store, factory):
+        """Only the first append queries DynamoDB for the current version."""
+        versions = [await event_store.append_event("inc-1", _event("inc-1", i)) for i in range(5)]
+
+        assert versions == [1, 2, 3, 4, 5]
+        assert factory.events_table.query_count == 1
+        assert sorted(v for _, v in factory.events_table.items) == [1, 2, 3, 4, 5]
+        assert len(factory.kinesis.streams[event_store._stream_name]) == 5
+
+    @pytest.mark.asyncio
+    async def test_append_events_writes_one_transaction(self, event_store, factory):
+        """Bulk appends become one conditional transaction and one PutRecords call."""
+        events = [_event("inc-1", i) for i in range(10)]
+
+        version = await event_store.append_events("inc-1", events)
+
+        assert version == 10
+        assert [e.sequence_number for e in events] == list(range(1, 11))
+        assert all(e.checksum for e in events)
+        assert factory.dynamodb.meta.client.transaction_count == 1
+        assert factory.kinesis.put_records_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_are_coalesced(self, event_store, factory):
+        """Concurrent callers get unique, contiguous versions with fewer writes."""
+        versions = await asyncio.gather(*[
+            event_store.append_event("inc-1", _event("inc-1", i)) for i in range(20)
+        ])
+
+        assert sorted(versions) == list(range(1, 21))
+        writes = factory.events_table.put_count + factory.dynamodb.meta.client.transaction_count
+        assert writes < 20
+        assert factory.kinesis.put_records_calls < 20
+
+    @pytest.mark.asyncio
+    async def test_conflict_refreshes_version_and_retries(self, event_store, factory):
+        """A stale cached version is corrected by the conditional write."""
+        await event_store.append_event("inc-1", _event("inc-1", 0))
+
+        # Another writer appends version 2 behind our back
+        other = ScalableEventStore(factory)
+        assert await other.append_event("inc-1", _event("inc-1", 1)) == 2
+
+        assert await event_store.append_event("inc-1", _event("inc-1", 2)) == 3
+        assert sorted(v for _, v in factory.events_table.items) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_persistent_conflict_raises(self, event_store, factory, monkeypatch):
+        """Conflicts that survive every retry surface as OptimisticLockException."""
+        async def stale_version(incident_id):
+            return 0
+
+        await event_store.append_event("inc-1", _event("inc-1", 0))
+        event_store._sequence_counters.clear()
+        monkeypatch.setattr(event_store, "get_current_version", stale_version)
+
+        with pytest.raises(OptimisticLockException):
+            await event_store.append_event("inc-1", _event("inc-1", 1))
+
+    @pytest.mark.asyncio
+    async def test_failed_kinesis_records_are_retried(self, event_store, factory, monkeypatch):
+        """Records rejected inside a PutRecords response are resent."""
+        calls = []
+
+        async def flaky_put_records(StreamName, Records):
+            calls.append(len(Records))
+            if len(calls) == 1:
+                return {"FailedRecordCount": 1,
+                        "Records": [{"SequenceNumber": "1"}, {"ErrorCode": "ProvisionedThroughputExceededException"}]}
+            return {"FailedRecordCount": 0, "Records": [{"SequenceNumber": "2"}]}
+
+        monkeypatch.setattr(factory.kinesis, "put_records", flaky_put_records)
+
+        await event_store.append_events("inc-1", [_event("inc-1", 0), _event("inc-1", 1)])
+
+        assert calls == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_transaction_only_fails_its_callers(self, event_store, factory, monkeypatch):
+        """Callers whose events committed before a later transaction failed get versions and are published."""
+        from botocore.exceptions import ClientError
+
+        client = factory.dynamodb.meta.client
+        transact_write_items = client.transact_write_items
+
+        async def failing_third_transaction(**kwargs):
+            if client.transaction_count == 2:
+                raise ClientError({"Error": {"Code": "InternalServerError", "Message": "injected"}},
+                                  "TransactWriteItems")
+            return await transact_write_items(**kwargs)
+
+        monkeypatch.setattr(client, "transact_write_items", failing_third_transaction)
+
+        results = await asyncio.gather(*[
+            event_store.append_events("inc-1", [_event("inc-1", i) for i in range(60)]) for _ in range(3)
+        ], return_exceptions=True)
+
+        assert results[:2] == [60, 120]
+        assert isinstance(results[2], ClientError)
+        assert len(factory.events_table.items) == 120
+        assert len(factory.kinesis.streams[event_store._stream_name]) == 120
@@ -0,0 +1,109 @@
+"""
+Unit tests for paginated, snapshot-accelerated replay in ScalableEventStore.
+"""
+
+import json
+
+import pytest
+
+from src.interfaces.event_store import IncidentEvent, IncidentState
+from src.services.event_store import ScalableEventStore
+from tests.mocks.aws_mocks import MockEventStoreServiceFactory
+
+
+def _events(incident_id: str, count: int):
+    return [
+        IncidentEvent(incident_id=incident_id, event_type="status_changed", event_data={"n": n})
+        for n in range(count)
+    ]
+
+
+class TestEventStoreReplay:
+    """Test cases for event paging and snapshot replay."""
+
+    @pytest.fixture
+    def factory(self):
+        return MockEventStoreServiceFactory(event_page_size=10)
+
+    @pytest.mark.asyncio
+    async def test_get_events_follows_every_page(self, factory):
+        """Histories larger than one query page are returned in full."""
+        event_store = ScalableEventStore(factory, snapshot_every_events=0, snapshot_every_bytes=0)
+        await event_store.append_events("inc-1", _events("inc-1", 35))
+
+        events = await event_store.get_events("inc-1")
+
+        assert [e.sequence_number for e in events] == list(range(1, 36))
+        assert [e.sequence_number for e in await event_store.get_events("inc-1", from_version=31)] == [
+            31, 32, 33, 34, 35
+        ]
+
+    @pytest.mark.asyncio
+    async def test_replay_without_snapshot(self, factory):
+        """Replay without a snapshot applies the whole history."""
+        event_store = ScalableEventStore(factory, snapshot_every_events=0, snapshot_every_bytes=0)
+        await event_store.append_events("inc-1", _events("inc-1", 25))
+
+        state = await event_store.replay_events("inc-1")
+
+        assert state.version == 25
+        assert state.event_count == 25
+
+    @pytest.mark.asyncio
+    async def test_replay_starts_from_snapshot(self, factory):
+        """Only events after the snapshot version are read."""
+        event_store = ScalableEventStore(factory, snapshot_every_events=0, snapshot_every_bytes=0)
+        await event_store.append_events("inc-1", _events("inc-1", 50))
+        await event_store.create_snapshot("inc-1", await event_store.replay_events("inc-1"))
+        await event_store.append_events("inc-1", _events("inc-1", 5))
+
+        factory.events_table.query_count = 0
+        state = await event_store.replay_events("inc-1")
+
+        assert state.version == 55
+        assert state.event_count == 55
+        assert factory.events_table.query_count == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_round_trips_as_json(self, factory):
+        """Snapshots are stored as JSON and restored with their fields intact."""
+        event_store = ScalableEventStore(factory)
+        state = IncidentState()
+        state.version = 12
+        state.event_count = 12
+
+        await event_store.create_snapshot("inc-1", state)
+        stored = factory.snapshots_table.items["inc-1"]["state_data"]
+        restored = await event_store.get_snapshot("inc-1")
+
+        assert json.loads(stored)["version"] == 12
+        assert restored.version == 12
+        assert restored.last_updated == state.last_updated
+        assert restored.incident is None
+
+    @pytest.mark.asyncio
+    async def test_automatic_snapshot_every_n_events(self, factory):
+        """Crossing the event threshold schedules a background snapshot."""
+        event_store = ScalableEventStore(factory, snapshot_every_events=20, snapshot_every_bytes=0)
+        for _ in range(3):
+            await event_store.append_events("inc-1", _events("inc-1", 8))
+        await event_store.wait_for_snapshots()
+
+        snapshot = await event_store.get_snapshot("inc-1")
+
+        assert snapshot is not None
+        assert snapshot.version == 24
+        assert event_store._events_since_snapshot["inc-1"] == 0
+
+    @pytest.mark.asyncio
+    async def test_automatic_snapshot_by_bytes(self, factory):
+        """Large payloads trigger a snapshot before the event threshold."""
+        event_store = ScalableEventStore(factory, snapshot_every_events=1000, snapshot_every_bytes=1024)
+        events = [
+            IncidentEvent(incident_id="inc-1", event_type="log_attached", event_data={"log": "x" * 600})
+            for _ in range(2)
+        ]
+        await event_store.append_events("inc-1", events)
+        await event_store.wait_for_snapshots()
+
+        assert (await event_store.get_snapshot("inc-1")).version == 2
@@ -0,0 +1,172 @@
+"""
+Unit tests for the indexed incident registry.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.orchestrator.incident_registry import IncidentRegistry
+from src.orchestrator.swarm_coordinator import (
+    AgentSwarmCoordinator,
+    IncidentProcessingState,
+    ProcessingPhase,
+)
+
+
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def _state(incident_id: str, minute: int, severity: str = "high",
+           phase: ProcessingPhase = ProcessingPhase.DETECTION) -> IncidentProcessingState:
+    return IncidentProcessingState(
+        incident_id=incident_id,
+        incident=SimpleNamespace(severity=severity, description=f"Incident {incident_id}"),
+        phase=phase,
+        agent_executions={},
+        start_time=BASE_TIME + timedelta(minutes=minute)
+    )
+
+
+@pytest.fixture
+def registry():
+    return IncidentRegistry(retention_seconds=3600, max_completed=100)
+
+
+class TestIncidentRegistry:
+    """Test cases for IncidentRegistry."""
+
+    def test_counts_follow_phase_transitions(self, registry):
+        """Index buckets update when a state's phase changes."""
+        for i, severity in enumerate(["high", "high", "low"]):
+            registry[f"inc-{i}"] = _state(f"inc-{i}", i, severity)
+
+        assert registry.count() == 3
+        assert registry.count(status="active") == 3
+        assert registry.count(status="active", severity="high") == 2
+
+        registry["inc-0"].phase = ProcessingPhase.DIAGNOSIS
+        registry["inc-1"].phase = ProcessingPhase.COMPLETED
+
+        assert registry.count(status="active") == 2
+        assert registry.count(status="resolved", severity="high") == 1
+        assert registry.count(phase="diagnosis") == 1
+        assert registry.count(phase="detection") == 1
+        assert registry.count(status="all", severity="all") == 3
+
+    def test_query_orders_by_start_time_and_filters(self, registry):
+        """Results come back in start-time order regardless of insertion order."""
+        for minute in (5, 1, 3, 2, 4):
+            registry[f"inc-{minute}"] = _state(f"inc-{minute}", minute, "low" if minute % 2 else "high")
+
+        states, _ = registry.query(limit=10)
+        assert [s.incident_id for s in states] == ["inc-1", "inc-2", "inc-3", "inc-4", "inc-5"]
+
+        states, _ = registry.query(severity="high", limit=10, newest_first=True)
+        assert [s.incident_id for s in states] == ["inc-4", "inc-2"]
+
+        states, _ = registry.query(limit=2, offset=1)
+        assert [s.incident_id for s in states] == ["inc-2", "inc-3"]
+
+    def test_cursor_pagination_walks_every_incident(self, registry):
+        """Following next cursors visits each matching incident exactly once."""
+        for i in range(25):
+            registry[f"inc-{i:02d}"] = _state(f"inc-{i:02d}", i, "high" if i % 3 else "low")
+
+        for newest_first in (False, True):
+            seen, cursor = [], None
+            while True:
+                states, cursor = registry.query(severity="high", limit=4, cursor=cursor,
+                                                newest_first=newest_first)
+                seen.extend(s.incident_id for s in states)
+                if cursor is None:
+                    break
+
+            expected = sorted((f"inc-{i:02d}" for i in range(25) if i % 3), reverse=newest_first)
+            assert seen == expected
+
+    def test_invalid_cursor_rejected(self, registry):
+        """Malformed cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            registry.query(cursor="not-a-cursor")
+
+    def test_non_positive_limit_rejected(self, registry):
+        """A page must hold at least one incident, so limit=0 cannot produce a cursor."""
+        registry["inc-0"] = _state("inc-0", 0, "high")
+
+        for limit in (0, -1):
+            with pytest.raises(ValueError):
+                registry.query(limit=limit)
+
+    def test_finished_incidents_evicted_after_retention(self, registry):
+        """Completed states past retention are evicted and archived."""
+        archived = []
+        registry.on_evict = archived.append
+        registry["old"] = _state("old", 0)
+        registry["new"] = _state("new", 1)
+        registry["running"] = _state("running", 2)
+
+        registry["old"].end_time = BASE_TIME
+        registry["old"].phase = ProcessingPhase.COMPLETED
+        registry["new"].end_time = BASE_TIME + timedelta(minutes=90)
+        registry["new"].phase = ProcessingPhase.FAILED
+
+        evicted = registry.evict_expired(now=BASE_TIME + timedelta(minutes=100))
+
+        assert evicted == 1
+        assert [s.incident_id for s in archived] == ["old"]
+        assert "old" not in registry
+        assert registry.count() == 2
+        assert registry.count(status="resolved") == 0
+        assert [s.incident_id for s in registry.query()[0]] == ["new", "running"]
+
+    def test_completed_cap_bounds_memory(self):
+        """Only max_completed finished states are retained."""
+        registry = IncidentRegistry(retention_seconds=10 ** 9, max_completed=3)
+        for i in range(6):
+            registry[f"inc-{i}"] = _state(f"inc-{i}", i, phase=ProcessingPhase.COMPLETED)
+
+        assert sorted(registry) == ["inc-3", "inc-4", "inc-5"]
+        assert registry.get_stats()["evicted"] == 3
+
+    def test_replacing_and_deleting_states(self, registry):
+        """Replaced or deleted states no longer affect the indexes."""
+        old = _state("inc-1", 0, "low")
+        registry["inc-1"] = old
+        registry["inc-1"] = _state("inc-1", 0, "critical")
+        old.phase = ProcessingPhase.COMPLETED  # Detached, must not reindex
+
+        assert registry.count(severity="low") == 0
+        assert registry.count(status="active", severity="critical") == 1
+
+        del registry["inc-1"]
+        assert registry.count() == 0
+        assert registry.query() == ([], None)
+
+
+class TestCoordinatorListing:
+    """list_incidents and get_incidents_count served from the registry."""
+
+    @pytest.fixture
+    def coordinator(self, monkeypatch):
+        monkeypatch.setattr("src.orchestrator.swarm_coordinator.get_message_bus", lambda _: MagicMock())
+        return AgentSwarmCoordinator(service_factory=MagicMock())
+
+    def test_list_and_count(self, coordinator):
+        coordinator.processing_states = {
+            "inc-1": _state("inc-1", 0, "high", ProcessingPhase.COMPLETED),
+            "inc-2": _state("inc-2", 1, "low"),
+            "inc-3": _state("inc-3", 2, "high"),
+        }
+
+        incidents = coordinator.list_incidents(status="active")
+        page = coordinator.list_incidents_page(limit=2)
+
+        assert [i["incident_id"] for i in incidents] == ["inc-2", "inc-3"]
+        assert incidents[0]["status"] == "active"
+        assert coordinator.get_incidents_count(severity="high") == 2
+        assert coordinator.get_incidents_count(status="resolved") == 1
+        assert [i["incident_id"] for i in page["incidents"]] == ["inc-1", "inc-2"]
+        assert [i["incident_id"] for i in coordinator.list_incidents_page(cursor=page["next_cursor"])["incidents"]] == ["inc-3"]
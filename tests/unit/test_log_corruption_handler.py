@@ -0,0 +1,91 @@
+"""
+Unit tests for byte-level log corruption detection.
+"""
+
+import base64
+import math
+import os
+import zlib
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.services.log_corruption_handler import (
+    CorruptionType,
+    LogCorruptionHandler,
+    _byte_counts,
+    _strip_control_characters,
+)
+
+
+def _reference_entropy(data: bytes) -> float:
+    return -sum(count / len(data) * math.log2(count / len(data)) for count in Counter(data).values())
+
+
+class TestLogCorruptionHandler:
+    """Test cases for whole-buffer corruption checks."""
+
+    def test_byte_counts_across_chunks(self):
+        """Chunked histograms of bytes and memoryviews match a single bincount."""
+        data = os.urandom(1000) + b"\x00" * 17
+
+        expected = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+
+        assert (_byte_counts(data, chunk_size=7) == expected).all()
+        assert (_byte_counts(memoryview(data)[3:], chunk_size=64) == _byte_counts(data[3:])).all()
+
+    @pytest.mark.parametrize("data", [b"a" * 500, b"ab" * 250, bytes(range(256)) * 4, os.urandom(5000)])
+    def test_entropy_matches_shannon(self, data):
+        """Entropy is Shannon entropy in bits per byte."""
+        entropy = LogCorruptionHandler()._calculate_entropy(data)
+
+        assert entropy == pytest.approx(_reference_entropy(data))
+
+    def test_control_characters_counted_in_text_positions(self):
+        """Counts come from the UTF-8 bytes, positions from the text."""
+        handler = LogCorruptionHandler()
+        content = "ünï\x07cödé ✓\x1b[0m\tok\r\n" * 3
+        positions = [i for i, c in enumerate(content) if c in "\x07\x1b"]
+
+        detection, = handler._detect_control_characters(content)
+
+        assert detection.description == "Found 6 control characters"
+        assert detection.location == f"positions: {positions[:5]}"
+        assert _strip_control_characters(content) == content.replace("\x07", "").replace("\x1b", "")
+
+    def test_null_byte_positions_are_capped(self):
+        """All null bytes are counted but only the first ten are located."""
+        content = "x\x00" * 12
+
+        detection, = LogCorruptionHandler()._detect_null_bytes(content)
+
+        assert detection.description == "Found 12 null bytes"
+        assert detection.location == f"positions: {list(range(1, 21, 2))}"
+
+    @pytest.mark.asyncio
+    async def test_buffer_input_matches_text(self):
+        """UTF-8 bytes and memoryviews sanitize exactly like the decoded text."""
+        text = '{"level": "INFO", "message": "ok"}\nplain \x00line\x01 ünï\n'
+
+        expected = await LogCorruptionHandler().sanitize_log_content(text)
+        for buffer in (text.encode(), memoryview(text.encode())):
+            result = await LogCorruptionHandler().sanitize_log_content(buffer)
+
+            assert result.sanitized_content == expected.sanitized_content
+            assert [c.description for c in result.corruptions_detected] == \
+                [c.description for c in expected.corruptions_detected]
+
+    def test_compressed_lines_detected(self):
+        """zlib payloads are found by header, other dense payloads by entropy."""
+        handler = LogCorruptionHandler()
+        zlib_line = base64.b64encode(zlib.compress(" ".join(map(str, range(100))).encode())).decode()
+        dense_line = base64.b64encode(bytes(range(256)) * 2).decode()
+        text_line = base64.b64encode(b"plain words only " * 20).decode()
+
+        assert [c.corruption_type for c in handler._detect_compressed_data(zlib_line, 0)] == \
+            [CorruptionType.COMPRESSED_DATA]
+        assert [c.corruption_type for c in handler._detect_compressed_data(dense_line, 0)] == \
+            [CorruptionType.COMPRESSED_DATA]
+        assert handler._detect_compressed_data(text_line, 0) == []
+        assert handler._detect_compressed_data("not base64 " * 20, 0) == []
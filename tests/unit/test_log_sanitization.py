@@ -0,0 +1,119 @@
+"""
+Unit tests for the log sanitization pipeline.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.services.log_sanitization import LogAnomalyType, LogSanitizationPipeline, _required_literals
+
+
+# (entry, corruptions, sanitizations applied, rejected)
+CASES = [
+    ("2024-01-01 12:00:00 INFO Request 42 processed for user7@example.com", [], [], False),
+    ("2024-01-01T12:00:00Z ERROR query failed: SELECT * FROM users WHERE id = '1' OR '1'='1' -- drop",
+     ["injection_attempt"], ["sql_injection_sanitization", "sql_injection_sanitization"], True),
+    ('{"timestamp": "2024-01-01T12:00:00Z", "level": "INFO", "message": "payload <script>alert(1)</script>"}',
+     ["injection_attempt"], ["xss_injection_sanitization"], True),
+    ("{'timestamp': '2024-01-01 12:00:00', level: 'ERROR', message: 'broken json',}",
+     ["malformed_json"], [], False),
+    ("Jan 01 12:00:00 host sshd[99]: Accepted publickey for deploy from 10.0.0.1",
+     ["timestamp_corruption"], [], False),
+    ("2024-01-01 12:00:00 INFO \ufb01le \uff46\uff55\uff4c\uff4c normalized", [], ["encoding_sanitization"], False),
+    ("\x01\x02\x03\x04\x05\x06\x07\x08 binary-ish 2024-01-01 12:00:00",
+     ["binary_data"], ["encoding_sanitization"], True),
+    # Long s only becomes an 's' under NFKC, after the ASCII literal screen would have run
+    ("2024-01-01 12:00:00 INFO \u017felect name \u017from t union \u017felect 1",
+     ["injection_attempt"], ["encoding_sanitization", "sql_injection_sanitization"], True),
+    ("2024-01-01 12:00:00 INFO onload = run() and `whoami` and $(id)",
+     ["injection_attempt"],
+     ["xss_injection_sanitization", "command_injection_sanitization", "command_injection_sanitization"], True),
+    ("2024-01-01 12:00:00 INFO C:\\Windows\\System32 and ..\\boot and %2e%2e%2f",
+     ["injection_attempt"],
+     ["path_traversal_sanitization", "path_traversal_sanitization", "path_traversal_sanitization"], True),
+]
+
+
+def _summary(result):
+    entry = result.sanitized_entry
+    return (
+        [c.value for c in result.corruptions_found],
+        result.sanitization_applied,
+        [a.value for a in result.anomalies_found],
+        result.rejected,
+        None if entry is None else (entry.level, entry.message, entry.source, entry.timestamp.year)
+    )
+
+
+class TestLogSanitizationPipeline:
+    """Test cases for log sanitization."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("entry,corruptions,applied,rejected", CASES)
+    async def test_sanitize_log_entry(self, entry, corruptions, applied, rejected):
+        """Detection and sanitization results for representative entries."""
+        result = await LogSanitizationPipeline().sanitize_log_entry(entry)
+
+        assert [c.value for c in result.corruptions_found] == corruptions
+        assert result.sanitization_applied == applied
+        assert result.rejected == rejected
+
+    @pytest.mark.asyncio
+    async def test_process_pool_batch_matches_sequential(self):
+        """Batches prepared in worker processes give the same results in the same order."""
+        entries = [case[0] for case in CASES] * 3
+        sequential = LogSanitizationPipeline(process_pool_threshold=len(entries) + 1)
+        pooled = LogSanitizationPipeline(process_pool_threshold=1, max_workers=2)
+        try:
+            expected = await sequential.process_log_batch(entries)
+            results = await pooled.process_log_batch(entries)
+        finally:
+            pooled.close()
+
+        assert [_summary(r) for r in results] == [_summary(r) for r in expected]
+        assert pooled.sanitization_stats == sequential.sanitization_stats
+
+    @pytest.mark.asyncio
+    async def test_injection_pattern_edits_apply(self):
+        """Patterns added after construction are compiled on the next call."""
+        pipeline = LogSanitizationPipeline()
+        entry = "2024-01-01 12:00:00 INFO ssh-rsa AAAAB3Nza key uploaded"
+        assert not (await pipeline.sanitize_log_entry(entry)).sanitization_applied
+
+        pipeline.injection_patterns["key_leak"] = [r"(ssh-rsa \S+)"]
+        result = await pipeline.sanitize_log_entry(entry)
+
+        assert result.sanitization_applied == ["key_leak_sanitization"]
+
+    def test_frequency_window_drops_old_entries(self):
+        """Only entries from the last minute count towards a frequency spike."""
+        pipeline = LogSanitizationPipeline()
+        stale = datetime.utcnow() - timedelta(minutes=2)
+        pipeline.log_frequency_history.extend([stale] * 500)
+        entry = pipeline._parse_log_entry("2024-01-01 12:00:00 INFO ok")
+
+        anomalies = pipeline._detect_anomalies(entry)
+
+        assert LogAnomalyType.FREQUENCY_SPIKE not in anomalies
+        assert len(pipeline.log_frequency_history) == 1
+
+    def test_required_literals(self):
+        """Literals every match must contain, most selective first."""
+        assert _required_literals(r"(;.*rm\s+-rf)") == ("-rf", ";", "rm")
+        assert _required_literals(r"(\bUNION\b.*\bSELECT\b)") == ("select", "union")
+        assert _required_literals(r"(\w+|x)") == ()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("entry,corruptions,applied,rejected", CASES)
+    async def test_without_regex_parser_patterns_run_in_full(self, monkeypatch, entry, corruptions, applied,
+                                                            rejected):
+        """Without the private regex parser no literals are extracted and results are unchanged."""
+        monkeypatch.setattr("src.services.log_sanitization.sre_parse", None)
+        assert _required_literals(r"(;.*rm\s+-rf)") == ()
+
+        result = await LogSanitizationPipeline().sanitize_log_entry(entry)
+
+        assert [c.value for c in result.corruptions_found] == corruptions
+        assert result.sanitization_applied == applied
+        assert result.rejected == rejected
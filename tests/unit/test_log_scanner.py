@@ -0,0 +1,206 @@
+"""
+Unit tests for the single-pass diagnosis log scanner.
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from agents.diagnosis.agent import HardenedDiagnosisAgent
+from agents.diagnosis.log_scanner import LogPatternMatcher, LogScanSummary
+
+
+MIXED_LOG = "\n".join([
+    "2024-01-01T12:00:00Z ERROR Database connection timeout after 30s",
+    "2024-01-01T12:01:00Z WARN High memory usage detected: 85%",
+    "",
+    "   ",
+    '{"timestamp": "2024-01-01T13:00:00", "level": "ERROR", "message": "SQL error near SELECT"}',
+    '{"broken json',
+    "[1, 2, 3]",
+    "free text line mentioning rate limit exceeded",
+    "2024-01-01T13:05:00Z err upstream returned 503",
+    "2024-01-01T13:06:00Z INFO Request processed successfully\r",
+    "2024-13-01T13:06:00Z ERROR invalid month still counts as error",
+])
+
+
+_STRUCTURED_LINE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z?)\s+(\w+)\s+(.*)")
+
+
+def _legacy_parse(log_data: str) -> List[Dict[str, Any]]:
+    """Split and parse lines into dicts, as the agent did before the scanner."""
+    parsed = []
+    for line_num, line in enumerate(log_data.split("\n")):
+        if not line.strip():
+            continue
+        try:
+            if line.strip().startswith("{"):
+                entry = json.loads(line)
+            else:
+                match = _STRUCTURED_LINE_RE.match(line)
+                if match:
+                    entry = dict(zip(("timestamp", "level", "message"), match.groups()))
+                else:
+                    entry = {"timestamp": datetime.utcnow().isoformat(), "level": "unknown", "message": line}
+            if isinstance(entry, dict):
+                parsed.append(entry)
+        except Exception as e:
+            parsed.append({
+                "line_number": line_num, "raw_message": line[:500], "level": "unknown",
+                "timestamp": datetime.utcnow().isoformat(), "parse_error": str(e)[:100]
+            })
+        if len(parsed) >= 10000:
+            break
+    return parsed
+
+
+def _legacy_anomalies(agent: HardenedDiagnosisAgent, parsed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Error rate spikes from parsed entries windowed by hour."""
+    totals, errors = defaultdict(int), defaultdict(int)
+    for entry in parsed:
+        try:
+            dt = datetime.fromisoformat(entry.get("timestamp", "").replace("Z", "+00:00"))
+        except Exception:
+            continue
+        hour_key = dt.strftime("%Y-%m-%d %H:00")
+        totals[hour_key] += 1
+        if entry.get("level", "").lower() in ["error", "err"]:
+            errors[hour_key] += 1
+    return agent._detect_anomalies_from_counts(totals, errors)
+
+
+def _legacy_scan(agent: HardenedDiagnosisAgent, log_data: str):
+    """Per-line, per-pattern matching as done before the combined matcher."""
+    parsed = _legacy_parse(log_data)
+    patterns, errors, warnings = set(), 0, 0
+    for entry in parsed:
+        level = entry.get("level", "").lower()
+        if level in ["error", "err"]:
+            errors += 1
+        elif level in ["warning", "warn"]:
+            warnings += 1
+        message = entry.get("message", "").lower()
+        for name, pattern in agent.error_patterns.items():
+            if re.search(pattern, message, re.IGNORECASE):
+                patterns.add(name)
+    return patterns, errors, warnings, _legacy_anomalies(agent, parsed), len(parsed)
+
+
+class TestLogPatternMatcher:
+    """Test cases for LogPatternMatcher."""
+
+    @pytest.fixture
+    def agent(self):
+        return HardenedDiagnosisAgent("diagnosis_test")
+
+    @pytest.mark.parametrize("encode", [False, True])
+    def test_matches_per_line_scan(self, agent, encode):
+        """str and bytes scans agree with the per-line, per-pattern scan."""
+        matcher = LogPatternMatcher(agent.error_patterns)
+        data = MIXED_LOG.encode() if encode else MIXED_LOG
+
+        summary = matcher.scan(memoryview(data) if encode else data)
+        patterns, errors, warnings, anomalies, entries = _legacy_scan(agent, MIXED_LOG)
+
+        assert summary.patterns_found == patterns
+        assert (summary.error_count, summary.warning_count, summary.entries) == (errors, warnings, entries)
+        assert agent._detect_anomalies_from_counts(summary.hourly_totals, summary.hourly_errors) == anomalies
+
+    def test_reports_every_pattern_on_one_line(self):
+        """A line matching several patterns reports all of them."""
+        matcher = LogPatternMatcher({"timeout": r"timeout", "database": r"database.*error", "oom": r"oom"})
+
+        summary = matcher.scan("2024-01-01T12:00:00Z ERROR database error caused a timeout\n")
+
+        assert summary.patterns_found == {"timeout", "database"}
+
+    def test_entry_limit_and_accumulation(self):
+        """Scans stop at max_entries and accumulate into a shared summary."""
+        matcher = LogPatternMatcher({"oom": r"out of memory"}, max_entries=5)
+        lines = "\n".join(f"2024-01-01T12:00:0{i}Z INFO ok" for i in range(8))
+
+        summary = matcher.scan(lines)
+        assert summary.entries == 5
+
+        more = LogPatternMatcher({"oom": r"out of memory"}).scan(
+            "2024-01-01T12:00:00Z ERROR out of memory", LogScanSummary(entries=2)
+        )
+        assert more.entries == 3 and more.patterns_found == {"oom"}
+
+    def test_combined_patterns_are_cached(self):
+        """Alternations are compiled once per set of remaining patterns."""
+        matcher = LogPatternMatcher({"a": "alpha", "b": "beta"})
+        matcher.scan("alpha\nbeta\nalpha beta\n")
+        compiled = len(matcher._combined)
+
+        matcher.scan("alpha\nbeta\nalpha beta\n")
+
+        assert len(matcher._combined) == compiled
+
+    def test_combined_pattern_cache_is_bounded(self):
+        """Least recently used alternations are evicted past max_combined."""
+        matcher = LogPatternMatcher({name: name for name in "abcdef"}, max_combined=4)
+        names = frozenset("ab")
+        kept = matcher.combined(names)
+
+        for drop in "cdef":
+            matcher.combined(frozenset("abcdef") - {drop})
+            assert matcher.combined(names) is kept
+
+        assert len(matcher._combined) == 4
+        assert (frozenset("abcdef") - {"c"}, False) not in matcher._combined
+
+    def test_agent_rebuilds_matcher_when_patterns_change(self, agent):
+        """Edits to error_patterns take effect on the next scan."""
+        first = agent._get_pattern_matcher()
+        agent.error_patterns["disk_full"] = r"no space left"
+
+        assert agent._get_pattern_matcher() is not first
+        assert "disk_full" in agent._get_pattern_matcher().scan("write failed: No space left on device").patterns_found
+
+
+class TestConcurrentLogAnalysis:
+    """Test cases for concurrent multi-source analysis."""
+
+    @pytest.mark.asyncio
+    async def test_sources_are_analyzed_concurrently(self):
+        """Retrieval latency overlaps across sources."""
+        agent = HardenedDiagnosisAgent("diagnosis_test")
+
+        async def slow_retrieve(source, time_range):
+            await asyncio.sleep(0.1)
+            return MIXED_LOG
+
+        agent._retrieve_log_data = slow_retrieve
+        sources = [f"service-{i}-error" for i in range(5)]
+
+        start = time.perf_counter()
+        result = await agent.analyze_logs(sources, ("t0", "t1"))
+        elapsed = time.perf_counter() - start
+
+        assert list(result["analysis_results"]) == sources
+        assert elapsed < 0.3
+        assert "database_error" in result["analysis_results"][sources[0]].patterns_found
+
+    @pytest.mark.asyncio
+    async def test_failed_source_degrades_to_empty_result(self):
+        """One failing source does not fail the others."""
+        agent = HardenedDiagnosisAgent("diagnosis_test")
+
+        async def flaky_retrieve(source, time_range):
+            if source == "bad":
+                raise RuntimeError("log store unavailable")
+            return MIXED_LOG
+
+        agent._retrieve_log_data = flaky_retrieve
+        result = await agent.analyze_logs(["good", "bad"], ("t0", "t1"))
+
+        assert result["analysis_results"]["bad"].confidence == 0.0
+        assert result["analysis_results"]["good"].error_count == 4
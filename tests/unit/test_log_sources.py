@@ -0,0 +1,237 @@
+"""
+Unit tests for streamed log sources and sampled log ingestion.
+"""
+
+import asyncio
+import gzip
+import random
+import tracemalloc
+
+import pytest
+
+from agents.diagnosis.agent import HardenedDiagnosisAgent
+from agents.diagnosis.log_scanner import StratifiedLineSampler
+from agents.diagnosis.log_sources import (
+    FileLogSource, GzipLogSource, ObjectStoreLogSource, TextLogSource, open_log_source
+)
+
+
+def _log_lines(count: int, hours: int = 1, error_every: int = 10):
+    for i in range(count):
+        level = "ERROR" if i % error_every == 0 else "INFO"
+        hour = (i * hours) // count
+        yield f"2024-01-01T{hour:02d}:{i % 60:02d}:00Z {level} request handled"
+
+
+LOG_TEXT = "\n".join(_log_lines(200)) + "\n" + "x" * 500 + "\nlast line without newline"
+
+
+async def _collect(source):
+    return [bytes(chunk) if isinstance(chunk, memoryview) else chunk async for chunk in source.chunks()]
+
+
+class FakeBody:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.closed = False
+
+    async def read(self, size):
+        block, self.data = self.data[:size], self.data[size:]
+        return block
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeObjectStore:
+    def __init__(self, objects):
+        self.objects = objects
+        self.bodies = []
+
+    async def get_object(self, Bucket, Key):
+        body = FakeBody(self.objects[(Bucket, Key)])
+        self.bodies.append(body)
+        return {"Body": body}
+
+
+class TestLogSources:
+    """Test cases for line-aligned log sources."""
+
+    @pytest.mark.asyncio
+    async def test_file_chunks_are_line_aligned(self, tmp_path):
+        """mmap chunks end on newlines and reassemble to the file, even around long lines."""
+        path = tmp_path / "app.log"
+        path.write_text(LOG_TEXT)
+
+        chunks = await _collect(FileLogSource(str(path), chunk_size=128))
+
+        assert b"".join(chunks) == LOG_TEXT.encode()
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+        assert max(len(chunk) for chunk in chunks) > 500
+
+    @pytest.mark.asyncio
+    async def test_empty_file_yields_nothing(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_bytes(b"")
+
+        assert await _collect(open_log_source(str(path))) == []
+
+    @pytest.mark.asyncio
+    async def test_text_source_yields_to_event_loop_between_chunks(self):
+        """Other tasks run while a large fetched log is consumed."""
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def fetch():
+            return LOG_TEXT * 50
+
+        task = asyncio.create_task(ticker())
+        chunks = await _collect(TextLogSource("text", fetch, chunk_size=1024))
+        task.cancel()
+
+        assert len(chunks) > 10
+        assert len(ticks) >= len(chunks) - 1
+
+    @pytest.mark.asyncio
+    async def test_gzip_file_is_decompressed_incrementally(self, tmp_path):
+        """Gzip sources reassemble to the original text on line boundaries."""
+        path = tmp_path / "app.log.gz"
+        path.write_bytes(gzip.compress(LOG_TEXT.encode()))
+
+        source = open_log_source(f"file://{path}", chunk_size=100)
+        chunks = await _collect(source)
+
+        assert isinstance(source, GzipLogSource)
+        assert b"".join(chunks) == LOG_TEXT.encode()
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+
+    @pytest.mark.parametrize("key", ["logs/app.log", "logs/app.log.gz"])
+    @pytest.mark.asyncio
+    async def test_object_store_streams_body(self, key):
+        """Objects stream from the response body and gzip keys are decompressed."""
+        data = LOG_TEXT.encode()
+        store = FakeObjectStore({("bucket", key): gzip.compress(data) if key.endswith(".gz") else data})
+
+        chunks = await _collect(ObjectStoreLogSource(store, "bucket", key, chunk_size=64))
+
+        assert b"".join(chunks) == data
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+        assert store.bodies[0].closed
+
+    @pytest.mark.asyncio
+    async def test_text_source_rechunks_fetched_text(self):
+        async def fetch():
+            return LOG_TEXT
+
+        chunks = await _collect(TextLogSource("svc", fetch, chunk_size=256))
+
+        assert "".join(chunks) == LOG_TEXT
+        assert len(chunks) > 1
+
+
+class TestStratifiedLineSampler:
+    """Test cases for hour-stratified reservoir sampling."""
+
+    def test_keeps_everything_under_capacity(self):
+        sampler = StratifiedLineSampler(capacity=100)
+        sampler.offer_chunk("\n".join(_log_lines(50, hours=3)) + "\n\n")
+
+        assert sorted(sampler.lines()) == sorted(_log_lines(50, hours=3))
+        assert sampler.lines_offered == 50
+
+    def test_sample_is_bounded_and_spread_across_hours(self):
+        """A burst in one hour does not crowd out quieter hours."""
+        sampler = StratifiedLineSampler(capacity=100, rng=random.Random(7))
+        burst = [f"2024-01-01T00:00:{i % 60:02d}Z INFO burst {i}" for i in range(10000)]
+        quiet = [f"2024-01-01T{hour:02d}:00:00Z INFO quiet {hour}-{i}" for hour in (1, 2, 3) for i in range(40)]
+        sampler.offer_chunk("\n".join(burst + quiet).encode())
+
+        lines = sampler.lines()
+        per_hour = {hour: sum(1 for line in lines if line.startswith(f"2024-01-01T{hour:02d}".encode()))
+                    for hour in range(4)}
+
+        assert len(lines) == 100
+        assert per_hour == {0: 25, 1: 25, 2: 25, 3: 25}
+
+    def test_strata_beyond_limit_share_overflow(self):
+        sampler = StratifiedLineSampler(capacity=10, max_strata=2)
+        for hour in range(6):
+            sampler.offer(f"line {hour}", f"2024-01-01T{hour:02d}")
+
+        assert len(sampler._strata) == 3
+        assert len(sampler.lines()) <= 10
+
+
+class TestStreamedLogAnalysis:
+    """Test cases for streamed analysis in the diagnosis agent."""
+
+    @pytest.mark.asyncio
+    async def test_file_and_text_sources_agree(self, tmp_path):
+        """A log under the scan budget gives the same result however it is read."""
+        text = "\n".join(_log_lines(3000, hours=3)) + "\n2024-01-01T02:59:00Z ERROR database error\n"
+        path = tmp_path / "svc.log"
+        path.write_text(text)
+        agent = HardenedDiagnosisAgent("diagnosis_test")
+        agent.log_chunk_bytes = 4096
+        agent.log_root = str(tmp_path)
+
+        async def fetch(source, time_range):
+            return text
+
+        agent._retrieve_log_data = fetch
+        from_file = await agent._analyze_single_log_source("svc.log", ("t0", "t1"))
+        from_text = await agent._analyze_single_log_source("svc", ("t0", "t1"))
+
+        assert from_file.patterns_found == from_text.patterns_found == ["database_error"]
+        assert from_file.error_count == from_text.error_count == 301
+        assert from_file.anomalies == from_text.anomalies
+
+    @pytest.mark.asyncio
+    async def test_only_files_under_log_root_are_opened(self, tmp_path):
+        """Source names from incident metadata cannot read files outside the log root."""
+        root = tmp_path / "logs"
+        root.mkdir()
+        (root / "app.log").write_text("2024-01-01T00:00:00Z INFO ok\n")
+        (tmp_path / "secret").write_text("password=hunter2\n")
+        agent = HardenedDiagnosisAgent("diagnosis_test")
+        agent.log_root = str(root)
+
+        async def fetch(source, time_range):
+            return f"fetched {source}"
+
+        agent._retrieve_log_data = fetch
+
+        assert isinstance(agent._open_log_source("app.log", ("t0", "t1")), FileLogSource)
+        assert isinstance(agent._open_log_source(f"file://{root}/app.log", ("t0", "t1")), FileLogSource)
+        for escape in ("../secret", str(tmp_path / "secret"), f"file://{tmp_path}/secret", "file:///etc/passwd"):
+            assert agent._log_file_path(escape) is None
+        with pytest.raises(ValueError):
+            agent._open_log_source(f"file://{tmp_path}/secret", ("t0", "t1"))
+        assert isinstance(agent._open_log_source(str(tmp_path / "secret"), ("t0", "t1")), TextLogSource)
+
+        agent.log_root = None
+        assert isinstance(agent._open_log_source("app.log", ("t0", "t1")), TextLogSource)
+
+    @pytest.mark.asyncio
+    async def test_large_log_is_sampled_in_constant_memory(self, tmp_path):
+        """Past the scan budget lines are sampled, and Python memory stays flat."""
+        path = tmp_path / "big.log"
+        with open(path, "w") as handle:
+            for line in _log_lines(200_000, hours=10):
+                handle.write(line + "\n")
+        agent = HardenedDiagnosisAgent("diagnosis_test")
+        agent.register_log_source("big", FileLogSource(str(path)))
+
+        tracemalloc.start()
+        result = await agent._analyze_single_log_source("big", ("t0", "t1"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # 9000 scanned lines at a 10% error rate, plus a 1000 line sample of the rest
+        assert 950 <= result.error_count <= 1050
+        assert path.stat().st_size > 8 * 1024 * 1024
+        assert peak < 2 * 1024 * 1024
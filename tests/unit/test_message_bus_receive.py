@@ -0,0 +1,249 @@
+"""
+Unit tests for the batched, parallel message bus receive engine.
+"""
+
+import asyncio
+import json
+from contextlib import suppress
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from src.services.message_bus import MessageEnvelope, MessagePriority, ResilientMessageBus
+
+
+class StubRedisClient:
+    """In-memory Redis list stand-in with blocking pops."""
+
+    def __init__(self):
+        self.lists = {}
+        self._pushed = asyncio.Condition()
+
+    async def _notify(self):
+        async with self._pushed:
+            self._pushed.notify_all()
+
+    async def lpush(self, name, *values):
+        self.lists.setdefault(name, [])[:0] = list(reversed(values))
+        await self._notify()
+
+    async def rpush(self, name, *values):
+        self.lists.setdefault(name, []).extend(values)
+        await self._notify()
+
+    async def expire(self, name, seconds):
+        return True
+
+    async def lpop(self, name, count=None):
+        items = self.lists.get(name, [])
+        if count is None:
+            return items.pop(0) if items else None
+        popped, items[:count] = items[:count], []
+        return popped or None
+
+    async def _wait_for_items(self, name, timeout):
+        async with self._pushed:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._pushed.wait_for(lambda: bool(self.lists.get(name))), timeout
+                )
+        return bool(self.lists.get(name))
+
+    async def blmpop(self, timeout, numkeys, *keys, direction="LEFT", count=1):
+        if not await self._wait_for_items(keys[0], timeout):
+            return None
+        return [keys[0], await self.lpop(keys[0], count)]
+
+    async def blpop(self, keys, timeout=0):
+        if not await self._wait_for_items(keys[0], timeout):
+            return None
+        return (keys[0], await self.lpop(keys[0]))
+
+    async def close(self):
+        return None
+
+
+class StubSQSClient:
+    """SQS stand-in that long-polls until messages are queued."""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.deleted_batches = []
+
+    async def get_queue_url(self, QueueName):
+        return {"QueueUrl": QueueName}
+
+    async def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0, MessageAttributeNames=None):
+        try:
+            first = await asyncio.wait_for(self.messages.get(), timeout=WaitTimeSeconds)
+        except asyncio.TimeoutError:
+            return {"Messages": []}
+        batch = [first]
+        while len(batch) < MaxNumberOfMessages and not self.messages.empty():
+            batch.append(self.messages.get_nowait())
+        return {
+            "Messages": [
+                {"Body": body, "ReceiptHandle": f"rh-{i}"} for i, body in enumerate(batch)
+            ]
+        }
+
+    async def delete_message_batch(self, QueueUrl, Entries):
+        self.deleted_batches.append([entry["ReceiptHandle"] for entry in Entries])
+        return {"Successful": Entries, "Failed": []}
+
+    async def close(self):
+        return None
+
+
+class StubAWSFactory:
+    def __init__(self):
+        self.client = StubSQSClient()
+
+    async def create_client(self, service_name: str, **kwargs):
+        return self.client
+
+    async def close_client(self, client):
+        await client.close()
+
+
+def _envelope(message_id: str, expires_in: float = 300) -> MessageEnvelope:
+    now = datetime.utcnow()
+    return MessageEnvelope(
+        message_id=message_id,
+        sender_agent="detection",
+        recipient_agent="diagnosis",
+        message_type="incident_detected",
+        payload={"id": message_id},
+        priority=MessagePriority.MEDIUM,
+        created_at=now,
+        expires_at=now + timedelta(seconds=expires_in),
+        correlation_id="corr-1"
+    )
+
+
+@pytest_asyncio.fixture
+async def bus():
+    factory = StubAWSFactory()
+    message_bus = ResilientMessageBus(
+        factory, receive_batch_size=16, max_concurrency=4, redis_block_seconds=0.2, sqs_wait_seconds=1
+    )
+    message_bus._redis_client = StubRedisClient()
+    yield message_bus
+    await message_bus.shutdown()
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.005)
+
+
+class TestMessageBusReceive:
+    """Test cases for the message bus receive engine."""
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_drained_in_batches(self, bus):
+        """A queued backlog is received in a few multi-message round trips."""
+        for i in range(40):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+
+        received = []
+
+        async def handler(message):
+            received.append(message.payload["id"])
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: len(received) == 40)
+
+        assert sorted(received) == sorted(f"m{i}" for i in range(40))
+        assert bus.get_bus_stats()["message_stats"]["receive_batches"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_handler_concurrency_is_bounded(self, bus):
+        """No more than max_concurrency handlers run for one agent."""
+        for i in range(20):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+
+        running, peak, done = 0, 0, []
+
+        async def handler(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            done.append(message)
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: len(done) == 20)
+
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_idle_agent_wakes_on_push(self, bus):
+        """A blocked receiver picks up a new message without a polling sleep."""
+        delivered = asyncio.Event()
+
+        async def handler(message):
+            delivered.set()
+
+        await bus.subscribe("diagnosis", handler)
+        await asyncio.sleep(0.05)  # Let the receiver block
+
+        started = asyncio.get_running_loop().time()
+        await bus._send_via_redis(_envelope("m1"))
+        await asyncio.wait_for(delivered.wait(), timeout=1.0)
+
+        assert asyncio.get_running_loop().time() - started < 0.1
+
+    @pytest.mark.asyncio
+    async def test_sqs_is_polled_in_parallel(self, bus):
+        """SQS messages are delivered while Redis is idle and deleted in one batch call."""
+        sqs = bus._service_factory.client
+        received = []
+
+        async def handler(message):
+            received.append(message.payload["id"])
+
+        for i in range(3):
+            sqs.messages.put_nowait(json.dumps(_envelope(f"s{i}").to_dict()))
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: len(received) == 3)
+
+        assert sorted(received) == ["s0", "s1", "s2"]
+        assert sqs.deleted_batches == [["rh-0", "rh-1", "rh-2"]]
+
+    @pytest.mark.asyncio
+    async def test_expired_and_malformed_messages_are_dropped(self, bus):
+        """Only valid, unexpired messages in a batch reach the handler."""
+        queue = bus._get_queue_name("diagnosis")
+        await bus._redis_client.rpush(
+            queue,
+            json.dumps(_envelope("expired", expires_in=-1).to_dict()),
+            "not json",
+            json.dumps(_envelope("valid").to_dict())
+        )
+
+        envelopes = await bus._receive_batch_from_redis("diagnosis", 10)
+
+        assert [e.message_id for e in envelopes] == ["valid"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_blmpop(self, bus, monkeypatch):
+        """Servers without BLMPOP are drained with BLPOP plus a counted LPOP."""
+        client = bus._redis_client
+
+        async def unsupported(*args, **kwargs):
+            raise redis.ResponseError("unknown command 'BLMPOP'")
+
+        monkeypatch.setattr(client, "blmpop", unsupported)
+        for i in range(5):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+
+        envelopes = await bus._receive_batch_from_redis("diagnosis", 10)
+
+        assert [e.message_id for e in envelopes] == [f"m{i}" for i in range(5)]
+        assert bus._redis_supports_blmpop is False
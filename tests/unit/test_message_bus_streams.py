@@ -0,0 +1,219 @@
+"""
+Unit tests for the Redis Streams message bus transport.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from src.services.message_bus import MessageEnvelope, MessagePriority, ResilientMessageBus
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class IdleSQSClient:
+    """SQS stand-in that never has messages."""
+
+    async def get_queue_url(self, QueueName):
+        return {"QueueUrl": QueueName}
+
+    async def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0, MessageAttributeNames=None):
+        await asyncio.sleep(WaitTimeSeconds)
+        return {"Messages": []}
+
+    async def close(self):
+        return None
+
+
+class StubAWSFactory:
+    def __init__(self):
+        self.client = IdleSQSClient()
+
+    async def create_client(self, service_name: str, **kwargs):
+        return self.client
+
+    async def close_client(self, client):
+        await client.close()
+
+
+def _envelope(message_id: str, priority: MessagePriority = MessagePriority.MEDIUM,
+              expires_in: float = 300) -> MessageEnvelope:
+    now = datetime.utcnow()
+    return MessageEnvelope(
+        message_id=message_id,
+        sender_agent="detection",
+        recipient_agent="diagnosis",
+        message_type="incident_detected",
+        payload={"id": message_id},
+        priority=priority,
+        created_at=now,
+        expires_at=now + timedelta(seconds=expires_in),
+        correlation_id="corr-1"
+    )
+
+
+class BlockingFakeRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis returns empty XREADGROUP results at once; wait out BLOCK like a real server."""
+
+    async def xreadgroup(self, *args, block=None, **kwargs):
+        response = await super().xreadgroup(*args, block=block, **kwargs)
+        if not response and block:
+            await asyncio.sleep(block / 1000)
+        return response
+
+
+def _make_bus(server, reclaim_idle_ms: int = 60000) -> ResilientMessageBus:
+    message_bus = ResilientMessageBus(
+        StubAWSFactory(), receive_batch_size=16, max_concurrency=4,
+        redis_block_seconds=0.05, sqs_wait_seconds=1, redis_transport="streams"
+    )
+    message_bus._redis_client = BlockingFakeRedis(server=server, decode_responses=True)
+    message_bus._reclaim_idle_ms = reclaim_idle_ms
+    message_bus._reclaim_interval = 0.01
+    return message_bus
+
+
+@pytest_asyncio.fixture
+async def server():
+    return fakeredis.FakeServer()
+
+
+@pytest_asyncio.fixture
+async def bus(server):
+    message_bus = _make_bus(server)
+    yield message_bus
+    await message_bus.shutdown()
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.005)
+
+
+class TestMessageBusStreams:
+    """Test cases for the Redis Streams transport."""
+
+    @pytest.mark.asyncio
+    async def test_entries_are_acked_after_handling(self, bus):
+        """Delivered entries leave nothing pending in the consumer group."""
+        for i in range(10):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+
+        received = []
+
+        async def handler(message):
+            received.append(message.payload["id"])
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: len(received) == 10)
+        await bus.unsubscribe("diagnosis")
+
+        stats = await bus.get_queue_stats("diagnosis")
+        assert sorted(received) == sorted(f"m{i}" for i in range(10))
+        assert stats["redis_queue_length"] == 10
+        assert stats["pending_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_stream_is_read_first(self, bus):
+        """High priority entries are returned ahead of a normal backlog."""
+        for i in range(5):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+        await bus._send_via_redis(_envelope("urgent", priority=MessagePriority.CRITICAL))
+
+        entries = await bus._receive_batch_from_stream("diagnosis", 10)
+
+        assert entries[0].envelope.message_id == "urgent"
+        assert len(entries) == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_entry_is_reclaimed_and_retried(self, bus):
+        """A handler failure leaves the entry pending until it is reclaimed."""
+        bus._reclaim_idle_ms = 0
+        await bus._send_via_redis(_envelope("flaky"))
+        attempts = []
+
+        async def handler(message):
+            attempts.append(message.payload["id"])
+            if len(attempts) == 1:
+                raise RuntimeError("transient failure")
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: bus._message_stats["delivered"] == 1)
+
+        assert attempts == ["flaky", "flaky"]
+        assert bus._message_stats["retried"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entry_is_dead_lettered_after_max_retries(self, bus):
+        """Entries redelivered past max_retries go to the DLQ and are acked."""
+        bus._reclaim_idle_ms = 0
+        await bus._send_via_redis(_envelope("poison"))
+
+        async def handler(message):
+            raise RuntimeError("always fails")
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: bus._message_stats["dlq_messages"] == 1)
+        await bus.unsubscribe("diagnosis")
+
+        dlq = await bus._redis_client.lrange(bus._get_dlq_name("diagnosis"), 0, -1)
+        assert json.loads(dlq[0])["message_id"] == "poison"
+        assert (await bus.get_queue_stats("diagnosis"))["pending_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_crashed_consumer_entries_are_reclaimed(self, server, bus):
+        """Entries read by a consumer that died are processed by another replica."""
+        bus._reclaim_idle_ms = 0
+        crashed = _make_bus(server)
+        await crashed._send_via_redis(_envelope("orphan"))
+        read = await crashed._receive_batch_from_stream("diagnosis", 10)
+        assert [entry.envelope.message_id for entry in read] == ["orphan"]
+
+        received = []
+
+        async def handler(message):
+            received.append(message.payload["id"])
+
+        await bus.subscribe("diagnosis", handler)
+        await _wait_for(lambda: received == ["orphan"])
+        await crashed.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_replicas_share_work_without_duplicates(self, server, bus):
+        """Two subscribers of the same agent each receive distinct entries."""
+        replica = _make_bus(server)
+        for i in range(40):
+            await bus._send_via_redis(_envelope(f"m{i}"))
+
+        received = {"primary": [], "replica": []}
+
+        def handler_for(name):
+            async def handler(message):
+                received[name].append(message.payload["id"])
+                await asyncio.sleep(0.001)
+            return handler
+
+        await bus.subscribe("diagnosis", handler_for("primary"))
+        await replica.subscribe("diagnosis", handler_for("replica"))
+        await _wait_for(lambda: len(received["primary"]) + len(received["replica"]) == 40)
+        await replica.shutdown()
+
+        combined = received["primary"] + received["replica"]
+        assert sorted(combined) == sorted(f"m{i}" for i in range(40))
+        assert received["primary"] and received["replica"]
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_acked_and_dropped(self, bus):
+        """Expired entries never reach the handler and do not stay pending."""
+        await bus._send_via_redis(_envelope("stale", expires_in=-1))
+        await bus._send_via_redis(_envelope("fresh"))
+
+        entries = await bus._receive_batch_from_stream("diagnosis", 10)
+
+        assert [entry.envelope.message_id for entry in entries] == ["fresh"]
+        assert (await bus.get_queue_stats("diagnosis"))["pending_entries"] == 1
@@ -182,47 +182,33 @@ class TestModelRouter:
         assert selected_config.accuracy_score >= 0.90
         assert "High-priority incident" in result.routing_reason
     
-    @pytest.mark.asyncio
-    async def test_filter_available_models(self, router):
-        """Test model filtering based on requirements."""
-        await router.initialize()
-        
-        # Mock health checks
-        router._is_model_healthy = AsyncMock(return_value=True)
-        
+    def test_select_models_meets_requirements(self, router):
+        """Test selection and fallbacks only include models meeting requirements."""
         request = RoutingRequest(
             task_type="diagnosis",
-            required_accuracy=0.95,  # High accuracy requirement
-            max_latency_ms=1000      # Low latency requirement
+            required_accuracy=0.92,  # High accuracy requirement
+            max_latency_ms=1500      # Low latency requirement
         )
         
-        task_prefs = router.task_preferences.get("diagnosis", {})
-        available_models = await router._filter_available_models(request, task_prefs)
+        selected, fallbacks = router.select_models(request)
         
-        # Should only include models that meet requirements
-        for model_name in available_models:
+        # Only Sonnet is both accurate and fast enough
+        assert selected == "claude-3-sonnet"
+        for model_name in [selected] + fallbacks:
             config = router.model_configs[model_name]
-            assert config.accuracy_score >= 0.95
-            assert config.avg_response_time_ms <= 1000
+            assert config.accuracy_score >= 0.92
+            assert config.avg_response_time_ms <= 1500
     
-    @pytest.mark.asyncio
-    async def test_filter_available_models_unhealthy(self, router):
-        """Test that unhealthy models are filtered out."""
-        await router.initialize()
-        
-        # Mock one model as unhealthy
-        def mock_health_check(model_name):
-            return model_name != "claude-3-opus"  # Opus is unhealthy
+    def test_select_models_skips_unhealthy(self, router):
+        """Test that unhealthy models are never selected or offered as fallbacks."""
+        router.model_health_cache["claude-3-opus"] = (False, datetime.utcnow())
+        request = RoutingRequest(task_type="diagnosis", strategy=RoutingStrategy.ACCURACY_OPTIMIZED)
         
-        router._is_model_healthy = AsyncMock(side_effect=mock_health_check)
-        
-        request = RoutingRequest(task_type="diagnosis")
-        task_prefs = router.task_preferences.get("diagnosis", {})
-        available_models = await router._filter_available_models(request, task_prefs)
+        selected, fallbacks = router.select_models(request)
         
         # Should exclude unhealthy model
-        assert "claude-3-opus" not in available_models
-        assert len(available_models) >= 1  # Should have other healthy models
+        assert selected != "claude-3-opus"
+        assert "claude-3-opus" not in fallbacks
     
     @pytest.mark.asyncio
     async def test_no_available_models_error(self, router):
@@ -240,44 +226,30 @@ class TestModelRouter:
         with pytest.raises(ModelRoutingError, match="No models available"):
             await router.route_request(request)
     
-    def test_select_optimal_model_single_option(self, router):
-        """Test model selection with single available model."""
-        available_models = ["claude-3-haiku"]
-        request = RoutingRequest(task_type="detection")
-        task_prefs = {}
+    def test_build_routing_table_single_option(self, router):
+        """Test routing table with a single configured model."""
+        router.model_configs = {"claude-3-haiku": router.model_configs["claude-3-haiku"]}
         
-        selected = router._select_optimal_model(available_models, request, task_prefs)
-        assert selected == "claude-3-haiku"
-    
-    def test_select_optimal_model_cost_strategy(self, router):
-        """Test model selection with cost-optimized strategy."""
-        available_models = ["claude-3-haiku", "claude-3-sonnet"]
-        request = RoutingRequest(
-            task_type="detection",
-            strategy=RoutingStrategy.COST_OPTIMIZED
-        )
-        task_prefs = {}
-        
-        selected = router._select_optimal_model(available_models, request, task_prefs)
+        table = router._build_routing_table("detection", RoutingStrategy.BALANCED, False)
         
-        # Should select cheaper model
-        selected_config = router.model_configs[selected]
-        other_model = [m for m in available_models if m != selected][0]
-        other_config = router.model_configs[other_model]
-        assert selected_config.cost_per_1k_tokens <= other_config.cost_per_1k_tokens
+        assert [candidate.model_name for candidate in table.ranked] == ["claude-3-haiku"]
+        assert [candidate.model_name for candidate in table.fallback_order] == ["claude-3-haiku"]
     
-    def test_select_optimal_model_task_preference(self, router):
-        """Test model selection with task preferences."""
-        available_models = ["claude-3-haiku", "claude-3-sonnet"]
-        request = RoutingRequest(task_type="detection")
-        task_prefs = {"preferred_tier": ModelTier.ECONOMY}
+    def test_build_routing_table_cost_strategy(self, router):
+        """Test cost-optimized routing tables rank cheaper models first."""
+        table = router._build_routing_table("detection", RoutingStrategy.COST_OPTIMIZED, False)
         
-        selected = router._select_optimal_model(available_models, request, task_prefs)
+        costs = [candidate.cost_per_1k_tokens for candidate in table.ranked]
+        assert costs == sorted(costs)
+    
+    def test_build_routing_table_task_preference(self, router):
+        """Test routing tables apply task preferences and limits."""
+        table = router._build_routing_table("detection", RoutingStrategy.BALANCED, False)
         
         # Should prefer economy tier for detection tasks
-        selected_config = router.model_configs[selected]
-        if selected_config.tier == ModelTier.ECONOMY:
-            assert selected == "claude-3-haiku"
+        assert table.ranked[0].model_name == "claude-3-haiku"
+        assert table.min_accuracy == router.task_preferences["detection"]["min_accuracy"]
+        assert table.max_latency_ms == router.task_preferences["detection"]["max_latency_ms"]
     
     def test_estimate_cost(self, router):
         """Test cost estimation."""
@@ -306,22 +278,18 @@ class TestModelRouter:
         larger_latency = router._estimate_latency(config, 4000)
         assert larger_latency > estimated_latency
     
-    def test_generate_fallback_options(self, router):
-        """Test fallback model generation."""
-        selected_model = "claude-3-sonnet"
-        available_models = ["claude-3-haiku", "claude-3-sonnet", "claude-3-opus"]
+    def test_select_models_fallbacks(self, router):
+        """Test fallback model selection."""
+        router.model_configs["claude-3-haiku"].availability_score = 0.95
+        request = RoutingRequest(task_type="general", strategy=RoutingStrategy.ACCURACY_OPTIMIZED)
         
-        fallbacks = router._generate_fallback_options(selected_model, available_models)
+        selected, fallbacks = router.select_models(request)
         
         # Should not include selected model
-        assert selected_model not in fallbacks
-        # Should return up to 2 fallbacks
-        assert len(fallbacks) <= 2
-        # Should be ordered by availability score
-        if len(fallbacks) > 1:
-            config1 = router.model_configs[fallbacks[0]]
-            config2 = router.model_configs[fallbacks[1]]
-            assert config1.availability_score >= config2.availability_score
+        assert selected == "claude-3-opus"
+        assert selected not in fallbacks
+        # Should return up to 2 fallbacks, ordered by availability score
+        assert fallbacks == ["claude-3-sonnet", "claude-3-haiku"]
     
     def test_generate_routing_reason(self, router):
         """Test routing reason generation."""
@@ -570,6 +538,63 @@ class TestModelRouter:
         # Invalid field should not exist
         assert not hasattr(config, "invalid_field")
 
+    @pytest.mark.asyncio
+    async def test_routing_uses_cached_health_only(self, router):
+        """Routing reads health bits from the cache and never runs a health check."""
+        router.model_health_cache["claude-3-sonnet"] = (False, datetime.utcnow())
+        request = RoutingRequest(task_type="diagnosis", required_accuracy=0.9)
+
+        result = await router.route_request(request)
+
+        assert result.selected_model == "claude-3-opus"
+        assert "claude-3-sonnet" not in result.fallback_models
+        router.bedrock_client.invoke_model.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_routing_tables_follow_metric_and_config_changes(self, router):
+        """Tables are reused per routing key and rebuilt after metrics or configs change."""
+        request = RoutingRequest(task_type="detection", strategy=RoutingStrategy.LATENCY_OPTIMIZED)
+        assert router.select_models(request)[0] == "claude-3-haiku"
+        table = router._routing_table(request)
+        assert router._routing_table(RoutingRequest(task_type="detection", strategy=RoutingStrategy.LATENCY_OPTIMIZED,
+                                                    incident_severity="critical")) is table
+
+        await router.record_request_completion("claude-3-haiku", True, 3000, 0.1, 500)
+        await router.update_model_config("claude-3-sonnet", {"avg_response_time_ms": 700})
+
+        assert router.select_models(request)[0] == "claude-3-sonnet"
+
+    @pytest.mark.asyncio
+    async def test_completions_rebuild_only_stale_tables(self, router):
+        """Small metric moves keep tables; latency shifts only re-rank latency-optimized tables."""
+        balanced = RoutingRequest(task_type="diagnosis")
+        latency = RoutingRequest(task_type="detection", strategy=RoutingStrategy.LATENCY_OPTIMIZED)
+        await router.record_request_completion("claude-3-haiku", True, 500, 0.1, 500)
+        balanced_table, latency_table = router._routing_table(balanced), router._routing_table(latency)
+
+        for _ in range(20):
+            await router.record_request_completion("claude-3-haiku", True, 510, 0.1, 500)
+        assert router._routing_table(balanced) is balanced_table
+        assert router._routing_table(latency) is latency_table
+
+        await router.record_request_completion("claude-3-haiku", True, 5000, 0.1, 500)
+        assert router._routing_table(balanced) is balanced_table
+        assert router._routing_table(latency) is not latency_table
+
+        await router.record_request_completion("claude-3-haiku", False, 510, 0.0, 0)
+        assert router._routing_table(balanced) is not balanced_table
+
+    @pytest.mark.asyncio
+    async def test_estimates_use_observed_metrics(self, router):
+        """Latency and cost estimates follow moving averages of completed requests."""
+        config = router.model_configs["claude-3-haiku"]
+        configured_cost = router._estimate_cost(config, 1000)
+
+        await router.record_request_completion("claude-3-haiku", True, 2000, 1.0, 1000)
+
+        assert router._estimate_latency(config, 1000) == 2050
+        assert router._estimate_cost(config, 1000) == pytest.approx(configured_cost * 4)
+
 
 class TestModelConfig:
     """Test ModelConfig data class."""
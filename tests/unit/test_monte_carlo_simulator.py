@@ -0,0 +1,93 @@
+"""
+Unit tests for the batched Monte Carlo risk simulator.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from agents.prediction.models import MonteCarloSimulator, TrendData
+
+
+def _trend(metric_name: str, values):
+    return TrendData(
+        timestamps=[datetime.utcnow()] * len(values),
+        values=list(values),
+        metric_name=metric_name,
+        service_name="api"
+    )
+
+
+@pytest.fixture
+def trend_data():
+    rng = np.random.default_rng(5)
+    return {
+        "cpu_utilization": _trend("cpu_utilization", 60 + np.cumsum(rng.normal(0.5, 2, 40))),
+        "error_rate": _trend("error_rate", np.full(40, 0.05)),
+        "queue_depth": _trend("queue_depth", [1, 2, 3]),  # Too short, skipped
+    }
+
+
+class TestMonteCarloSimulator:
+    """Test cases for MonteCarloSimulator."""
+
+    @pytest.mark.asyncio
+    async def test_seeded_runs_are_reproducible(self, trend_data):
+        """The same seed yields identical risk statistics."""
+        first = await MonteCarloSimulator(seed=42).simulate_incident_risk(trend_data, [])
+        second = await MonteCarloSimulator(seed=42).simulate_incident_risk(trend_data, [])
+
+        assert first == second
+        assert 0.0 <= first["mean_risk"] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_accepts_generator(self, trend_data):
+        """A caller-supplied Generator drives the simulation stream."""
+        first = await MonteCarloSimulator(seed=np.random.default_rng(7)).simulate_incident_risk(trend_data, [])
+        second = await MonteCarloSimulator(seed=7).simulate_incident_risk(trend_data, [])
+
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_deterministic_metric_risk(self):
+        """Flat metrics without volatility produce their exact risk."""
+        data = {
+            "cpu_utilization": _trend("cpu_utilization", [50.0] * 10),
+            "error_rate": _trend("error_rate", [0.2] * 10),
+            "short": _trend("short", [1.0]),
+        }
+
+        result = await MonteCarloSimulator(num_simulations=100, seed=1).simulate_incident_risk(data, [])
+
+        # (0.5 + 1.0) averaged over all three metrics, including the skipped one
+        assert result["mean_risk"] == pytest.approx(0.5)
+        assert result["std_risk"] == pytest.approx(0.0)
+        assert result["probability_high_risk"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_no_metrics(self):
+        """Empty trend data yields zero risk."""
+        result = await MonteCarloSimulator(seed=1).simulate_incident_risk({}, [])
+
+        assert result["mean_risk"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_process_pool_split_is_reproducible(self, trend_data):
+        """Large runs split across processes remain seeded and consistent."""
+        results = []
+        for _ in range(2):
+            simulator = MonteCarloSimulator(
+                num_simulations=3000, seed=9, process_pool_threshold=1000, max_workers=2
+            )
+            try:
+                results.append(await simulator.simulate_incident_risk(trend_data, []))
+            finally:
+                simulator.close()
+
+        in_process = await MonteCarloSimulator(num_simulations=3000, seed=9).simulate_incident_risk(
+            trend_data, []
+        )
+
+        assert results[0] == results[1]
+        assert results[0]["mean_risk"] == pytest.approx(in_process["mean_risk"], abs=0.01)
@@ -0,0 +1,135 @@
+"""
+Unit tests for the pipelined PBFT consensus engine.
+"""
+
+import asyncio
+
+import pytest
+
+from src.consensus.pbft import ConsensusPhase, ConsensusProposal, PBFTConsensusEngine, PBFTNode
+
+
+def _engine(**kwargs) -> PBFTConsensusEngine:
+    engine = PBFTConsensusEngine("node_0", 1, network_delay=0.005, **kwargs)
+    engine.register_node(PBFTNode(node_id="node_0"))
+    return engine
+
+
+def _proposal(index: int) -> ConsensusProposal:
+    return ConsensusProposal(proposal_id=f"p{index}", proposer="detection", data={"action": index})
+
+
+class TestPBFTPipeline:
+    """Test cases for pipelined PBFT consensus."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_is_unchanged(self):
+        """Without a window each proposal gets its own sequence number."""
+        engine = _engine()
+
+        results = [await engine.reach_consensus(_proposal(i)) for i in range(3)]
+
+        assert [r.sequence_number for r in results] == [1, 2, 3]
+        assert all(r.phase == ConsensusPhase.EXECUTED for r in results)
+        assert engine.last_executed == 3
+
+    @pytest.mark.asyncio
+    async def test_batches_share_a_sequence_number(self):
+        """Queued proposals are packed into one instance up to max_batch_size."""
+        engine = _engine(pipeline_window=2, max_batch_size=4)
+
+        results = await engine.reach_consensus_batch([_proposal(i) for i in range(8)])
+        await engine.stop()
+
+        assert [r.proposal_id for r in results] == [f"p{i}" for i in range(8)]
+        assert [r.decision for r in results] == [{"action": i} for i in range(8)]
+        assert len({r.sequence_number for r in results}) < 8
+
+    @pytest.mark.asyncio
+    async def test_window_bounds_in_flight_sequences(self):
+        """No more than pipeline_window sequence numbers run at once."""
+        engine = _engine(pipeline_window=3)
+        peak = 0
+        original = engine._phase_commit
+
+        async def tracking_commit(instance):
+            nonlocal peak
+            peak = max(peak, engine.sequence_number - engine.last_executed)
+            await original(instance)
+
+        engine._phase_commit = tracking_commit
+        await engine.reach_consensus_batch([_proposal(i) for i in range(12)])
+        await engine.stop()
+
+        assert peak == 3
+        assert engine.sequence_number == 12
+
+    @pytest.mark.asyncio
+    async def test_execution_follows_sequence_order(self):
+        """A slow early instance holds back execution of later ones."""
+        engine = _engine(pipeline_window=4)
+        executed = []
+        original_commit = engine._phase_commit
+        original_execute = engine._phase_execute
+
+        async def slow_first_commit(instance):
+            if instance.sequence_number == 1:
+                await asyncio.sleep(0.05)
+            await original_commit(instance)
+
+        async def recording_execute(instance):
+            executed.append(instance.sequence_number)
+            return await original_execute(instance)
+
+        engine._phase_commit = slow_first_commit
+        engine._phase_execute = recording_execute
+        await engine.reach_consensus_batch([_proposal(i) for i in range(4)])
+        await engine.stop()
+
+        assert executed == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_failed_instance_does_not_block_pipeline(self):
+        """A failing instance falls back and later sequences still execute."""
+        engine = _engine(pipeline_window=4)
+        original = engine._phase_prepare
+
+        async def failing_prepare(instance):
+            if instance.sequence_number == 2:
+                raise RuntimeError("lost quorum")
+            await original(instance)
+
+        engine._phase_prepare = failing_prepare
+        results = await engine.reach_consensus_batch([_proposal(i) for i in range(4)])
+        await engine.stop()
+
+        assert [r.phase for r in results].count(ConsensusPhase.IDLE) == 1
+        assert results[1].confidence == 0.5
+        assert engine.last_executed == 4
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_collect_old_logs(self):
+        """Logs at or below the stable checkpoint are garbage-collected."""
+        engine = _engine(pipeline_window=4, checkpoint_interval=5)
+
+        await engine.reach_consensus_batch([_proposal(i) for i in range(12)])
+        await engine.stop()
+
+        assert engine.low_watermark == 10
+        assert list(engine.checkpoints) == [10]
+        assert min(engine.prepare_log) == 11
+        assert min(engine.instances) == 11
+        assert all(seq > 10 for seq in engine.pre_prepare_log)
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_digest_is_deterministic(self):
+        """Replicas executing the same batches agree on the checkpoint digest."""
+        digests = []
+        for _ in range(2):
+            engine = _engine(pipeline_window=2, checkpoint_interval=3)
+            for i in range(3):
+                await engine.reach_consensus(_proposal(i))
+            await engine.stop()
+            digests.append(engine.checkpoints[3])
+
+        assert digests[0] == digests[1]
@@ -0,0 +1,110 @@
+"""
+Unit tests for the single-pass PII redaction engine.
+"""
+
+import json
+
+import pytest
+
+from src.services.pii_redaction import BulkPIIRedactor, PIIMatch, PIIRedactor, redactor_for
+
+
+PATTERNS = {
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'ssn': r'\b\d{3}-?\d{2}-?\d{4}\b',
+    'phone': r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+    'password': r'(?i)(?:password|passwd|pwd)[\s]*[:=][\s]*[^\s\n]{6,}'
+}
+
+
+class TestPIIRedactor:
+    """Test cases for span selection and structured redaction."""
+
+    def test_redact_builds_text_from_spans(self):
+        """Every type is found in one scan and replaced at its own position."""
+        text = "Mail a@b.io, call 555-123-4567, SSN 123-45-6789, again a@b.io"
+
+        redacted, matches = redactor_for(PATTERNS).redact(text)
+
+        assert redacted == ("Mail [REDACTED_EMAIL], call [REDACTED_PHONE], "
+                            "SSN [REDACTED_SSN], again [REDACTED_EMAIL]")
+        assert [m.pii_type for m in matches] == ['email', 'phone', 'ssn', 'email']
+        assert all(text[m.start:m.end] == m.text for m in matches)
+
+    def test_overlapping_matches_redacted_once(self):
+        """Overlapping matches merge into one span typed by the earlier pattern at the leftmost position."""
+        redactor = PIIRedactor([('ssn', r'\d{9}'), ('long_number', r'\d{9,}'), ('tail', r'\d{4}\b')])
+
+        redacted, matches = redactor.redact("id 1234567890123 and 123456789 0123")
+
+        assert redacted == "id [REDACTED_SSN] and [REDACTED_SSN] [REDACTED_TAIL]"
+        assert matches == [
+            PIIMatch('ssn', 3, 16, '1234567890123'),
+            PIIMatch('ssn', 21, 30, '123456789'),
+            PIIMatch('tail', 31, 35, '0123')
+        ]
+
+    def test_match_straddling_another_type_is_covered(self):
+        """An SSN starting inside an IP address match is redacted with it, not left half visible."""
+        redactor = redactor_for({'ip_address': r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', 'ssn': PATTERNS['ssn']})
+
+        redacted, matches = redactor.redact('10.0.0.110.0.0.1.123-45-6789')
+
+        assert redacted == '[REDACTED_IP_ADDRESS].[REDACTED_IP_ADDRESS]'
+        assert [(m.pii_type, m.text) for m in matches] == [
+            ('ip_address', '10.0.0.110'), ('ip_address', '0.0.1.123-45-6789')
+        ]
+
+    def test_global_flags_are_scoped(self):
+        """A leading (?i) applies to its own pattern only."""
+        redactor = PIIRedactor([('password', r'(?i)pwd=\S+'), ('token', r'tok_[a-z]+')], flags=0)
+
+        assert redactor.redact("PWD=x TOK_ab tok_ab")[0] == "[REDACTED_PASSWORD] TOK_ab [REDACTED_TOKEN]"
+
+    def test_redact_json_keeps_document_valid(self):
+        """Literals are redacted in place and bare values become quoted placeholders."""
+        document = json.dumps({"user": "a@b.io", "ssn": 123456789, "note": 'pwd="secret123', "n": 5})
+
+        redacted, matches = redactor_for(PATTERNS).redact_json(document)
+
+        assert json.loads(redacted) == {
+            "user": "[REDACTED_EMAIL]", "ssn": "[REDACTED_SSN]", "note": "[REDACTED_PASSWORD]", "n": 5
+        }
+        assert len(matches) == 3
+
+    def test_redact_value_walks_nested_structures(self):
+        """Strings in dicts, lists and tuples are redacted; other values are kept."""
+        value = {
+            "contacts": [{"email": "a@b.io"}, ("555-123-4567", 7)],
+            "payload": '{"ssn": "123-45-6789"}',
+            "count": 3
+        }
+
+        assert redactor_for(PATTERNS).redact_value(value) == {
+            "contacts": [{"email": "[REDACTED_EMAIL]"}, ("[REDACTED_PHONE]", 7)],
+            "payload": '{"ssn": "[REDACTED_SSN]"}',
+            "count": 3
+        }
+
+    def test_redactor_for_follows_pattern_edits(self):
+        """The shared redactor is reused until the patterns change."""
+        patterns = dict(PATTERNS)
+        redactor = redactor_for(patterns)
+        assert redactor_for(dict(PATTERNS)) is redactor
+
+        patterns['ticket'] = r'\bTKT-\d+\b'
+
+        assert redactor_for(patterns).redact("see TKT-42")[0] == "see [REDACTED_TICKET]"
+
+    @pytest.mark.asyncio
+    async def test_bulk_redaction_matches_sequential(self):
+        """Batches redacted in worker processes give the same results in the same order."""
+        texts = [f"user{i}@example.com called 555-123-{i:04d}" for i in range(40)]
+        redactor = redactor_for(PATTERNS)
+        bulk = BulkPIIRedactor(process_pool_threshold=1, max_workers=2)
+        try:
+            results = await bulk.redact_many(redactor, texts)
+        finally:
+            bulk.close()
+
+        assert results == [redactor.redact(text) for text in texts]
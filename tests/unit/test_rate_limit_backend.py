@@ -0,0 +1,197 @@
+"""
+Unit tests for token buckets shared between workers through Redis.
+"""
+
+import asyncio
+
+import pytest
+
+from agents.communication.channels import RateLimiter
+from src.services.rate_limit_backend import RedisTokenBucketBackend
+from src.services.rate_limiter import BedrockRateLimitManager, DistributedTokenBucket, RequestPriority
+from src.utils.exceptions import RateLimitError
+
+# Imported before the autouse fixtures patch redis.asyncio.Redis
+fakeredis = pytest.importorskip("fakeredis")
+
+
+SONNET = "anthropic.claude-3-sonnet-20240229-v1:0"
+HAIKU = "anthropic.claude-3-haiku-20240307-v1:0"
+
+
+class FailingBackend:
+    """Backend whose Redis is unreachable."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def take(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("Redis unavailable")
+
+
+@pytest.fixture
+def backend():
+    pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+    client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    return RedisTokenBucketBackend(redis_client=client, key_prefix="test")
+
+
+async def _drain(bucket) -> int:
+    granted = 0
+    while await bucket.consume():
+        granted += 1
+    return granted
+
+
+class TestRedisTokenBucketBackend:
+    """Test cases for the atomic take script."""
+
+    @pytest.mark.asyncio
+    async def test_take_grants_up_to_available_tokens(self, backend):
+        """A new bucket starts full; once empty the script reports the wait for a token."""
+        assert await backend.take("slack", 5, 2.0, 3) == (3, 0.0)
+
+        granted, wait = await backend.take("slack", 5, 2.0, 3)
+
+        assert granted == 2
+        assert 0.4 < wait <= 0.5
+
+    @pytest.mark.asyncio
+    async def test_forced_take_leaves_bucket_in_debt(self, backend):
+        """A forced take is granted in full and delays the next token by the debt."""
+        assert (await backend.take("slack", 2, 2.0, 3, force=True))[0] == 3
+
+        granted, wait = await backend.take("slack", 2, 2.0, 1)
+
+        assert granted == 0
+        assert wait > 0.9
+
+    @pytest.mark.asyncio
+    async def test_refund_is_capped_at_capacity(self, backend):
+        """Refunded tokens return to the bucket but never overfill it."""
+        await backend.take("slack", 5, 0.001, 2)
+
+        assert (await backend.take("slack", 5, 0.001, 10, refund=2))[0] == 5
+        assert (await backend.take("slack", 5, 0.001, 10, refund=50))[0] == 5
+
+
+class TestDistributedTokenBucket:
+    """Test cases for leased shared tokens."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_one_quota(self, backend):
+        """Buckets with the same name in different workers admit the capacity once in total."""
+        workers = [DistributedTokenBucket("bedrock:sonnet", 20, 0.001, backend, lease_size=3) for _ in range(3)]
+
+        granted = sum(await asyncio.gather(*[_drain(bucket) for bucket in workers]))
+
+        assert granted == 20
+
+    @pytest.mark.asyncio
+    async def test_leased_tokens_are_spent_without_round_trips(self, backend):
+        """Admissions within a lease are local."""
+        bucket = DistributedTokenBucket("embeddings", 1000, 500.0, backend, lease_size=50)
+
+        for _ in range(200):
+            assert await bucket.consume()
+
+        assert bucket.round_trips == 4
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_refunded(self, backend):
+        """Tokens unspent when a lease expires go back to the shared bucket, not to the worker."""
+        holder = DistributedTokenBucket("slack", 10, 0.001, backend, lease_size=5, lease_ttl=0.05)
+        other = DistributedTokenBucket("slack", 10, 0.001, backend, lease_size=10)
+        assert await holder.consume()
+
+        await asyncio.sleep(0.06)
+        assert holder.try_consume() is False
+        assert await holder.consume()
+
+        assert await _drain(other) == 4
+        assert holder.tokens == 4
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_local_limits(self):
+        """Without Redis the bucket keeps limiting per process and retries the backend later."""
+        failing = FailingBackend()
+        bucket = DistributedTokenBucket("slack", 3, 0.001, failing)
+
+        assert await _drain(bucket) == 3
+        assert failing.calls == 1
+        assert bucket.get_status()["backend_available"] is False
+
+
+class TestSharedRateLimits:
+    """Test cases for rate limiters built on a shared backend."""
+
+    @pytest.mark.asyncio
+    async def test_bedrock_managers_share_model_quotas(self, backend):
+        """Two workers together get each model's capacity once."""
+        workers = [BedrockRateLimitManager(backend=backend) for _ in range(2)]
+        capacity = sum(bucket.capacity for bucket in workers[0].model_buckets.values())
+
+        granted = 0
+        for n in range(capacity * 2):
+            try:
+                await workers[n % 2].request_model_access(SONNET, priority=RequestPriority.MEDIUM)
+                granted += 1
+            except RateLimitError:
+                pass
+
+        assert granted == capacity
+
+    @pytest.mark.asyncio
+    async def test_request_leases_only_candidate_models(self, backend):
+        """A request refreshes the preferred model and its alternatives, not every bucket."""
+        manager = BedrockRateLimitManager(backend=backend)
+
+        assert await manager.request_model_access(SONNET, complexity_score=0.9) == SONNET
+
+        assert manager.model_buckets[SONNET].round_trips == 1
+        assert manager.model_buckets[HAIKU].round_trips == 0
+
+    @pytest.mark.asyncio
+    async def test_notification_limiters_share_channel_limits(self, backend):
+        """The per-second limit holds across workers, and critical messages may bypass it."""
+        workers = [RateLimiter(2, 100, backend=backend, name="notifications:slack") for _ in range(2)]
+
+        allowed = [await limiter.can_send() for limiter in workers + workers]
+
+        assert allowed == [True, True, False, False]
+        assert await workers[0].can_send(priority_bypass=True)
+        assert workers[0].get_current_usage()["per_second_usage"] == 2
+
+    @pytest.mark.asyncio
+    async def test_priority_bypass_is_charged_to_shared_limits(self, backend):
+        """A bypassing send takes a token other workers no longer see, even from an empty bucket."""
+        workers = [RateLimiter(2, 100, backend=backend, name="notifications:slack") for _ in range(2)]
+        assert await workers[0].can_send() and await workers[1].can_send()
+
+        assert await workers[0].can_send(priority_bypass=True)
+
+        _, wait = await backend.take("notifications:slack:second", 2, 2.0, 0)
+        assert wait > 0.9
+
+    @pytest.mark.asyncio
+    async def test_refused_send_keeps_the_other_limit_token(self, backend):
+        """A send refused by one limit does not spend a token of the other."""
+        minute_limited = RateLimiter(5, 1, backend=backend, name="notifications:pagerduty")
+        second_limited = RateLimiter(1, 100, backend=backend, name="notifications:email")
+        assert await minute_limited.can_send() and await second_limited.can_send()
+
+        assert not await minute_limited.can_send()
+        assert not await second_limited.can_send()
+
+        assert (await backend.take("notifications:pagerduty:second", 5, 5.0, 5))[0] >= 4
+        assert second_limited.shared_buckets[1].tokens == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_below_one_per_second_still_admits(self, backend):
+        """A channel allowed one send every few seconds gets its first send, then waits."""
+        workers = [RateLimiter(0.2, 5, backend=backend, name="notifications:sms") for _ in range(2)]
+
+        allowed = [await limiter.can_send() for limiter in workers]
+
+        assert allowed == [True, False]
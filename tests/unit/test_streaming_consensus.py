@@ -0,0 +1,138 @@
+"""
+Unit tests for streaming consensus in the agent swarm coordinator.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models.agent import ActionType, AgentRecommendation, AgentType, Evidence, RiskLevel
+from src.models.incident import BusinessImpact, Incident, IncidentMetadata, IncidentSeverity, ServiceTier
+from src.orchestrator.swarm_coordinator import AgentSwarmCoordinator, IncidentProcessingState, ProcessingPhase
+
+
+class FakeAgent(SimpleNamespace):
+    """Agent returning one recommendation after a delay."""
+
+    async def process_incident(self, incident):
+        self.started = True
+        await asyncio.sleep(self.delay)
+        self.finished = True
+        return [AgentRecommendation(
+            agent_name=self.agent_type,
+            incident_id=incident.id,
+            action_type=ActionType.RESTART_SERVICE,
+            action_id=self.action_id,
+            confidence=self.confidence,
+            risk_level=RiskLevel.LOW,
+            estimated_impact="brief restart",
+            reasoning="pool exhausted",
+            evidence=[Evidence(source="metrics", data={}, confidence=self.confidence, description="cpu")],
+            urgency=0.5,
+        )]
+
+
+def _agent(name: str, agent_type: AgentType, action_id: str, confidence: float, delay: float) -> FakeAgent:
+    return FakeAgent(name=name, agent_type=agent_type, action_id=action_id,
+                     confidence=confidence, delay=delay, started=False, finished=False)
+
+
+@pytest.fixture
+def coordinator(monkeypatch):
+    monkeypatch.setattr("src.orchestrator.swarm_coordinator.get_message_bus", lambda _: MagicMock())
+    return AgentSwarmCoordinator(service_factory=MagicMock())
+
+
+@pytest.fixture
+def state():
+    incident = Incident(
+        title="Database Connection Failure",
+        description="Connection pool exhausted",
+        severity=IncidentSeverity.HIGH,
+        business_impact=BusinessImpact(service_tier=ServiceTier.TIER_1, affected_users=500),
+        metadata=IncidentMetadata(source_system="unit_test"),
+    )
+    return IncidentProcessingState(
+        incident_id=incident.id, incident=incident, phase=ProcessingPhase.DETECTION, agent_executions={}
+    )
+
+
+async def _run(coordinator, state, agents):
+    coordinator.agents = {agent.name: agent for agent in agents}
+    await coordinator._execute_detection_phase(state)
+    await coordinator._execute_streaming_consensus(state)
+
+
+class TestStreamingConsensus:
+    """Test cases for streaming consensus."""
+
+    @pytest.mark.asyncio
+    async def test_slow_agent_is_cancelled_once_outcome_is_settled(self, coordinator, state):
+        """Agreeing diagnosis agents settle consensus before a slow prediction agent."""
+        slow = _agent("prediction_slow", AgentType.PREDICTION, "scale_out", 0.9, delay=30)
+        agents = [_agent("detection_1", AgentType.DETECTION, "enhance_monitoring", 0.8, delay=0)]
+        agents += [_agent(f"diagnosis_{i}", AgentType.DIAGNOSIS, "restart_db", 0.95, delay=0.01) for i in range(4)]
+        agents.append(slow)
+
+        await asyncio.wait_for(_run(coordinator, state, agents), timeout=5)
+
+        assert state.phase == ProcessingPhase.COMPLETED
+        assert state.consensus_decision.selected_action == "restart_db"
+        assert slow.started and not slow.finished
+        assert state.agent_executions["prediction_slow"].status == "cancelled"
+        assert state.time_saved_seconds > 0
+        assert coordinator.processing_metrics["early_decisions"] == 1
+        assert "prediction_slow" in state.consensus_decision.decision_rationale
+        assert any(e.event_type == "consensus_short_circuit" for e in state.timeline)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_agents_that_can_change_outcome(self, coordinator, state):
+        """A pending agent heavy enough to win keeps the phase open."""
+        agents = [
+            _agent("detection_1", AgentType.DETECTION, "enhance_monitoring", 0.8, delay=0),
+            _agent("prediction_1", AgentType.PREDICTION, "scale_out", 0.6, delay=0.01),
+            _agent("diagnosis_slow", AgentType.DIAGNOSIS, "restart_db", 0.9, delay=0.1),
+        ]
+
+        await _run(coordinator, state, agents)
+
+        assert state.consensus_decision.selected_action == "restart_db"
+        assert state.agent_executions["diagnosis_slow"].status == "completed"
+        assert state.time_saved_seconds == 0.0
+        assert coordinator.processing_metrics["early_decisions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_not_counted_as_early_decision(self, coordinator, state):
+        """Cancelling the phase stops running agents without recording a short circuit."""
+        slow = _agent("diagnosis_slow", AgentType.DIAGNOSIS, "restart_db", 0.9, delay=30)
+        coordinator.agents = {slow.name: slow}
+        run = asyncio.create_task(coordinator._execute_streaming_consensus(state))
+        await asyncio.sleep(0.01)
+
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+        assert slow.started and not slow.finished
+        assert coordinator.processing_metrics["early_decisions"] == 0
+        assert coordinator.processing_metrics["time_saved_seconds"] == 0
+        assert not any(e.event_type == "consensus_short_circuit" for e in state.timeline)
+
+    @pytest.mark.asyncio
+    async def test_matches_batch_consensus(self, coordinator, state):
+        """Streaming selects what waiting for every agent would have selected."""
+        agents = [
+            _agent("detection_1", AgentType.DETECTION, "enhance_monitoring", 0.8, delay=0),
+            _agent("diagnosis_1", AgentType.DIAGNOSIS, "restart_db", 0.7, delay=0.02),
+            _agent("prediction_1", AgentType.PREDICTION, "scale_out", 0.9, delay=0.01),
+        ]
+
+        await _run(coordinator, state, agents)
+        batched = await coordinator.consensus_engine.reach_consensus(
+            state.incident, state.get_all_recommendations()
+        )
+
+        assert state.consensus_decision.selected_action == batched.selected_action
+        assert state.consensus_decision.final_confidence == batched.final_confidence
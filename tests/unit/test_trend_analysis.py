@@ -0,0 +1,165 @@
+"""
+Unit tests for matrix-based trend analysis and seasonal decomposition.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from agents.prediction import models
+from agents.prediction.models import PredictionModel, SeasonalDecomposer, TrendAnalyzer, TrendData
+
+
+def _trend(metric_name: str, values):
+    return TrendData(
+        timestamps=[datetime.utcnow()] * len(values),
+        values=list(values),
+        metric_name=metric_name,
+        service_name="api"
+    )
+
+
+@pytest.fixture
+def metrics():
+    rng = np.random.default_rng(11)
+    hours = np.arange(200)
+    return {
+        "cpu_utilization": _trend("cpu_utilization", 60 + 0.1 * hours + rng.normal(0, 2, 200)),
+        "memory_utilization": _trend("memory_utilization", 70 + 10 * np.sin(hours * 2 * np.pi / 24)),
+        "error_rate": _trend("error_rate", np.full(200, 0.05)),
+        "response_time": _trend("response_time", 200 + rng.normal(0, 5, 30)),
+        "queue_depth": _trend("queue_depth", [1, 2, 3]),
+    }
+
+
+class TestTrendAnalyzer:
+    """Test cases for TrendAnalyzer."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_series(self, metrics):
+        """Scoring many metrics at once matches scoring them one by one."""
+        analyzer = TrendAnalyzer()
+
+        batch = await analyzer.analyze_trends(metrics)
+
+        assert list(batch) == list(metrics)
+        for name, data in metrics.items():
+            single = await analyzer.analyze_trend(data)
+            assert batch[name].keys() == single.keys()
+            for key, value in single.items():
+                assert batch[name][key] == pytest.approx(value)
+
+    @pytest.mark.asyncio
+    async def test_matrix_scores(self):
+        """Known series produce the expected trend and anomaly scores."""
+        values = np.vstack([
+            np.linspace(10, 20, 50),  # Steady growth
+            np.full(50, 5.0),  # Flat
+            np.r_[np.full(45, 1.0), np.full(5, 10.0)],  # Recent spike
+        ])
+
+        scores = await TrendAnalyzer().analyze_matrix(values)
+
+        slope = 10 / 49
+        assert scores["trend_score"][0] == pytest.approx(slope / 15)
+        assert scores["trend_score"][1] == 0.0
+        assert scores["anomaly_score"][1] == 0.0
+        assert scores["anomaly_score"][2] == pytest.approx(1.0)
+        assert scores["seasonal_score"].tolist() == [0.0, 0.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_matrix_runs_off_event_loop_thread(self, monkeypatch):
+        """The vectorized pass executes on a worker thread."""
+        threads = []
+        score = models._score_trends
+
+        def recording(*args):
+            threads.append(threading.current_thread())
+            return score(*args)
+
+        monkeypatch.setattr(models, "_score_trends", recording)
+        await TrendAnalyzer().analyze_matrix(np.ones((3, 20)))
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_matrix_input(self):
+        """Matrix analysis requires metrics x time points."""
+        with pytest.raises(ValueError):
+            await TrendAnalyzer().analyze_matrix(np.ones(20))
+
+
+class TestSeasonalDecomposer:
+    """Test cases for SeasonalDecomposer."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_series(self, metrics):
+        """Batch decomposition matches per-series decomposition."""
+        decomposer = SeasonalDecomposer()
+
+        batch = await decomposer.decompose_trends(metrics)
+
+        for name, data in metrics.items():
+            single = await decomposer.decompose_trend(data)
+            for key, value in single.items():
+                assert np.allclose(batch[name][key], value)
+
+    @pytest.mark.asyncio
+    async def test_daily_pattern_is_seasonal(self):
+        """A pure daily cycle is captured by the seasonal component."""
+        hours = np.arange(24 * 7)
+        values = np.vstack([
+            50 + 10 * np.sin(hours * 2 * np.pi / 24),
+            np.linspace(0, 100, len(hours)),
+        ])
+
+        components = await SeasonalDecomposer().decompose_matrix(values)
+
+        assert components["seasonal"].shape == values.shape
+        assert components["seasonal_strength"][0] > 0.9
+        assert components["seasonal_strength"][1] < 0.1
+        assert np.allclose(components["seasonal"].mean(axis=1), 0.0)
+        assert np.allclose(
+            components["trend"] + components["seasonal"] + components["residual"], values
+        )
+
+    @pytest.mark.asyncio
+    async def test_short_series_use_linear_trend(self):
+        """Series shorter than two periods get a least-squares line and no seasonality."""
+        values = np.linspace(1, 2, 20)[np.newaxis, :]
+
+        components = await SeasonalDecomposer().decompose_matrix(values)
+
+        assert np.allclose(components["trend"], values)
+        assert not components["seasonal"].any()
+
+
+class TestPredictionModelBatching:
+    """Test cases for batched metric scoring in PredictionModel."""
+
+    @pytest.mark.asyncio
+    async def test_scores_hundreds_of_metrics_in_one_pass(self, monkeypatch):
+        """A few hundred equal-length metrics are scored and decomposed in one pass each."""
+        calls = []
+        score, decompose = models._score_trends, models._decompose_rows
+
+        def counting(kernel):
+            def wrapper(values, *args):
+                calls.append((kernel.__name__, values.shape))
+                return kernel(values, *args)
+            return wrapper
+
+        monkeypatch.setattr(models, "_score_trends", counting(score))
+        monkeypatch.setattr(models, "_decompose_rows", counting(decompose))
+        rng = np.random.default_rng(3)
+        metrics = {
+            f"cpu_utilization_{i}": _trend(f"cpu_utilization_{i}", 50 + np.cumsum(rng.normal(1, 1, 96)))
+            for i in range(300)
+        }
+
+        predictions = await PredictionModel().predict_incident(metrics, [])
+
+        assert sorted(calls) == [("_decompose_rows", (300, 96)), ("_score_trends", (300, 96))]
+        assert len(predictions) <= 5
@@ -0,0 +1,125 @@
+"""
+Unit tests for the matrix-backed embedding index.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.vector_index import EmbeddingIndex
+
+
+def _random_vectors(count: int, dimension: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, dimension)).astype(np.float32)
+
+
+class TestEmbeddingIndex:
+    """Test cases for EmbeddingIndex."""
+
+    def test_exact_search_matches_brute_force(self):
+        """Top-k results match a brute-force cosine ranking."""
+        vectors = _random_vectors(200, 16)
+        index = EmbeddingIndex(dimension=16, initial_capacity=8)
+        index.add_batch([f"doc-{i}" for i in range(200)], vectors)
+
+        query = vectors[3] + 0.01
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+
+        results = index.search(query, k=5)[0]
+
+        assert [doc_id for doc_id, _ in results] == [f"doc-{i}" for i in expected]
+        assert results[0][0] == "doc-3"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+
+    def test_batched_queries_return_one_list_per_query(self):
+        """A query matrix yields one ranked list per row."""
+        vectors = _random_vectors(50, 8)
+        index = EmbeddingIndex(dimension=8)
+        index.add_batch([f"doc-{i}" for i in range(50)], vectors)
+
+        results = index.search(vectors[:4], k=3)
+
+        assert len(results) == 4
+        assert [r[0][0] for r in results] == ["doc-0", "doc-1", "doc-2", "doc-3"]
+
+    def test_document_type_filter_and_exclusions(self):
+        """Type filters and excluded ids are applied before ranking."""
+        index = EmbeddingIndex(dimension=2)
+        index.add("incident-a", [1.0, 0.0], "incident")
+        index.add("incident-b", [0.9, 0.1], "incident")
+        index.add("pattern-a", [1.0, 0.0], "pattern")
+
+        results = index.search(np.array([1.0, 0.0]), k=5, document_type="incident",
+                               exclude_ids=["incident-a"])[0]
+
+        assert [doc_id for doc_id, _ in results] == ["incident-b"]
+        assert index.search(np.array([1.0, 0.0]), document_type="unknown") == [[]]
+
+    def test_min_score_threshold(self):
+        """Matches below the minimum score are dropped."""
+        index = EmbeddingIndex(dimension=2)
+        index.add("aligned", [1.0, 0.0])
+        index.add("orthogonal", [0.0, 1.0])
+
+        results = index.search(np.array([1.0, 0.0]), k=None, min_score=0.5)[0]
+
+        assert [doc_id for doc_id, _ in results] == ["aligned"]
+
+    def test_remove_keeps_remaining_rows_searchable(self):
+        """Deleting swaps the last row in without losing other documents."""
+        vectors = _random_vectors(10, 4)
+        index = EmbeddingIndex(dimension=4)
+        index.add_batch([f"doc-{i}" for i in range(10)], vectors)
+
+        assert index.remove("doc-2") is True
+        assert index.remove("doc-2") is False
+        assert len(index) == 9
+        assert "doc-2" not in index
+
+        # The row previously at the end was moved into the freed slot
+        assert index.search(vectors[9], k=1)[0][0][0] == "doc-9"
+        assert all(doc_id != "doc-2" for doc_id, _ in index.search(vectors[2], k=9)[0])
+
+    def test_add_replaces_existing_embedding(self):
+        """Re-adding an id overwrites its embedding in place."""
+        index = EmbeddingIndex(dimension=2)
+        index.add("doc", [1.0, 0.0])
+        index.add("doc", [0.0, 1.0])
+
+        assert len(index) == 1
+        assert index.search(np.array([0.0, 1.0]), k=1)[0][0][1] == pytest.approx(1.0)
+
+    def test_zero_vectors_score_zero(self):
+        """Zero embeddings never divide by zero."""
+        index = EmbeddingIndex(dimension=3)
+        index.add("empty", [0.0, 0.0, 0.0])
+
+        assert index.search(np.array([1.0, 0.0, 0.0]), k=1)[0] == [("empty", 0.0)]
+
+    def test_ivf_search_with_incremental_updates(self):
+        """IVF mode finds near-duplicates and tracks adds and deletes after training."""
+        vectors = _random_vectors(500, 16)
+        index = EmbeddingIndex(dimension=16, nlist=8, nprobe=3)
+        index.add_batch([f"doc-{i}" for i in range(500)], vectors)
+        index.train()
+
+        assert index.is_trained
+        assert index.get_stats()["mode"] == "ivf"
+        assert index.search(vectors[42], k=1)[0][0][0] == "doc-42"
+
+        index.add("late", vectors[7] * 2)
+        index.remove("doc-7")
+        assert index.search(vectors[7], k=1)[0][0][0] == "late"
+
+    def test_train_requires_clusters(self):
+        """Training without a cluster count is rejected."""
+        index = EmbeddingIndex(dimension=4)
+        with pytest.raises(ValueError):
+            index.train()
+
+    def test_shape_mismatch_rejected(self):
+        """Embeddings of the wrong dimension raise."""
+        index = EmbeddingIndex(dimension=4)
+        with pytest.raises(ValueError):
+            index.add("doc", [1.0, 2.0])
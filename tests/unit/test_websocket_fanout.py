@@ -0,0 +1,161 @@
+"""
+Unit tests for event-driven WebSocketManager fan-out.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from src.services.websocket_manager import SlowConsumerPolicy, WebSocketManager, WebSocketMessage
+
+
+class FakeWebSocket:
+    """Minimal WebSocket that records frames and can block sends."""
+
+    def __init__(self, blocked: bool = False):
+        self.frames = []
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not blocked:
+            self._gate.set()
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = None):
+        self.closed_with = code
+
+    async def send_text(self, text: str):
+        await self._gate.wait()
+        self.frames.append(json.loads(text))
+
+    def unblock(self):
+        self._gate.set()
+
+    @property
+    def messages(self):
+        return [m for frame in self.frames for m in frame["messages"]]
+
+
+def _message(message_type: str, n: int, priority: int = 1) -> WebSocketMessage:
+    return WebSocketMessage(type=message_type, timestamp=datetime.utcnow(), data={"n": n}, priority=priority)
+
+
+async def _drain(manager: WebSocketManager):
+    for _ in range(10):
+        await asyncio.sleep(0)
+    while manager._flush_tasks:
+        await asyncio.gather(*manager._flush_tasks.values(), return_exceptions=True)
+
+
+class TestWebSocketFanout:
+    """Test cases for shared encoding, ring buffers and slow-consumer policies."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once(self, monkeypatch):
+        """A broadcast is serialized once regardless of subscriber count."""
+        manager = WebSocketManager(batch_size=50)
+        await manager.start()
+        sockets = [FakeWebSocket() for _ in range(20)]
+        for i, ws in enumerate(sockets):
+            await manager.connect(ws, f"conn-{i}")
+        await _drain(manager)
+
+        calls = []
+        original = WebSocketManager._encode_message
+        monkeypatch.setattr(WebSocketManager, "_encode_message",
+                            staticmethod(lambda m: calls.append(m) or original(m)))
+
+        await manager.broadcast(_message("consensus_update", 1, priority=3))
+        await _drain(manager)
+
+        assert len(calls) == 1
+        assert all(ws.messages[-1]["data"] == {"n": 1} for ws in sockets)
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_enqueue_wakes_sender_without_polling(self):
+        """Messages are delivered without waiting for batch_interval."""
+        manager = WebSocketManager(batch_interval=60)
+        await manager.start()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "conn-1")
+
+        await manager.broadcast(_message("agent_state_update", 1))
+        await asyncio.wait_for(_drain(manager), timeout=1)
+
+        assert [m["type"] for m in ws.messages] == ["initial_state", "agent_state_update"]
+        assert manager.connection_metrics["conn-1"].messages_sent == 2
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_frames_respect_batch_size(self):
+        """Queued messages are flushed in frames of at most batch_size."""
+        manager = WebSocketManager(batch_size=4)
+        ws = FakeWebSocket()
+        await manager.connect(ws, "conn-1")
+        for n in range(9):
+            await manager.broadcast(_message("agent_state_update", n))
+
+        await manager.start()
+        await _drain(manager)
+
+        assert [len(frame["messages"]) for frame in ws.frames] == [4, 4, 2]
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_policy_keeps_high_priority(self):
+        """Full buffers drop low priority messages and evict them for high priority."""
+        manager = WebSocketManager(queue_size=3, slow_consumer_policy="drop")
+        ws = FakeWebSocket()
+        await manager.connect(ws, "conn-1")  # initial_state is high priority
+        for n in range(4):
+            await manager.broadcast(_message("agent_state_update", n))
+        await manager.broadcast(_message("consensus_update", 9, priority=3))
+
+        queued = [m.type for m in manager.connection_queues["conn-1"]]
+
+        assert queued == ["initial_state", "agent_state_update", "consensus_update"]
+        assert manager.connection_metrics["conn-1"].messages_dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_keeps_latest_state(self):
+        """Full buffers replace queued messages of the same type with the newest."""
+        manager = WebSocketManager(queue_size=3, slow_consumer_policy=SlowConsumerPolicy.COALESCE)
+        ws = FakeWebSocket()
+        await manager.connect(ws, "conn-1")
+        for n in range(5):
+            await manager.broadcast(_message("agent_state_update", n))
+
+        await manager.start()
+        await _drain(manager)
+
+        updates = [m["data"]["n"] for m in ws.messages if m["type"] == "agent_state_update"]
+        assert updates == [3, 4]
+        assert manager.total_messages_coalesced == 3
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_consumer(self):
+        """A blocked client is disconnected without slowing other subscribers."""
+        manager = WebSocketManager(queue_size=2, batch_size=1,
+                                   slow_consumer_policy=SlowConsumerPolicy.DISCONNECT)
+        await manager.start()
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow, "slow")
+        await manager.connect(fast, "fast")
+
+        for n in range(5):
+            await manager.broadcast(_message("agent_state_update", n))
+            for _ in range(5):
+                await asyncio.sleep(0)
+        await _drain(manager)
+
+        assert "slow" not in manager.active_connections
+        assert slow.closed_with == 1013
+        assert manager.slow_consumer_disconnects == 1
+        assert not manager._disconnect_tasks
+        assert len(fast.messages) == 6
+        await manager.stop()
@@ -0,0 +1,184 @@
+"""
+Unit tests for single-pass and streaming weighted consensus.
+"""
+
+import asyncio
+import random
+from collections import defaultdict
+
+import pytest
+
+from src.models.agent import ActionType, AgentRecommendation, AgentType, Evidence, RiskLevel
+from src.models.incident import BusinessImpact, Incident, IncidentMetadata, IncidentSeverity, ServiceTier
+from src.services.consensus import BasicWeightedConsensusEngine, ConsensusRecord
+
+
+@pytest.fixture
+def incident() -> Incident:
+    return Incident(
+        title="Database Connection Failure",
+        description="Connection pool exhausted",
+        severity=IncidentSeverity.HIGH,
+        business_impact=BusinessImpact(service_tier=ServiceTier.TIER_1, affected_users=500),
+        metadata=IncidentMetadata(source_system="unit_test"),
+    )
+
+
+def _recommendation(agent: AgentType, action_id: str, confidence: float,
+                    evidence_confidence: float = None) -> AgentRecommendation:
+    evidence = []
+    if evidence_confidence is not None:
+        evidence.append(Evidence(source="metrics", data={}, confidence=evidence_confidence, description="cpu"))
+    return AgentRecommendation(
+        agent_name=agent,
+        incident_id="inc-1",
+        action_type=ActionType.RESTART_SERVICE,
+        action_id=action_id,
+        confidence=confidence,
+        risk_level=RiskLevel.LOW,
+        estimated_impact="brief restart",
+        reasoning="pool exhausted",
+        evidence=evidence,
+        urgency=0.5,
+    )
+
+
+async def _multi_pass(engine: BasicWeightedConsensusEngine, recommendations):
+    """Selection as computed before scoring moved to a single pass."""
+    suspicious = await engine.detect_byzantine_faults(recommendations)
+    accepted = [r for r in recommendations if r.agent_name not in suspicious]
+    scores, counts = defaultdict(float), defaultdict(int)
+    for r in accepted:
+        scores[r.action_id] += r.confidence * engine.agent_weights.get(r.agent_name, 0.1)
+        counts[r.action_id] += 1
+    confidences = {action: scores[action] / counts[action] for action in scores}
+    if not confidences:
+        return "no_action", 0.0
+    best = max(confidences, key=lambda k: confidences[k])
+    return best, confidences[best]
+
+
+async def _stream(recommendations, delay: float = 0.0):
+    for recommendation in recommendations:
+        if delay:
+            await asyncio.sleep(delay)
+        yield recommendation
+
+
+AGENTS = [AgentType.DETECTION, AgentType.DIAGNOSIS, AgentType.PREDICTION, AgentType.RESOLUTION]
+
+
+class TestWeightedConsensus:
+    """Test cases for the weighted consensus engine."""
+
+    @pytest.mark.asyncio
+    async def test_single_pass_matches_multi_pass(self, incident):
+        """Randomised recommendation sets select the same action and confidence."""
+        engine = BasicWeightedConsensusEngine()
+        rng = random.Random(7)
+
+        for _ in range(200):
+            recommendations = [
+                _recommendation(
+                    rng.choice(AGENTS), rng.choice(["restart", "scale", "rollback"]),
+                    round(rng.uniform(0.0, 1.0), 2),
+                    rng.choice([None, round(rng.uniform(0.0, 1.0), 2)])
+                )
+                for _ in range(rng.randint(1, 8))
+            ]
+
+            decision = await engine.reach_consensus(incident, recommendations)
+
+            assert (decision.selected_action, decision.final_confidence) == await _multi_pass(engine, recommendations)
+
+    @pytest.mark.asyncio
+    async def test_suspicious_agent_is_withdrawn_retroactively(self, incident):
+        """A later suspicious recommendation removes the agent's earlier votes."""
+        engine = BasicWeightedConsensusEngine()
+        recommendations = [
+            _recommendation(AgentType.DIAGNOSIS, "rollback", 0.9, 0.9),
+            _recommendation(AgentType.DETECTION, "restart", 0.8, 0.8),
+            _recommendation(AgentType.DIAGNOSIS, "rollback", 0.99),
+        ]
+
+        decision = await engine.reach_consensus(incident, recommendations)
+
+        assert decision.selected_action == "restart"
+        assert decision.participating_agents == ["detection"]
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded_and_compact(self, incident):
+        """History keeps the latest records only while totals keep counting."""
+        engine = BasicWeightedConsensusEngine()
+        engine.consensus_history = type(engine.consensus_history)(maxlen=5)
+
+        for i in range(12):
+            await engine.reach_consensus(incident, [_recommendation(AgentType.DIAGNOSIS, f"a{i}", 0.8, 0.8)])
+
+        stats = engine.get_consensus_statistics()
+        assert len(engine.consensus_history) == 5
+        assert isinstance(engine.consensus_history[-1], ConsensusRecord)
+        assert not hasattr(engine.consensus_history[-1], "__dict__")
+        assert engine.latest_decision.selected_action == "a11"
+        assert stats["total_decisions"] == 12
+        assert stats["history_window"] == 5
+
+    @pytest.mark.asyncio
+    async def test_stream_decides_before_slow_agent(self, incident):
+        """Consensus settles once outstanding weight cannot overtake the leader."""
+        engine = BasicWeightedConsensusEngine()
+        consumed = []
+        recommendations = [
+            _recommendation(AgentType.DIAGNOSIS, "rollback", 0.9, 0.9),
+            _recommendation(AgentType.PREDICTION, "rollback", 0.85, 0.8),
+            _recommendation(AgentType.RESOLUTION, "restart", 0.2, 0.2),
+            _recommendation(AgentType.DETECTION, "restart", 0.9, 0.9),
+        ]
+
+        async def tracked():
+            for recommendation in recommendations:
+                consumed.append(recommendation.agent_name)
+                yield recommendation
+
+        decision = await engine.stream_consensus(incident, tracked(), [a.value for a in AGENTS])
+
+        assert decision.selected_action == (await _multi_pass(engine, recommendations))[0]
+        assert consumed == ["diagnosis", "prediction", "resolution"]
+        assert "detection responded" in decision.decision_rationale
+
+    @pytest.mark.asyncio
+    async def test_stream_waits_when_outcome_is_open(self, incident):
+        """A close race consumes every recommendation and matches the batch result."""
+        engine = BasicWeightedConsensusEngine()
+        recommendations = [
+            _recommendation(AgentType.DETECTION, "restart", 0.9, 0.9),
+            _recommendation(AgentType.RESOLUTION, "scale", 0.9, 0.9),
+            _recommendation(AgentType.DIAGNOSIS, "scale", 0.7, 0.7),
+        ]
+
+        streamed = await engine.stream_consensus(incident, _stream(recommendations), ["detection", "resolution", "diagnosis"])
+        batched = await engine.reach_consensus(incident, recommendations)
+
+        assert streamed.selected_action == batched.selected_action
+        assert streamed.final_confidence == batched.final_confidence
+        assert len(streamed.participating_agents) == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_early_decisions_are_never_overturned(self, incident):
+        """Whenever the stream settles early, the full set selects the same action."""
+        engine = BasicWeightedConsensusEngine()
+        rng = random.Random(11)
+
+        for _ in range(300):
+            agents = rng.sample(AGENTS, len(AGENTS))
+            recommendations = [
+                _recommendation(agent, rng.choice(["restart", "scale", "rollback"]),
+                                round(rng.uniform(0.0, 0.95), 2), round(rng.uniform(0.6, 1.0), 2))
+                for agent in agents
+            ]
+
+            streamed = await engine.stream_consensus(incident, _stream(recommendations), [a.value for a in agents])
+            batched = await engine.reach_consensus(incident, recommendations)
+
+            assert streamed.selected_action == batched.selected_action
+            assert streamed.requires_human_approval == batched.requires_human_approval